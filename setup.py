@@ -27,6 +27,9 @@ setup(
     entry_points={
         "console_scripts": [
             "project-anima=src.project_anima.cli:main",
+            "project-anima-analytics=src.project_anima.analytics:main",
+            "project-anima-export-training=src.project_anima.training_export:main",
+            "project-anima-campaign=src.project_anima.campaign:main",
         ],
     },
 )
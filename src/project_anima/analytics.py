@@ -0,0 +1,568 @@
+#!/usr/bin/env python3
+"""
+Project Anima - 保存済みシミュレーションログの分析ツール
+
+このモジュールは、logsディレクトリ以下に保存された場面ログを1ファイルずつ読み込み、
+実行ごとのターン数、キャラクターごとの行動・発言の比率、プロンプトサイズの推移、
+エラーによる代替ターンの割合、（記録されている場合は）LLM呼び出しのレイテンシ分布と
+モデルごとの不正な応答の発生率を集計して出力します。
+
+ファイルの解析は複数プロセスで並列に実行され、集計は逐次的に行われるため、
+ログの総量に関係なく一定のメモリで動作します。
+
+使用例:
+    python -m project_anima.analytics --log-dir logs --since 20240101 --workers 4
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .utils.log_files import iter_scene_log_files, parse_date_filter
+
+# SimulationEngineが思考生成に失敗した際に記録する代替テキストの接頭辞
+ERROR_PLACEHOLDER_PREFIXES = ("（エラーにより", "（予期せぬエラー")
+
+# 代替テキストに含まれる、LLMの応答が不正だったことを示す例外名
+INVALID_RESPONSE_ERROR_NAME = "InvalidLLMResponseError"
+
+
+def is_error_placeholder(think: Optional[str]) -> bool:
+    """
+    思考内容がエラー時の代替テキストかどうかを判定する
+
+    Args:
+        think: ターンの思考内容
+
+    Returns:
+        代替テキストの場合はTrue
+    """
+    return bool(think) and think.startswith(ERROR_PLACEHOLDER_PREFIXES)
+
+
+def is_invalid_response_placeholder(think: Optional[str]) -> bool:
+    """
+    思考内容がLLMの不正な応答（修復にも失敗したもの）による代替テキストかどうかを判定する
+
+    Args:
+        think: ターンの思考内容
+
+    Returns:
+        不正な応答による代替テキストの場合はTrue
+    """
+    return is_error_placeholder(think) and INVALID_RESPONSE_ERROR_NAME in think
+
+
+def analyze_scene_log(simulation_id: str, file_path: str) -> Dict[str, Any]:
+    """
+    1つの場面ログファイルを解析して要約を作成する
+
+    ワーカープロセスで実行されるため、戻り値はpickle可能な辞書のみで構成します。
+
+    Args:
+        simulation_id: ログが属するシミュレーションID
+        file_path: 場面ログファイルのパス
+
+    Returns:
+        場面ログの要約を格納した辞書
+    """
+    summary: Dict[str, Any] = {
+        "simulation_id": simulation_id,
+        "file_path": file_path,
+        "scene_id": None,
+        "turns": 0,
+        "error_turns": 0,
+        "characters": {},
+        "prompt_chars": [],
+        "latencies_ms": [],
+        "models": {},
+        "error": None,
+    }
+
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            log_data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        summary["error"] = str(e)
+        return summary
+
+    summary["scene_id"] = (log_data.get("scene_info") or {}).get("scene_id")
+
+    for turn in log_data.get("turns") or []:
+        summary["turns"] += 1
+
+        character_id = turn.get("character_id", "unknown")
+        character = summary["characters"].setdefault(
+            character_id,
+            {
+                "name": turn.get("character_name") or character_id,
+                "turns": 0,
+                "act_turns": 0,
+                "talk_turns": 0,
+                "error_turns": 0,
+            },
+        )
+        character["turns"] += 1
+        if turn.get("act"):
+            character["act_turns"] += 1
+        if turn.get("talk"):
+            character["talk_turns"] += 1
+        if is_error_placeholder(turn.get("think")):
+            character["error_turns"] += 1
+            summary["error_turns"] += 1
+
+        metadata = turn.get("metadata") or {}
+        if metadata.get("llm_model"):
+            model = summary["models"].setdefault(
+                metadata["llm_model"],
+                {"turns": 0, "invalid_responses": 0, "repaired_responses": 0},
+            )
+            model["turns"] += 1
+            if is_invalid_response_placeholder(turn.get("think")):
+                model["invalid_responses"] += 1
+            if metadata.get("response_repaired"):
+                model["repaired_responses"] += 1
+        if metadata.get("prompt_chars") is not None:
+            summary["prompt_chars"].append(metadata["prompt_chars"])
+        if metadata.get("llm_latency_ms") is not None:
+            summary["latencies_ms"].append(metadata["llm_latency_ms"])
+
+    return summary
+
+
+class LatencyHistogram:
+    """
+    レイテンシの分布を固定サイズで保持するヒストグラム
+
+    等比的なバケットに件数のみを記録するため、サンプル数に関係なく
+    一定のメモリでパーセンタイルの近似値を求めることができます。
+    """
+
+    # バケット境界の公比（相対誤差はおおよそ5%以内）
+    GROWTH_FACTOR = 1.1
+    MIN_LATENCY_MS = 1.0
+
+    def __init__(self):
+        self._bucket_counts: Dict[int, int] = {}
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms: Optional[float] = None
+        self.max_ms: Optional[float] = None
+
+    def add(self, latency_ms: float) -> None:
+        """レイテンシを1件記録する"""
+        self.count += 1
+        self.total_ms += latency_ms
+        self.min_ms = (
+            latency_ms if self.min_ms is None else min(self.min_ms, latency_ms)
+        )
+        self.max_ms = (
+            latency_ms if self.max_ms is None else max(self.max_ms, latency_ms)
+        )
+
+        bucket = self._bucket_index(latency_ms)
+        self._bucket_counts[bucket] = self._bucket_counts.get(bucket, 0) + 1
+
+    def _bucket_index(self, latency_ms: float) -> int:
+        if latency_ms <= self.MIN_LATENCY_MS:
+            return 0
+        return int(math.log(latency_ms / self.MIN_LATENCY_MS, self.GROWTH_FACTOR)) + 1
+
+    def _bucket_upper_bound(self, bucket: int) -> float:
+        return self.MIN_LATENCY_MS * (self.GROWTH_FACTOR**bucket)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        パーセンタイルの近似値を返す
+
+        Args:
+            percent: 0-100のパーセンタイル
+
+        Returns:
+            近似値（ミリ秒）。サンプルがない場合はNone
+        """
+        if self.count == 0:
+            return None
+
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for bucket in sorted(self._bucket_counts):
+            seen += self._bucket_counts[bucket]
+            if seen >= rank:
+                # 実測の最小値・最大値を超えないように丸める
+                estimate = self._bucket_upper_bound(bucket)
+                return min(max(estimate, self.min_ms), self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """集計結果を辞書形式で返す"""
+        return {
+            "count": self.count,
+            "mean_ms": (self.total_ms / self.count) if self.count else None,
+            "min_ms": self.min_ms,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_ms,
+        }
+
+
+class SimulationLogReport:
+    """
+    場面ログの要約を逐次集計するクラス
+
+    実行（シミュレーションID）ごとのターン数と、キャラクター単位・全体の集計値のみを
+    保持します。
+    """
+
+    def __init__(self):
+        self.files = 0
+        self.unreadable_files = 0
+        self.turns = 0
+        self.error_turns = 0
+        self.turns_per_run: Dict[str, int] = {}
+        self.characters: Dict[str, Dict[str, Any]] = {}
+        self.models: Dict[str, Dict[str, int]] = {}
+        self.latency = LatencyHistogram()
+
+        # プロンプトサイズの推移（計測値が2件以上ある場面のみ対象）
+        self._prompt_growth_scenes = 0
+        self._prompt_first_total = 0
+        self._prompt_last_total = 0
+        self._prompt_growth_per_turn_total = 0.0
+
+    def add(self, summary: Dict[str, Any]) -> None:
+        """
+        1ファイル分の要約を集計に加える
+
+        Args:
+            summary: analyze_scene_logが返した要約
+        """
+        self.files += 1
+        if summary["error"] is not None:
+            self.unreadable_files += 1
+            return
+
+        simulation_id = summary["simulation_id"]
+        self.turns_per_run[simulation_id] = (
+            self.turns_per_run.get(simulation_id, 0) + summary["turns"]
+        )
+        self.turns += summary["turns"]
+        self.error_turns += summary["error_turns"]
+
+        for character_id, stats in summary["characters"].items():
+            totals = self.characters.setdefault(
+                character_id,
+                {
+                    "name": stats["name"],
+                    "turns": 0,
+                    "act_turns": 0,
+                    "talk_turns": 0,
+                    "error_turns": 0,
+                },
+            )
+            for key in ("turns", "act_turns", "talk_turns", "error_turns"):
+                totals[key] += stats[key]
+
+        for model_name, stats in summary["models"].items():
+            totals = self.models.setdefault(
+                model_name,
+                {"turns": 0, "invalid_responses": 0, "repaired_responses": 0},
+            )
+            for key in totals:
+                totals[key] += stats[key]
+
+        prompt_chars = summary["prompt_chars"]
+        if len(prompt_chars) >= 2:
+            self._prompt_growth_scenes += 1
+            self._prompt_first_total += prompt_chars[0]
+            self._prompt_last_total += prompt_chars[-1]
+            self._prompt_growth_per_turn_total += (
+                prompt_chars[-1] - prompt_chars[0]
+            ) / (len(prompt_chars) - 1)
+
+        for latency_ms in summary["latencies_ms"]:
+            self.latency.add(latency_ms)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """集計結果を辞書形式で返す"""
+        run_turns = list(self.turns_per_run.values())
+        characters = {}
+        for character_id, totals in sorted(self.characters.items()):
+            turns = totals["turns"]
+            characters[character_id] = {
+                **totals,
+                "act_ratio": totals["act_turns"] / turns if turns else 0.0,
+                "talk_ratio": totals["talk_turns"] / turns if turns else 0.0,
+                "error_rate": totals["error_turns"] / turns if turns else 0.0,
+            }
+
+        models = {}
+        for model_name, totals in sorted(self.models.items()):
+            turns = totals["turns"]
+            models[model_name] = {
+                **totals,
+                "invalid_rate": totals["invalid_responses"] / turns if turns else 0.0,
+                "repair_rate": totals["repaired_responses"] / turns if turns else 0.0,
+            }
+
+        prompt_size = None
+        if self._prompt_growth_scenes:
+            scenes = self._prompt_growth_scenes
+            prompt_size = {
+                "scenes": scenes,
+                "mean_first_prompt_chars": self._prompt_first_total / scenes,
+                "mean_last_prompt_chars": self._prompt_last_total / scenes,
+                "mean_growth_chars_per_turn": self._prompt_growth_per_turn_total
+                / scenes,
+            }
+
+        return {
+            "files": self.files,
+            "unreadable_files": self.unreadable_files,
+            "runs": len(run_turns),
+            "turns": self.turns,
+            "turns_per_run": {
+                "mean": (sum(run_turns) / len(run_turns)) if run_turns else 0.0,
+                "min": min(run_turns) if run_turns else 0,
+                "max": max(run_turns) if run_turns else 0,
+            },
+            "error_turns": self.error_turns,
+            "error_rate": self.error_turns / self.turns if self.turns else 0.0,
+            "characters": characters,
+            "models": models,
+            "prompt_size": prompt_size,
+            "latency": self.latency.to_dict() if self.latency.count else None,
+        }
+
+
+def iter_summaries(log_files: Iterable, workers: int = 1) -> Iterator[Dict[str, Any]]:
+    """
+    場面ログファイルを解析し、要約を順に返す
+
+    workersが2以上の場合はプロセスプールで並列に解析します。
+    同時に処理中とするファイル数を制限するため、ファイル数に関係なく
+    一定のメモリで動作します。
+
+    Args:
+        log_files: (シミュレーションID, ファイルパス) のイテラブル
+        workers: 並列に実行するプロセス数
+
+    Yields:
+        analyze_scene_logが返した要約
+    """
+    if workers <= 1:
+        for simulation_id, file_path in log_files:
+            yield analyze_scene_log(simulation_id, file_path)
+        return
+
+    max_in_flight = workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for simulation_id, file_path in log_files:
+            in_flight.append(
+                executor.submit(analyze_scene_log, simulation_id, file_path)
+            )
+            if len(in_flight) >= max_in_flight:
+                yield in_flight.popleft().result()
+
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def analyze_logs(
+    log_dir: str,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    simulation_ids: Optional[List[str]] = None,
+    workers: int = 1,
+) -> SimulationLogReport:
+    """
+    ログディレクトリ以下の場面ログを集計する
+
+    Args:
+        log_dir: ログのルートディレクトリ
+        since: この日付以降の実行に限定（"YYYYMMDD" または "YYYY-MM-DD"）
+        until: この日付以前の実行に限定（"YYYYMMDD" または "YYYY-MM-DD"）
+        simulation_ids: 対象とするシミュレーションIDのリスト（Noneの場合は全て）
+        workers: 並列に実行するプロセス数
+
+    Returns:
+        集計結果
+    """
+    log_files = iter_scene_log_files(
+        log_dir,
+        since=parse_date_filter(since),
+        until=parse_date_filter(until),
+        simulation_ids=simulation_ids,
+    )
+
+    report = SimulationLogReport()
+    for summary in iter_summaries(log_files, workers):
+        report.add(summary)
+    return report
+
+
+def format_report(report_dict: Dict[str, Any], per_run: Dict[str, int]) -> str:
+    """
+    集計結果を人間が読みやすいテキストに整形する
+
+    Args:
+        report_dict: SimulationLogReport.to_dictの結果
+        per_run: 実行ごとのターン数（空の場合は実行ごとの一覧を出力しない）
+
+    Returns:
+        整形されたテキスト
+    """
+    lines = ["Project Anima - シミュレーションログ分析", "=" * 60]
+    lines.append(
+        f"ファイル数: {report_dict['files']} (読み込み失敗: {report_dict['unreadable_files']})"
+    )
+    lines.append(f"実行数: {report_dict['runs']}")
+    lines.append(f"総ターン数: {report_dict['turns']}")
+
+    turns_per_run = report_dict["turns_per_run"]
+    lines.append(
+        f"実行あたりのターン数: 平均 {turns_per_run['mean']:.1f} "
+        f"(最小 {turns_per_run['min']}, 最大 {turns_per_run['max']})"
+    )
+    lines.append(
+        f"エラー代替ターン: {report_dict['error_turns']} "
+        f"({report_dict['error_rate'] * 100:.1f}%)"
+    )
+
+    if report_dict["characters"]:
+        lines.append("")
+        lines.append("キャラクター別:")
+        for character_id, stats in report_dict["characters"].items():
+            lines.append(
+                f"  {stats['name']} ({character_id}): {stats['turns']}ターン, "
+                f"行動 {stats['act_ratio'] * 100:.1f}%, "
+                f"発言 {stats['talk_ratio'] * 100:.1f}%, "
+                f"エラー {stats['error_rate'] * 100:.1f}%"
+            )
+
+    if report_dict.get("models"):
+        lines.append("")
+        lines.append("モデル別の応答:")
+        for model_name, stats in report_dict["models"].items():
+            lines.append(
+                f"  {model_name}: {stats['turns']}ターン, "
+                f"不正な応答 {stats['invalid_rate'] * 100:.1f}%, "
+                f"修復 {stats['repair_rate'] * 100:.1f}%"
+            )
+
+    prompt_size = report_dict["prompt_size"]
+    if prompt_size:
+        lines.append("")
+        lines.append(f"プロンプトサイズ ({prompt_size['scenes']}場面):")
+        lines.append(
+            f"  最初のターン平均 {prompt_size['mean_first_prompt_chars']:.0f}文字 -> "
+            f"最後のターン平均 {prompt_size['mean_last_prompt_chars']:.0f}文字"
+        )
+        lines.append(
+            f"  1ターンあたりの増加: 平均 {prompt_size['mean_growth_chars_per_turn']:.1f}文字"
+        )
+
+    latency = report_dict["latency"]
+    if latency:
+        lines.append("")
+        lines.append(f"LLMレイテンシ ({latency['count']}件):")
+        lines.append(
+            f"  平均 {latency['mean_ms']:.0f}ms, p50 {latency['p50_ms']:.0f}ms, "
+            f"p95 {latency['p95_ms']:.0f}ms, p99 {latency['p99_ms']:.0f}ms, "
+            f"最大 {latency['max_ms']:.0f}ms"
+        )
+
+    if per_run:
+        lines.append("")
+        lines.append("実行別ターン数:")
+        for simulation_id, turns in per_run.items():
+            lines.append(f"  {simulation_id}\t{turns}")
+
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Analyze saved Project Anima simulation logs"
+    )
+    parser.add_argument(
+        "--log-dir",
+        type=str,
+        default="logs",
+        help="Path to logs directory",
+    )
+    parser.add_argument(
+        "--since",
+        type=str,
+        default=None,
+        help="Only include runs on or after this date (YYYYMMDD or YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--until",
+        type=str,
+        default=None,
+        help="Only include runs on or before this date (YYYYMMDD or YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--sim-id",
+        action="append",
+        default=None,
+        help="Only include the given simulation ID (can be repeated)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format",
+    )
+    parser.add_argument(
+        "--per-run",
+        action="store_true",
+        help="Also list the number of turns for each run",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main entry point for the analytics command."""
+    args = parse_args(argv)
+
+    try:
+        report = analyze_logs(
+            args.log_dir,
+            since=args.since,
+            until=args.until,
+            simulation_ids=args.sim_id,
+            workers=args.workers,
+        )
+    except ValueError as e:
+        print(f"エラー: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    report_dict = report.to_dict()
+    per_run = report.turns_per_run if args.per_run else {}
+
+    if args.format == "json":
+        if per_run:
+            report_dict["runs_detail"] = per_run
+        print(json.dumps(report_dict, ensure_ascii=False, indent=2))
+    else:
+        print(format_report(report_dict, per_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,572 @@
+#!/usr/bin/env python3
+"""
+Project Anima - 複数場面のキャンペーン実行ツール
+
+このモジュールは、順序付けられた複数の場面を続けて実行するCampaignRunnerを提供します。
+各場面の終了後にその場面のサマリーを生成して保存し、次の場面の全キャラクターに
+「直前の場面のサマリー」として渡します。参加キャラクターの長期情報の更新は
+場面の終了後にまとめて行います。
+
+進行状況は場面単位で状態ファイルに保存されるため、中断したキャンペーンを
+再実行すると、完了済みの場面をやり直さずに続きから再開できます。
+
+キャンペーン定義ファイルの例:
+    campaign_id: school_days
+    max_turns_per_scene: 6
+    scenes:
+      - scene_file: data/scenes/school_rooftop.yaml
+      - scene_file: data/scenes/library_study_room.yaml
+        max_turns: 10
+
+使用例:
+    python -m project_anima.campaign campaign.yaml --state logs/campaign_state.json
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import sys
+import tempfile
+from typing import Callable, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from .core.context_builder import format_short_term_context
+from .core.data_models import SceneLogData
+from .core.memory_consolidator import MemoryConsolidator
+from .core.simulation_engine import SimulationEngine
+from .utils.file_handler import load_yaml
+from .utils.logging_setup import add_logging_arguments, configure_logging_from_args
+
+logger = logging.getLogger(__name__)
+
+# 状態ファイルの形式バージョン
+CAMPAIGN_STATE_VERSION = "1.0"
+
+# LLMでサマリーを生成できなかった場合に、代わりに使用する直近のターン数
+FALLBACK_SUMMARY_TURNS = 10
+
+# 場面を実行するエンジンを作成する関数（場面ファイル、直前の場面のサマリー、直前の場面のログ）
+EngineFactory = Callable[[str, Optional[str], Optional[str]], SimulationEngine]
+
+# 場面のサマリーを生成する関数
+SceneSummarizer = Callable[[SimulationEngine, SceneLogData], str]
+
+
+class CampaignError(Exception):
+    """キャンペーン実行に関するエラー"""
+
+    pass
+
+
+class CampaignSceneSpec(BaseModel):
+    """キャンペーンを構成する1つの場面の定義"""
+
+    scene_file: str = Field(description="場面設定ファイルのパス")
+    max_turns: Optional[int] = Field(
+        None,
+        description="この場面で実行する最大ターン数（省略時はキャンペーンの既定値）",
+    )
+
+
+class CampaignDefinition(BaseModel):
+    """キャンペーン全体の定義"""
+
+    campaign_id: str = Field(description="キャンペーンを識別するID")
+    max_turns_per_scene: int = Field(
+        10, description="各場面で実行する最大ターン数の既定値"
+    )
+    scenes: List[CampaignSceneSpec] = Field(
+        description="実行する場面のリスト（実行順）"
+    )
+
+
+class CampaignSceneState(BaseModel):
+    """キャンペーン内の1つの場面の進行状況"""
+
+    scene_file: str = Field(description="場面設定ファイルのパス")
+    status: Literal["pending", "simulated", "completed"] = Field(
+        "pending",
+        description="pending: 未実行、simulated: 場面の実行とサマリー生成が完了（長期情報の更新に失敗したキャラクターがいる場合を含む）、completed: 長期情報の更新まで完了",
+    )
+    scene_id: Optional[str] = Field(None, description="場面ID")
+    simulation_id: Optional[str] = Field(
+        None, description="場面を実行したシミュレーションID"
+    )
+    scene_log_path: Optional[str] = Field(None, description="保存された場面ログのパス")
+    turns_executed: int = Field(0, description="実行したターン数")
+    summary: Optional[str] = Field(None, description="場面のサマリー")
+    long_term_updated: List[str] = Field(
+        default_factory=list, description="長期情報の更新が完了したキャラクターID"
+    )
+    long_term_failed: List[str] = Field(
+        default_factory=list, description="長期情報の更新に失敗したキャラクターID"
+    )
+    completed_at: Optional[str] = Field(None, description="場面の処理が完了した日時")
+
+
+class CampaignState(BaseModel):
+    """キャンペーンの進行状況（状態ファイルの内容）"""
+
+    version: str = CAMPAIGN_STATE_VERSION
+    campaign_id: str
+    scenes: List[CampaignSceneState]
+    updated_at: Optional[str] = None
+
+    @property
+    def is_completed(self) -> bool:
+        """全ての場面が完了しているか"""
+        return all(scene.status == "completed" for scene in self.scenes)
+
+
+def load_campaign_definition(file_path: str) -> CampaignDefinition:
+    """
+    キャンペーン定義ファイル（YAML）を読み込む
+
+    Args:
+        file_path: キャンペーン定義ファイルのパス
+
+    Returns:
+        キャンペーン定義
+
+    Raises:
+        FileNotFoundError: ファイルが存在しない場合
+        pydantic.ValidationError: 定義の内容が不正な場合
+    """
+    return CampaignDefinition.model_validate(load_yaml(file_path) or {})
+
+
+def build_fallback_summary(
+    scene_log: SceneLogData, max_turns: int = FALLBACK_SUMMARY_TURNS
+) -> str:
+    """
+    LLMを使わずに場面のサマリーを作成する（直近のやり取りの抜粋）
+
+    Args:
+        scene_log: 場面ログ
+        max_turns: 含める直近のターン数
+
+    Returns:
+        サマリー文字列
+    """
+    scene_info = scene_log.scene_info
+    header = f"場面「{scene_info.scene_id}」"
+    if scene_info.location:
+        header += f"（{scene_info.location}）"
+    return (
+        f"{header}: {scene_info.situation}\n"
+        f"{format_short_term_context(list(scene_log.turns), max_turns)}"
+    )
+
+
+def summarize_scene_with_llm(engine: SimulationEngine, scene_log: SceneLogData) -> str:
+    """
+    エンジンのLLMAdapterで場面のサマリーを生成する
+
+    生成に失敗した場合は直近のやり取りの抜粋をサマリーとして返します。
+
+    Args:
+        engine: 場面を実行したエンジン
+        scene_log: 場面ログ
+
+    Returns:
+        サマリー文字列
+    """
+    scene_info = scene_log.scene_info
+    summary_context = {
+        "scene_context": "\n".join(
+            part
+            for part in (
+                f"場所: {scene_info.location}" if scene_info.location else "",
+                f"時間: {scene_info.time}" if scene_info.time else "",
+                f"状況: {scene_info.situation}",
+            )
+            if part
+        ),
+        "transcript": format_short_term_context(
+            list(scene_log.turns), max(len(scene_log.turns), 1)
+        ),
+    }
+    prompt_file_path = os.path.join(engine.prompts_dir_path, "scene_summary.txt")
+
+    try:
+        return engine.llm_adapter.generate_scene_summary(
+            summary_context, prompt_file_path
+        )
+    except Exception as e:
+        logger.warning(
+            f"場面 '{scene_info.scene_id}' のサマリー生成に失敗したため、やり取りの抜粋を使用します: {e}"
+        )
+        return build_fallback_summary(scene_log)
+
+
+def _now() -> str:
+    return datetime.datetime.now().isoformat(timespec="seconds")
+
+
+class CampaignRunner:
+    """
+    複数の場面を順に実行するキャンペーンランナー
+
+    各場面は「実行 → ログ保存・サマリー生成（simulated） → 長期情報の一括更新（completed）」
+    の順に進み、段階ごとに状態ファイルへ保存されます。再実行時は完了済みの場面を飛ばし、
+    simulatedの場面は長期情報の更新が済んでいないキャラクターのみ更新します。
+    """
+
+    def __init__(
+        self,
+        definition: CampaignDefinition,
+        state_path: str,
+        engine_factory: EngineFactory,
+        summarizer: SceneSummarizer = summarize_scene_with_llm,
+        long_term_workers: Optional[int] = None,
+    ):
+        """
+        CampaignRunnerを初期化する
+
+        Args:
+            definition: キャンペーン定義
+            state_path: 進行状況を保存する状態ファイルのパス
+            engine_factory: 場面を実行するSimulationEngineを作成する関数
+            summarizer: 場面のサマリーを生成する関数
+            long_term_workers: 長期情報の一括更新で同時に行う更新の上限
+        """
+        if not definition.scenes:
+            raise CampaignError("キャンペーンに場面が定義されていません")
+
+        self.definition = definition
+        self.state_path = state_path
+        self.engine_factory = engine_factory
+        self.summarizer = summarizer
+        self.long_term_workers = long_term_workers
+        self.state = self._load_or_create_state()
+
+    def run(self) -> CampaignState:
+        """
+        未完了の場面を順に実行する
+
+        Returns:
+            実行後のキャンペーンの進行状況
+
+        Raises:
+            CampaignError: 場面のセットアップに失敗した場合
+        """
+        previous_engine: Optional[SimulationEngine] = None
+        for index, spec in enumerate(self.definition.scenes):
+            scene_state = self.state.scenes[index]
+            if scene_state.status == "completed":
+                logger.info(f"場面 {index + 1} は完了済みのためスキップします")
+                continue
+
+            previous_state = self.state.scenes[index - 1] if index > 0 else None
+            previous_summary = previous_state.summary if previous_state else None
+            previous_log = previous_state.scene_log_path if previous_state else None
+
+            # 前の場面の長期情報の整理が終わってから次の場面の長期情報を読み込む
+            if previous_engine is not None:
+                previous_engine.wait_for_memory_consolidation()
+
+            engine = self.engine_factory(
+                spec.scene_file, previous_summary, previous_log
+            )
+
+            if scene_state.status == "pending":
+                self._simulate_scene(engine, spec, scene_state)
+            else:
+                self._attach_saved_scene_log(engine, scene_state)
+
+            self._update_long_term(engine, scene_state)
+            previous_engine = engine
+
+        if previous_engine is not None:
+            previous_engine.wait_for_memory_consolidation()
+
+        if self.state.is_completed:
+            logger.info(f"キャンペーン '{self.definition.campaign_id}' が完了しました")
+        else:
+            logger.warning(
+                f"キャンペーン '{self.definition.campaign_id}' には長期情報の更新が未完了の場面があります"
+                "（再実行すると失敗したキャラクターのみ更新します）"
+            )
+        return self.state
+
+    def _simulate_scene(
+        self,
+        engine: SimulationEngine,
+        spec: CampaignSceneSpec,
+        scene_state: CampaignSceneState,
+    ) -> None:
+        """場面を実行し、ログの保存とサマリーの生成を行う"""
+        logger.info(f"場面 '{spec.scene_file}' を開始します")
+        if not engine.start_simulation_setup():
+            raise CampaignError(
+                f"場面 '{spec.scene_file}' のセットアップに失敗しました"
+            )
+
+        scene_log_path = engine.get_scene_log_file_path()
+        max_turns = (
+            spec.max_turns
+            if spec.max_turns is not None
+            else self.definition.max_turns_per_scene
+        )
+        turns_executed = 0
+        while turns_executed < max_turns and engine.execute_one_turn():
+            turns_executed += 1
+
+        scene_log = engine.get_current_scene_log()
+        # 長期情報はサマリーの保存後にまとめて更新する
+        engine.end_simulation(update_long_term=False)
+
+        scene_state.scene_id = scene_log.scene_info.scene_id
+        scene_state.scene_log_path = scene_log_path
+        scene_state.simulation_id = (
+            os.path.basename(os.path.dirname(scene_log_path))
+            if scene_log_path
+            else None
+        )
+        scene_state.turns_executed = turns_executed
+        scene_state.summary = self.summarizer(engine, scene_log)
+        scene_state.status = "simulated"
+        self._save_state()
+
+        logger.info(
+            f"場面 '{scene_state.scene_id}' が終了しました（{turns_executed} ターン）"
+        )
+
+    def _attach_saved_scene_log(
+        self, engine: SimulationEngine, scene_state: CampaignSceneState
+    ) -> None:
+        """中断前に保存した場面ログをエンジンに読み込む"""
+        if not scene_state.scene_log_path or not os.path.exists(
+            scene_state.scene_log_path
+        ):
+            raise CampaignError(
+                f"再開に必要な場面ログが見つかりません: {scene_state.scene_log_path}"
+            )
+
+        logger.info(f"保存済みの場面ログから再開します: {scene_state.scene_log_path}")
+        with open(scene_state.scene_log_path, "r", encoding="utf-8") as f:
+            engine.attach_scene_log(SceneLogData.model_validate(json.load(f)))
+
+    def _update_long_term(
+        self, engine: SimulationEngine, scene_state: CampaignSceneState
+    ) -> None:
+        """長期情報が未更新の参加キャラクターをまとめて更新する"""
+        scene_log = engine.get_current_scene_log()
+        pending = [
+            character_id
+            for character_id in scene_log.scene_info.participant_character_ids
+            if character_id not in scene_state.long_term_updated
+        ]
+
+        if pending:
+            results = engine.update_long_term_info_batch(
+                pending, max_workers=self.long_term_workers
+            )
+            for character_id in pending:
+                if results.get(character_id) is not None:
+                    scene_state.long_term_updated.append(character_id)
+                    if character_id in scene_state.long_term_failed:
+                        scene_state.long_term_failed.remove(character_id)
+                elif character_id not in scene_state.long_term_failed:
+                    scene_state.long_term_failed.append(character_id)
+
+        if scene_state.long_term_failed:
+            # 失敗したキャラクターは次回の実行で再試行する（simulatedのまま保存する）
+            logger.warning(
+                f"場面 '{scene_state.scene_id}' の長期情報の更新に失敗したキャラクターがいます: "
+                f"{scene_state.long_term_failed}（次回の実行で再試行します）"
+            )
+            self._save_state()
+            return
+
+        scene_state.status = "completed"
+        scene_state.completed_at = _now()
+        self._save_state()
+
+    def _load_or_create_state(self) -> CampaignState:
+        """状態ファイルを読み込む（存在しない場合は新しい状態を作成する）"""
+        scene_files = [spec.scene_file for spec in self.definition.scenes]
+
+        if os.path.exists(self.state_path):
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = CampaignState.model_validate(json.load(f))
+
+            saved_files = [scene.scene_file for scene in state.scenes]
+            if (
+                state.campaign_id != self.definition.campaign_id
+                or saved_files != scene_files[: len(saved_files)]
+            ):
+                raise CampaignError(
+                    f"状態ファイル '{self.state_path}' はこのキャンペーン定義と一致しません"
+                )
+
+            # 定義の末尾に追加された場面は未実行として扱う
+            for scene_file in scene_files[len(saved_files) :]:
+                state.scenes.append(CampaignSceneState(scene_file=scene_file))
+
+            completed = sum(scene.status == "completed" for scene in state.scenes)
+            logger.info(
+                f"キャンペーン '{state.campaign_id}' を再開します（完了済み: {completed}/{len(state.scenes)}）"
+            )
+            return state
+
+        return CampaignState(
+            campaign_id=self.definition.campaign_id,
+            scenes=[CampaignSceneState(scene_file=f) for f in scene_files],
+        )
+
+    def _save_state(self) -> None:
+        """状態ファイルを一時ファイル経由で書き出す（中断しても壊れないようにする）"""
+        self.state.updated_at = _now()
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        os.makedirs(directory, exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.state.model_dump(), f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.state_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Run an ordered list of Project Anima scenes as a resumable campaign"
+    )
+    parser.add_argument(
+        "campaign",
+        type=str,
+        help="Path to campaign definition file (YAML)",
+    )
+    parser.add_argument(
+        "--state",
+        type=str,
+        default=None,
+        help="Path to campaign state file (defaults to <log-dir>/campaign_<id>.json)",
+    )
+    parser.add_argument(
+        "--characters-dir",
+        type=str,
+        default="data/characters",
+        help="Path to characters directory",
+    )
+    parser.add_argument(
+        "--prompts-dir",
+        type=str,
+        default="data/prompts",
+        help="Path to prompts directory",
+    )
+    parser.add_argument(
+        "--log-dir",
+        type=str,
+        default="logs",
+        help="Path to logs directory",
+    )
+    parser.add_argument(
+        "--llm-model",
+        type=str,
+        default="gemini-1.5-flash-latest",
+        help="LLM model to use",
+    )
+    parser.add_argument(
+        "--long-term-workers",
+        type=int,
+        default=None,
+        help="Maximum number of concurrent long-term memory updates",
+    )
+    parser.add_argument(
+        "--long-term-batch-size",
+        type=int,
+        default=None,
+        help="Update up to this many characters' long-term memory per LLM call",
+    )
+    parser.add_argument(
+        "--consolidate-memories",
+        action="store_true",
+        help="Merge near-duplicate long-term memories in the background between scenes",
+    )
+    parser.add_argument(
+        "--chat-sessions",
+        action="store_true",
+        default=None,
+        help="Keep a chat session per character and send only new events each turn",
+    )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Enable debug mode",
+    )
+    add_logging_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main entry point for the campaign command."""
+    args = parse_args(argv)
+
+    configure_logging_from_args(args)
+
+    try:
+        definition = load_campaign_definition(args.campaign)
+    except Exception as e:
+        print(f"エラー: キャンペーン定義を読み込めませんでした: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    state_path = args.state or os.path.join(
+        args.log_dir, f"campaign_{definition.campaign_id}.json"
+    )
+
+    memory_consolidator = MemoryConsolidator() if args.consolidate_memories else None
+
+    def create_engine(
+        scene_file: str,
+        previous_scene_summary: Optional[str],
+        previous_scene_log_reference: Optional[str],
+    ) -> SimulationEngine:
+        return SimulationEngine(
+            scene_file_path=scene_file,
+            characters_dir=args.characters_dir,
+            prompts_dir=args.prompts_dir,
+            log_dir=args.log_dir,
+            llm_model=args.llm_model,
+            debug=args.debug,
+            previous_scene_summary=previous_scene_summary,
+            previous_scene_log_reference=previous_scene_log_reference,
+            memory_consolidator=memory_consolidator,
+            long_term_batch_size=args.long_term_batch_size,
+            chat_session_mode=args.chat_sessions,
+        )
+
+    try:
+        runner = CampaignRunner(
+            definition,
+            state_path,
+            create_engine,
+            long_term_workers=args.long_term_workers,
+        )
+        state = runner.run()
+    except CampaignError as e:
+        print(f"エラー: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if memory_consolidator is not None:
+            memory_consolidator.shutdown()
+
+    for index, scene in enumerate(state.scenes, start=1):
+        print(
+            f"{index}. {scene.scene_id or scene.scene_file}: {scene.status}"
+            f"（{scene.turns_executed} ターン）"
+        )
+        if scene.long_term_failed:
+            print(f"   長期情報の更新に失敗: {', '.join(scene.long_term_failed)}")
+    print(f"状態ファイル: {state_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,21 @@
 読み込み、Pydanticモデルに変換して提供する機能を実装します。
 """
 
+import atexit
 import os
+import threading
+import time
 import logging
-from typing import Dict, Optional
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 import yaml
 from pydantic import ValidationError
 
 from .data_models import ImmutableCharacterData, LongTermCharacterData
 from ..utils.file_handler import load_yaml, save_yaml
+from ..utils.yaml_snapshot import load_model_with_snapshot
 
 # ロガーの設定
 logger = logging.getLogger(__name__)
@@ -45,26 +51,110 @@ class InvalidCharacterDataError(CharacterManagerError):
         self.original_error = original_error
 
 
+# 遅延書き込みが有効なCharacterManager（他のインスタンスが読み込む前と終了時に書き込みを完了させる）
+_write_behind_managers: "weakref.WeakSet[CharacterManager]" = weakref.WeakSet()
+
+
+def _flush_pending_writes_for(
+    file_path: str, requester: Optional["CharacterManager"] = None
+) -> None:
+    """他のCharacterManagerが同じファイルへの書き込みを保留していれば完了させる"""
+    for manager in list(_write_behind_managers):
+        if manager is not requester and manager._has_pending_write_for(file_path):
+            manager.flush()
+
+
+@atexit.register
+def _flush_all_write_behind_managers() -> None:
+    """終了時に保留中の長期情報を全て書き込む"""
+    for manager in list(_write_behind_managers):
+        manager.close()
+
+
 class CharacterManager:
     """
     キャラクター設定ファイルを管理するクラス
 
     指定されたキャラクターの不変情報（immutable.yaml）と長期情報（long_term.yaml）を
     読み込み、Pydanticモデルとして提供します。
-    一度読み込んだデータはキャッシュされ、再度の読み込みは行われません。
+    一度読み込んだデータはキャッシュされますが、取得時にファイルの更新時刻とサイズを
+    （reload_check_interval秒に1回まで）確認し、変更されたファイルのみを再読み込みします。
     """
 
-    def __init__(self, characters_base_path: str):
+    # ファイルの変更を確認する最短間隔（秒）
+    DEFAULT_RELOAD_CHECK_INTERVAL = 1.0
+
+    # スナップショットキャッシュを既定で有効にする環境変数
+    SNAPSHOT_CACHE_ENV = "PROJECT_ANIMA_CHARACTER_SNAPSHOT_CACHE"
+
+    # 長期情報の遅延書き込みを既定で有効にする環境変数
+    WRITE_BEHIND_ENV = "PROJECT_ANIMA_LONG_TERM_WRITE_BEHIND"
+
+    # 遅延書き込みで、最初の更新から書き込みを始めるまでの待ち時間（秒）
+    DEFAULT_WRITE_BEHIND_DELAY = 0.1
+
+    def __init__(
+        self,
+        characters_base_path: str,
+        reload_check_interval: Optional[float] = DEFAULT_RELOAD_CHECK_INTERVAL,
+        use_snapshot_cache: Optional[bool] = None,
+        write_behind: Optional[bool] = None,
+        write_behind_delay: float = DEFAULT_WRITE_BEHIND_DELAY,
+    ):
         """
         CharacterManagerを初期化する
 
         Args:
             characters_base_path: キャラクターデータが格納されているディレクトリのパス
+            reload_check_interval: ファイルの変更を確認する最短間隔（秒）。
+                Noneの場合は変更を確認しない
+            use_snapshot_cache: 解析済みのデータをYAMLの隣にJSONのスナップショットとして
+                保存し、内容が変わっていなければそこから読み込むか。
+                Noneの場合は環境変数 PROJECT_ANIMA_CHARACTER_SNAPSHOT_CACHE が "1" のときに有効
+            write_behind: 長期情報の更新をメモリに反映した時点で戻り、ファイルへの書き込みは
+                バックグラウンドのスレッドで行うか。同じキャラクターへの連続した更新は
+                最後の内容のみ書き込む。Noneの場合は環境変数
+                PROJECT_ANIMA_LONG_TERM_WRITE_BEHIND が "1" のときに有効
+            write_behind_delay: 遅延書き込みで、最初の更新から書き込みを始めるまでの待ち時間（秒）。
+                この間の更新はまとめて書き込まれる
         """
         self.characters_base_path = characters_base_path
+        self.reload_check_interval = reload_check_interval
+        if use_snapshot_cache is None:
+            use_snapshot_cache = os.environ.get(self.SNAPSHOT_CACHE_ENV) == "1"
+        self.use_snapshot_cache = use_snapshot_cache
         self._immutable_cache: Dict[str, ImmutableCharacterData] = {}
         self._long_term_cache: Dict[str, LongTermCharacterData] = {}
 
+        # ファイルパス -> 読み込み時の (st_mtime_ns, st_size)
+        self._file_signatures: Dict[str, Tuple[int, int]] = {}
+        # キャラクターID -> 最後に変更を確認した時刻
+        self._last_checked: Dict[str, float] = {}
+        # キャラクターID -> データのバージョン（読み込み・更新のたびに増加）
+        self._versions: Dict[str, int] = {}
+        # 長期情報の読み込みとバージョンの取得・更新を直列化するロック
+        self._long_term_lock = threading.RLock()
+        # ファイルパス -> 直近の読み込みにかかった時間（ミリ秒）
+        self._load_timings_ms: Dict[str, float] = {}
+
+        # 遅延書き込みの状態
+        if write_behind is None:
+            write_behind = os.environ.get(self.WRITE_BEHIND_ENV) == "1"
+        self.write_behind = write_behind
+        self.write_behind_delay = write_behind_delay
+        # キャラクターID -> 書き込み待ちの長期情報（同じキャラクターは最新の内容で上書き）
+        self._pending_writes: Dict[str, LongTermCharacterData] = {}
+        # 書き込み中のキャラクターID
+        self._writing: Set[str] = set()
+        # 書き込みに失敗したキャラクターIDとエラー
+        self.write_errors: Dict[str, OSError] = {}
+        self._write_condition = threading.Condition()
+        self._writer_thread: Optional[threading.Thread] = None
+        self._flush_requested = False
+        self._closed = False
+        if write_behind:
+            _write_behind_managers.add(self)
+
     def _get_character_dir_path(self, character_id: str) -> str:
         """
         キャラクターIDからキャラクターディレクトリのパスを取得する
@@ -77,6 +167,155 @@ class CharacterManager:
         """
         return os.path.join(self.characters_base_path, character_id)
 
+    def _get_immutable_file_path(self, character_id: str) -> str:
+        """キャラクターの不変情報ファイルのパスを取得する"""
+        return os.path.join(
+            self._get_character_dir_path(character_id), "immutable.yaml"
+        )
+
+    def _get_long_term_file_path(self, character_id: str) -> str:
+        """キャラクターの長期情報ファイルのパスを取得する"""
+        return os.path.join(
+            self._get_character_dir_path(character_id), "long_term.yaml"
+        )
+
+    @staticmethod
+    def _get_file_signature(file_path: str) -> Optional[Tuple[int, int]]:
+        """
+        ファイルの変更検出用のシグネチャ（更新時刻とサイズ）を取得する
+
+        Args:
+            file_path: 対象ファイルのパス
+
+        Returns:
+            (st_mtime_ns, st_size) のタプル。ファイルが存在しない場合はNone
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load_model(self, file_path: str, model_cls):
+        """YAMLファイルを読み込み、Pydanticモデルに変換する"""
+        if self.use_snapshot_cache:
+            return load_model_with_snapshot(file_path, model_cls)
+        return model_cls(**load_yaml(file_path))
+
+    def _load_immutable_file(self, character_id: str) -> None:
+        """不変情報ファイルを読み込んでキャッシュに格納する"""
+        file_path = self._get_immutable_file_path(character_id)
+        signature = self._get_file_signature(file_path)
+        started = time.perf_counter()
+        self._immutable_cache[character_id] = self._load_model(
+            file_path, ImmutableCharacterData
+        )
+        self._load_timings_ms[file_path] = (time.perf_counter() - started) * 1000
+        if signature is not None:
+            self._file_signatures[file_path] = signature
+
+    def _load_long_term_file(self, character_id: str) -> None:
+        """長期情報ファイルを読み込んでキャッシュに格納する"""
+        file_path = self._get_long_term_file_path(character_id)
+        # 他のインスタンスが保留している書き込みを先に完了させる
+        _flush_pending_writes_for(file_path, requester=self)
+        signature = self._get_file_signature(file_path)
+        started = time.perf_counter()
+        self._long_term_cache[character_id] = self._load_model(
+            file_path, LongTermCharacterData
+        )
+        self._load_timings_ms[file_path] = (time.perf_counter() - started) * 1000
+        if signature is not None:
+            self._file_signatures[file_path] = signature
+
+    def _bump_version(self, character_id: str) -> None:
+        """キャラクターデータのバージョンを進める"""
+        self._versions[character_id] = self._versions.get(character_id, 0) + 1
+
+    def get_character_version(self, character_id: str) -> int:
+        """
+        キャラクターデータのバージョンを取得する
+
+        データが読み込み・再読み込み・更新されるたびに値が増加するため、
+        キャラクターデータから派生したキャッシュの無効化判定に使用できます。
+
+        Args:
+            character_id: キャラクターID
+
+        Returns:
+            バージョン番号（未読み込みの場合は0）
+        """
+        return self._versions.get(character_id, 0)
+
+    def _reload_if_stale(self, character_id: str) -> None:
+        """
+        キャッシュ済みのキャラクターデータが古くなっていれば再読み込みする
+
+        確認はreload_check_interval秒に1回までに制限し、
+        更新時刻またはサイズが変わったファイルのみを再読み込みします。
+        再読み込みに失敗した場合（編集途中の不正なYAMLなど）は既存のキャッシュを使い続けます。
+
+        Args:
+            character_id: キャラクターID
+        """
+        if self.reload_check_interval is None:
+            return
+
+        now = time.monotonic()
+        last_checked = self._last_checked.get(character_id)
+        if last_checked is not None and now - last_checked < self.reload_check_interval:
+            return
+        self._last_checked[character_id] = now
+
+        reloaded = False
+        for file_path, loader in (
+            (self._get_immutable_file_path(character_id), self._load_immutable_file),
+            (self._get_long_term_file_path(character_id), self._load_long_term_file),
+        ):
+            # ファイルから読み込んでいないキャッシュ（直接設定されたものなど）は対象外
+            known_signature = self._file_signatures.get(file_path)
+            if known_signature is None:
+                continue
+
+            # 書き込み待ちの長期情報はメモリ上の方が新しいため再読み込みしない
+            if loader == self._load_long_term_file and self._is_write_pending(
+                character_id
+            ):
+                continue
+
+            current_signature = self._get_file_signature(file_path)
+            if current_signature is None or current_signature == known_signature:
+                continue
+
+            try:
+                loader(character_id)
+                reloaded = True
+                logger.info(
+                    f"キャラクター '{character_id}' の変更を検出したため再読み込みしました: {file_path}"
+                )
+            except (OSError, yaml.YAMLError, ValidationError, TypeError) as e:
+                logger.warning(
+                    f"キャラクター '{character_id}' の再読み込みに失敗しました（既存のデータを使用します）: {file_path}: {e}"
+                )
+
+        if reloaded:
+            self._bump_version(character_id)
+
+    def reload_character(self, character_id: str) -> None:
+        """
+        キャラクターの設定ファイルを強制的に再読み込みする
+
+        Args:
+            character_id: 再読み込みするキャラクターのID
+
+        Raises:
+            CharacterNotFoundError: キャラクターディレクトリやファイルが存在しない場合
+            InvalidCharacterDataError: YAMLファイルの形式が不正な場合
+        """
+        self._immutable_cache.pop(character_id, None)
+        self._long_term_cache.pop(character_id, None)
+        self.load_character_data(character_id)
+
     def load_character_data(self, character_id: str) -> None:
         """
         指定されたキャラクターの設定ファイルを読み込む
@@ -98,20 +337,15 @@ class CharacterManager:
         ):
             return
 
-        character_dir_path = self._get_character_dir_path(character_id)
-        immutable_file_path = os.path.join(character_dir_path, "immutable.yaml")
-        long_term_file_path = os.path.join(character_dir_path, "long_term.yaml")
-
         try:
             # 不変情報の読み込み
-            raw_immutable_data = load_yaml(immutable_file_path)
-            immutable_data = ImmutableCharacterData(**raw_immutable_data)
-            self._immutable_cache[character_id] = immutable_data
+            self._load_immutable_file(character_id)
 
             # 長期情報の読み込み
-            raw_long_term_data = load_yaml(long_term_file_path)
-            long_term_data = LongTermCharacterData(**raw_long_term_data)
-            self._long_term_cache[character_id] = long_term_data
+            self._load_long_term_file(character_id)
+
+            self._last_checked[character_id] = time.monotonic()
+            self._bump_version(character_id)
 
         except FileNotFoundError as e:
             raise CharacterNotFoundError(character_id) from e
@@ -123,11 +357,91 @@ class CharacterManager:
                 f"Unexpected error loading character data for ID: {character_id}: {e}"
             ) from e
 
+    def preload_characters(
+        self,
+        character_ids: Iterable[str],
+        max_workers: Optional[int] = None,
+        include_related: bool = True,
+    ) -> Dict[str, Optional[CharacterManagerError]]:
+        """
+        複数のキャラクターをスレッドプールで並行して読み込む
+
+        include_relatedがTrueの場合は、読み込んだキャラクターの記憶に含まれる
+        関連キャラクター（related_character_ids）も同様に読み込みます。
+        読み込みに失敗したキャラクターがあっても処理は継続し、結果として返します。
+
+        Args:
+            character_ids: 読み込むキャラクターIDのリスト
+            max_workers: 並行して読み込む最大スレッド数（Noneの場合は既定値）
+            include_related: 記憶に含まれる関連キャラクターも読み込むか
+
+        Returns:
+            キャラクターIDと読み込み時のエラー（成功した場合はNone）の辞書
+        """
+        results: Dict[str, Optional[CharacterManagerError]] = {}
+        pending = list(dict.fromkeys(character_ids))
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending:
+                futures = {
+                    character_id: executor.submit(
+                        self.load_character_data, character_id
+                    )
+                    for character_id in pending
+                }
+
+                next_pending = []
+                for character_id, future in futures.items():
+                    try:
+                        future.result()
+                        results[character_id] = None
+                    except CharacterManagerError as e:
+                        results[character_id] = e
+                        continue
+
+                    if not include_related:
+                        continue
+
+                    for memory in self._long_term_cache[character_id].memories:
+                        for related_id in memory.related_character_ids:
+                            if related_id not in results and related_id not in futures:
+                                next_pending.append(related_id)
+
+                pending = list(dict.fromkeys(next_pending))
+
+        logger.info(
+            f"{len(results)}人のキャラクターを読み込みました "
+            f"(失敗: {sum(1 for e in results.values() if e is not None)}人, "
+            f"{(time.perf_counter() - started) * 1000:.1f}ms)"
+        )
+        for character_id in results:
+            for file_path in (
+                self._get_immutable_file_path(character_id),
+                self._get_long_term_file_path(character_id),
+            ):
+                if file_path in self._load_timings_ms:
+                    logger.debug(
+                        f"  {file_path}: {self._load_timings_ms[file_path]:.1f}ms"
+                    )
+
+        return results
+
+    def get_load_timings(self) -> Dict[str, float]:
+        """
+        ファイルごとの直近の読み込み時間を取得する
+
+        Returns:
+            ファイルパスと読み込み時間（ミリ秒、YAML解析とバリデーションを含む）の辞書
+        """
+        return dict(self._load_timings_ms)
+
     def get_immutable_context(self, character_id: str) -> ImmutableCharacterData:
         """
         キャラクターの不変情報を取得する
 
         キャッシュに存在しない場合は、load_character_dataを呼び出して読み込みます。
+        キャッシュ済みの場合は、ファイルが変更されていれば再読み込みします。
 
         Args:
             character_id: 取得するキャラクターのID
@@ -141,6 +455,8 @@ class CharacterManager:
         """
         if character_id not in self._immutable_cache:
             self.load_character_data(character_id)
+        else:
+            self._reload_if_stale(character_id)
         return self._immutable_cache[character_id]
 
     def get_long_term_context(self, character_id: str) -> LongTermCharacterData:
@@ -148,6 +464,7 @@ class CharacterManager:
         キャラクターの長期情報を取得する
 
         キャッシュに存在しない場合は、load_character_dataを呼び出して読み込みます。
+        キャッシュ済みの場合は、ファイルが変更されていれば再読み込みします。
 
         Args:
             character_id: 取得するキャラクターのID
@@ -161,11 +478,39 @@ class CharacterManager:
         """
         if character_id not in self._long_term_cache:
             self.load_character_data(character_id)
+        else:
+            self._reload_if_stale(character_id)
         return self._long_term_cache[character_id]
 
+    def get_long_term_context_with_version(
+        self, character_id: str
+    ) -> Tuple[LongTermCharacterData, int]:
+        """
+        キャラクターの長期情報と、そのデータのバージョンを取得する
+
+        取得したバージョンをupdate_long_term_contextのexpected_versionに渡すと、
+        読み込んでから保存するまでの間に他の更新があった場合に上書きを防げます。
+
+        Args:
+            character_id: 取得するキャラクターのID
+
+        Returns:
+            (長期情報, バージョン番号) のタプル
+
+        Raises:
+            CharacterNotFoundError: キャラクターが見つからない場合
+            InvalidCharacterDataError: キャラクターデータが不正な場合
+        """
+        with self._long_term_lock:
+            data = self.get_long_term_context(character_id)
+            return data, self.get_character_version(character_id)
+
     def update_long_term_context(
-        self, character_id: str, new_long_term_data: LongTermCharacterData
-    ) -> None:
+        self,
+        character_id: str,
+        new_long_term_data: LongTermCharacterData,
+        expected_version: Optional[int] = None,
+    ) -> bool:
         """
         キャラクターの長期情報を更新する
 
@@ -174,24 +519,55 @@ class CharacterManager:
         Args:
             character_id: 更新するキャラクターのID
             new_long_term_data: 新しい長期情報
+            expected_version: 指定した場合、現在のバージョンが一致するときのみ更新する
+                （get_long_term_context_with_versionで取得した値を渡す）
+
+        Returns:
+            bool: 更新したかどうか（expected_versionが一致しない場合はFalse）
 
         Raises:
             CharacterNotFoundError: キャラクターが見つからない場合
             OSError: ファイルの書き込みに失敗した場合
         """
-        # キャラクターの存在確認
-        if character_id not in self._long_term_cache:
-            # load_character_dataを呼び出して存在確認
-            try:
-                self.load_character_data(character_id)
-            except CharacterNotFoundError:
-                # キャラクターが存在しない場合はそのまま例外を再発生
-                raise
-
-        # メモリキャッシュを更新
-        self._long_term_cache[character_id] = new_long_term_data
+        with self._long_term_lock:
+            # キャラクターの存在確認
+            if character_id not in self._long_term_cache:
+                # load_character_dataを呼び出して存在確認
+                try:
+                    self.load_character_data(character_id)
+                except CharacterNotFoundError:
+                    # キャラクターが存在しない場合はそのまま例外を再発生
+                    raise
+
+            if (
+                expected_version is not None
+                and self.get_character_version(character_id) != expected_version
+            ):
+                logger.info(
+                    f"キャラクター '{character_id}' の長期情報は読み込み後に更新されたため、上書きしません"
+                )
+                return False
+
+            # メモリキャッシュを更新
+            self._long_term_cache[character_id] = new_long_term_data
+            self._bump_version(character_id)
+
+            if self.write_behind:
+                self._enqueue_write(character_id, new_long_term_data)
+                return True
+
+            self._write_long_term_file(character_id, new_long_term_data)
+            return True
+
+    def _write_long_term_file(
+        self, character_id: str, new_long_term_data: LongTermCharacterData
+    ) -> None:
+        """
+        長期情報をlong_term.yamlに書き込む
 
-        # ファイルにも保存
+        Raises:
+            OSError: ファイルの書き込みに失敗した場合
+        """
         try:
             character_dir_path = self._get_character_dir_path(character_id)
             long_term_file_path = os.path.join(character_dir_path, "long_term.yaml")
@@ -203,6 +579,11 @@ class CharacterManager:
             long_term_dict = new_long_term_data.model_dump()
             save_yaml(long_term_dict, long_term_file_path)
 
+            # 自身の書き込みを外部からの変更として再読み込みしないよう記録する
+            signature = self._get_file_signature(long_term_file_path)
+            if signature is not None:
+                self._file_signatures[long_term_file_path] = signature
+
             logger.info(
                 f"キャラクター '{character_id}' の長期情報をファイルに保存しました: {long_term_file_path}"
             )
@@ -210,3 +591,127 @@ class CharacterManager:
             error_msg = f"キャラクター '{character_id}' の長期情報のファイル保存に失敗しました: {str(e)}"
             logger.error(error_msg)
             raise OSError(error_msg) from e
+
+    def _enqueue_write(
+        self, character_id: str, long_term_data: LongTermCharacterData
+    ) -> None:
+        """長期情報の書き込みを予約し、必要であれば書き込みスレッドを開始する"""
+        with self._write_condition:
+            if self._closed:
+                # 終了後の更新は同期的に書き込む
+                closed = True
+            else:
+                closed = False
+                self._pending_writes[character_id] = long_term_data
+                if self._writer_thread is None:
+                    self._writer_thread = threading.Thread(
+                        target=self._writer_loop,
+                        name="anima-long-term-writer",
+                        daemon=True,
+                    )
+                    self._writer_thread.start()
+                self._write_condition.notify_all()
+        if closed:
+            self._write_long_term_file(character_id, long_term_data)
+
+    def _writer_loop(self) -> None:
+        """書き込み待ちの長期情報をファイルに書き込み続ける（書き込みスレッド）"""
+        while True:
+            with self._write_condition:
+                while not self._pending_writes and not self._closed:
+                    self._write_condition.wait()
+                if not self._pending_writes and self._closed:
+                    return
+
+                # 最初の更新から少し待ち、その間の更新をまとめて書き込む
+                # （flushまたはcloseが呼ばれた場合は待たない）
+                deadline = time.monotonic() + self.write_behind_delay
+                while not self._closed and not self._flush_requested:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._write_condition.wait(remaining)
+                self._flush_requested = False
+
+                batch = self._pending_writes
+                self._pending_writes = {}
+                self._writing.update(batch)
+
+            for character_id, long_term_data in batch.items():
+                try:
+                    self._write_long_term_file(character_id, long_term_data)
+                    self.write_errors.pop(character_id, None)
+                except OSError as e:
+                    self.write_errors[character_id] = e
+                finally:
+                    with self._write_condition:
+                        self._writing.discard(character_id)
+                        self._write_condition.notify_all()
+
+    def _is_write_pending(self, character_id: str) -> bool:
+        """キャラクターの長期情報が書き込み待ちまたは書き込み中かどうか"""
+        with self._write_condition:
+            return character_id in self._pending_writes or character_id in self._writing
+
+    def _has_pending_write_for(self, file_path: str) -> bool:
+        """指定したファイルへの書き込みを保留しているかどうか"""
+        target = os.path.abspath(file_path)
+        return any(
+            os.path.abspath(self._get_long_term_file_path(character_id)) == target
+            for character_id in self.get_pending_writes()
+        )
+
+    def get_pending_writes(self) -> List[str]:
+        """
+        長期情報の書き込みが完了していないキャラクターのIDを取得する
+
+        Returns:
+            書き込み待ちまたは書き込み中のキャラクターIDのリスト
+        """
+        with self._write_condition:
+            return sorted(set(self._pending_writes) | self._writing)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        書き込み待ちの長期情報が全てファイルに書き込まれるまで待つ
+
+        遅延書き込みが無効な場合は何もしません。
+
+        Args:
+            timeout: 待つ時間の上限（秒）。Noneの場合は完了するまで待つ
+
+        Returns:
+            全ての書き込みが完了した場合はTrue、timeout以内に完了しなかった場合はFalse
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._write_condition:
+            while self._pending_writes or self._writing:
+                # 待ち時間を設けずに書き込ませる
+                self._flush_requested = True
+                self._write_condition.notify_all()
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._write_condition.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        書き込み待ちの長期情報を書き込んでから書き込みスレッドを停止する
+
+        停止後の更新は同期的に書き込まれます。
+
+        Args:
+            timeout: 待つ時間の上限（秒）。Noneの場合は完了するまで待つ
+
+        Returns:
+            全ての書き込みが完了した場合はTrue
+        """
+        with self._write_condition:
+            self._closed = True
+            self._write_condition.notify_all()
+            thread = self._writer_thread
+        if thread is not None:
+            thread.join(timeout)
+        _write_behind_managers.discard(self)
+        return not self.get_pending_writes()
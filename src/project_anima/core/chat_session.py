@@ -0,0 +1,136 @@
+"""
+キャラクターごとの会話セッションを管理するモジュール
+
+会話モードでは、キャラクターの最初のターン（またはセッションの作り直し時）に
+通常と同じ全文のプロンプトを送信し、以降のターンではそのキャラクターが前回行動してから
+起きた出来事のみを、これまでのやり取りに続くメッセージとして送信します。
+
+不変情報・長期情報・場面情報などが変わった場合（fingerprintが一致しない場合）や、
+やり取りが上限に達した場合はセッションを作り直します。
+"""
+
+import hashlib
+import json
+import threading
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+# 会話モードを有効にする環境変数（"1"で有効）
+CHAT_SESSION_ENV = "PROJECT_ANIMA_CHAT_SESSIONS"
+
+# セッションの作り直しを判定するコンテクストのキー
+# （これらのいずれかが変わると全文のプロンプトから始め直す）
+SESSION_CONTEXT_KEYS = (
+    "immutable_context",
+    "long_term_context",
+    "scene_context",
+    "previous_scene_context",
+)
+
+
+def compute_session_fingerprint(
+    context_dict: Dict[str, str], prompt_template_path: str
+) -> str:
+    """
+    セッションの前提となるコンテクストのハッシュを計算する
+
+    Args:
+        context_dict: ContextBuilder.build_context_for_characterで構築したコンテクスト
+        prompt_template_path: 全文のプロンプトのテンプレートのパス
+
+    Returns:
+        SHA-256のハッシュ（16進数文字列）
+    """
+    payload = json.dumps(
+        {
+            "template": prompt_template_path,
+            **{key: context_dict.get(key, "") for key in SESSION_CONTEXT_KEYS},
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ChatSession(BaseModel):
+    """1キャラクター分の会話セッション"""
+
+    character_id: str = Field(..., description="キャラクターID")
+    fingerprint: str = Field(
+        ..., description="セッションの前提となるコンテクストのハッシュ"
+    )
+    history: List[Dict] = Field(
+        default_factory=list,
+        description="これまでのやり取り（{'role': 'user'|'model', 'parts': [テキスト]}のリスト）",
+    )
+    exchanges: int = Field(0, description="セッション内で行ったやり取りの回数")
+
+    def append_exchange(self, message: str, response_text: str) -> None:
+        """送信したメッセージとモデルの応答を履歴に追加する"""
+        self.history.append({"role": "user", "parts": [message]})
+        self.history.append({"role": "model", "parts": [response_text]})
+        self.exchanges += 1
+
+
+class ChatSessionStore:
+    """
+    キャラクターIDごとの会話セッションを保持するクラス（複数スレッドから使用できる）
+    """
+
+    def __init__(self, max_exchanges: int = 8):
+        """
+        ChatSessionStoreを初期化する
+
+        Args:
+            max_exchanges: 1つのセッションで行うやり取りの上限
+                （達した場合は作り直し、送信する履歴の長さを抑える）
+        """
+        self.max_exchanges = max_exchanges
+        self._sessions: Dict[str, ChatSession] = {}
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+
+    def get_reusable(
+        self, character_id: str, fingerprint: str
+    ) -> Optional[ChatSession]:
+        """
+        続けて使用できるセッションを取得する
+
+        Args:
+            character_id: キャラクターID
+            fingerprint: 現在のコンテクストのハッシュ
+
+        Returns:
+            前提が一致し、やり取りが上限に達していないセッション（なければNone）
+        """
+        with self._lock:
+            session = self._sessions.get(character_id)
+            if (
+                session is None
+                or session.fingerprint != fingerprint
+                or session.exchanges >= self.max_exchanges
+            ):
+                return None
+            return session
+
+    def start(self, character_id: str, fingerprint: str) -> ChatSession:
+        """新しいセッションを開始する（既存のセッションは破棄する）"""
+        session = ChatSession(character_id=character_id, fingerprint=fingerprint)
+        with self._lock:
+            if character_id in self._sessions:
+                self.rebuilds += 1
+            self._sessions[character_id] = session
+        return session
+
+    def discard(self, character_id: Optional[str] = None) -> None:
+        """セッションを破棄する（character_idを省略した場合は全て）"""
+        with self._lock:
+            if character_id is None:
+                self._sessions.clear()
+            else:
+                self._sessions.pop(character_id, None)
+
+    def __contains__(self, character_id: str) -> bool:
+        with self._lock:
+            return character_id in self._sessions
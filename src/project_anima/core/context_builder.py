@@ -5,7 +5,7 @@
 LLMに渡すためのコンテクストを構築するContextBuilderクラスを提供します。
 """
 
-from typing import List, Optional, Dict, Any, TYPE_CHECKING
+from typing import List, Optional, Dict, Any, Sequence, TYPE_CHECKING
 
 # 循環参照を避けるための型チェック時のみのインポート
 if TYPE_CHECKING:
@@ -17,6 +17,7 @@ if TYPE_CHECKING:
         SceneInfoData,
         TurnData,
         SceneLogData,
+        InterventionData,
     )
 
 
@@ -51,6 +52,7 @@ class ContextBuilder:
         character_id: str,
         current_scene_short_term_log: List["TurnData"],
         previous_scene_summary: Optional[str] = None,
+        include_new_events: bool = False,
     ) -> Dict[str, str]:
         """
         キャラクターの思考生成のためのコンテクストを構築する
@@ -59,6 +61,9 @@ class ContextBuilder:
             character_id: コンテクストを構築するキャラクターのID
             current_scene_short_term_log: 現在の場面の短期ログ（ターンのリスト）
             previous_scene_summary: 前の場面のサマリー（オプション）
+            include_new_events: キャラクターが前回行動してからの出来事を
+                new_events_contextとして含めるか（会話モードで使用。
+                短期ログに前回の行動が含まれない場合は含めない）
 
         Returns:
             整形されたコンテクスト文字列を格納した辞書
@@ -118,6 +123,13 @@ class ContextBuilder:
         if previous_scene_summary:
             context_dict["previous_scene_context"] = previous_scene_context
 
+        if include_new_events:
+            new_events_context = format_new_events_context(
+                current_scene_short_term_log, character_id
+            )
+            if new_events_context is not None:
+                context_dict["new_events_context"] = new_events_context
+
         return context_dict
 
     def build_context_for_long_term_update(
@@ -185,19 +197,9 @@ class ContextBuilder:
         # ユーザー介入があれば追加
         if scene_log.interventions_in_scene:
             result += "【ユーザー介入】\n"
-            for intervention in scene_log.interventions_in_scene:
-                # 特定のキャラクターへの介入か、または場面全体への介入かを判断
-                if (
-                    intervention.target_character_id == character_id
-                    or intervention.target_character_id is None
-                ):
-                    # 介入タイプに応じた記述を追加
-                    if intervention.intervention_type == "SCENE_SITUATION_UPDATE":
-                        result += f"- ターン{intervention.applied_before_turn_number}前: 場面状況が更新されました：{intervention.intervention.updated_situation_element}\n"
-                    elif intervention.intervention_type == "REVELATION":
-                        result += f"- ターン{intervention.applied_before_turn_number}前: あなたは天啓を受けました：{intervention.intervention.revelation_content}\n"
-                    else:
-                        result += f"- ターン{intervention.applied_before_turn_number}前: {intervention.intervention_type}タイプの介入がありました\n"
+            # 特定のキャラクターへの介入と場面全体への介入のみをインデックスから取得
+            for intervention in scene_log.get_interventions_for_character(character_id):
+                result += self._describe_intervention(intervention)
 
             result += "\n"
 
@@ -235,6 +237,116 @@ class ContextBuilder:
 
         return result
 
+    @staticmethod
+    def _describe_intervention(intervention: "InterventionData") -> str:
+        """介入を長期情報更新用の1行の記述に整形する（介入タイプに応じた記述）"""
+        turn = intervention.applied_before_turn_number
+        if intervention.intervention_type == "SCENE_SITUATION_UPDATE":
+            return f"- ターン{turn}前: 場面状況が更新されました：{intervention.intervention.updated_situation_element}\n"
+        if intervention.intervention_type == "REVELATION":
+            return f"- ターン{turn}前: あなたは天啓を受けました：{intervention.intervention.revelation_content}\n"
+        return f"- ターン{turn}前: {intervention.intervention_type}タイプの介入がありました\n"
+
+    def build_context_for_batch_long_term_update(
+        self, character_ids: List[str], current_scene_log: "SceneLogData"
+    ) -> Dict[str, str]:
+        """
+        複数キャラクターの長期情報をまとめて更新するためのコンテクストを構築する
+
+        全員が観察できる場面の状況・介入・行動・発言は1回だけ記載し、
+        各キャラクター固有の情報（既存の長期情報、自分の思考、自分宛ての天啓）は
+        キャラクターごとの節に分けて記載します。
+
+        Args:
+            character_ids: 長期情報を更新するキャラクターのIDのリスト
+            current_scene_log: 現在の場面の完全なログデータ
+
+        Returns:
+            整形されたコンテクスト文字列を格納した辞書
+            {
+                "character_ids_str": "更新対象のキャラクターIDの一覧",
+                "shared_scene_events_str": "全員に共通の場面の出来事",
+                "character_sections_str": "キャラクターごとの情報"
+            }
+        """
+        scene_log = current_scene_log
+        limited_turns = (
+            scene_log.turns[-self.MAX_SIGNIFICANT_TURNS :] if scene_log else []
+        )
+
+        # 全員に共通の出来事（思考は含めない）
+        if scene_log is None or not scene_log.turns:
+            shared = "まだ重要な出来事は発生していません。"
+        else:
+            shared = (
+                f"【場面の状況】（Scene_ID: {scene_log.scene_info.scene_id}）\n"
+                f"{scene_log.scene_info.situation}\n\n"
+            )
+            public_interventions = [
+                intervention
+                for intervention in scene_log.interventions_in_scene
+                if intervention.target_character_id is None
+            ]
+            if public_interventions:
+                shared += "【ユーザー介入】\n"
+                for intervention in public_interventions:
+                    shared += self._describe_intervention(intervention)
+                shared += "\n"
+
+            shared += "【重要な出来事や会話】\n"
+            for turn in limited_turns:
+                if turn.act:
+                    shared += f"ターン{turn.turn_number}: {turn.character_name}（{turn.character_id}）は行動しました：{turn.act}\n"
+                if turn.talk:
+                    shared += f"ターン{turn.turn_number}: {turn.character_name}（{turn.character_id}）は発言しました：「{turn.talk}」\n"
+
+        # キャラクターごとの情報
+        sections = []
+        for character_id in character_ids:
+            immutable_data = self.character_manager.get_immutable_context(character_id)
+            long_term_data = self.character_manager.get_long_term_context(character_id)
+
+            section = f"## {immutable_data.name}（character_id: {character_id}）\n"
+            section += self._format_long_term_context(long_term_data) + "\n"
+
+            # キャラクター別のインデックスから、このキャラクター宛ての介入と思考を取得
+            private_interventions = [
+                intervention
+                for intervention in (
+                    scene_log.get_interventions_for_character(character_id)
+                    if scene_log
+                    else []
+                )
+                if intervention.target_character_id == character_id
+            ]
+            if private_interventions:
+                section += "【このキャラクターへの介入】\n"
+                for intervention in private_interventions:
+                    section += self._describe_intervention(intervention)
+                section += "\n"
+
+            section += "【このキャラクターの思考】\n"
+            own_turns = (
+                scene_log.get_turns_by_character(
+                    character_id, limit=self.MAX_SIGNIFICANT_TURNS
+                )
+                if limited_turns
+                else []
+            )
+            thoughts = [
+                f"ターン{turn.turn_number}: 「{turn.think}」\n"
+                for turn in own_turns
+                if turn.turn_number >= limited_turns[0].turn_number and turn.think
+            ]
+            section += "".join(thoughts) if thoughts else "（なし）\n"
+            sections.append(section)
+
+        return {
+            "character_ids_str": ", ".join(character_ids),
+            "shared_scene_events_str": shared,
+            "character_sections_str": "\n".join(sections),
+        }
+
     def _format_immutable_context(
         self, immutable_data: "ImmutableCharacterData"
     ) -> str:
@@ -409,28 +521,76 @@ class ContextBuilder:
         Returns:
             整形された短期情報文字列
         """
-        if not short_term_log:
-            return "【最近のやり取り】\nまだやり取りは始まっていません。"
-
-        # 直近のN件のみ表示
-        limited_log = (
-            short_term_log[-self.MAX_TURNS :]
-            if len(short_term_log) > self.MAX_TURNS
-            else short_term_log
-        )
+        return format_short_term_context(short_term_log, self.MAX_TURNS)
 
-        context = "【最近のやり取り】\n"
-        for turn in limited_log:
-            # 思考は内面なので含めない（キャラクターには他者の思考は見えない）
-            if turn.act and turn.talk:
-                context += f"{turn.character_name}：{turn.act} 「{turn.talk}」\n\n"
-            elif turn.act:
-                context += f"{turn.character_name}：{turn.act}\n\n"
-            elif turn.talk:
-                context += f"{turn.character_name}：「{turn.talk}」\n\n"
-            else:
-                context += (
-                    f"{turn.character_name}：(何も行動せず、何も話さなかった)\n\n"
-                )
 
-        return context.strip()
+def format_short_term_context(
+    short_term_log: List["TurnData"], max_turns: int = ContextBuilder.MAX_TURNS
+) -> str:
+    """
+    短期情報（会話履歴など）を会話形式の文字列に整形する
+
+    ContextBuilderがプロンプトを構築する際と同じ形式で整形するため、
+    保存済みログからプロンプトのコンテクストを再構築する用途にも使用できます。
+
+    Args:
+        short_term_log: 短期情報（ターンのリスト）
+        max_turns: 表示する最大ターン数
+
+    Returns:
+        整形された短期情報文字列
+    """
+    if not short_term_log:
+        return "【最近のやり取り】\nまだやり取りは始まっていません。"
+
+    # 直近のN件のみ表示
+    limited_log = (
+        short_term_log[-max_turns:]
+        if len(short_term_log) > max_turns
+        else short_term_log
+    )
+
+    context = "【最近のやり取り】\n"
+    for turn in limited_log:
+        # 思考は内面なので含めない（キャラクターには他者の思考は見えない）
+        if turn.act and turn.talk:
+            context += f"{turn.character_name}：{turn.act} 「{turn.talk}」\n\n"
+        elif turn.act:
+            context += f"{turn.character_name}：{turn.act}\n\n"
+        elif turn.talk:
+            context += f"{turn.character_name}：「{turn.talk}」\n\n"
+        else:
+            context += f"{turn.character_name}：(何も行動せず、何も話さなかった)\n\n"
+
+    return context.strip()
+
+
+def format_new_events_context(
+    short_term_log: Sequence["TurnData"], character_id: str
+) -> Optional[str]:
+    """
+    キャラクターが前回行動してからの出来事を会話形式の文字列に整形する
+
+    Args:
+        short_term_log: 短期情報（ターンのリスト）
+        character_id: 対象のキャラクターID
+
+    Returns:
+        整形された文字列（短期ログにキャラクターの行動が含まれない場合はNone）
+    """
+    last_index = None
+    for index in range(len(short_term_log) - 1, -1, -1):
+        if short_term_log[index].character_id == character_id:
+            last_index = index
+            break
+    if last_index is None:
+        return None
+
+    new_turns = list(short_term_log[last_index + 1 :])
+    if not new_turns:
+        return "【あなたが前回行動してからの出来事】\n新しい出来事はありません。"
+
+    context = format_short_term_context(new_turns, len(new_turns))
+    return context.replace(
+        "【最近のやり取り】", "【あなたが前回行動してからの出来事】", 1
+    )
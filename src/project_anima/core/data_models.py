@@ -6,8 +6,10 @@ AIキャラクターシミュレーションに必要なデータモデル定義
 YAML/JSONとの相互変換やバリデーションを担当します。
 """
 
-from typing import List, Optional, Dict, Any, Union
-from pydantic import BaseModel, Field
+from typing import Annotated, List, Optional, Dict, Any, Union
+from pydantic import BaseModel, Field, PrivateAttr
+
+from .turn_store import TurnSequenceSchema
 
 
 class ExperienceData(BaseModel):
@@ -138,6 +140,38 @@ class InterventionData(BaseModel):
     )
 
 
+class TurnMetadata(BaseModel):
+    """1ターンの実行時メタデータを表すデータモデル
+
+    ターン記録時に取得できた情報のみが設定され、取得できない項目はNoneとなる。
+    """
+
+    started_at: Optional[str] = Field(None, description="ターン開始時刻 (ISO 8601形式)")
+    ended_at: Optional[str] = Field(None, description="ターン記録時刻 (ISO 8601形式)")
+    llm_latency_ms: Optional[float] = Field(
+        None, description="LLM API呼び出しの所要時間 (ミリ秒)"
+    )
+    prompt_chars: Optional[int] = Field(None, description="プロンプトの文字数")
+    response_chars: Optional[int] = Field(None, description="LLM応答の文字数")
+    prompt_tokens: Optional[int] = Field(
+        None, description="入力トークン数 (プロバイダーが報告した場合のみ)"
+    )
+    completion_tokens: Optional[int] = Field(
+        None, description="出力トークン数 (プロバイダーが報告した場合のみ)"
+    )
+    total_tokens: Optional[int] = Field(
+        None, description="合計トークン数 (プロバイダーが報告した場合のみ)"
+    )
+    cached_prompt_tokens: Optional[int] = Field(
+        None,
+        description="入力トークンのうちプロンプトキャッシュから読み込まれた数 (プロバイダーが報告した場合のみ)",
+    )
+    llm_model: Optional[str] = Field(None, description="使用したLLMモデル名")
+    response_repaired: Optional[bool] = Field(
+        None, description="不正な応答を再試行で修復したか (修復した場合のみTrue)"
+    )
+
+
 class TurnData(BaseModel):
     """1ターンの記録を表すデータモデル"""
 
@@ -153,18 +187,127 @@ class TurnData(BaseModel):
     talk: Optional[str] = Field(
         None, description="キャラクターの発言内容 (発言しない場合はNone)"
     )
+    metadata: Optional[TurnMetadata] = Field(
+        None, description="ターンの実行時メタデータ (記録されていない場合はNone)"
+    )
 
 
 class SceneLogData(BaseModel):
     """1場面の全ログを表すデータモデル
 
     場面情報、ユーザー介入記録、各ターンの記録を含む完全なログデータ。
+    turnsには通常のリストの代わりにCompactTurnStoreを格納することもできる。
     """
 
     scene_info: SceneInfoData = Field(description="場面の基本情報")
     interventions_in_scene: List[InterventionData] = Field(
         default_factory=list, description="この場面で発生したユーザー介入のリスト"
     )
-    turns: List[TurnData] = Field(
+    turns: Annotated[List[TurnData], TurnSequenceSchema()] = Field(
         default_factory=list, description="この場面で実行された各ターンのリスト"
     )
+
+    # 二次インデックス（キャラクターID -> turns内の位置、介入対象ID -> interventions_in_scene内の位置）
+    # append_turn/append_interventionで追加時に更新し、直接追加された分は参照時に追従する
+    # （リスト自体が置き換えられた場合は、リストのidの変化を検知して作り直す）
+    _turn_indices_by_character: Dict[str, List[int]] = PrivateAttr(default_factory=dict)
+    _indexed_turn_count: int = PrivateAttr(default=0)
+    _indexed_turns_id: Optional[int] = PrivateAttr(default=None)
+    _intervention_indices_by_target: Dict[Optional[str], List[int]] = PrivateAttr(
+        default_factory=dict
+    )
+    _indexed_intervention_count: int = PrivateAttr(default=0)
+    _indexed_interventions_id: Optional[int] = PrivateAttr(default=None)
+
+    def append_turn(self, turn: TurnData) -> None:
+        """ターンを追加し、キャラクター別インデックスを更新する"""
+        self._sync_turn_index()
+        self.turns.append(turn)
+        self._turn_indices_by_character.setdefault(turn.character_id, []).append(
+            len(self.turns) - 1
+        )
+        self._indexed_turn_count = len(self.turns)
+
+    def append_intervention(self, intervention: InterventionData) -> None:
+        """介入を追加し、対象キャラクター別インデックスを更新する"""
+        self._sync_intervention_index()
+        self.interventions_in_scene.append(intervention)
+        self._intervention_indices_by_target.setdefault(
+            intervention.target_character_id, []
+        ).append(len(self.interventions_in_scene) - 1)
+        self._indexed_intervention_count = len(self.interventions_in_scene)
+
+    def get_turns_by_character(
+        self, character_id: str, limit: Optional[int] = None
+    ) -> List[TurnData]:
+        """
+        指定したキャラクターのターンを古い順に取得する
+
+        Args:
+            character_id: キャラクターID
+            limit: 取得する最大件数（直近のものを優先。Noneの場合は全て）
+
+        Returns:
+            ターンのリスト
+        """
+        self._sync_turn_index()
+        indices = self._turn_indices_by_character.get(character_id, [])
+        if limit is not None:
+            indices = indices[-limit:] if limit > 0 else []
+        return [self.turns[index] for index in indices]
+
+    def get_interventions_for_character(
+        self, character_id: str
+    ) -> List[InterventionData]:
+        """
+        指定したキャラクターに関係する介入（対象指定なしの介入を含む）を発生順に取得する
+
+        Args:
+            character_id: キャラクターID
+
+        Returns:
+            介入のリスト
+        """
+        self._sync_intervention_index()
+        indices = sorted(
+            self._intervention_indices_by_target.get(character_id, [])
+            + self._intervention_indices_by_target.get(None, [])
+        )
+        return [self.interventions_in_scene[index] for index in indices]
+
+    def _sync_turn_index(self) -> None:
+        """turnsへ直接追加された分をインデックスに反映する"""
+        turn_count = len(self.turns)
+        if (
+            id(self.turns) != self._indexed_turns_id
+            or turn_count < self._indexed_turn_count
+        ):
+            # リストが置き換えられた場合は作り直す
+            self._turn_indices_by_character = {}
+            self._indexed_turn_count = 0
+            self._indexed_turns_id = id(self.turns)
+        if turn_count == self._indexed_turn_count:
+            return
+
+        for index in range(self._indexed_turn_count, turn_count):
+            character_id = self.turns[index].character_id
+            self._turn_indices_by_character.setdefault(character_id, []).append(index)
+        self._indexed_turn_count = turn_count
+
+    def _sync_intervention_index(self) -> None:
+        """interventions_in_sceneへ直接追加された分をインデックスに反映する"""
+        intervention_count = len(self.interventions_in_scene)
+        if (
+            id(self.interventions_in_scene) != self._indexed_interventions_id
+            or intervention_count < self._indexed_intervention_count
+        ):
+            self._intervention_indices_by_target = {}
+            self._indexed_intervention_count = 0
+            self._indexed_interventions_id = id(self.interventions_in_scene)
+        if intervention_count == self._indexed_intervention_count:
+            return
+
+        for index in range(self._indexed_intervention_count, intervention_count):
+            target = self.interventions_in_scene[index].target_character_id
+            self._intervention_indices_by_target.setdefault(target, []).append(index)
+        self._indexed_intervention_count = intervention_count
@@ -0,0 +1,121 @@
+"""
+シミュレーションイベントの発行・購読を担当するモジュール
+
+このモジュールは、シミュレーション中に発生する状態変化（ターンの記録、介入の適用、
+状態遷移、長期情報の更新など）を型付きイベントとして購読者に通知する
+SimulationEventBusクラスを提供します。Web UIなどはポーリングの代わりに
+このイベントを購読することで、状態変化を即座に受け取ることができます。
+"""
+
+import logging
+import threading
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+# ロガーの設定
+logger = logging.getLogger(__name__)
+
+
+class SimulationEventType(str, Enum):
+    """シミュレーションイベントの種類"""
+
+    TURN_RECORDED = "turn_recorded"
+    INTERVENTION_APPLIED = "intervention_applied"
+    STATUS_CHANGED = "status_changed"
+    LTM_UPDATED = "ltm_updated"
+
+
+class SimulationEvent(BaseModel):
+    """シミュレーションイベントを表すデータモデル"""
+
+    event_type: SimulationEventType = Field(description="イベントの種類")
+    sequence: int = Field(description="バス内で単調増加するイベント番号")
+    timestamp: str = Field(description="イベント発生時刻 (ISO 8601形式)")
+    payload: Dict[str, Any] = Field(
+        default_factory=dict, description="イベント固有のデータ"
+    )
+
+
+EventCallback = Callable[[SimulationEvent], None]
+
+
+class SimulationEventBus:
+    """
+    シミュレーションイベントを購読者に配信するクラス
+
+    publishはスレッドセーフで、購読者のコールバックは発行したスレッド上で
+    同期的に呼び出されます。コールバック内で発生した例外はログに記録され、
+    他の購読者やシミュレーションの進行には影響しません。
+    """
+
+    def __init__(self):
+        """SimulationEventBusを初期化する"""
+        self._subscribers: List[EventCallback] = []
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: EventCallback) -> None:
+        """
+        イベントの購読を開始する
+
+        Args:
+            callback: イベント発生時に呼び出される関数
+        """
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: EventCallback) -> None:
+        """
+        イベントの購読を解除する
+
+        Args:
+            callback: 購読を解除する関数（未登録の場合は何もしない）
+        """
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    @property
+    def subscriber_count(self) -> int:
+        """現在の購読者数"""
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(
+        self,
+        event_type: SimulationEventType,
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> SimulationEvent:
+        """
+        イベントを発行し、全ての購読者に通知する
+
+        Args:
+            event_type: イベントの種類
+            payload: イベント固有のデータ
+
+        Returns:
+            発行されたイベント
+        """
+        with self._lock:
+            self._sequence += 1
+            event = SimulationEvent(
+                event_type=event_type,
+                sequence=self._sequence,
+                timestamp=datetime.now().isoformat(),
+                payload=payload or {},
+            )
+            subscribers = list(self._subscribers)
+
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(
+                    f"イベント '{event_type.value}' の通知中にエラーが発生しました: {str(e)}"
+                )
+
+        return event
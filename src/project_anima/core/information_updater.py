@@ -7,7 +7,8 @@
 """
 
 import logging
-from typing import Optional, TYPE_CHECKING, Dict, Any
+from datetime import datetime
+from typing import Optional, TYPE_CHECKING, Dict, Any, List
 
 # 循環参照を避けるための型チェック時のみのインポート
 if TYPE_CHECKING:
@@ -54,10 +55,15 @@ class InformationUpdater:
         think: str,
         act: Optional[str],
         talk: Optional[str],
+        turn_started_at: Optional[datetime] = None,
+        generation_info: Optional[Dict[str, Any]] = None,
     ) -> None:
         """
         1ターンの結果を短期ログに記録する
 
+        記録時刻を終了時刻として、開始時刻やLLM呼び出しの情報とともに
+        ターンのメタデータに保存します。
+
         Args:
             scene_log_data: 更新対象の場面ログデータ
             character_id: 行動したキャラクターのID
@@ -65,6 +71,8 @@ class InformationUpdater:
             think: キャラクターの思考内容
             act: キャラクターの行動内容（行動しない場合はNone）
             talk: キャラクターの発言内容（発言しない場合はNone）
+            turn_started_at: ターンの開始時刻（省略時は記録しない）
+            generation_info: LLMAdapter.last_generation_info形式のLLM呼び出し情報
 
         Raises:
             ValueError: scene_log_dataがNoneの場合
@@ -80,7 +88,19 @@ class InformationUpdater:
         next_turn_number = len(scene_log_data.turns) + 1
 
         # 型チェック時はimportされないため、動的にインポート
-        from .data_models import TurnData
+        from .data_models import TurnData, TurnMetadata
+
+        # ターンのメタデータを構築（LLM呼び出し情報は存在する項目のみ採用）
+        info = generation_info or {}
+        metadata = TurnMetadata(
+            started_at=turn_started_at.isoformat() if turn_started_at else None,
+            ended_at=datetime.now().isoformat(),
+            **{
+                key: info.get(key)
+                for key in TurnMetadata.model_fields
+                if key not in ("started_at", "ended_at")
+            },
+        )
 
         # TurnDataインスタンスを生成
         new_turn = TurnData(
@@ -90,10 +110,11 @@ class InformationUpdater:
             think=think,
             act=act,
             talk=talk,
+            metadata=metadata,
         )
 
-        # scene_log_dataのturnsリストに追加
-        scene_log_data.turns.append(new_turn)
+        # scene_log_dataのturnsリストに追加（キャラクター別インデックスも更新）
+        scene_log_data.append_turn(new_turn)
 
         logger.info(
             f"ターン {next_turn_number}: キャラクター '{character_name}' の行動を記録しました"
@@ -119,8 +140,8 @@ class InformationUpdater:
             logger.error(error_msg)
             raise ValueError(error_msg)
 
-        # scene_log_dataのinterventions_in_sceneリストに追加
-        scene_log_data.interventions_in_scene.append(intervention_data)
+        # scene_log_dataのinterventions_in_sceneリストに追加（対象別インデックスも更新）
+        scene_log_data.append_intervention(intervention_data)
 
         # 介入タイプとターン番号を取得してログに出力
         intervention_type = intervention_data.intervention_type
@@ -195,33 +216,8 @@ class InformationUpdater:
                 f"長期情報更新用のコンテキストを構築しました: {update_context.keys()}"
             )
 
-            # プロンプトテンプレートを読み込んで値を埋め込み、コンソールに出力
-            try:
-                with open(prompt_template_path, "r", encoding="utf-8") as f:
-                    prompt_template = f.read()
-
-                # プロンプトテンプレートに値を埋め込み
-                final_prompt = prompt_template
-                for key, value in update_context.items():
-                    final_prompt = final_prompt.replace(f"{{{{{key}}}}}", str(value))
-
-                # コンソールにプロンプトを出力
-                print("\n" + "=" * 80)
-                print("【長期記憶更新プロンプト】")
-                print(f"キャラクターID: {character_id}")
-                print("=" * 80)
-                print(final_prompt)
-                print("=" * 80 + "\n")
-
-                logger.info(
-                    f"長期記憶更新プロンプトをコンソールに出力しました（キャラクター: {character_id}）"
-                )
-            except Exception as e:
-                logger.warning(
-                    f"プロンプトのコンソール出力でエラーが発生しました: {str(e)}"
-                )
-
             # LLMに長期情報の更新提案を生成させる
+            # （値を埋め込んだプロンプトはLLMAdapterがプロンプトダンプ用のロガーに出力する）
             update_proposal = llm_adapter.update_character_long_term_info(
                 character_id, update_context, prompt_template_path
             )
@@ -256,6 +252,74 @@ class InformationUpdater:
             # 元の例外を保持して再発生
             raise type(e)(error_msg) from e
 
+    def trigger_batch_long_term_update(
+        self,
+        character_ids: List[str],
+        llm_adapter: "LLMAdapter",
+        current_scene_log: "SceneLogData",
+        context_builder: "ContextBuilder",
+        prompt_template_path: str,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        複数キャラクターの長期情報更新を1回のLLM呼び出しでまとめて行う
+
+        場面の出来事は1回だけプロンプトに含め、キャラクターごとの思考は個別の節に分けます。
+        形式が正しい提案が得られたキャラクターのみ長期情報を更新します。
+
+        Args:
+            character_ids: 更新対象のキャラクターIDのリスト
+            llm_adapter: LLM API呼び出しを行うLLMAdapterインスタンス
+            current_scene_log: 現在の場面ログデータ
+            context_builder: コンテキスト構築を行うContextBuilderインスタンス
+            prompt_template_path: 一括更新用のプロンプトテンプレートのパス
+
+        Returns:
+            長期情報を更新できたキャラクターのIDと更新提案の辞書
+            （含まれないキャラクターは呼び出し側で個別に更新する）
+
+        Raises:
+            ValueError: current_scene_logがNoneの場合
+            LLMAdapterError: LLM APIの呼び出しに失敗した場合、または応答全体が不正な場合
+        """
+        if current_scene_log is None:
+            error_msg = (
+                "current_scene_logがNoneです。有効な場面ログデータを指定してください。"
+            )
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        logger.info(
+            f"{len(character_ids)} 人のキャラクターの長期情報を一括で更新します: {', '.join(character_ids)}"
+        )
+        batch_context = context_builder.build_context_for_batch_long_term_update(
+            character_ids, current_scene_log
+        )
+        proposals = llm_adapter.update_long_term_info_batch(
+            character_ids, batch_context, prompt_template_path
+        )
+
+        applied: Dict[str, Dict[str, Any]] = {}
+        for character_id, update_proposal in proposals.items():
+            try:
+                current_lt_data = self._character_manager.get_long_term_context(
+                    character_id
+                )
+                updated_lt_data = self._apply_update_proposal(
+                    character_id, current_lt_data, update_proposal
+                )
+                self._character_manager.update_long_term_context(
+                    character_id, updated_lt_data
+                )
+            except Exception as e:
+                logger.error(
+                    f"キャラクター '{character_id}' の一括更新の提案を適用できませんでした: {str(e)}"
+                )
+                continue
+            applied[character_id] = update_proposal
+            logger.info(f"キャラクター '{character_id}' の長期情報を更新しました")
+
+        return applied
+
     def _apply_update_proposal(
         self,
         character_id: str,
@@ -8,16 +8,64 @@ LLM APIとの通信を抽象化するアダプターモジュール
 import os
 import json
 import re
-from typing import Dict, Optional, Any, List
+import threading
+import time
+from typing import Callable, Dict, Optional, Any, List
 import logging
 from dotenv import load_dotenv
 
 import google.generativeai as genai
 from langgraph.graph import StateGraph, END
 
+from .structured_output import (
+    CHARACTER_THOUGHT_SCHEMA,
+    LONG_TERM_UPDATE_BATCH_SCHEMA,
+    LONG_TERM_UPDATE_SCHEMA,
+    ResponseStats,
+    extract_json_object,
+    response_stats,
+)
+from .llm_cassette import (
+    CASSETTE_MODES,
+    CassetteError,
+    LLMCassette,
+    RecordingModel,
+    ReplayModel,
+)
+from .chat_session import (
+    CHAT_SESSION_ENV,
+    ChatSessionStore,
+    compute_session_fingerprint,
+)
+from .prompt_cache import (
+    GeminiCacheBackend,
+    PromptCacheError,
+    PromptCacheRegistry,
+    split_cacheable_prompt,
+)
+from ..utils.logging_setup import dump_prompt_exchange
+
 # ロガーの設定
 logger = logging.getLogger(__name__)
 
+# カセット（LLM呼び出しの記録・再生）の設定を指定する環境変数
+ENV_CASSETTE_PATH = "PROJECT_ANIMA_LLM_CASSETTE"
+ENV_CASSETTE_MODE = "PROJECT_ANIMA_LLM_CASSETTE_MODE"
+ENV_REPLAY_LATENCY = "PROJECT_ANIMA_LLM_REPLAY_LATENCY"
+
+# プロンプトキャッシュの設定を指定する環境変数（"gemini"でGeminiのコンテクストキャッシュを使用）
+ENV_PROMPT_CACHE = "PROJECT_ANIMA_PROMPT_CACHE"
+ENV_PROMPT_CACHE_TTL = "PROJECT_ANIMA_PROMPT_CACHE_TTL"
+
+# スキーマ指定が受け付けられなかったことを示すエラーメッセージに含まれる語句
+_STRUCTURED_OUTPUT_ERROR_KEYWORDS = (
+    "response_schema",
+    "response_mime_type",
+    "schema",
+    "mime type",
+    "mime_type",
+)
+
 
 class LLMAdapterError(Exception):
     """LLMAdapterの基本例外クラス"""
@@ -65,6 +113,14 @@ class LLMAdapter:
         model_name: str = "gemini-1.5-flash-latest",
         api_key: Optional[str] = None,
         debug: bool = False,
+        structured_output: bool = True,
+        stats: Optional[ResponseStats] = None,
+        cassette_path: Optional[str] = None,
+        cassette_mode: Optional[str] = None,
+        replay_latency: Optional[str] = None,
+        replay_strict: bool = True,
+        prompt_cache: Optional[PromptCacheRegistry] = None,
+        chat_sessions: Optional[ChatSessionStore] = None,
     ):
         """
         LLMAdapterを初期化する
@@ -72,10 +128,29 @@ class LLMAdapter:
         Args:
             model_name: 使用するLLMモデル名（デフォルト: "gemini-1.5-flash-latest"）
             api_key: LLM APIキー（省略時は環境変数または.envファイルから読み込み）
-            debug: デバッグモードフラグ（プロンプトと応答をターミナルに出力）
+            debug: デバッグモードフラグ
+                （プロンプトと応答は標準出力ではなくプロンプトダンプ用のロガーに出力される。
+                utils.logging_setup.configure_loggingを参照）
+            structured_output: JSONスキーマを指定した構造化出力を使用するか
+                （プロバイダーが対応していない場合は自動的に無効化される）
+            stats: 応答の検証結果を記録する集計（省略時はプロセス全体で共有する集計）
+            cassette_path: LLM呼び出しを記録・再生するカセットファイルのパス
+                （省略時は環境変数 PROJECT_ANIMA_LLM_CASSETTE）
+            cassette_mode: "off"、"record"（実際に呼び出して記録）、"replay"（記録を再生）
+                （省略時は環境変数 PROJECT_ANIMA_LLM_CASSETTE_MODE、未設定なら"off"）
+            replay_latency: 再生時の待ち時間。"zero"または"original"（記録時の所要時間を再現）
+                （省略時は環境変数 PROJECT_ANIMA_LLM_REPLAY_LATENCY、未設定なら"zero"）
+            replay_strict: Falseの場合、プロンプトが記録と一致しなくても記録順の応答を再生する
+            prompt_cache: 思考生成のプロンプトの共通部分（指示・不変情報・長期情報）を
+                プロバイダー側にキャッシュするregistry（省略時は環境変数
+                PROJECT_ANIMA_PROMPT_CACHE が "gemini" の場合のみ作成する。
+                カセットの記録・再生中は使用しない）
+            chat_sessions: 会話モードでキャラクターごとのセッションを保持するstore
+                （省略時は環境変数 PROJECT_ANIMA_CHAT_SESSIONS が "1" の場合のみ作成する。
+                generate_character_thought_in_sessionを参照）
 
         Raises:
-            LLMAdapterError: APIキーが設定されていない場合
+            LLMAdapterError: APIキーが設定されていない場合、またはカセットの設定が不正な場合
         """
         # デバッグモードの設定
         self.debug = debug
@@ -83,10 +158,29 @@ class LLMAdapter:
         # .envファイルから環境変数を読み込む
         load_dotenv()
 
+        # カセットの設定（引数 -> 環境変数の順）
+        self.cassette_mode = cassette_mode or os.environ.get(ENV_CASSETTE_MODE) or "off"
+        if self.cassette_mode not in CASSETTE_MODES:
+            raise LLMAdapterError(
+                f"未知のカセットモードです: {self.cassette_mode}（利用可能: {', '.join(CASSETTE_MODES)}）"
+            )
+        cassette_path = cassette_path or os.environ.get(ENV_CASSETTE_PATH)
+        if self.cassette_mode != "off" and not cassette_path:
+            raise LLMAdapterError(
+                "カセットモードを使用するにはカセットファイルのパスを指定してください"
+            )
+        try:
+            self.cassette: Optional[LLMCassette] = (
+                LLMCassette(cassette_path) if self.cassette_mode != "off" else None
+            )
+        except (CassetteError, OSError) as e:
+            raise LLMAdapterError(f"カセットを読み込めませんでした: {str(e)}") from e
+
         # APIキーの取得（引数 -> 環境変数の順）
+        # 再生モードではAPIを呼び出さないため、APIキーは不要
         self.api_key = api_key or os.environ.get("GOOGLE_API_KEY")
 
-        if not self.api_key:
+        if not self.api_key and self.cassette_mode != "replay":
             raise LLMAdapterError(
                 "APIキーが設定されていません。引数で渡すか、環境変数 GOOGLE_API_KEY を設定するか、"
                 'プロジェクトルートに .env ファイルを作成して GOOGLE_API_KEY="YOUR_API_KEY" と記述してください。'
@@ -94,9 +188,12 @@ class LLMAdapter:
 
         # モデル名の保存
         self.model_name = model_name
+        self.structured_output = structured_output
+        self.response_stats = stats if stats is not None else response_stats
 
-        # Google Gemini APIの初期化
-        genai.configure(api_key=self.api_key)
+        # 直近のLLM呼び出し情報（所要時間、文字数、トークン数など）
+        # 複数スレッドから同時に呼び出されても混ざらないようスレッドごとに保持する
+        self._generation_state = threading.local()
 
         # モデル設定
         self.generation_config = {
@@ -106,21 +203,79 @@ class LLMAdapter:
             "max_output_tokens": 2048,
         }
 
+        # 会話モードのセッション
+        self.chat_sessions = chat_sessions
+        if self.chat_sessions is None and os.environ.get(CHAT_SESSION_ENV) == "1":
+            self.chat_sessions = ChatSessionStore()
+
+        # プロンプトキャッシュ（カセットには全文の呼び出しを記録するため併用しない）
+        self.prompt_cache = prompt_cache if self.cassette_mode == "off" else None
+        if prompt_cache is not None and self.prompt_cache is None:
+            logger.info("カセットの記録・再生中はプロンプトキャッシュを使用しません")
+
+        # 再生モードでは記録済みの応答を返すモデルを使用する
+        if self.cassette_mode == "replay":
+            try:
+                self.model = ReplayModel(
+                    self.cassette,
+                    base_config=self.generation_config,
+                    latency=replay_latency
+                    or os.environ.get(ENV_REPLAY_LATENCY)
+                    or "zero",
+                    strict=replay_strict,
+                )
+            except ValueError as e:
+                raise LLMAdapterError(str(e)) from e
+            logger.info(
+                f"LLMAdapterを再生モードで初期化しました（カセット: {cassette_path}、{len(self.cassette.entries)} 件）"
+            )
+            return
+
+        # Google Gemini APIの初期化
+        genai.configure(api_key=self.api_key)
+
         # LLMモデルの初期化
         try:
             self.model = genai.GenerativeModel(
                 model_name=self.model_name, generation_config=self.generation_config
             )
             logger.info(f"LLMAdapterを初期化しました（モデル: {model_name}）")
-            if self.debug:
-                print(
-                    f"\n===== LLMAdapter: モデル {model_name} が初期化されました =====\n"
-                )
         except Exception as e:
             error_msg = f"LLMモデルの初期化に失敗しました: {str(e)}"
             logger.error(error_msg)
             raise LLMAdapterError(error_msg) from e
 
+        # 環境変数でGeminiのコンテクストキャッシュが指定されていれば使用する
+        if (
+            self.prompt_cache is None
+            and self.cassette_mode == "off"
+            and os.environ.get(ENV_PROMPT_CACHE) == "gemini"
+        ):
+            self.prompt_cache = PromptCacheRegistry(
+                GeminiCacheBackend(self.generation_config),
+                ttl_seconds=float(os.environ.get(ENV_PROMPT_CACHE_TTL) or 3600),
+            )
+            logger.info("Geminiのコンテクストキャッシュを使用します")
+
+        # 記録モードでは呼び出しごとに要求と応答をカセットへ追記する
+        if self.cassette_mode == "record":
+            self.model = RecordingModel(
+                self.model,
+                self.cassette,
+                get_model_name=lambda: self.model_name,
+                base_config=self.generation_config,
+            )
+            logger.info(f"LLM呼び出しをカセットに記録します: {cassette_path}")
+
+    @property
+    def last_generation_info(self) -> Optional[Dict[str, Any]]:
+        """現在のスレッドで直近に行ったLLM呼び出しの情報"""
+        return getattr(self._generation_state, "info", None)
+
+    @last_generation_info.setter
+    def last_generation_info(self, value: Optional[Dict[str, Any]]) -> None:
+        self._generation_state.info = value
+
     def _load_prompt_template(self, template_path: str) -> str:
         """
         プロンプトテンプレートファイルを読み込む
@@ -208,75 +363,20 @@ class LLMAdapter:
             # プロンプトテンプレートの読み込み
             template_str = self._load_prompt_template(prompt_template_path)
 
-            # コンテクスト情報の埋め込み
-            final_prompt = self._fill_prompt_template(template_str, context_dict)
-
-            logger.debug(f"生成された最終プロンプト: {final_prompt}")
-
-            # デバッグモードの場合、プロンプトをターミナルに出力
-            if self.debug:
-                print("\n" + "=" * 80)
-                print(
-                    f"===== LLM PROMPT (Character Thought) - Model: {self.model_name} ====="
-                )
-                print("=" * 80)
-                print(final_prompt)
-                print("=" * 80 + "\n")
-
-            # Gemini APIを呼び出して思考生成
-            try:
-                response = self.model.generate_content(final_prompt)
-                response_text = response.text
-
-                logger.debug(f"LLMからの応答: {response_text}")
-
-                # デバッグモードの場合、応答をターミナルに出力
-                if self.debug:
-                    print("\n" + "=" * 80)
-                    print(f"===== LLM RESPONSE (Character Thought) =====")
-                    print("=" * 80)
-                    print(response_text)
-                    print("=" * 80 + "\n")
-
-                # コードブロックマーカーの除去
-                # ```json や ``` などのマーカーを削除する
-                cleaned_response = self._clean_json_response(response_text)
-
-                # JSON形式の応答をパース
-                try:
-                    response_dict = json.loads(cleaned_response)
-
-                    # 必要なキーが含まれているか検証
-                    required_keys = ["think", "act", "talk"]
-                    for key in required_keys:
-                        if key not in response_dict:
-                            raise InvalidLLMResponseError(
-                                response_text,
-                                f"応答に必須キー '{key}' が含まれていません",
-                            )
-
-                    return response_dict
-
-                except json.JSONDecodeError as e:
-                    error_msg = f"LLMからの応答をJSONとしてパースできません: {e}\n応答: {response_text}\nクリーン後: {cleaned_response}\nクリーン後のrepr: {repr(cleaned_response)}"
-                    logger.error(error_msg)
-                    if self.debug:
-                        print(
-                            f"\n===== JSON PARSE ERROR =====\n{error_msg}\n============================\n"
-                        )
-                    raise InvalidLLMResponseError(response_text, error_msg)
-
-            except Exception as e:
-                # LLM API呼び出し関連のエラー
-                if isinstance(e, InvalidLLMResponseError):
-                    raise
-                error_msg = f"LLM API呼び出しに失敗しました: {str(e)}"
-                logger.error(error_msg)
-                if self.debug:
-                    print(
-                        f"\n===== LLM API ERROR =====\n{error_msg}\n========================\n"
-                    )
-                raise LLMGenerationError(error_msg, e)
+            # コンテクスト情報の埋め込み（キャッシュ境界より前がターンをまたいで共通の部分）
+            cache_prefix, suffix = split_cacheable_prompt(
+                self._fill_prompt_template(template_str, context_dict)
+            )
+            final_prompt = cache_prefix + suffix
+
+            # Gemini APIを呼び出して思考生成（不正な応答は1回だけ修復を試みる）
+            return self._generate_json(
+                final_prompt,
+                CHARACTER_THOUGHT_SCHEMA,
+                self._validate_character_thought_response,
+                "Character Thought",
+                cache_prefix=cache_prefix,
+            )
 
         except PromptTemplateNotFoundError:
             # 既に適切な例外が発生しているので、そのまま再度発生させる
@@ -288,12 +388,413 @@ class LLMAdapter:
             # その他の例外は LLMGenerationError でラップ
             error_msg = f"思考生成中に予期せぬエラーが発生しました: {str(e)}"
             logger.error(error_msg)
-            if self.debug:
-                print(
-                    f"\n===== UNEXPECTED ERROR =====\n{error_msg}\n===========================\n"
+            raise LLMGenerationError(error_msg, e)
+
+    def enable_chat_sessions(self, max_exchanges: int = 8) -> ChatSessionStore:
+        """
+        会話モードを有効にする（既に有効な場合は既存のstoreを返す）
+
+        Args:
+            max_exchanges: 1つのセッションで行うやり取りの上限
+
+        Returns:
+            セッションを保持するChatSessionStore
+        """
+        if self.chat_sessions is None:
+            self.chat_sessions = ChatSessionStore(max_exchanges=max_exchanges)
+        return self.chat_sessions
+
+    def generate_character_thought_in_session(
+        self,
+        character_id: str,
+        context_dict: Dict[str, str],
+        prompt_template_path: str,
+        session_template_path: str,
+    ) -> Dict[str, str]:
+        """
+        キャラクターごとの会話セッションを使って思考・行動・発言を生成する
+
+        セッションの最初のターンでは通常と同じ全文のプロンプトを送信し、以降のターンでは
+        context_dictのnew_events_context（前回行動してからの出来事）のみを
+        これまでのやり取りに続けて送信します。不変情報・長期情報・場面情報・前の場面の
+        サマリーが変わった場合、new_events_contextがない場合、やり取りが上限に達した場合は
+        セッションを作り直します。
+
+        Args:
+            character_id: キャラクターID
+            context_dict: ContextBuilder.build_context_for_characterで構築したコンテクスト
+                （include_new_events=Trueで構築する）
+            prompt_template_path: セッションの最初に送信するプロンプトのテンプレートのパス
+            session_template_path: 以降のターンで送信するメッセージのテンプレートのパス
+
+        Returns:
+            生成された思考・行動・発言を格納した辞書
+
+        Raises:
+            PromptTemplateNotFoundError: テンプレートファイルが見つからない場合
+            LLMGenerationError: LLM API呼び出しに失敗した場合
+            InvalidLLMResponseError: LLMからの応答が不正な形式の場合
+        """
+        sessions = self.enable_chat_sessions()
+        fingerprint = compute_session_fingerprint(context_dict, prompt_template_path)
+        session = (
+            sessions.get_reusable(character_id, fingerprint)
+            if "new_events_context" in context_dict
+            else None
+        )
+
+        try:
+            if session is not None:
+                template_str = self._load_prompt_template(session_template_path)
+                message = self._fill_prompt_template(template_str, context_dict)
+                label = "Character Thought (session)"
+            else:
+                template_str = self._load_prompt_template(prompt_template_path)
+                prefix, suffix = split_cacheable_prompt(
+                    self._fill_prompt_template(template_str, context_dict)
                 )
+                message = prefix + suffix
+                label = "Character Thought"
+                session = sessions.start(character_id, fingerprint)
+                logger.debug(
+                    f"キャラクター '{character_id}' の会話セッションを開始します"
+                )
+
+            result = self._generate_json(
+                message,
+                CHARACTER_THOUGHT_SCHEMA,
+                self._validate_character_thought_response,
+                label,
+                history=session.history,
+            )
+        except Exception as e:
+            # 失敗したやり取りを含めないよう、次のターンはセッションを作り直す
+            sessions.discard(character_id)
+            if isinstance(
+                e,
+                (
+                    PromptTemplateNotFoundError,
+                    InvalidLLMResponseError,
+                    LLMGenerationError,
+                ),
+            ):
+                raise
+            error_msg = f"思考生成中に予期せぬエラーが発生しました: {str(e)}"
+            logger.error(error_msg)
             raise LLMGenerationError(error_msg, e)
 
+        session.append_exchange(message, json.dumps(result, ensure_ascii=False))
+        if self.last_generation_info is not None:
+            self.last_generation_info["session_exchanges"] = session.exchanges
+        return result
+
+    def _generate_json(
+        self,
+        final_prompt: str,
+        schema: Dict[str, Any],
+        validate: Callable[[Dict[str, Any]], None],
+        label: str,
+        cache_prefix: str = "",
+        history: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        LLMを呼び出してJSONオブジェクトの応答を生成する
+
+        構造化出力が有効な場合はスキーマを指定して呼び出します。応答を読み込めない、
+        または検証に失敗した場合は、エラー内容を伝えて1回だけ修復を依頼します。
+        結果はモデルごとにresponse_statsへ記録されます。
+
+        Args:
+            final_prompt: 送信するプロンプト
+            schema: 応答のJSONスキーマ
+            validate: 読み込んだ応答を検証する関数（不正な場合はInvalidLLMResponseErrorを発生）
+            label: ログとプロンプトダンプに使用する処理名
+            cache_prefix: final_promptの先頭のうち、プロンプトキャッシュに登録する部分
+                （修復の依頼ではキャッシュを使用しない）
+            history: 会話モードでfinal_promptの前に送信するこれまでのやり取り
+                （修復の依頼では使用しない）
+
+        Returns:
+            検証済みの応答辞書
+
+        Raises:
+            LLMGenerationError: LLM API呼び出しに失敗した場合
+            InvalidLLMResponseError: 修復後も応答が不正な場合
+        """
+        self.last_generation_info = None
+        try:
+            call_started = time.perf_counter()
+            response, structured = self._call_model(
+                final_prompt, schema, cache_prefix, history
+            )
+            response_text = response.text
+            self.last_generation_info = self._build_generation_info(
+                final_prompt,
+                response,
+                response_text,
+                (time.perf_counter() - call_started) * 1000,
+            )
+        except Exception as e:
+            error_msg = f"LLM API呼び出しに失敗しました: {str(e)}"
+            logger.error(error_msg)
+            dump_prompt_exchange(label, final_prompt, None, model=self.model_name)
+            raise LLMGenerationError(error_msg, e)
+
+        # プロンプトと応答はダンプ用のロガーへ（書き込みはリスナーのスレッドで行われる）
+        dump_prompt_exchange(label, final_prompt, response_text, model=self.model_name)
+
+        try:
+            result = self._parse_json_response(response_text, validate)
+            self.response_stats.record(self.model_name, "valid", structured)
+            return result
+        except InvalidLLMResponseError as e:
+            invalid_error = e
+            logger.warning(
+                f"LLMの応答が不正なため修復を依頼します ({label}): {e.error_details}"
+            )
+
+        try:
+            repair_prompt = self._build_repair_prompt(
+                response_text, invalid_error.error_details, schema
+            )
+            repair_response, structured = self._call_model(repair_prompt, schema)
+            dump_prompt_exchange(
+                f"{label} (repair)",
+                repair_prompt,
+                repair_response.text,
+                model=self.model_name,
+            )
+            result = self._parse_json_response(repair_response.text, validate)
+        except Exception as e:
+            logger.error(f"LLMの応答を修復できませんでした ({label}): {str(e)}")
+            self.response_stats.record(self.model_name, "invalid", structured)
+            raise invalid_error
+
+        self.response_stats.record(self.model_name, "repaired", structured)
+        if self.last_generation_info is not None:
+            self.last_generation_info["response_repaired"] = True
+        return result
+
+    def _call_model(
+        self,
+        prompt: str,
+        schema: Optional[Dict[str, Any]],
+        cache_prefix: str = "",
+        history: Optional[List[Dict[str, Any]]] = None,
+    ):
+        """
+        モデルを呼び出す（構造化出力が有効な場合はスキーマを指定する）
+
+        プロバイダーがスキーマ指定に対応していない場合は、スキーマを指定せずに呼び出し直し、
+        それが成功した場合は以降は構造化出力を使用しない。
+        cache_prefixが指定されていてプロンプトキャッシュが有効な場合は、
+        キャッシュしたプレフィックスに続けて残りの部分のみを送信する。
+
+        Args:
+            prompt: 送信するプロンプト
+            schema: 応答のJSONスキーマ
+            cache_prefix: promptの先頭のうち、プロンプトキャッシュに登録する部分
+            history: promptの前に送信するこれまでのやり取り（会話モード）
+
+        Returns:
+            (応答, 構造化出力を使用したか) のタプル
+        """
+        if self.structured_output and schema is not None:
+            try:
+                generation_config = {
+                    "response_mime_type": "application/json",
+                    "response_schema": schema,
+                }
+                response = self._generate_content(
+                    prompt, generation_config, cache_prefix, history
+                )
+                return response, True
+            except Exception as e:
+                if not self._is_structured_output_unsupported(e):
+                    raise
+                # スキーマを指定しない呼び出しが成功した場合のみ、以降は構造化出力を使用しない
+                response = self._generate_content(prompt, None, cache_prefix, history)
+                logger.warning(
+                    f"モデル {self.model_name} は構造化出力に対応していないため、通常の出力に切り替えます: {str(e)}"
+                )
+                self.structured_output = False
+                return response, False
+
+        return self._generate_content(prompt, None, cache_prefix, history), False
+
+    def _generate_content(
+        self,
+        prompt: str,
+        generation_config: Optional[Dict[str, Any]],
+        cache_prefix: str = "",
+        history: Optional[List[Dict[str, Any]]] = None,
+    ):
+        """プロンプトキャッシュが使用できればキャッシュ経由で、できなければ全文で呼び出す"""
+        if history:
+            # 会話モードではこれまでのやり取りに続けて送信する
+            contents: Any = [*history, {"role": "user", "parts": [prompt]}]
+            if generation_config is None:
+                return self.model.generate_content(contents)
+            return self.model.generate_content(
+                contents, generation_config=generation_config
+            )
+
+        if self.prompt_cache is not None and cache_prefix:
+            try:
+                return self.prompt_cache.generate(
+                    self.model_name,
+                    cache_prefix,
+                    prompt[len(cache_prefix) :],
+                    generation_config,
+                )
+            except PromptCacheError as e:
+                logger.debug(f"プロンプトキャッシュを使用せずに呼び出します: {str(e)}")
+
+        if generation_config is None:
+            return self.model.generate_content(prompt)
+        return self.model.generate_content(prompt, generation_config=generation_config)
+
+    @staticmethod
+    def _is_structured_output_unsupported(error: Exception) -> bool:
+        """スキーマ指定が受け付けられなかったことを示すエラーかどうかを判定する"""
+        # 再生時は記録された例外の型名で判定する
+        error_type = getattr(error, "error_type", None) or type(error).__name__
+        if not isinstance(error, (TypeError, ValueError)) and error_type not in (
+            "TypeError",
+            "ValueError",
+            "InvalidArgument",
+        ):
+            return False
+        # 引数の誤りでも、スキーマやMIMEタイプに関するもの以外（入力の長さなど）は対象外
+        message = str(error).lower()
+        return any(keyword in message for keyword in _STRUCTURED_OUTPUT_ERROR_KEYWORDS)
+
+    def _parse_json_response(
+        self, response_text: str, validate: Callable[[Dict[str, Any]], None]
+    ) -> Dict[str, Any]:
+        """
+        応答テキストからJSONオブジェクトを読み込んで検証する
+
+        そのまま読み込めない場合は、前後の説明文やコメント、末尾のカンマ、
+        途中で途切れた閉じ括弧などを許容する抽出器で読み込みを試みます。
+
+        Args:
+            response_text: LLMからの応答テキスト
+            validate: 読み込んだ応答を検証する関数
+
+        Returns:
+            検証済みの応答辞書
+
+        Raises:
+            InvalidLLMResponseError: 応答が不正な場合
+        """
+        cleaned_response = self._clean_json_response(response_text)
+        try:
+            response_dict = json.loads(cleaned_response)
+        except json.JSONDecodeError as e:
+            try:
+                response_dict = extract_json_object(response_text)
+            except ValueError:
+                error_msg = f"LLMからの応答をJSONとしてパースできません: {e}"
+                logger.error(f"{error_msg}\n応答: {response_text}")
+                raise InvalidLLMResponseError(response_text, error_msg)
+
+        if not isinstance(response_dict, dict):
+            raise InvalidLLMResponseError(
+                response_text, "応答がJSONオブジェクトではありません"
+            )
+
+        validate(response_dict)
+        return response_dict
+
+    def _build_repair_prompt(
+        self, response_text: str, error_details: str, schema: Dict[str, Any]
+    ) -> str:
+        """不正な応答をスキーマに沿ったJSONに直すよう依頼するプロンプトを作成する"""
+        return (
+            "以下の応答は、指定された形式のJSONとして読み込めませんでした。\n"
+            f"問題: {error_details}\n\n"
+            "# 応答\n"
+            f"{response_text}\n\n"
+            "# 指示\n"
+            "応答の内容を変えずに、次のJSONスキーマに従うJSONオブジェクトのみを出力してください。"
+            "コードブロックや説明文は付けないでください。\n"
+            f"{json.dumps(schema, ensure_ascii=False)}"
+        )
+
+    def _validate_character_thought_response(
+        self, response_dict: Dict[str, Any]
+    ) -> None:
+        """
+        思考生成の応答が有効な形式かどうかを検証する
+
+        Args:
+            response_dict: 検証対象の応答辞書
+
+        Raises:
+            InvalidLLMResponseError: 応答が不正な形式の場合
+        """
+        # 必要なキーが含まれているか検証
+        for key in ("think", "act", "talk"):
+            if key not in response_dict:
+                raise InvalidLLMResponseError(
+                    str(response_dict), f"応答に必須キー '{key}' が含まれていません"
+                )
+
+    def get_response_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        モデルごとの応答の検証結果と不正応答率を取得する
+
+        Returns:
+            モデル名と集計結果の辞書
+        """
+        return self.response_stats.to_dict()
+
+    def get_prompt_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        プロンプトキャッシュの使用状況を取得する
+
+        Returns:
+            PromptCacheRegistry.get_stats()の結果（プロンプトキャッシュを使用していない場合はNone）
+        """
+        if self.prompt_cache is None:
+            return None
+        return self.prompt_cache.get_stats()
+
+    def _build_generation_info(
+        self, prompt: str, response: Any, response_text: str, latency_ms: float
+    ) -> Dict[str, Any]:
+        """
+        LLM呼び出し1回分の計測情報を構築する
+
+        トークン数はプロバイダーが応答に含めた場合のみ設定されます。
+
+        Args:
+            prompt: 送信したプロンプト
+            response: LLM APIの応答オブジェクト
+            response_text: 応答テキスト
+            latency_ms: API呼び出しの所要時間（ミリ秒）
+
+        Returns:
+            計測情報を格納した辞書
+        """
+        usage = getattr(response, "usage_metadata", None)
+
+        def _token_count(field_name: str) -> Optional[int]:
+            value = getattr(usage, field_name, None)
+            return value if isinstance(value, int) else None
+
+        return {
+            "llm_model": self.model_name,
+            "llm_latency_ms": round(latency_ms, 3),
+            "prompt_chars": len(prompt),
+            "response_chars": len(response_text),
+            "prompt_tokens": _token_count("prompt_token_count"),
+            "completion_tokens": _token_count("candidates_token_count"),
+            "total_tokens": _token_count("total_token_count"),
+            "cached_prompt_tokens": _token_count("cached_content_token_count"),
+        }
+
     def _clean_json_response(self, response_text: str) -> str:
         """
         LLMからの応答テキストからコードブロックマーカーと不正な制御文字を除去する
@@ -400,82 +901,174 @@ class LLMAdapter:
                 template_str, context_for_lt_update
             )
 
-            logger.debug(f"生成された長期情報更新用プロンプト: {final_prompt}")
+            # Gemini APIを呼び出して更新提案を生成（不正な応答は1回だけ修復を試みる）
+            return self._generate_json(
+                final_prompt,
+                LONG_TERM_UPDATE_SCHEMA,
+                self._validate_long_term_update_response,
+                "Long Term Update",
+            )
 
-            # デバッグモードの場合、プロンプトをターミナルに出力
-            if self.debug:
-                print("\n" + "=" * 80)
-                print(
-                    f"===== LLM PROMPT (Long Term Update) - Model: {self.model_name} ====="
-                )
-                print("=" * 80)
-                print(final_prompt)
-                print("=" * 80 + "\n")
+        except PromptTemplateNotFoundError:
+            # 既に適切な例外が発生しているので、そのまま再度発生させる
+            raise
+        except (InvalidLLMResponseError, LLMGenerationError):
+            # 既知の例外はそのまま再発生
+            raise
+        except Exception as e:
+            # その他の例外は LLMGenerationError でラップ
+            error_msg = f"長期情報更新中に予期せぬエラーが発生しました: {str(e)}"
+            logger.error(error_msg)
+            raise LLMGenerationError(error_msg, e)
 
-            # Gemini APIを呼び出して更新提案を生成
+    def update_long_term_info_batch(
+        self,
+        character_ids: List[str],
+        batch_context: Dict[str, str],
+        prompt_template_path: str,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        複数キャラクターの長期情報を更新する提案を1回の呼び出しで生成する
+
+        応答のうち、形式が不正な提案や依頼していないキャラクターの提案は除外します。
+        除外された（または応答に含まれなかった）キャラクターは戻り値に含まれないため、
+        呼び出し側で個別の更新に切り替えてください。
+
+        Args:
+            character_ids: 更新対象のキャラクターIDのリスト
+            batch_context: ContextBuilder.build_context_for_batch_long_term_updateで構築したコンテクスト
+            prompt_template_path: 使用するプロンプトテンプレートのパス
+
+        Returns:
+            キャラクターIDと更新提案（update_character_long_term_infoと同じ形式）の辞書
+
+        Raises:
+            PromptTemplateNotFoundError: テンプレートファイルが見つからない場合
+            LLMGenerationError: LLM API呼び出しに失敗した場合
+            InvalidLLMResponseError: 応答にupdatesのリストが含まれていない場合
+        """
+        template_str = self._load_prompt_template(prompt_template_path)
+        final_prompt = self._fill_prompt_template(template_str, batch_context)
+
+        response = self._generate_json(
+            final_prompt,
+            LONG_TERM_UPDATE_BATCH_SCHEMA,
+            self._validate_long_term_update_batch_response,
+            "Long Term Update Batch",
+        )
+
+        proposals: Dict[str, Dict[str, Any]] = {}
+        for update in response["updates"]:
+            character_id = update.get("character_id")
+            if character_id not in character_ids or character_id in proposals:
+                logger.warning(
+                    f"一括更新の応答に想定外のキャラクターの提案が含まれているため無視します: {character_id}"
+                )
+                continue
+            proposal = {
+                key: value for key, value in update.items() if key != "character_id"
+            }
             try:
-                response = self.model.generate_content(final_prompt)
-                response_text = response.text
+                self._validate_long_term_update_response(proposal)
+            except InvalidLLMResponseError as e:
+                logger.warning(
+                    f"キャラクター '{character_id}' の一括更新の提案が不正なため除外します: {e.error_details}"
+                )
+                continue
+            proposals[character_id] = proposal
+        return proposals
+
+    def _validate_long_term_update_batch_response(
+        self, response_dict: Dict[str, Any]
+    ) -> None:
+        """
+        一括更新の応答がキャラクターごとの提案のリストを含むかどうかを検証する
 
-                logger.debug(f"LLMからの長期情報更新応答: {response_text}")
+        個々の提案の内容はupdate_long_term_info_batchでキャラクターごとに検証します。
+
+        Raises:
+            InvalidLLMResponseError: 応答が不正な形式の場合
+        """
+        updates = response_dict.get("updates")
+        if not isinstance(updates, list):
+            raise InvalidLLMResponseError(
+                str(response_dict), "updates はリスト形式である必要があります"
+            )
+        for i, update in enumerate(updates):
+            if not isinstance(update, dict) or not isinstance(
+                update.get("character_id"), str
+            ):
+                raise InvalidLLMResponseError(
+                    str(response_dict),
+                    f"updates[{i}] には文字列の 'character_id' キーが必要です",
+                )
 
-                # デバッグモードの場合、応答をターミナルに出力
-                if self.debug:
-                    print("\n" + "=" * 80)
-                    print(f"===== LLM RESPONSE (Long Term Update) =====")
-                    print("=" * 80)
-                    print(response_text)
-                    print("=" * 80 + "\n")
+    def generate_scene_summary(
+        self, summary_context: Dict[str, str], prompt_template_path: str
+    ) -> str:
+        """
+        終了した場面のサマリーを生成する
 
-                # コードブロックマーカーの除去
-                cleaned_response = self._clean_json_response(response_text)
+        Args:
+            summary_context: サマリー生成用のコンテクスト情報を格納した辞書
+                {
+                    "scene_context": "場面情報",
+                    "transcript": "場面のやり取りの記録"
+                }
+            prompt_template_path: 使用するプロンプトテンプレートのパス
 
-                # JSON形式の応答をパース
-                try:
-                    response_dict = json.loads(cleaned_response)
+        Returns:
+            生成されたサマリー
 
-                    # 応答の構造を検証
-                    self._validate_long_term_update_response(response_dict)
+        Raises:
+            PromptTemplateNotFoundError: テンプレートファイルが見つからない場合
+            LLMGenerationError: LLM API呼び出しに失敗した場合
+            InvalidLLMResponseError: LLMからの応答が空の場合
+        """
+        return self.generate_text(
+            summary_context, prompt_template_path, label="Scene Summary"
+        )
 
-                    return response_dict
+    def generate_text(
+        self,
+        context: Dict[str, str],
+        prompt_template_path: str,
+        label: str = "Text",
+    ) -> str:
+        """
+        プロンプトテンプレートに値を埋め込み、自由形式のテキストを生成する
 
-                except json.JSONDecodeError as e:
-                    error_msg = f"LLMからの長期情報更新応答をJSONとしてパースできません: {e}\n応答: {response_text}\nクリーン後: {cleaned_response}\nクリーン後のrepr: {repr(cleaned_response)}"
-                    logger.error(error_msg)
-                    if self.debug:
-                        print(
-                            f"\n===== JSON PARSE ERROR (Long Term Update) =====\n{error_msg}\n============================\n"
-                        )
-                    raise InvalidLLMResponseError(response_text, error_msg)
+        Args:
+            context: テンプレートに埋め込む値を格納した辞書
+            prompt_template_path: 使用するプロンプトテンプレートのパス
+            label: ログとプロンプトダンプに使用する処理名
 
-            except Exception as e:
-                # LLM API呼び出し関連のエラー
-                if isinstance(e, InvalidLLMResponseError):
-                    raise
-                error_msg = f"長期情報更新のLLM API呼び出しに失敗しました: {str(e)}"
-                logger.error(error_msg)
-                if self.debug:
-                    print(
-                        f"\n===== LLM API ERROR (Long Term Update) =====\n{error_msg}\n========================\n"
-                    )
-                raise LLMGenerationError(error_msg, e)
+        Returns:
+            生成されたテキスト（前後の空白は除去される）
 
-        except PromptTemplateNotFoundError:
-            # 既に適切な例外が発生しているので、そのまま再度発生させる
-            raise
-        except (InvalidLLMResponseError, LLMGenerationError):
-            # 既知の例外はそのまま再発生
-            raise
+        Raises:
+            PromptTemplateNotFoundError: テンプレートファイルが見つからない場合
+            LLMGenerationError: LLM API呼び出しに失敗した場合
+            InvalidLLMResponseError: LLMからの応答が空の場合
+        """
+        template_str = self._load_prompt_template(prompt_template_path)
+        final_prompt = self._fill_prompt_template(template_str, context)
+        try:
+            response = self.model.generate_content(final_prompt)
+            response_text = response.text
         except Exception as e:
-            # その他の例外は LLMGenerationError でラップ
-            error_msg = f"長期情報更新中に予期せぬエラーが発生しました: {str(e)}"
+            error_msg = f"LLM API呼び出しに失敗しました ({label}): {str(e)}"
             logger.error(error_msg)
-            if self.debug:
-                print(
-                    f"\n===== UNEXPECTED ERROR (Long Term Update) =====\n{error_msg}\n===========================\n"
-                )
+            dump_prompt_exchange(label, final_prompt, None, model=self.model_name)
             raise LLMGenerationError(error_msg, e)
 
+        dump_prompt_exchange(label, final_prompt, response_text, model=self.model_name)
+
+        text = (response_text or "").strip()
+        if not text:
+            raise InvalidLLMResponseError(response_text, f"応答が空です ({label})")
+        return text
+
     def _validate_long_term_update_response(
         self, response_dict: Dict[str, Any]
     ) -> None:
@@ -0,0 +1,360 @@
+"""
+LLM呼び出しの記録・再生（カセット）を提供するモジュール
+
+このモジュールは、LLMAdapterが使用するモデルオブジェクトを包み、
+generate_contentの要求と応答をカセットファイルに記録する、
+または記録済みの応答をネットワークを使わずに再生する機能を提供します。
+
+カセットファイルはJSON Lines形式（1行に1回の呼び出し）で、以下を記録します。
+
+- key: プロンプトと生成設定から計算したハッシュ（再生時の照合に使用）
+- model / generation_config: 呼び出し時のモデル名と生成設定
+- prompt_sha256 / prompt_chars: プロンプトのハッシュと文字数（プロンプト本文は保存しない）
+- latency_ms: API呼び出しの所要時間
+- text / usage: 応答テキストとトークン数
+- error_type / error_message: API呼び出しが失敗した場合の例外
+
+同じプロンプトが複数回記録されている場合は、記録された順に再生します。
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from types import SimpleNamespace
+from typing import Any, Callable, Deque, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+# ロガーの設定
+logger = logging.getLogger(__name__)
+
+# カセットの動作モード
+CASSETTE_MODES = ("off", "record", "replay")
+
+# 再生時の待ち時間（記録時の所要時間を再現するか、待たずに返すか）
+REPLAY_LATENCIES = ("zero", "original")
+
+
+class CassetteError(Exception):
+    """カセットの記録・再生に関する基本例外クラス"""
+
+    pass
+
+
+class CassetteMissError(CassetteError):
+    """再生時に要求に対応する記録が見つからない場合に発生する例外"""
+
+    def __init__(self, key: str, prompt_chars: int):
+        self.key = key
+        super().__init__(
+            f"カセットに対応する記録がありません（key: {key[:12]}..., プロンプト {prompt_chars} 文字）"
+        )
+
+
+class ReplayedAPIError(CassetteError):
+    """記録時に失敗したAPI呼び出しを再生した場合に発生する例外"""
+
+    def __init__(self, error_type: str, error_message: str):
+        self.error_type = error_type
+        super().__init__(f"{error_type}: {error_message}")
+
+
+class CassetteEntry(BaseModel):
+    """カセットに記録されるLLM呼び出し1回分の情報"""
+
+    key: str = Field(
+        ..., description="プロンプトと生成設定から計算した照合用のハッシュ"
+    )
+    model: str = Field(..., description="呼び出し時のモデル名")
+    generation_config: Dict[str, Any] = Field(
+        default_factory=dict, description="呼び出し時の生成設定"
+    )
+    prompt_sha256: str = Field(..., description="プロンプトのSHA-256ハッシュ")
+    prompt_chars: int = Field(..., description="プロンプトの文字数")
+    latency_ms: float = Field(..., description="API呼び出しの所要時間（ミリ秒）")
+    text: Optional[str] = Field(None, description="応答テキスト")
+    usage: Dict[str, Optional[int]] = Field(
+        default_factory=dict, description="応答に含まれていたトークン数"
+    )
+    error_type: Optional[str] = Field(None, description="失敗した場合の例外の型名")
+    error_message: Optional[str] = Field(None, description="失敗した場合の例外の内容")
+    recorded_at: datetime.datetime = Field(
+        default_factory=datetime.datetime.now, description="記録日時"
+    )
+
+
+_USAGE_FIELDS = ("prompt_token_count", "candidates_token_count", "total_token_count")
+
+
+def prompt_to_text(prompt: Any) -> str:
+    """
+    プロンプトを文字列として取得する
+
+    会話モードではこれまでのやり取りを含むメッセージのリストを送信するため、
+    文字列以外のプロンプトはJSONに変換します。
+    """
+    if isinstance(prompt, str):
+        return prompt
+    return json.dumps(prompt, ensure_ascii=False, sort_keys=True, default=str)
+
+
+def compute_request_key(prompt: str, generation_config: Dict[str, Any]) -> str:
+    """
+    要求を照合するためのキーを計算する
+
+    モデル名はキーに含めません（モデルを切り替えた再実行でも同じ記録を再生できるようにするため）。
+
+    Args:
+        prompt: 送信するプロンプト
+        generation_config: 生成設定
+
+    Returns:
+        SHA-256のハッシュ（16進数文字列）
+    """
+    payload = json.dumps(
+        {"prompt": prompt, "generation_config": generation_config},
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCassette:
+    """
+    カセットファイルの読み書きを行うクラス
+
+    記録は1回の呼び出しごとにファイルへ追記するため、途中で中断しても
+    それまでの呼び出しは失われません。複数スレッドから同時に使用できます。
+    """
+
+    def __init__(self, path: str):
+        """
+        LLMCassetteを初期化する（既存のファイルがあれば読み込む）
+
+        Args:
+            path: カセットファイルのパス
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries: List[CassetteEntry] = []
+        self._unplayed: Dict[str, Deque[int]] = defaultdict(deque)
+        self._next_sequential = 0
+        self._played: set = set()
+        self.misses = 0
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self) -> None:
+        """カセットファイルを読み込む"""
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = CassetteEntry.model_validate_json(line)
+                except ValueError as e:
+                    raise CassetteError(
+                        f"カセットファイルの {line_number} 行目を読み込めません: {self.path}: {e}"
+                    ) from e
+                self._unplayed[entry.key].append(len(self.entries))
+                self.entries.append(entry)
+        logger.info(f"カセットを読み込みました: {self.path}（{len(self.entries)} 件）")
+
+    def append(self, entry: CassetteEntry) -> None:
+        """
+        記録を追加してファイルに追記する
+
+        Args:
+            entry: 追加する記録
+        """
+        line = entry.model_dump_json() + "\n"
+        with self._lock:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+            self.entries.append(entry)
+
+    def next_entry(self, key: str, strict: bool = True) -> Optional[CassetteEntry]:
+        """
+        要求に対応する未再生の記録を取り出す
+
+        Args:
+            key: compute_request_keyで計算したキー
+            strict: Trueの場合はキーが一致する記録のみを返す。
+                Falseの場合、一致する記録がなければ記録順で次の未再生の記録を返す
+
+        Returns:
+            対応する記録（見つからない場合はNone）
+        """
+        with self._lock:
+            candidates = self._unplayed.get(key)
+            if candidates:
+                index = candidates.popleft()
+            else:
+                self.misses += 1
+                if strict:
+                    return None
+                index = self._next_unplayed_index()
+                if index is None:
+                    return None
+                self._unplayed[self.entries[index].key].remove(index)
+
+            self._played.add(index)
+            return self.entries[index]
+
+    def _next_unplayed_index(self) -> Optional[int]:
+        """記録順で次の未再生の記録の位置を返す"""
+        while self._next_sequential < len(self.entries):
+            index = self._next_sequential
+            self._next_sequential += 1
+            if index not in self._played:
+                return index
+        return None
+
+    @property
+    def remaining(self) -> int:
+        """未再生の記録の件数"""
+        with self._lock:
+            return len(self.entries) - len(self._played)
+
+
+class RecordingModel:
+    """
+    モデルへの呼び出しをそのまま行い、要求と応答をカセットに記録するラッパー
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        cassette: LLMCassette,
+        get_model_name: Callable[[], str],
+        base_config: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        RecordingModelを初期化する
+
+        Args:
+            model: 包む対象のモデル（generate_contentを持つオブジェクト）
+            cassette: 記録先のカセット
+            get_model_name: 呼び出し時点のモデル名を返す関数
+            base_config: モデル作成時に指定した生成設定
+        """
+        self.model = model
+        self.cassette = cassette
+        self.get_model_name = get_model_name
+        self.base_config = dict(base_config or {})
+
+    def generate_content(self, prompt: str, generation_config=None, **kwargs):
+        config = {**self.base_config, **(generation_config or {})}
+        started = time.perf_counter()
+        try:
+            if generation_config is None:
+                response = self.model.generate_content(prompt, **kwargs)
+            else:
+                response = self.model.generate_content(
+                    prompt, generation_config=generation_config, **kwargs
+                )
+            text = response.text
+        except Exception as e:
+            self.cassette.append(
+                self._entry(prompt, config, started, error=e, text=None, response=None)
+            )
+            raise
+
+        self.cassette.append(
+            self._entry(
+                prompt, config, started, error=None, text=text, response=response
+            )
+        )
+        return response
+
+    def _entry(
+        self,
+        prompt: str,
+        config: Dict[str, Any],
+        started: float,
+        error: Optional[Exception],
+        text: Optional[str],
+        response: Any,
+    ) -> CassetteEntry:
+        """記録する情報を構築する"""
+        usage = getattr(response, "usage_metadata", None)
+        return CassetteEntry(
+            key=compute_request_key(prompt, config),
+            model=self.get_model_name(),
+            generation_config=json.loads(json.dumps(config, default=str)),
+            prompt_sha256=hashlib.sha256(
+                prompt_to_text(prompt).encode("utf-8")
+            ).hexdigest(),
+            prompt_chars=len(prompt_to_text(prompt)),
+            latency_ms=round((time.perf_counter() - started) * 1000, 3),
+            text=text,
+            usage={
+                name: value
+                for name in _USAGE_FIELDS
+                if isinstance(value := getattr(usage, name, None), int)
+            },
+            error_type=type(error).__name__ if error is not None else None,
+            error_message=str(error) if error is not None else None,
+        )
+
+
+class ReplayModel:
+    """
+    カセットに記録された応答を再生するモデル（ネットワークを使用しない）
+    """
+
+    def __init__(
+        self,
+        cassette: LLMCassette,
+        base_config: Optional[Dict[str, Any]] = None,
+        latency: Literal["zero", "original"] = "zero",
+        strict: bool = True,
+    ):
+        """
+        ReplayModelを初期化する
+
+        Args:
+            cassette: 再生するカセット
+            base_config: モデル作成時に指定した生成設定（記録時と同じ値を指定する）
+            latency: "original"の場合は記録時の所要時間だけ待ってから応答を返す
+            strict: Falseの場合、プロンプトが一致しなくても記録順で次の応答を返す
+                （プロンプトを変更した後の挙動の比較に使用する）
+        """
+        if latency not in REPLAY_LATENCIES:
+            raise ValueError(
+                f"未知の待ち時間の指定です: {latency}（利用可能: {', '.join(REPLAY_LATENCIES)}）"
+            )
+        self.cassette = cassette
+        self.base_config = dict(base_config or {})
+        self.latency = latency
+        self.strict = strict
+
+    def generate_content(self, prompt: str, generation_config=None, **kwargs):
+        config = {**self.base_config, **(generation_config or {})}
+        key = compute_request_key(prompt, config)
+        entry = self.cassette.next_entry(key, strict=self.strict)
+        if entry is None:
+            raise CassetteMissError(key, len(prompt_to_text(prompt)))
+        if entry.key != key:
+            logger.warning(
+                f"プロンプトが記録と一致しないため、記録順の応答を再生します（{entry.prompt_chars} 文字 -> {len(prompt_to_text(prompt))} 文字）"
+            )
+
+        if self.latency == "original":
+            time.sleep(entry.latency_ms / 1000)
+
+        if entry.error_type is not None:
+            raise ReplayedAPIError(entry.error_type, entry.error_message or "")
+
+        return SimpleNamespace(
+            text=entry.text or "",
+            usage_metadata=SimpleNamespace(**entry.usage),
+        )
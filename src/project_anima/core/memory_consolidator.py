@@ -0,0 +1,525 @@
+"""
+キャラクターの長期情報を整理（統合・重複排除）するモジュール
+
+長期情報の更新では、場面ごとにLLMが提案した経験や記憶がそのまま追加されるため、
+同じ出来事を言い換えただけの項目が蓄積し、long_term.yamlとプロンプトが増え続けます。
+このモジュールは、以下の手順で長期情報を一定の大きさに保ちます。
+
+1. 経験・目標・記憶のそれぞれについて、文字n-gramのJaccard係数で類似した項目をまとめる
+   （項目数が多い場合はMinHash/LSHで候補の組を絞り込んでから類似度を計算する）
+2. まとめた項目を1つに統合する（必要に応じてLLMで要約する）
+3. 上限を超えた場合は、重要度の低い経験や古い記憶から削除する
+
+MemoryConsolidatorは場面の合間にバックグラウンドのスレッドで実行できます。
+"""
+
+import hashlib
+import logging
+import random
+import threading
+import unicodedata
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from pydantic import BaseModel, Field
+
+from .data_models import ExperienceData, GoalData, LongTermCharacterData, MemoryData
+
+# 循環参照を避けるための型チェック時のみのインポート
+if TYPE_CHECKING:
+    from .character_manager import CharacterManager
+    from .llm_adapter import LLMAdapter
+
+# ロガーの設定
+logger = logging.getLogger(__name__)
+
+# 類似した項目の本文のリストを受け取り、統合後の本文を返す関数
+# 第1引数は項目の種類（"experience"、"goal"、"memory"）
+ClusterSummarizer = Callable[[str, List[str]], str]
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def normalize_text(text: str) -> str:
+    """
+    類似度の計算用に本文を正規化する
+
+    全角・半角を統一して小文字にし、空白と句読点・記号を取り除きます。
+    """
+    normalized = unicodedata.normalize("NFKC", text).lower()
+    return "".join(
+        char
+        for char in normalized
+        if not unicodedata.category(char).startswith(("P", "Z", "S", "C"))
+    )
+
+
+def char_ngrams(text: str, n: int = 2) -> Set[str]:
+    """
+    正規化した本文の文字n-gramの集合を返す
+
+    Args:
+        text: 対象の本文
+        n: n-gramの長さ
+
+    Returns:
+        文字n-gramの集合（本文がnより短い場合は本文そのものを要素とする集合）
+    """
+    normalized = normalize_text(text)
+    if len(normalized) <= n:
+        return {normalized} if normalized else set()
+    return {normalized[i : i + n] for i in range(len(normalized) - n + 1)}
+
+
+def jaccard_similarity(a: Set[str], b: Set[str]) -> float:
+    """2つの集合のJaccard係数を返す（どちらも空の場合は0）"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHashLSH:
+    """
+    MinHashの署名をバンドに分割し、類似している可能性の高い組を求めるクラス
+
+    全ての組の類似度を計算せずに候補を絞り込むため、項目数が多い場合に使用します。
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, seed: int = 1):
+        """
+        MinHashLSHを初期化する
+
+        Args:
+            num_perm: 署名の長さ（ハッシュ関数の数）
+            bands: バンドの数（num_permを割り切れる値）
+            seed: ハッシュ関数の係数を決める乱数のシード
+        """
+        if num_perm % bands != 0:
+            raise ValueError("num_permはbandsで割り切れる値を指定してください")
+        rng = random.Random(seed)
+        self._coefficients = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        self.bands = bands
+        self.rows = num_perm // bands
+
+    def signature(self, shingles: Iterable[str]) -> List[int]:
+        """n-gramの集合からMinHashの署名を計算する"""
+        hashes = [
+            int.from_bytes(
+                hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big"
+            )
+            for s in shingles
+        ]
+        return [
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+            for a, b in self._coefficients
+        ]
+
+    def candidate_pairs(self, shingle_sets: Sequence[Set[str]]) -> Set[Tuple[int, int]]:
+        """
+        いずれかのバンドの署名が一致する項目の組を返す
+
+        Args:
+            shingle_sets: 項目ごとのn-gramの集合
+
+        Returns:
+            (小さい方の位置, 大きい方の位置) の組の集合
+        """
+        buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        for index, shingles in enumerate(shingle_sets):
+            if not shingles:
+                continue
+            signature = self.signature(shingles)
+            for band in range(self.bands):
+                key = (
+                    band,
+                    tuple(signature[band * self.rows : (band + 1) * self.rows]),
+                )
+                buckets.setdefault(key, []).append(index)
+
+        pairs = set()
+        for members in buckets.values():
+            for i, first in enumerate(members):
+                for second in members[i + 1 :]:
+                    pairs.add((first, second))
+        return pairs
+
+
+def cluster_similar_texts(
+    texts: Sequence[str],
+    threshold: float = 0.6,
+    ngram_size: int = 2,
+    lsh_threshold: int = 200,
+    lsh: Optional[MinHashLSH] = None,
+) -> List[List[int]]:
+    """
+    類似した本文をまとめる
+
+    Jaccard係数がthreshold以上の組を連結し、推移的につながる項目を1つのグループにします。
+
+    Args:
+        texts: 本文のリスト
+        threshold: 同じグループとみなすJaccard係数の下限
+        ngram_size: n-gramの長さ
+        lsh_threshold: 項目数がこの値を超える場合はMinHash/LSHで候補を絞り込む
+        lsh: 使用するMinHashLSH（省略時は既定の設定で作成）
+
+    Returns:
+        グループごとの位置のリスト（各グループは昇順、グループは先頭の位置の順）
+    """
+    shingle_sets = [char_ngrams(text, ngram_size) for text in texts]
+
+    if len(texts) > lsh_threshold:
+        candidates: Iterable[Tuple[int, int]] = (lsh or MinHashLSH()).candidate_pairs(
+            shingle_sets
+        )
+    else:
+        candidates = (
+            (i, j) for i in range(len(texts)) for j in range(i + 1, len(texts))
+        )
+
+    parent = list(range(len(texts)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for first, second in candidates:
+        if jaccard_similarity(shingle_sets[first], shingle_sets[second]) >= threshold:
+            root_first, root_second = find(first), find(second)
+            if root_first != root_second:
+                parent[max(root_first, root_second)] = min(root_first, root_second)
+
+    groups: Dict[int, List[int]] = {}
+    for index in range(len(texts)):
+        groups.setdefault(find(index), []).append(index)
+    return sorted(groups.values(), key=lambda members: members[0])
+
+
+class ConsolidationResult(BaseModel):
+    """1キャラクター分の長期情報の整理結果"""
+
+    character_id: str = Field(description="対象キャラクターのID")
+    before: Dict[str, int] = Field(
+        default_factory=dict, description="整理前の種類ごとの項目数"
+    )
+    after: Dict[str, int] = Field(
+        default_factory=dict, description="整理後の種類ごとの項目数"
+    )
+    merged: int = Field(0, description="統合によって減った項目数")
+    pruned: int = Field(0, description="上限を超えたために削除した項目数")
+    summarized: int = Field(0, description="LLMで要約したグループ数")
+    discarded: bool = Field(
+        False,
+        description="整理中に長期情報が更新されたため、整理結果を保存しなかったか",
+    )
+
+    @property
+    def changed(self) -> bool:
+        """長期情報が変更されたかどうか"""
+        return self.merged > 0 or self.pruned > 0
+
+
+class MemoryConsolidator:
+    """
+    キャラクターの長期情報の類似項目を統合し、項目数を一定に保つクラス
+
+    - 経験: 類似した経験は最も重要度の高い表現を残し、重要度はグループ内の最大値とする
+    - 目標: 類似した目標は後から追加された表現を残し、重要度はグループ内の最大値とする
+    - 記憶: 類似した記憶は最も新しい記憶を残し、関連キャラクターを統合する
+
+    グループの項目数がsummarize_min_cluster以上でsummarizerが指定されている場合は、
+    残す項目の本文をsummarizerで作成した要約に置き換えます。
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.6,
+        ngram_size: int = 2,
+        max_experiences: Optional[int] = 50,
+        max_goals: Optional[int] = 20,
+        max_memories: Optional[int] = 100,
+        summarizer: Optional[ClusterSummarizer] = None,
+        summarize_min_cluster: int = 3,
+        lsh_threshold: int = 200,
+    ):
+        """
+        MemoryConsolidatorを初期化する
+
+        Args:
+            similarity_threshold: 同じ内容とみなす文字n-gramのJaccard係数の下限
+            ngram_size: 類似度の計算に使用する文字n-gramの長さ
+            max_experiences: 経験の上限（超えた分は重要度の低い古い経験から削除。Noneの場合は無制限）
+            max_goals: 目標の上限（超えた分は重要度の低い古い目標から削除。Noneの場合は無制限）
+            max_memories: 記憶の上限（超えた分は古い記憶から削除。Noneの場合は無制限）
+            summarizer: 類似した項目の本文を1つにまとめる関数（省略時は要約しない）
+            summarize_min_cluster: summarizerを使用するグループの最小項目数
+            lsh_threshold: 項目数がこの値を超える場合はMinHash/LSHで候補を絞り込む
+        """
+        self.similarity_threshold = similarity_threshold
+        self.ngram_size = ngram_size
+        self.max_experiences = max_experiences
+        self.max_goals = max_goals
+        self.max_memories = max_memories
+        self.summarizer = summarizer
+        self.summarize_min_cluster = summarize_min_cluster
+        self.lsh_threshold = lsh_threshold
+        self._lsh = MinHashLSH()
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def consolidate(
+        self, data: LongTermCharacterData
+    ) -> Tuple[LongTermCharacterData, ConsolidationResult]:
+        """
+        長期情報を整理する（引数のデータは変更しない）
+
+        Args:
+            data: 整理する長期情報
+
+        Returns:
+            (整理後の長期情報, 整理結果) のタプル
+        """
+        result = ConsolidationResult(
+            character_id=data.character_id,
+            before={
+                "experiences": len(data.experiences),
+                "goals": len(data.goals),
+                "memories": len(data.memories),
+            },
+        )
+
+        experiences = self._merge_clusters(
+            data.experiences, "experience", "event", self._merge_experiences, result
+        )
+        goals = self._merge_clusters(
+            data.goals, "goal", "goal", self._merge_goals, result
+        )
+        memories = self._merge_clusters(
+            data.memories, "memory", "memory", self._merge_memories, result
+        )
+
+        experiences = self._prune_by_importance(experiences, self.max_experiences)
+        goals = self._prune_by_importance(goals, self.max_goals)
+        if self.max_memories is not None and len(memories) > self.max_memories:
+            memories = memories[len(memories) - self.max_memories :]
+
+        consolidated = LongTermCharacterData(
+            character_id=data.character_id,
+            experiences=experiences,
+            goals=goals,
+            memories=memories,
+        )
+        result.after = {
+            "experiences": len(experiences),
+            "goals": len(goals),
+            "memories": len(memories),
+        }
+        result.pruned = sum(result.before.values()) - sum(result.after.values())
+        result.pruned -= result.merged
+        return consolidated, result
+
+    def consolidate_character(
+        self, character_manager: "CharacterManager", character_id: str
+    ) -> ConsolidationResult:
+        """
+        キャラクターの長期情報を整理し、変更があれば保存する
+
+        整理している間に同じキャラクターの長期情報が更新された場合は、
+        その更新を上書きしないよう整理結果を保存しません（次回の整理で改めて行います）。
+
+        Args:
+            character_manager: 長期情報の読み込みと保存に使用するCharacterManager
+            character_id: 対象キャラクターのID
+
+        Returns:
+            整理結果
+        """
+        data, version = character_manager.get_long_term_context_with_version(
+            character_id
+        )
+        consolidated, result = self.consolidate(data)
+        if result.changed:
+            if not character_manager.update_long_term_context(
+                character_id, consolidated, expected_version=version
+            ):
+                result.discarded = True
+                logger.info(
+                    f"キャラクター '{character_id}' の長期情報は整理中に更新されたため、整理結果を保存しませんでした"
+                )
+                return result
+            logger.info(
+                f"キャラクター '{character_id}' の長期情報を整理しました"
+                f"（{result.before} -> {result.after}、統合 {result.merged} 件、削除 {result.pruned} 件）"
+            )
+        else:
+            logger.debug(
+                f"キャラクター '{character_id}' の長期情報に整理する項目はありません"
+            )
+        return result
+
+    def submit(
+        self, character_manager: "CharacterManager", character_ids: Sequence[str]
+    ) -> "Future[Dict[str, Optional[ConsolidationResult]]]":
+        """
+        キャラクターの長期情報の整理をバックグラウンドで開始する
+
+        整理は1つのスレッドで順に行われるため、複数回呼び出しても同じキャラクターの
+        整理が同時に実行されることはありません。
+
+        Args:
+            character_manager: 長期情報の読み込みと保存に使用するCharacterManager
+            character_ids: 対象キャラクターのIDのリスト
+
+        Returns:
+            キャラクターIDと整理結果（失敗した場合はNone）の辞書を結果とするFuture
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="anima-consolidate"
+                )
+            return self._executor.submit(
+                self._consolidate_all, character_manager, list(character_ids)
+            )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """バックグラウンドのスレッドを停止する"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+    def _consolidate_all(
+        self, character_manager: "CharacterManager", character_ids: List[str]
+    ) -> Dict[str, Optional[ConsolidationResult]]:
+        """複数のキャラクターの長期情報を順に整理する（失敗したキャラクターはNone）"""
+        results: Dict[str, Optional[ConsolidationResult]] = {}
+        for character_id in character_ids:
+            try:
+                results[character_id] = self.consolidate_character(
+                    character_manager, character_id
+                )
+            except Exception as e:
+                logger.error(
+                    f"キャラクター '{character_id}' の長期情報の整理に失敗しました: {str(e)}"
+                )
+                results[character_id] = None
+        return results
+
+    def _merge_clusters(self, items, kind, text_field, merge, result):
+        """類似した項目のグループをそれぞれ1つの項目に統合する"""
+        if len(items) < 2:
+            return list(items)
+
+        texts = [getattr(item, text_field) for item in items]
+        groups = cluster_similar_texts(
+            texts,
+            threshold=self.similarity_threshold,
+            ngram_size=self.ngram_size,
+            lsh_threshold=self.lsh_threshold,
+            lsh=self._lsh,
+        )
+
+        merged_items = []
+        for members in groups:
+            group = [items[index] for index in members]
+            if len(group) == 1:
+                merged_items.append(group[0])
+                continue
+
+            merged = merge(group)
+            if self.summarizer is not None and len(group) >= self.summarize_min_cluster:
+                try:
+                    summary = self.summarizer(
+                        kind, [getattr(item, text_field) for item in group]
+                    )
+                    if summary:
+                        merged = merged.model_copy(update={text_field: summary})
+                        result.summarized += 1
+                except Exception as e:
+                    logger.warning(
+                        f"類似項目の要約に失敗したため、要約せずに統合します: {str(e)}"
+                    )
+            merged_items.append(merged)
+            result.merged += len(group) - 1
+        return merged_items
+
+    @staticmethod
+    def _merge_experiences(group: List[ExperienceData]) -> ExperienceData:
+        # 重要度が最も高い経験（同じ場合は新しい方）の表現を残す
+        representative = max(
+            enumerate(group), key=lambda pair: (pair[1].importance, pair[0])
+        )[1]
+        return representative.model_copy()
+
+    @staticmethod
+    def _merge_goals(group: List[GoalData]) -> GoalData:
+        return group[-1].model_copy(
+            update={"importance": max(goal.importance for goal in group)}
+        )
+
+    @staticmethod
+    def _merge_memories(group: List[MemoryData]) -> MemoryData:
+        related = []
+        for memory in group:
+            for character_id in memory.related_character_ids:
+                if character_id not in related:
+                    related.append(character_id)
+        return group[-1].model_copy(update={"related_character_ids": related})
+
+    @staticmethod
+    def _prune_by_importance(items: List, limit: Optional[int]) -> List:
+        """上限を超えた分を重要度の低い順（同じ場合は古い順）に削除する"""
+        if limit is None or len(items) <= limit:
+            return items
+        ranked = sorted(
+            range(len(items)),
+            key=lambda index: (items[index].importance, index),
+            reverse=True,
+        )
+        keep = set(ranked[:limit])
+        return [item for index, item in enumerate(items) if index in keep]
+
+
+def create_llm_summarizer(
+    llm_adapter: "LLMAdapter", prompt_template_path: str
+) -> ClusterSummarizer:
+    """
+    LLMで類似項目を要約するsummarizerを作成する
+
+    Args:
+        llm_adapter: 要約に使用するLLMAdapter
+        prompt_template_path: 要約用のプロンプトテンプレート（{{kind}}と{{items}}を埋め込む）
+
+    Returns:
+        MemoryConsolidatorに渡すsummarizer
+    """
+    kind_labels = {"experience": "経験", "goal": "目標", "memory": "記憶"}
+
+    def summarize(kind: str, texts: List[str]) -> str:
+        return llm_adapter.generate_text(
+            {
+                "kind": kind_labels.get(kind, kind),
+                "items": "\n".join(f"- {text}" for text in texts),
+            },
+            prompt_template_path,
+            label="Memory Consolidation",
+        )
+
+    return summarize
@@ -0,0 +1,506 @@
+"""
+プロンプトの共通部分（プレフィックス）をプロバイダー側にキャッシュするモジュール
+
+思考生成のプロンプトは、指示・不変情報・長期情報からなるターンをまたいで変わらない部分
+（プレフィックス）と、場面情報・短期情報からなる毎ターン変わる部分（サフィックス）に
+分けて組み立てられます（テンプレート中のPROMPT_CACHE_BOUNDARYが境界）。
+
+このモジュールは、プレフィックスをプロバイダーのコンテクストキャッシュに登録し、
+以降の呼び出しではサフィックスのみを送信する仕組みを提供します。
+
+- PromptCacheRegistry: プレフィックスとキャッシュハンドルの対応、TTLの延長、ヒット率の集計
+- GeminiCacheBackend: Gemini APIのCachedContentを使用するバックエンド
+- StubCacheBackend: ネットワークを使わずにキャッシュとトークン数の計上を再現するバックエンド
+  （テストや負荷試験用）
+
+プレフィックスの位置で自動的にキャッシュされるプロバイダー（OpenAIのプロンプトキャッシュなど）では、
+ハンドルの管理は不要で、プレフィックスを先頭に置くプロンプトの並びのみで効果が得られます。
+"""
+
+import datetime
+import hashlib
+import logging
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+# ロガーの設定
+logger = logging.getLogger(__name__)
+
+# テンプレート中でプレフィックスとサフィックスの境界を示すプレースホルダー
+# （埋め込み後のプロンプトからは取り除かれる）
+PROMPT_CACHE_BOUNDARY = "{{cache_boundary}}"
+
+
+class PromptCacheError(Exception):
+    """プロンプトキャッシュの作成・使用に失敗した場合に発生する例外"""
+
+    pass
+
+
+class CacheHandleExpiredError(PromptCacheError):
+    """キャッシュハンドルが期限切れ、またはプロバイダー側で削除されていた場合に発生する例外"""
+
+    pass
+
+
+def split_cacheable_prompt(prompt: str) -> Tuple[str, str]:
+    """
+    境界のプレースホルダーでプロンプトをプレフィックスとサフィックスに分ける
+
+    Args:
+        prompt: 値を埋め込んだプロンプト
+
+    Returns:
+        (プレフィックス, サフィックス) のタプル。境界がない場合はプレフィックスを空文字とする
+    """
+    if PROMPT_CACHE_BOUNDARY not in prompt:
+        return "", prompt
+    prefix, suffix = prompt.split(PROMPT_CACHE_BOUNDARY, 1)
+    return prefix, suffix.replace(PROMPT_CACHE_BOUNDARY, "")
+
+
+def estimate_tokens(text: str) -> int:
+    """トークン数の概算（4文字を1トークンとする）"""
+    return (len(text) + 3) // 4
+
+
+class CacheHandle(BaseModel):
+    """プロバイダーに登録したプレフィックスのキャッシュ"""
+
+    key: str = Field(..., description="モデル名とプレフィックスから計算したハッシュ")
+    name: str = Field(..., description="プロバイダー側のキャッシュ名")
+    model: str = Field(..., description="キャッシュを作成したモデル名")
+    prefix_chars: int = Field(..., description="プレフィックスの文字数")
+    expires_at: float = Field(..., description="有効期限（registryの時計の値）")
+    hits: int = Field(0, description="このキャッシュを使用した呼び出し回数")
+
+
+class PromptCacheBackend:
+    """
+    プロンプトキャッシュのバックエンドの基底クラス
+
+    プロバイダーごとにキャッシュの作成・延長・削除と、キャッシュを使用した生成を実装します。
+    """
+
+    def create(self, model_name: str, prefix: str, ttl_seconds: float) -> str:
+        """プレフィックスをキャッシュに登録し、キャッシュ名を返す"""
+        raise NotImplementedError
+
+    def refresh(self, name: str, ttl_seconds: float) -> None:
+        """キャッシュの有効期限を延長する"""
+        raise NotImplementedError
+
+    def delete(self, name: str) -> None:
+        """キャッシュを削除する"""
+        raise NotImplementedError
+
+    def generate(
+        self,
+        name: str,
+        suffix: str,
+        generation_config: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        キャッシュしたプレフィックスに続けてサフィックスを送信し、応答を生成する
+
+        Returns:
+            generate_contentと同じ形式の応答（text、usage_metadataを持つ）
+
+        Raises:
+            CacheHandleExpiredError: キャッシュが存在しない場合
+        """
+        raise NotImplementedError
+
+
+class GeminiCacheBackend(PromptCacheBackend):
+    """
+    Gemini APIのコンテクストキャッシュ（CachedContent）を使用するバックエンド
+
+    キャッシュできるのはバージョンを固定したモデル（例: gemini-1.5-flash-001）のみで、
+    プレフィックスが最小トークン数に満たない場合は作成に失敗します
+    （その場合、registryは通常の呼び出しに切り替えます）。
+    """
+
+    def __init__(self, base_generation_config: Optional[Dict[str, Any]] = None):
+        """
+        GeminiCacheBackendを初期化する
+
+        Args:
+            base_generation_config: キャッシュを使用するモデルの生成設定
+        """
+        import google.generativeai as genai
+        from google.generativeai import caching
+
+        self._genai = genai
+        self._caching = caching
+        self.base_generation_config = dict(base_generation_config or {})
+        self._models: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def create(self, model_name: str, prefix: str, ttl_seconds: float) -> str:
+        try:
+            cached_content = self._caching.CachedContent.create(
+                model=model_name,
+                display_name=f"anima-prefix-{hashlib.sha256(prefix.encode('utf-8')).hexdigest()[:12]}",
+                contents=[prefix],
+                ttl=datetime.timedelta(seconds=ttl_seconds),
+            )
+            model = self._genai.GenerativeModel.from_cached_content(
+                cached_content=cached_content,
+                generation_config=self.base_generation_config,
+            )
+        except Exception as e:
+            raise PromptCacheError(f"キャッシュを作成できませんでした: {str(e)}") from e
+        with self._lock:
+            self._models[cached_content.name] = model
+        return cached_content.name
+
+    def refresh(self, name: str, ttl_seconds: float) -> None:
+        try:
+            self._caching.CachedContent.get(name).update(
+                ttl=datetime.timedelta(seconds=ttl_seconds)
+            )
+        except Exception as e:
+            raise CacheHandleExpiredError(
+                f"キャッシュを延長できませんでした: {name}: {str(e)}"
+            ) from e
+
+    def delete(self, name: str) -> None:
+        with self._lock:
+            self._models.pop(name, None)
+        try:
+            self._caching.CachedContent.get(name).delete()
+        except Exception as e:
+            logger.warning(f"キャッシュを削除できませんでした: {name}: {str(e)}")
+
+    def generate(
+        self,
+        name: str,
+        suffix: str,
+        generation_config: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        with self._lock:
+            model = self._models.get(name)
+        if model is None:
+            raise CacheHandleExpiredError(f"キャッシュが見つかりません: {name}")
+        try:
+            if generation_config is None:
+                return model.generate_content(suffix)
+            return model.generate_content(suffix, generation_config=generation_config)
+        except Exception as e:
+            # 期限切れ・削除済みのキャッシュはNotFound/PermissionDeniedとして報告される
+            if type(e).__name__ in ("NotFound", "PermissionDenied"):
+                raise CacheHandleExpiredError(str(e)) from e
+            raise
+
+
+class StubCacheBackend(PromptCacheBackend):
+    """
+    ネットワークを使わずにプロバイダー側のキャッシュを再現するバックエンド
+
+    生成はプレフィックスとサフィックスを結合したプロンプトでmodelを呼び出して行い、
+    応答のusage_metadataに、キャッシュから読み込んだ分として
+    cached_content_token_count（プレフィックスの概算トークン数）を設定します。
+    """
+
+    def __init__(self, model: Any, clock: Callable[[], float] = time.monotonic):
+        """
+        StubCacheBackendを初期化する
+
+        Args:
+            model: 実際の生成を行うモデル（generate_contentを持つオブジェクト）
+            clock: 有効期限の判定に使用する時計
+        """
+        self.model = model
+        self.clock = clock
+        self.caches: Dict[str, Dict[str, Any]] = {}
+        self.created = 0
+        self._lock = threading.Lock()
+
+    def create(self, model_name: str, prefix: str, ttl_seconds: float) -> str:
+        with self._lock:
+            self.created += 1
+            name = f"cachedContents/stub-{self.created}"
+            self.caches[name] = {
+                "prefix": prefix,
+                "model": model_name,
+                "expires_at": self.clock() + ttl_seconds,
+            }
+        return name
+
+    def refresh(self, name: str, ttl_seconds: float) -> None:
+        with self._lock:
+            cache = self._get_live(name)
+            cache["expires_at"] = self.clock() + ttl_seconds
+
+    def delete(self, name: str) -> None:
+        with self._lock:
+            self.caches.pop(name, None)
+
+    def generate(
+        self,
+        name: str,
+        suffix: str,
+        generation_config: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        with self._lock:
+            prefix = self._get_live(name)["prefix"]
+
+        prompt = prefix + suffix
+        if generation_config is None:
+            response = self.model.generate_content(prompt)
+        else:
+            response = self.model.generate_content(
+                prompt, generation_config=generation_config
+            )
+
+        usage = getattr(response, "usage_metadata", None)
+        completion_tokens = getattr(usage, "candidates_token_count", None)
+        if not isinstance(completion_tokens, int):
+            completion_tokens = estimate_tokens(response.text)
+        prompt_tokens = estimate_tokens(prompt)
+        return SimpleNamespace(
+            text=response.text,
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=prompt_tokens,
+                cached_content_token_count=estimate_tokens(prefix),
+                candidates_token_count=completion_tokens,
+                total_token_count=prompt_tokens + completion_tokens,
+            ),
+        )
+
+    def _get_live(self, name: str) -> Dict[str, Any]:
+        """有効期限内のキャッシュを取得する（ロックを取得した状態で呼び出す）"""
+        cache = self.caches.get(name)
+        if cache is None or cache["expires_at"] <= self.clock():
+            self.caches.pop(name, None)
+            raise CacheHandleExpiredError(f"キャッシュが見つかりません: {name}")
+        return cache
+
+
+class PromptCacheRegistry:
+    """
+    プレフィックスとキャッシュハンドルの対応を管理するクラス
+
+    同じモデル・同じプレフィックスの呼び出しには同じキャッシュを使用し、
+    有効期限が近づいたキャッシュは使用時に延長します。キャッシュを作成できなかった
+    プレフィックスは記録しておき、以降はキャッシュを試みずに通常の呼び出しに切り替えます。
+    複数スレッドから同時に使用できます。
+    """
+
+    def __init__(
+        self,
+        backend: PromptCacheBackend,
+        ttl_seconds: float = 3600,
+        refresh_margin_seconds: float = 300,
+        min_prefix_chars: int = 0,
+        max_handles: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        PromptCacheRegistryを初期化する
+
+        Args:
+            backend: キャッシュを作成・使用するバックエンド
+            ttl_seconds: キャッシュの有効期間（秒）
+            refresh_margin_seconds: 残りの有効期間がこれ未満のキャッシュは使用時に延長する
+            min_prefix_chars: キャッシュするプレフィックスの最小文字数
+                （プロバイダーの最小トークン数に満たないプレフィックスを送らないため）
+            max_handles: 保持するキャッシュの上限（超えた場合は有効期限の近いものから削除）
+            clock: 有効期限の判定に使用する時計
+        """
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.min_prefix_chars = min_prefix_chars
+        self.max_handles = max_handles
+        self.clock = clock
+
+        self._handles: Dict[str, CacheHandle] = {}
+        self._uncacheable: set = set()
+        self._lock = threading.Lock()
+        self._counts = {
+            "requests": 0,
+            "hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "bypassed": 0,
+            "prompt_tokens": 0,
+            "cached_tokens": 0,
+        }
+
+    @staticmethod
+    def _make_key(model_name: str, prefix: str) -> str:
+        """モデル名とプレフィックスからキャッシュのキーを計算する"""
+        return hashlib.sha256(f"{model_name}\n{prefix}".encode("utf-8")).hexdigest()
+
+    def generate(
+        self,
+        model_name: str,
+        prefix: str,
+        suffix: str,
+        generation_config: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        プレフィックスのキャッシュを使用して応答を生成する
+
+        キャッシュが期限切れ・削除済みだった場合は1回だけ作り直します。
+
+        Args:
+            model_name: 使用するモデル名
+            prefix: キャッシュするプレフィックス
+            suffix: プレフィックスに続けて送信するサフィックス
+            generation_config: 呼び出しごとの生成設定
+
+        Returns:
+            バックエンドの応答
+
+        Raises:
+            PromptCacheError: キャッシュを使用できない場合（呼び出し側で通常の呼び出しに切り替える）
+        """
+        key = self._make_key(model_name, prefix)
+        with self._lock:
+            self._counts["requests"] += 1
+            if len(prefix) < self.min_prefix_chars or key in self._uncacheable:
+                self._counts["bypassed"] += 1
+                raise PromptCacheError("このプレフィックスはキャッシュしません")
+
+        for attempt in range(2):
+            handle, created = self._get_handle(key, model_name, prefix)
+            try:
+                response = self.backend.generate(handle.name, suffix, generation_config)
+            except CacheHandleExpiredError:
+                logger.info(f"キャッシュが失効していたため作り直します: {handle.name}")
+                with self._lock:
+                    if self._handles.get(key) is handle:
+                        del self._handles[key]
+                if attempt == 0:
+                    continue
+                raise
+            self._record_usage(handle, response, created)
+            return response
+
+    def _get_handle(
+        self, key: str, model_name: str, prefix: str
+    ) -> Tuple[CacheHandle, bool]:
+        """
+        キャッシュハンドルを取得する（なければ作成し、期限が近ければ延長する）
+
+        Returns:
+            (ハンドル, 新たに作成したか) のタプル
+        """
+        with self._lock:
+            handle = self._handles.get(key)
+            now = self.clock()
+            if handle is not None and handle.expires_at > now:
+                needs_refresh = handle.expires_at - now < self.refresh_margin_seconds
+            else:
+                handle = None
+
+        if handle is not None:
+            if needs_refresh:
+                try:
+                    self.backend.refresh(handle.name, self.ttl_seconds)
+                    with self._lock:
+                        handle.expires_at = self.clock() + self.ttl_seconds
+                        self._counts["refreshes"] += 1
+                except CacheHandleExpiredError:
+                    # 生成時に作り直す
+                    pass
+            return handle, False
+
+        try:
+            name = self.backend.create(model_name, prefix, self.ttl_seconds)
+        except PromptCacheError as e:
+            logger.warning(
+                f"プロンプトのキャッシュを作成できないため、このプレフィックスは通常の呼び出しを行います: {str(e)}"
+            )
+            with self._lock:
+                self._uncacheable.add(key)
+                self._counts["bypassed"] += 1
+            raise
+
+        handle = CacheHandle(
+            key=key,
+            name=name,
+            model=model_name,
+            prefix_chars=len(prefix),
+            expires_at=self.clock() + self.ttl_seconds,
+        )
+        with self._lock:
+            self._handles[key] = handle
+            evicted = self._evict_over_limit()
+        for name in evicted:
+            self.backend.delete(name)
+        logger.debug(f"プロンプトのキャッシュを作成しました: {handle.name}")
+        return handle, True
+
+    def _evict_over_limit(self) -> List[str]:
+        """上限を超えたハンドルを有効期限の近い順に取り除く（ロックを取得した状態で呼び出す）"""
+        evicted = []
+        while len(self._handles) > self.max_handles:
+            key = min(self._handles, key=lambda k: self._handles[k].expires_at)
+            evicted.append(self._handles.pop(key).name)
+        return evicted
+
+    def _record_usage(self, handle: CacheHandle, response: Any, created: bool) -> None:
+        """キャッシュのヒット・ミスと応答のトークン数を集計する"""
+        usage = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(usage, "prompt_token_count", None)
+        cached_tokens = getattr(usage, "cached_content_token_count", None)
+        with self._lock:
+            self._counts["misses" if created else "hits"] += 1
+            if not created:
+                handle.hits += 1
+            if isinstance(prompt_tokens, int):
+                self._counts["prompt_tokens"] += prompt_tokens
+            if isinstance(cached_tokens, int):
+                self._counts["cached_tokens"] += cached_tokens
+
+    def evict_expired(self) -> int:
+        """
+        有効期限切れのハンドルを取り除く
+
+        Returns:
+            取り除いたハンドルの数
+        """
+        with self._lock:
+            now = self.clock()
+            expired = [k for k, h in self._handles.items() if h.expires_at <= now]
+            for key in expired:
+                del self._handles[key]
+        return len(expired)
+
+    def clear(self) -> None:
+        """全てのキャッシュをプロバイダーから削除する"""
+        with self._lock:
+            handles = list(self._handles.values())
+            self._handles.clear()
+        for handle in handles:
+            self.backend.delete(handle.name)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        キャッシュの使用状況を取得する
+
+        Returns:
+            呼び出し回数、ヒット・ミス・延長・不使用の回数、ヒット率、
+            入力トークンのうちキャッシュから読み込まれた割合などを格納した辞書
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counts)
+            stats["handles"] = len(self._handles)
+        cached_requests = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = (
+            round(stats["hits"] / cached_requests, 4) if cached_requests else 0.0
+        )
+        stats["cached_token_ratio"] = (
+            round(stats["cached_tokens"] / stats["prompt_tokens"], 4)
+            if stats["prompt_tokens"]
+            else 0.0
+        )
+        return stats
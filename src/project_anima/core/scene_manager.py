@@ -107,6 +107,16 @@ class SceneManager:
         """
         return self._current_scene
 
+    def set_current_scene_info(self, scene_info: SceneInfoData) -> None:
+        """
+        場面情報を直接設定します（保存した状態からシミュレーションを再開する場合に使用）。
+
+        Args:
+            scene_info: 設定する場面情報
+        """
+        self._current_scene = scene_info
+        logger.info(f"場面情報を復元しました: {scene_info.scene_id}")
+
     def get_participant_character_ids(self) -> List[str]:
         """
         現在の場面に参加しているキャラクターIDのリストを返します。
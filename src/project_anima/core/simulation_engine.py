@@ -10,7 +10,18 @@ import os
 import logging
 import json
 import datetime
-from typing import Optional, List, Dict, Any, TYPE_CHECKING, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Optional,
+    List,
+    Dict,
+    Any,
+    TYPE_CHECKING,
+    Tuple,
+    NamedTuple,
+    Sequence,
+    Set,
+)
 
 # 循環参照を避けるための型チェック時のみのインポート
 if TYPE_CHECKING:
@@ -24,13 +35,18 @@ if TYPE_CHECKING:
         PromptTemplateNotFoundError,
     )
     from .information_updater import InformationUpdater
-    from .data_models import SceneLogData, InterventionData, SceneInfoData
+    from .memory_consolidator import ConsolidationResult, MemoryConsolidator
+    from .data_models import SceneLogData, InterventionData, SceneInfoData, TurnData
 
 # ロガーの設定
 logger = logging.getLogger(__name__)
 
 # ファイルハンドラーモジュールをインポート
 from ..utils.file_handler import save_json
+from .chat_session import CHAT_SESSION_ENV
+from .event_bus import SimulationEventBus, SimulationEventType
+from .turn_store import CompactTurnStore
+from .turn_scheduler import RoundRobinScheduler, TurnScheduler
 
 
 class SimulationEngineError(Exception):
@@ -48,6 +64,24 @@ class SceneNotLoadedError(SimulationEngineError):
         )
 
 
+class _PreparedTurn(NamedTuple):
+    """思考生成の前に構築したターンの情報"""
+
+    character_id: str
+    character_name: str
+    context_dict: Dict[str, str]
+    prompt_file_path: str
+
+
+class _GeneratedTurn(NamedTuple):
+    """LLMで生成したターンの内容"""
+
+    think: str
+    act: str
+    talk: str
+    generation_info: Optional[Dict[str, Any]]
+
+
 class SimulationEngine:
     """
     シミュレーションを制御するエンジンクラス
@@ -58,6 +92,9 @@ class SimulationEngine:
     LLMAdapter、InformationUpdater）を協調させ、シミュレーションの基本的な流れを実現します。
     """
 
+    # 会話モードで、前回行動してからの出来事を集めるために遡るターン数の上限
+    SESSION_LOOKBACK_TURNS = 50
+
     def __init__(
         self,
         scene_file_path,
@@ -66,6 +103,17 @@ class SimulationEngine:
         log_dir="logs",
         llm_model="gemini-1.5-flash-latest",
         debug=False,
+        event_bus: Optional[SimulationEventBus] = None,
+        compact_turns: bool = False,
+        spill_turns_after: Optional[int] = None,
+        turn_scheduler: Optional[TurnScheduler] = None,
+        max_concurrent_generations: int = 4,
+        previous_scene_summary: Optional[str] = None,
+        previous_scene_log_reference: Optional[str] = None,
+        llm_adapter: Optional["LLMAdapter"] = None,
+        memory_consolidator: Optional["MemoryConsolidator"] = None,
+        long_term_batch_size: Optional[int] = None,
+        chat_session_mode: Optional[bool] = None,
     ):
         """
         シミュレーションエンジンを初期化する
@@ -77,6 +125,25 @@ class SimulationEngine:
             log_dir (str): ログ出力先ディレクトリ
             llm_model (str): 使用するLLMモデル名
             debug (bool): デバッグモードフラグ
+            event_bus (SimulationEventBus): 状態変化を通知するイベントバス（省略時は新規作成）
+            compact_turns (bool): ターン記録をCompactTurnStoreで省メモリに保持するか
+            spill_turns_after (int): compact_turns有効時、メモリ上に保持するターン数の上限
+                （超えた古いターンは一時ファイルに退避。Noneの場合は退避しない）
+            turn_scheduler (TurnScheduler): 行動順を決定するスケジューラ（省略時はラウンドロビン）
+            max_concurrent_generations (int): 同時行動ラウンドで並行して行うLLM呼び出しの上限
+            previous_scene_summary (str): 直前の場面のサマリー（全キャラクターのコンテクストに含める）
+            previous_scene_log_reference (str): 直前の場面のログファイルのパス
+                （場面設定に指定がない場合にprevious_scene_log_referenceとして記録）
+            llm_adapter (LLMAdapter): 使用するLLMアダプター
+                （省略時はllm_modelから作成する。カセットを再生するアダプターを渡すと、
+                ネットワークを使わずに記録済みのセッションを再実行できる）
+            memory_consolidator (MemoryConsolidator): 長期情報の更新後に類似項目の統合を
+                バックグラウンドで行うMemoryConsolidator（省略時は統合しない）
+            long_term_batch_size (int): 長期情報の一括更新で1回のLLM呼び出しにまとめる
+                キャラクター数の上限（Noneの場合はキャラクターごとに呼び出す）
+            chat_session_mode (bool): キャラクターごとの会話セッションを使い、2回目以降の
+                ターンでは前回行動してからの出来事のみを送信するか
+                （省略時は環境変数 PROJECT_ANIMA_CHAT_SESSIONS が "1" の場合のみ有効）
         """
         self.logger = logging.getLogger(self.__class__.__name__)
         self.debug = debug
@@ -88,6 +155,15 @@ class SimulationEngine:
         self.scene_file_path = scene_file_path
         self.log_dir = log_dir
         self.prompts_dir_path = prompts_dir
+        self.compact_turns = compact_turns
+        self.spill_turns_after = spill_turns_after
+        self.turn_scheduler = (
+            turn_scheduler if turn_scheduler is not None else RoundRobinScheduler()
+        )
+        self.max_concurrent_generations = max_concurrent_generations
+        self.previous_scene_summary = previous_scene_summary
+        self.previous_scene_log_reference = previous_scene_log_reference
+        self.long_term_batch_size = long_term_batch_size
 
         # 各マネージャ・モジュールの初期化
         from .character_manager import CharacterManager
@@ -101,7 +177,22 @@ class SimulationEngine:
         self.information_updater = InformationUpdater(self.character_manager)
 
         # LLMアダプターの初期化
-        self.llm_adapter = LLMAdapter(model_name=llm_model, debug=debug)
+        self.llm_adapter = (
+            llm_adapter
+            if llm_adapter is not None
+            else LLMAdapter(model_name=llm_model, debug=debug)
+        )
+
+        # 会話モード（キャラクターごとのセッションで新しい出来事のみを送信する）
+        if chat_session_mode is None:
+            chat_session_mode = os.environ.get(CHAT_SESSION_ENV) == "1"
+        self.chat_session_mode = chat_session_mode
+        if chat_session_mode:
+            self.llm_adapter.enable_chat_sessions()
+
+        # 長期情報の整理（更新後にバックグラウンドで実行）
+        self.memory_consolidator = memory_consolidator
+        self._consolidation_future: Optional[Future] = None
 
         # コンテキストビルダーの初期化
         self.context_builder = ContextBuilder(
@@ -116,6 +207,9 @@ class SimulationEngine:
         self._divine_revelation = None
         self._end_scene_requested = False
         self._turn_count = 0
+        # 最後にターンを記録してから、ターンを記録できなかったキャラクター
+        # （次の行動者を決める際に飛ばし、同じキャラクターが選ばれ続けないようにする）
+        self._failed_speakers: Set[str] = set()
 
         # シミュレーションIDを保持（ターンごと保存用）
         self._simulation_id = None
@@ -124,6 +218,9 @@ class SimulationEngine:
         # 天啓情報を保持する辞書 (キャラクターID -> 天啓内容のリスト)
         self._pending_revelations: Dict[str, List[str]] = {}
 
+        # 状態変化を購読者に通知するイベントバス
+        self.event_bus = event_bus if event_bus is not None else SimulationEventBus()
+
         logger.info("SimulationEngineを初期化しました")
 
     def start_simulation_setup(self) -> bool:
@@ -151,6 +248,15 @@ class SimulationEngine:
             if scene_info is None:
                 raise ValueError("場面情報の取得に失敗しました")
 
+            # 直前の場面のログを引き継ぐ場合は参照を記録
+            if (
+                self.previous_scene_log_reference
+                and not scene_info.previous_scene_log_reference
+            ):
+                scene_info.previous_scene_log_reference = (
+                    self.previous_scene_log_reference
+                )
+
             # 参加キャラクターを確認
             participant_ids = scene_info.participant_character_ids
             if not participant_ids:
@@ -159,20 +265,25 @@ class SimulationEngine:
                 )
                 return False
 
-            # 参加キャラクターの情報をロード
+            # 参加キャラクターと記憶に登場する関連キャラクターの情報を並行してロード
+            load_errors = self.character_manager.preload_characters(participant_ids)
             for character_id in participant_ids:
-                try:
-                    self.character_manager.load_character_data(character_id)
-                except Exception as e:
+                error = load_errors.get(character_id)
+                if error is not None:
                     logger.error(
-                        f"キャラクター '{character_id}' の読み込みに失敗しました: {str(e)}"
+                        f"キャラクター '{character_id}' の読み込みに失敗しました: {str(error)}"
                     )
 
             # 場面ログの初期化（インメモリ）
             from .data_models import SceneLogData
 
+            turns = (
+                CompactTurnStore(spill_threshold=self.spill_turns_after)
+                if self.compact_turns
+                else []
+            )
             self._current_scene_log = SceneLogData(
-                scene_info=scene_info, interventions_in_scene=[], turns=[]
+                scene_info=scene_info, interventions_in_scene=[], turns=turns
             )
 
             # 場面終了フラグを初期化
@@ -181,10 +292,11 @@ class SimulationEngine:
             # ターンカウンターとインデックスの初期化
             self._turn_count = 0
             self._current_turn = 0
-            self._is_running = True
+            self._failed_speakers = set()
 
             # シミュレーションIDを生成し、ログディレクトリを作成
             self._initialize_simulation_logging()
+            self._set_running(True)
 
             # 初期状態のシーンログを即座に保存
             self._save_scene_log_realtime()
@@ -205,10 +317,11 @@ class SimulationEngine:
         """
         シミュレーションの1ターンを実行する
 
-        現在のターンインデックスに基づいて次のキャラクターを決定し、
-        そのキャラクターのターンを実行します。
-        キャラクターのロードエラーが発生した場合は、そのキャラクターを
-        参加者リストから除外し、残りのキャラクターで続行します。
+        ターンスケジューラに次の行動キャラクターを問い合わせ、
+        そのキャラクターのターンを実行します。スケジューラが複数のキャラクターを
+        返した場合は、同じ状態を見た全員のターンを生成してから参加順に記録します。
+        ターンを記録できなかったキャラクター（ロードエラーなど）は、次にいずれかの
+        ターンが記録されるまで行動順から飛ばし、残りのキャラクターで続行します。
 
         Returns:
             bool: シミュレーションが続行可能かどうか（Falseの場合は終了）
@@ -220,38 +333,33 @@ class SimulationEngine:
         if self._end_scene_requested:
             logger.info("場面終了が要求されたため、シミュレーションを終了します。")
             self._save_scene_log()
-            self._is_running = False
+            self._set_running(False)
             return False
 
         # 次の行動キャラクターを決定
-        character_id = self._determine_next_character()
-
-        # 全キャラクターが行動済みなら一巡完了
-        if character_id is None:
-            self._current_turn = 0
-            self._turn_count += len(
-                self._current_scene_log.scene_info.participant_character_ids
-            )
-            logger.info(
-                f"全キャラクターの行動が完了しました（計 {self._turn_count} ターン）"
+        speakers = self._determine_next_speakers()
+        if not speakers:  # 参加者がいなくなった場合
+            logger.warning(
+                "参加キャラクターがいなくなりました。シミュレーションを終了します。"
             )
+            self._save_scene_log()
+            self._set_running(False)
+            return False
 
-            # 再度次のキャラクターを取得
-            character_id = self._determine_next_character()
-            if character_id is None:  # 参加者がいなくなった場合
-                logger.warning(
-                    "参加キャラクターがいなくなりました。シミュレーションを終了します。"
-                )
-                self._save_scene_log()
-                self._is_running = False
-                return False
+        if len(speakers) > 1:
+            self._execute_simultaneous_turns(speakers)
+            return True
 
         # キャラクターのターンを実行
+        character_id = speakers[0]
         try:
             logger.info(f"キャラクター '{character_id}' のターンを実行します")
+            recorded_turns = len(self._current_scene_log.turns)
             self.next_turn(character_id)
+            if len(self._current_scene_log.turns) == recorded_turns:
+                return self._skip_failed_speaker(character_id)
             # 成功した場合のみターンを進める
-            self._current_turn += 1
+            self._advance_turn_counters(1)
             logger.info(f"キャラクター '{character_id}' のターンが正常に完了しました")
             return True
         except Exception as e:
@@ -280,17 +388,169 @@ class SimulationEngine:
                         "全てのキャラクターがエラーのため除外されました。シミュレーションを終了します。"
                     )
                     self._save_scene_log()
-                    self._is_running = False
+                    self._set_running(False)
                     return False
 
-                # 現在のターンインデックスが参加者数以上になった場合は調整
-                if self._current_turn >= len(participants):
-                    self._current_turn = 0
-                    logger.info("ターンインデックスをリセットしました")
-
             # エラーが発生したが、他のキャラクターで続行可能
             return True
 
+    def _skip_failed_speaker(self, character_id: str) -> bool:
+        """
+        ターンを記録できなかったキャラクターを、次にターンが記録されるまで行動順から飛ばす
+
+        Args:
+            character_id: ターンを記録できなかったキャラクターのID
+
+        Returns:
+            bool: シミュレーションが続行可能かどうか（全員が続けて失敗した場合はFalse）
+        """
+        self._failed_speakers.add(character_id)
+        logger.warning(
+            f"キャラクター '{character_id}' のターンを記録できなかったため、次のキャラクターに進みます"
+        )
+
+        participants = self._current_scene_log.scene_info.participant_character_ids
+        if set(participants) <= self._failed_speakers:
+            logger.error(
+                "全てのキャラクターのターンが続けて失敗しました。シミュレーションを終了します。"
+            )
+            self._save_scene_log()
+            self._set_running(False)
+            return False
+        return True
+
+    def execute_round(self, max_concurrency: Optional[int] = None) -> bool:
+        """
+        全ての参加キャラクターが同じ状態に同時に反応するラウンドを実行する
+
+        全員のコンテクストを現在の短期ログのスナップショットから構築し、
+        LLM呼び出しを並行して行った後、参加順に短期ログへ記録します。
+        ラウンドの所要時間は各呼び出しの合計ではなく最大値に近くなります。
+
+        Args:
+            max_concurrency: 同時に行うLLM呼び出しの上限（省略時はmax_concurrent_generations）
+
+        Returns:
+            bool: シミュレーションが続行可能かどうか（Falseの場合は終了）
+        """
+        if not self._is_running or self._current_scene_log is None:
+            raise SceneNotLoadedError()
+
+        # 場面終了フラグのチェック
+        if self._end_scene_requested:
+            logger.info("場面終了が要求されたため、シミュレーションを終了します。")
+            self._save_scene_log()
+            self._set_running(False)
+            return False
+
+        participants = list(
+            self._current_scene_log.scene_info.participant_character_ids
+        )
+        if not participants:
+            logger.warning(
+                "参加キャラクターがいなくなりました。シミュレーションを終了します。"
+            )
+            self._save_scene_log()
+            self._set_running(False)
+            return False
+
+        self._execute_simultaneous_turns(participants, max_concurrency)
+        return True
+
+    def _execute_simultaneous_turns(
+        self, character_ids: List[str], max_concurrency: Optional[int] = None
+    ) -> None:
+        """
+        複数のキャラクターが同じ状態を見て行動するターンを実行する
+
+        全員のコンテクストを同じ短期ログのスナップショットから構築し、
+        最大max_concurrency件ずつ並行して思考を生成した後、
+        character_idsの順番で短期ログに記録します。
+
+        Args:
+            character_ids: 行動するキャラクターIDのリスト（記録順）
+            max_concurrency: 同時に行うLLM呼び出しの上限（省略時はmax_concurrent_generations）
+        """
+        logger.info(f"キャラクター {character_ids} が同時に行動します")
+        turn_started_at = datetime.datetime.now()
+        short_term_log = self._snapshot_short_term_log()
+
+        # コンテクスト構築は天啓の消費などエンジンの状態を変更するため順番に行う
+        prepared_turns = []
+        for character_id in character_ids:
+            try:
+                prepared_turns.append(self._prepare_turn(character_id, short_term_log))
+            except Exception as e:
+                logger.error(
+                    f"キャラクター '{character_id}' のターン準備中にエラーが発生しました: {str(e)}",
+                    exc_info=True,
+                )
+
+        if max_concurrency is None:
+            max_concurrency = self.max_concurrent_generations
+        workers = max(1, min(max_concurrency, len(prepared_turns)))
+        if workers > 1:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="anima-generate"
+            ) as executor:
+                # mapは入力順に結果を返すため、記録順は完了順に依存しない
+                generated_turns = list(
+                    executor.map(self._generate_turn, prepared_turns)
+                )
+        else:
+            generated_turns = [self._generate_turn(p) for p in prepared_turns]
+
+        for prepared, generated in zip(prepared_turns, generated_turns):
+            try:
+                self._commit_turn(prepared, generated, turn_started_at)
+                self._advance_turn_counters(1)
+            except Exception as e:
+                logger.error(
+                    f"キャラクター '{prepared.character_id}' のターン記録中にエラーが発生しました: {str(e)}",
+                    exc_info=True,
+                )
+
+        self._save_scene_log_realtime()
+
+    def _advance_turn_counters(self, executed_turns: int) -> None:
+        """実行したターン数をカウンターに反映する"""
+        self._turn_count += executed_turns
+        if executed_turns:
+            self._failed_speakers.clear()
+        participants_count = len(
+            self._current_scene_log.scene_info.participant_character_ids
+        )
+        self._current_turn = (
+            self._turn_count % participants_count if participants_count else 0
+        )
+        if self._current_turn == 0 and executed_turns:
+            logger.info(
+                f"全キャラクターの行動が完了しました（計 {self._turn_count} ターン）"
+            )
+
+    def _snapshot_short_term_log(self) -> List["TurnData"]:
+        """コンテクスト構築に使用する短期ログのスナップショットを取得する"""
+        turns = self._current_scene_log.turns
+        max_turns = getattr(self.context_builder, "MAX_TURNS", None)
+        if not isinstance(max_turns, int) or max_turns <= 0:
+            return list(turns)
+
+        start = max(len(turns) - max_turns, 0)
+        if self.chat_session_mode:
+            # 会話モードでは各キャラクターが前回行動してからの出来事が必要なため、
+            # 参加キャラクター全員の直近のターンが含まれるところまで遡る
+            participants = set(
+                self._current_scene_log.scene_info.participant_character_ids
+            )
+            seen: Set[str] = set()
+            index = len(turns)
+            lower_bound = max(len(turns) - self.SESSION_LOOKBACK_TURNS, 0)
+            while index > lower_bound and not participants <= seen:
+                index -= 1
+                seen.add(turns[index].character_id)
+            start = min(start, index)
+        return list(turns[start:])
+
     def start_simulation(self, max_turns: Optional[int] = None) -> None:
         """
         【非推奨】シミュレーションを開始する（自動実行）
@@ -376,47 +636,132 @@ class SimulationEngine:
 
         return status
 
-    def end_simulation(self) -> None:
+    def export_state(self, include_turns: bool = True) -> Dict[str, Any]:
+        """
+        シミュレーションの進行状態をJSONに変換できる辞書として書き出す
+
+        別のプロセスで作成したエンジンのrestore_stateに渡すと、同じ状態から
+        シミュレーションを続行できます（キャラクターの長期情報はファイルから読み込みます）。
+
+        Args:
+            include_turns: ターンの記録を"turns"として含めるか
+                （呼び出し側でターンを差分で保存する場合はFalse）
+
+        Returns:
+            進行状態を格納した辞書
+
+        Raises:
+            SceneNotLoadedError: 場面がロードされていない場合
+        """
+        if self._current_scene_log is None:
+            raise SceneNotLoadedError()
+
+        state: Dict[str, Any] = {
+            "scene_file_path": str(self.scene_file_path),
+            "scene_log": self._current_scene_log.model_dump(
+                mode="json", exclude={"turns"}
+            ),
+            "current_turn": self._current_turn,
+            "turn_count": self._turn_count,
+            "is_running": self._is_running,
+            "end_scene_requested": self._end_scene_requested,
+            "failed_speakers": sorted(self._failed_speakers),
+            "pending_revelations": {
+                character_id: list(revelations)
+                for character_id, revelations in self._pending_revelations.items()
+                if revelations
+            },
+            "previous_scene_summary": self.previous_scene_summary,
+            "simulation_id": self._simulation_id,
+            "simulation_log_directory": self._simulation_log_directory,
+            "llm_model": self.llm_adapter.model_name,
+        }
+        if include_turns:
+            state["turns"] = [
+                turn.model_dump(mode="json") for turn in self._current_scene_log.turns
+            ]
+        return state
+
+    def restore_state(
+        self, state: Dict[str, Any], turns: Optional[Sequence[Dict[str, Any]]] = None
+    ) -> None:
+        """
+        export_stateで書き出した進行状態を復元する
+
+        Args:
+            state: export_stateで書き出した辞書
+            turns: ターンの記録（省略時はstateの"turns"を使用）
+        """
+        from .data_models import SceneLogData, TurnData
+
+        turn_list = (
+            CompactTurnStore(spill_threshold=self.spill_turns_after)
+            if self.compact_turns
+            else []
+        )
+        for turn in turns if turns is not None else state.get("turns", []):
+            turn_list.append(TurnData.model_validate(turn))
+
+        scene_log = SceneLogData.model_validate({**state["scene_log"], "turns": []})
+        scene_log.turns = turn_list
+        self.scene_manager.set_current_scene_info(scene_log.scene_info)
+
+        load_errors = self.character_manager.preload_characters(
+            scene_log.scene_info.participant_character_ids
+        )
+        for character_id, error in load_errors.items():
+            if error is None:
+                continue
+            logger.error(
+                f"キャラクター '{character_id}' の読み込みに失敗しました: {str(error)}"
+            )
+
+        self._current_scene_log = scene_log
+        self._current_turn = state.get("current_turn", 0)
+        self._turn_count = state.get("turn_count", len(turn_list))
+        self._end_scene_requested = state.get("end_scene_requested", False)
+        self._failed_speakers = set(state.get("failed_speakers", []))
+        self._pending_revelations = {
+            character_id: list(revelations)
+            for character_id, revelations in state.get(
+                "pending_revelations", {}
+            ).items()
+        }
+        self.previous_scene_summary = state.get("previous_scene_summary")
+        self._simulation_id = state.get("simulation_id")
+        self._simulation_log_directory = state.get("simulation_log_directory")
+        if state.get("llm_model"):
+            self.llm_adapter.model_name = state["llm_model"]
+        self._set_running(state.get("is_running", False))
+
+        logger.info(
+            f"場面 '{scene_log.scene_info.scene_id}' の状態を復元しました（{len(turn_list)} ターン）"
+        )
+
+    def end_simulation(self, update_long_term: bool = True) -> None:
         """
         シミュレーションを明示的に終了する
 
         現在の場面ログを保存し、シミュレーション状態をリセットします。
         終了前に場面に参加している全キャラクターの長期情報も更新します。
+
+        Args:
+            update_long_term: 参加キャラクターの長期情報を更新するか
+                （キャンペーンなど、呼び出し側でまとめて更新する場合はFalse）
         """
         # シーンログが存在する場合は履歴を保存（実行状態に関係なく）
         if self._current_scene_log is not None:
             logger.info("シミュレーション終了処理を開始します...")
 
-            # 参加キャラクターの長期情報を更新
-            logger.info(
-                "シミュレーション終了に伴い、参加キャラクターの長期情報を更新します..."
-            )
-            if self._current_scene_log.scene_info:
-                # この時点での最終的な参加者リストを使用する
-                final_participants = list(
-                    self._current_scene_log.scene_info.participant_character_ids
+            if not update_long_term:
+                logger.info("長期情報の更新は呼び出し側で行うためスキップします")
+            elif self._current_scene_log.scene_info:
+                # 参加キャラクターの長期情報を更新
+                logger.info(
+                    "シミュレーション終了に伴い、参加キャラクターの長期情報を更新します..."
                 )
-                for char_id_to_update in final_participants:
-                    logger.info(
-                        f"キャラクター '{char_id_to_update}' の長期情報更新を試みます..."
-                    )
-                    try:
-                        update_result = self.update_character_long_term_info(
-                            char_id_to_update
-                        )
-                        if update_result:
-                            logger.info(
-                                f"キャラクター '{char_id_to_update}' の長期情報更新に成功しました。"
-                            )
-                        else:  # Noneが返ってきた場合など
-                            logger.warning(
-                                f"キャラクター '{char_id_to_update}' の長期情報更新は行われませんでした、または結果が不明です。"
-                            )
-                    except Exception as e:
-                        logger.error(
-                            f"キャラクター '{char_id_to_update}' の長期情報更新中に予期せぬエラーが発生しました: {str(e)}",
-                            exc_info=True,
-                        )
+                # この時点での最終的な参加者リストを使用する
+                self.update_long_term_info_batch()
             else:
                 logger.warning(
                     "場面ログが存在しないため、長期情報更新はスキップされました。"
@@ -429,40 +774,272 @@ class SimulationEngine:
             logger.warning("保存すべきシーンログが存在しません")
 
         # シミュレーション状態をリセット
-        self._is_running = False
+        self._set_running(False)
         self._end_scene_requested = True
 
         # シミュレーションログ関連の状態もリセット
         self._simulation_id = None
         self._simulation_log_directory = None
 
+        # 会話セッションは場面をまたいで使用しない
+        if self.chat_session_mode:
+            self.llm_adapter.chat_sessions.discard()
+
         logger.info("シミュレーションを手動で終了しました")
 
+    def update_long_term_info_batch(
+        self,
+        character_ids: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        複数キャラクターの長期情報をまとめて更新する
+
+        キャラクターごとのLLM呼び出しを並行して行います。
+        個々のキャラクターの更新に失敗しても残りのキャラクターの更新は継続します。
+
+        long_term_batch_sizeが指定されている場合は、最大その人数ずつ1回のLLM呼び出しに
+        まとめて更新し、提案が得られなかったキャラクターのみ個別の呼び出しで更新します。
+
+        Args:
+            character_ids: 更新対象のキャラクターID（省略時は現在の参加キャラクター全員）
+            max_workers: 同時に行う更新の上限（省略時はmax_concurrent_generations）
+
+        Returns:
+            キャラクターIDと更新提案の辞書（更新できなかったキャラクターはNone）
+
+        Raises:
+            SceneNotLoadedError: 場面がロードされていない場合
+        """
+        if self._current_scene_log is None:
+            raise SceneNotLoadedError()
+
+        if character_ids is None:
+            character_ids = list(
+                self._current_scene_log.scene_info.participant_character_ids
+            )
+        if not character_ids:
+            return {}
+
+        if max_workers is None:
+            max_workers = self.max_concurrent_generations
+
+        batched: Dict[str, Dict[str, Any]] = {}
+        if self.long_term_batch_size and len(character_ids) > 1:
+            batched = self._update_long_term_info_in_batches(character_ids, max_workers)
+
+        def update(character_id: str) -> Optional[Dict[str, Any]]:
+            if character_id in batched:
+                return batched[character_id]
+            logger.info(f"キャラクター '{character_id}' の長期情報更新を試みます...")
+            try:
+                update_result = self.update_character_long_term_info(character_id)
+            except Exception as e:
+                logger.error(
+                    f"キャラクター '{character_id}' の長期情報更新中に予期せぬエラーが発生しました: {str(e)}",
+                    exc_info=True,
+                )
+                return None
+
+            if update_result:
+                logger.info(
+                    f"キャラクター '{character_id}' の長期情報更新に成功しました。"
+                )
+            else:  # Noneが返ってきた場合など
+                logger.warning(
+                    f"キャラクター '{character_id}' の長期情報更新は行われませんでした、または結果が不明です。"
+                )
+            return update_result
+
+        updated = dict(
+            zip(character_ids, self._map_long_term(update, character_ids, max_workers))
+        )
+        if self.memory_consolidator is not None:
+            updated_ids = [
+                character_id
+                for character_id, result in updated.items()
+                if result is not None
+            ]
+            if updated_ids:
+                self._consolidation_future = self.memory_consolidator.submit(
+                    self.character_manager, updated_ids
+                )
+        return updated
+
+    @staticmethod
+    def _map_long_term(func, items: List, max_workers: int) -> List:
+        """長期情報の更新処理を最大max_workers件ずつ並行して実行する"""
+        workers = max(1, min(max_workers, len(items)))
+        if workers == 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="anima-long-term"
+        ) as executor:
+            return list(executor.map(func, items))
+
+    def _update_long_term_info_in_batches(
+        self, character_ids: List[str], max_workers: int
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        参加キャラクターの長期情報をlong_term_batch_size人ずつまとめて更新する
+
+        Returns:
+            更新できたキャラクターのIDと更新提案の辞書（失敗したグループのキャラクターは含まない）
+        """
+        participants = self._current_scene_log.scene_info.participant_character_ids
+        targets = [
+            character_id
+            for character_id in character_ids
+            if character_id in participants
+        ]
+        size = self.long_term_batch_size
+        chunks = [targets[i : i + size] for i in range(0, len(targets), size)]
+        prompt_template_path = os.path.join(
+            self.prompts_dir_path, "long_term_update_batch.txt"
+        )
+
+        def update_chunk(chunk: List[str]) -> Dict[str, Dict[str, Any]]:
+            if len(chunk) < 2:
+                return {}
+            try:
+                return self.information_updater.trigger_batch_long_term_update(
+                    chunk,
+                    self.llm_adapter,
+                    self._current_scene_log,
+                    self.context_builder,
+                    prompt_template_path,
+                )
+            except Exception as e:
+                logger.warning(
+                    f"長期情報の一括更新に失敗したため、キャラクターごとに更新します: {str(e)}"
+                )
+                return {}
+
+        batched: Dict[str, Dict[str, Any]] = {}
+        for result in self._map_long_term(update_chunk, chunks, max_workers):
+            batched.update(result)
+
+        for character_id, update_proposal in batched.items():
+            self._publish_event(
+                SimulationEventType.LTM_UPDATED,
+                {"character_id": character_id, "update_proposal": update_proposal},
+            )
+        fallback = [
+            character_id
+            for character_id in character_ids
+            if character_id not in batched
+        ]
+        if fallback:
+            logger.info(
+                f"一括更新で更新できなかったキャラクターを個別に更新します: {', '.join(fallback)}"
+            )
+        return batched
+
+    def wait_for_memory_consolidation(
+        self, timeout: Optional[float] = None
+    ) -> Dict[str, Optional["ConsolidationResult"]]:
+        """
+        バックグラウンドで実行中の長期情報の整理が終わるまで待つ
+
+        次の場面で長期情報を読み込む前に呼び出すことで、整理後の長期情報を使用できます。
+
+        Args:
+            timeout: 待つ時間の上限（秒）。Noneの場合は終わるまで待つ
+
+        Returns:
+            キャラクターIDと整理結果の辞書（整理を行っていない場合は空の辞書）
+
+        Raises:
+            concurrent.futures.TimeoutError: timeout以内に終わらなかった場合
+        """
+        future = self._consolidation_future
+        if future is None:
+            return {}
+        results = future.result(timeout=timeout)
+        self._consolidation_future = None
+        return results
+
+    def get_current_scene_log(self) -> Optional["SceneLogData"]:
+        """
+        現在の場面ログを取得する
+
+        Returns:
+            現在の場面ログ、場面がロードされていない場合はNone
+        """
+        return self._current_scene_log
+
+    def attach_scene_log(self, scene_log: "SceneLogData") -> None:
+        """
+        保存済みの場面ログを現在の場面ログとして設定する
+
+        場面を実行し直さずに、保存済みのログを基に長期情報を更新する場合などに使用します。
+        シミュレーションの実行状態は変更しません。
+
+        Args:
+            scene_log: 設定する場面ログ
+        """
+        self._current_scene_log = scene_log
+
+    def get_scene_log_file_path(self) -> Optional[str]:
+        """
+        現在の場面ログの保存先のパスを取得する
+
+        Returns:
+            場面ログファイルのパス、シミュレーションが開始されていない場合はNone
+        """
+        if self._current_scene_log is None or self._simulation_log_directory is None:
+            return None
+        scene_id = self._current_scene_log.scene_info.scene_id
+        return os.path.join(self._simulation_log_directory, f"scene_{scene_id}.json")
+
     def _determine_next_character(self) -> Optional[str]:
         """
         次に行動するキャラクターを決定する
 
-        現在のターンインデックスに基づいて、次に行動するキャラクターのIDを返します。
-        単純なラウンドロビン方式で、参加キャラクターが順番に行動します。
+        ターンスケジューラが選んだキャラクターのうち、最初のキャラクターのIDを返します。
 
         Returns:
             次に行動するキャラクターのID、決定できない場合はNone
         """
+        speakers = self._determine_next_speakers()
+        return speakers[0] if speakers else None
+
+    def _determine_next_speakers(self) -> List[str]:
+        """
+        次に行動するキャラクターをターンスケジューラに問い合わせる
+
+        Returns:
+            次に行動するキャラクターIDのリスト、決定できない場合は空のリスト
+        """
         if self._current_scene_log is None:
             logger.warning("場面ログが初期化されていません")
-            return None
+            return []
 
         participants = self._current_scene_log.scene_info.participant_character_ids
 
         if not participants:
             logger.warning("参加キャラクターが指定されていません")
-            return None
+            return []
 
-        if self._current_turn >= len(participants):
-            logger.warning("全キャラクターが行動済みです")
-            return None
+        # 直前にターンを記録できなかったキャラクターは飛ばす（全員の場合は飛ばさない）
+        candidates = [c for c in participants if c not in self._failed_speakers]
+        if not candidates:
+            candidates = list(participants)
 
-        return participants[self._current_turn]
+        speakers = self.turn_scheduler.next_speakers(
+            candidates,
+            self._current_scene_log.turns,
+            self._get_character_name,
+        )
+        return [speaker for speaker in speakers if speaker in candidates]
+
+    def _get_character_name(self, character_id: str) -> str:
+        """キャラクター名を取得する（取得できない場合はIDを返す）"""
+        try:
+            name = self.character_manager.get_immutable_context(character_id).name
+        except Exception:
+            return character_id
+        return name if isinstance(name, str) else character_id
 
     def next_turn(self, character_id: str) -> None:
         """
@@ -483,167 +1060,221 @@ class SimulationEngine:
 
         logger.info(f"キャラクター '{character_id}' のターンを開始します")
 
-        # デバッグ: ターン実行前の状態
-        turns_before = len(self._current_scene_log.turns)
-        logger.info(f"DEBUG: ターン実行前のturns数: {turns_before}")
+        # ターン開始時刻（ターンのメタデータとして記録）
+        turn_started_at = datetime.datetime.now()
+
+        logger.debug("ターン実行前のturns数: %d", len(self._current_scene_log.turns))
 
         try:
-            # キャラクター情報の取得
-            character_name = character_id  # デフォルト値（情報取得に失敗した場合）
-            try:
-                char_info = self.character_manager.get_immutable_context(character_id)
-                character_name = char_info.name
-                logger.info(f"DEBUG: キャラクター情報取得成功: {character_name}")
-            except Exception as e:
-                logger.warning(f"キャラクター情報の取得に失敗しました: {str(e)}")
+            prepared = self._prepare_turn(character_id, self._current_scene_log.turns)
+            generated = self._generate_turn(prepared)
+            self._commit_turn(prepared, generated, turn_started_at)
 
-            # 短期ログの取得（現在の場面のターンリスト）
-            current_scene_short_term_log = self._current_scene_log.turns
-            logger.info(
-                f"DEBUG: 現在のシーン短期ログ数: {len(current_scene_short_term_log)}"
-            )
+            # ターン実行後に即座にログを保存
+            self._save_scene_log_realtime()
 
-            # キャラクターのコンテクストを構築
-            # 天啓情報がある場合は追加情報として渡す
-            previous_scene_summary = None
-            if (
-                character_id in self._pending_revelations
-                and self._pending_revelations[character_id]
-            ):
-                # 天啓情報を結合して一つの文字列にする
-                revelations = self._pending_revelations[character_id]
-                revelation_text = "\n".join([f"- {rev}" for rev in revelations])
-                previous_scene_summary = (
-                    f"【あなたは次の天啓を受けました】\n{revelation_text}"
-                )
+        except Exception as e:
+            error_msg = f"ターン実行中にエラーが発生しました: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            # SimulationEngineErrorとしてラップせず、そのままログに出力して継続する
+            # これにより、start_simulationのループ内でキャッチされて処理が継続する
+            pass  # ターン全体のエラーがあっても次のキャラクターのターンに進む
 
-                # 使用した天啓情報をクリア
-                self._pending_revelations[character_id] = []
+    def _prepare_turn(
+        self, character_id: str, short_term_log: Sequence["TurnData"]
+    ) -> "_PreparedTurn":
+        """
+        キャラクターのターンのためのコンテクストを構築する
 
-                logger.info(f"キャラクター '{character_id}' に天啓情報を反映します")
+        Args:
+            character_id: 行動するキャラクターのID
+            short_term_log: コンテクストに含める短期ログ
 
-            # コンテクスト構築
-            logger.info(f"DEBUG: コンテクスト構築開始")
-            context_dict = self.context_builder.build_context_for_character(
-                character_id, current_scene_short_term_log, previous_scene_summary
-            )
-            logger.info(f"DEBUG: コンテクスト構築完了")
+        Returns:
+            思考生成に必要な情報
+        """
+        # キャラクター情報の取得
+        character_name = character_id  # デフォルト値（情報取得に失敗した場合）
+        try:
+            char_info = self.character_manager.get_immutable_context(character_id)
+            character_name = char_info.name
+            logger.debug("キャラクター情報取得成功: %s", character_name)
+        except Exception as e:
+            logger.warning(f"キャラクター情報の取得に失敗しました: {str(e)}")
 
-            # プロンプトテンプレートのパスを設定
-            prompt_file_path = os.path.join(self.prompts_dir_path, "think_generate.txt")
+        logger.debug("現在のシーン短期ログ数: %d", len(short_term_log))
 
-            # プロンプトテンプレートを読み込んで値を埋め込み、コンソールに出力
-            try:
-                with open(prompt_file_path, "r", encoding="utf-8") as f:
-                    prompt_template = f.read()
+        # キャラクターのコンテクストを構築
+        # 直前の場面のサマリーと天啓情報がある場合は追加情報として渡す
+        summary_parts = []
+        if self.previous_scene_summary:
+            summary_parts.append(self.previous_scene_summary)
+        if (
+            character_id in self._pending_revelations
+            and self._pending_revelations[character_id]
+        ):
+            # 天啓情報を結合して一つの文字列にする
+            revelations = self._pending_revelations[character_id]
+            revelation_text = "\n".join([f"- {rev}" for rev in revelations])
+            summary_parts.append(f"【あなたは次の天啓を受けました】\n{revelation_text}")
 
-                # プロンプトテンプレートに値を埋め込み
-                final_prompt = prompt_template
-                for key, value in context_dict.items():
-                    final_prompt = final_prompt.replace(f"{{{{{key}}}}}", str(value))
+            # 使用した天啓情報をクリア
+            self._pending_revelations[character_id] = []
 
-                # キャラクター名も埋め込み
-                final_prompt = final_prompt.replace(
-                    "{{character_name}}", character_name
-                )
+            logger.info(f"キャラクター '{character_id}' に天啓情報を反映します")
 
-                # コンソールにプロンプトを出力
-                print("\n" + "=" * 80)
-                print(f"🤖 PROMPT FOR {character_name} (ID: {character_id})")
-                print("=" * 80)
-                print(final_prompt)
-                print("=" * 80 + "\n")
+        previous_scene_summary = "\n\n".join(summary_parts) or None
 
-            except Exception as e:
-                logger.warning(f"プロンプト表示エラー: {str(e)}")
+        # コンテクスト構築
+        if self.chat_session_mode:
+            context_dict = self.context_builder.build_context_for_character(
+                character_id,
+                short_term_log,
+                previous_scene_summary,
+                include_new_events=True,
+            )
+        else:
+            context_dict = self.context_builder.build_context_for_character(
+                character_id, short_term_log, previous_scene_summary
+            )
 
-            # LLM思考生成
-            logger.info(f"DEBUG: LLM思考生成開始")
-            try:
-                # LLMAdapterを使って思考を生成
-                from .llm_adapter import (
-                    LLMGenerationError,
-                    InvalidLLMResponseError,
-                    PromptTemplateNotFoundError,
-                )
+        # プロンプトテンプレートのパスを設定
+        # （値を埋め込んだプロンプトはLLMAdapterがプロンプトダンプ用のロガーに出力する）
+        prompt_file_path = os.path.join(self.prompts_dir_path, "think_generate.txt")
 
-                llm_response = self.llm_adapter.generate_character_thought(
-                    context_dict, prompt_file_path
-                )
+        return _PreparedTurn(
+            character_id, character_name, context_dict, prompt_file_path
+        )
 
-                think_content = llm_response.get(
-                    "think", "（思考の生成に失敗しました）"
-                )
-                act_content = llm_response.get(
-                    "act", ""
-                )  # エラー時やキーがない場合は空文字
-                talk_content = llm_response.get("talk", "")  # 同上
+    def _generate_turn(self, prepared: "_PreparedTurn") -> "_GeneratedTurn":
+        """
+        LLMを使ってキャラクターの思考・行動・発言を生成する
 
-                logger.info(f"DEBUG: LLM思考生成完了")
+        生成に失敗した場合はエラー内容を示す思考を返します。
 
-            except (
+        Args:
+            prepared: _prepare_turnで構築した情報
+
+        Returns:
+            生成された思考・行動・発言とLLM呼び出し情報
+        """
+        character_id = prepared.character_id
+        character_name = prepared.character_name
+
+        # LLM思考生成
+        generation_info = None
+        try:
+            # LLMAdapterを使って思考を生成
+            from .llm_adapter import (
                 LLMGenerationError,
                 InvalidLLMResponseError,
                 PromptTemplateNotFoundError,
-            ) as e:
-                logger.error(
-                    f"キャラクター '{character_name}' ({character_id}) の思考生成中にエラーが発生しました: {str(e)}"
-                )
-                # エラーが発生した場合のフォールバック動作
-                think_content = (
-                    f"（エラーにより思考できませんでした: {type(e).__name__}）"
+            )
+
+            if self.chat_session_mode:
+                llm_response = self.llm_adapter.generate_character_thought_in_session(
+                    character_id,
+                    prepared.context_dict,
+                    prepared.prompt_file_path,
+                    os.path.join(self.prompts_dir_path, "think_session_turn.txt"),
                 )
-                act_content = ""  # または "（エラーにより行動できません）" など
-                talk_content = ""  # または "（エラーにより発言できません）" など
-            except Exception as e:  # その他の予期せぬLLMAdapter関連エラー
-                logger.error(
-                    f"キャラクター '{character_name}' ({character_id}) の思考生成中に予期せぬLLMAdapterエラー: {str(e)}"
+            else:
+                llm_response = self.llm_adapter.generate_character_thought(
+                    prepared.context_dict, prepared.prompt_file_path
                 )
-                think_content = f"（予期せぬエラーにより思考停止: {type(e).__name__}）"
-                act_content = ""
-                talk_content = ""
 
-            # 短期ログへの記録
-            logger.info(f"DEBUG: 短期ログ記録開始")
-            self.information_updater.record_turn_to_short_term_log(
-                self._current_scene_log,
-                character_id,
-                character_name,
-                think_content,
-                act_content,
-                talk_content,
+            think_content = llm_response.get("think", "（思考の生成に失敗しました）")
+            act_content = llm_response.get(
+                "act", ""
+            )  # エラー時やキーがない場合は空文字
+            talk_content = llm_response.get("talk", "")  # 同上
+
+            generation_info = self._get_last_generation_info()
+
+        except (
+            LLMGenerationError,
+            InvalidLLMResponseError,
+            PromptTemplateNotFoundError,
+        ) as e:
+            logger.error(
+                f"キャラクター '{character_name}' ({character_id}) の思考生成中にエラーが発生しました: {str(e)}"
             )
-            logger.info(f"DEBUG: 短期ログ記録完了")
-
-            # デバッグ: ターン実行後の状態
-            turns_after = len(self._current_scene_log.turns)
-            logger.info(f"DEBUG: ターン実行後のturns数: {turns_after}")
-
-            # 現在のターンの情報をログに出力
-            turn_number = len(self._current_scene_log.turns)
-            logger.info(f"ターン {turn_number}: {character_name}")
-            logger.info(f"  思考: {think_content}")
-            if act_content:
-                logger.info(f"  行動: {act_content}")
-            if talk_content:
-                logger.info(f"  発言: 「{talk_content}」")  # 発言を括弧で囲む
-            if (
-                not act_content and not talk_content and "エラー" not in think_content
-            ):  # エラーでない場合で行動も発言もない場合
-                logger.info(f"  (何も行動せず、何も話さなかった)")
+            # エラーが発生した場合のフォールバック動作
+            think_content = f"（エラーにより思考できませんでした: {type(e).__name__}）"
+            act_content = ""  # または "（エラーにより行動できません）" など
+            talk_content = ""  # または "（エラーにより発言できません）" など
+            # 応答の解析に失敗した場合でもLLM呼び出しの計測情報は残す
+            generation_info = self._get_last_generation_info()
+        except Exception as e:  # その他の予期せぬLLMAdapter関連エラー
+            logger.error(
+                f"キャラクター '{character_name}' ({character_id}) の思考生成中に予期せぬLLMAdapterエラー: {str(e)}"
+            )
+            think_content = f"（予期せぬエラーにより思考停止: {type(e).__name__}）"
+            act_content = ""
+            talk_content = ""
 
-            # ターン実行後に即座にログを保存
-            logger.info(f"DEBUG: ログ保存開始")
-            self._save_scene_log_realtime()
-            logger.info(f"DEBUG: ログ保存完了")
+        return _GeneratedTurn(think_content, act_content, talk_content, generation_info)
 
-        except Exception as e:
-            error_msg = f"ターン実行中にエラーが発生しました: {str(e)}"
-            logger.error(error_msg)
-            logger.error(f"DEBUG: next_turnメソッドでエラー発生: {e}", exc_info=True)
-            # SimulationEngineErrorとしてラップせず、そのままログに出力して継続する
-            # これにより、start_simulationのループ内でキャッチされて処理が継続する
-            pass  # ターン全体のエラーがあっても次のキャラクターのターンに進む
+    def _commit_turn(
+        self,
+        prepared: "_PreparedTurn",
+        generated: "_GeneratedTurn",
+        turn_started_at: datetime.datetime,
+    ) -> None:
+        """
+        生成したターンを短期ログに記録し、購読者に通知する
+
+        Args:
+            prepared: _prepare_turnで構築した情報
+            generated: _generate_turnで生成した結果
+            turn_started_at: ターンの開始時刻
+        """
+        character_name = prepared.character_name
+        think_content, act_content, talk_content, generation_info = generated
+        turns_before = len(self._current_scene_log.turns)
+
+        # 短期ログへの記録
+        self.information_updater.record_turn_to_short_term_log(
+            self._current_scene_log,
+            prepared.character_id,
+            character_name,
+            think_content,
+            act_content,
+            talk_content,
+            turn_started_at=turn_started_at,
+            generation_info=generation_info,
+        )
+
+        turns_after = len(self._current_scene_log.turns)
+
+        # 記録されたターンを購読者に通知
+        if turns_after > turns_before:
+            self._publish_event(
+                SimulationEventType.TURN_RECORDED,
+                {"turn": self._current_scene_log.turns[-1].model_dump()},
+            )
+
+        # 現在のターンの情報をログに出力（内容はverbose以上の詳細度でのみ出力する）
+        logger.info("ターン %d: %s", turns_after, character_name)
+        logger.debug("  思考: %s", think_content)
+        if act_content:
+            logger.debug("  行動: %s", act_content)
+        if talk_content:
+            logger.debug("  発言: 「%s」", talk_content)  # 発言を括弧で囲む
+        if (
+            not act_content and not talk_content and "エラー" not in think_content
+        ):  # エラーでない場合で行動も発言もない場合
+            logger.debug("  (何も行動せず、何も話さなかった)")
+
+    def _get_last_generation_info(self) -> Optional[Dict[str, Any]]:
+        """
+        LLMAdapterから直近のLLM呼び出し情報を取得する
+
+        Returns:
+            LLM呼び出し情報の辞書、取得できない場合はNone
+        """
+        generation_info = getattr(self.llm_adapter, "last_generation_info", None)
+        return generation_info if isinstance(generation_info, dict) else None
 
     def process_user_intervention(self, intervention_data: "InterventionData") -> None:
         """
@@ -798,6 +1429,12 @@ class SimulationEngine:
             # 元の例外を保持して再発生させず、警告ログとして出力
             # これにより、介入処理が失敗してもシミュレーションは継続可能
 
+        # 適用された介入を購読者に通知
+        self._publish_event(
+            SimulationEventType.INTERVENTION_APPLIED,
+            {"intervention": intervention_data.model_dump()},
+        )
+
         # 介入処理後に即座にログを保存
         self._save_scene_log_realtime()
 
@@ -909,6 +1546,10 @@ class SimulationEngine:
             )
 
             logger.info(f"キャラクター '{character_id}' の長期情報を更新しました")
+            self._publish_event(
+                SimulationEventType.LTM_UPDATED,
+                {"character_id": character_id, "update_proposal": update_proposal},
+            )
             return update_proposal
 
         except Exception as e:
@@ -1172,6 +1813,42 @@ class SimulationEngine:
             logger.error(f"介入コマンド処理中にエラーが発生しました: {str(e)}")
             return False, f"介入コマンド処理中にエラーが発生しました: {str(e)}"
 
+    def _set_running(self, is_running: bool) -> None:
+        """
+        実行状態を更新し、変化があった場合はイベントを発行する
+
+        Args:
+            is_running: 新しい実行状態
+        """
+        if self._is_running == is_running:
+            return
+
+        self._is_running = is_running
+        self._publish_event(
+            SimulationEventType.STATUS_CHANGED,
+            {"source": "engine", "status": "running" if is_running else "ended"},
+        )
+
+    def _publish_event(
+        self, event_type: SimulationEventType, payload: Dict[str, Any]
+    ) -> None:
+        """
+        イベントバスにイベントを発行する
+
+        シミュレーションIDを付加して発行します。通知に失敗しても
+        シミュレーションは継続します。
+
+        Args:
+            event_type: イベントの種類
+            payload: イベント固有のデータ
+        """
+        try:
+            self.event_bus.publish(
+                event_type, {"simulation_id": self._simulation_id, **payload}
+            )
+        except Exception as e:
+            logger.error(f"イベントの発行中にエラーが発生しました: {str(e)}")
+
     def _initialize_simulation_logging(self) -> None:
         """
         シミュレーションログの初期化
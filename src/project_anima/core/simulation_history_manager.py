@@ -7,12 +7,15 @@ LINEのトーク画面のような感覚でシミュレーションセッショ
 
 import os
 import json
+import logging
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional, Dict
 
 from ..core.data_models import SimulationHistoryEntry
 
+logger = logging.getLogger(__name__)
+
 
 class SimulationHistoryManager:
     """シミュレーション履歴管理クラス
@@ -56,7 +59,7 @@ class SimulationHistoryManager:
             return True
 
         except Exception as e:
-            print(f"シミュレーション履歴保存エラー: {e}")
+            logger.error(f"シミュレーション履歴保存エラー: {e}")
             return False
 
     def load_all_histories(self) -> List[SimulationHistoryEntry]:
@@ -71,7 +74,7 @@ class SimulationHistoryManager:
             return [SimulationHistoryEntry(**item) for item in data]
 
         except Exception as e:
-            print(f"シミュレーション履歴読み込みエラー: {e}")
+            logger.error(f"シミュレーション履歴読み込みエラー: {e}")
             return []
 
     def get_active_simulation(self) -> Optional[SimulationHistoryEntry]:
@@ -111,7 +114,7 @@ class SimulationHistoryManager:
             self._save_histories(histories)
             return True
         except Exception as e:
-            print(f"シミュレーション履歴削除エラー: {e}")
+            logger.error(f"シミュレーション履歴削除エラー: {e}")
             return False
 
     def get_simulation_statistics(self) -> Dict:
@@ -0,0 +1,321 @@
+"""
+LLMの構造化出力（JSON）を扱うモジュール
+
+このモジュールは、LLMAdapterが使用する以下の機能を提供します。
+
+- 思考生成・長期情報更新（複数キャラクターの一括更新を含む）の応答形式を表すJSONスキーマ
+  （構造化出力に対応したプロバイダーにはこのスキーマを渡して形式を強制する）
+- コードブロックや前後の説明文、末尾のカンマ、コメント、途中で途切れた応答などを
+  許容してJSONオブジェクトを取り出すストリーミング抽出器
+- モデルごとの不正な応答の発生率を集計する統計
+"""
+
+import json
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+# 思考生成の応答形式
+CHARACTER_THOUGHT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "think": {"type": "string", "description": "キャラクターの内心の思考"},
+        "act": {
+            "type": "string",
+            "description": "キャラクターの行動（なければ空文字）",
+        },
+        "talk": {
+            "type": "string",
+            "description": "キャラクターの発言（なければ空文字）",
+        },
+    },
+    "required": ["think", "act", "talk"],
+}
+
+# 長期情報更新の応答形式
+LONG_TERM_UPDATE_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "new_experiences": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "event": {"type": "string"},
+                    "importance": {"type": "integer", "description": "1から10の整数"},
+                },
+                "required": ["event", "importance"],
+            },
+        },
+        "updated_goals": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "goal": {"type": "string"},
+                    "importance": {"type": "integer", "description": "1から10の整数"},
+                },
+                "required": ["goal", "importance"],
+            },
+        },
+        "new_memories": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "memory": {"type": "string"},
+                    "scene_id_of_memory": {"type": "string"},
+                    "related_character_ids": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                    },
+                },
+                "required": ["memory", "scene_id_of_memory", "related_character_ids"],
+            },
+        },
+    },
+    "required": ["new_experiences", "updated_goals", "new_memories"],
+}
+
+# 複数キャラクターの長期情報をまとめて更新する場合の応答形式
+# （キャラクターごとの更新提案を、character_idを付けたリストで返す）
+LONG_TERM_UPDATE_BATCH_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "updates": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "character_id": {"type": "string"},
+                    **LONG_TERM_UPDATE_SCHEMA["properties"],
+                },
+                "required": ["character_id", *LONG_TERM_UPDATE_SCHEMA["required"]],
+            },
+        },
+    },
+    "required": ["updates"],
+}
+
+_CONTROL_CHARS = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\x9F]")
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+
+
+class StreamingJsonExtractor:
+    """
+    テキストの断片を順に受け取り、最上位のJSONオブジェクトを取り出す抽出器
+
+    オブジェクトの外側にある文字（コードブロックのマーカーや説明文）は読み飛ばします。
+    文字列リテラル内の括弧やエスケープを考慮して対応する閉じ括弧を判定するため、
+    ストリーミング応答の断片をそのまま渡すことができます。
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._closers: List[str] = []
+
+    def feed(self, chunk: str) -> List[str]:
+        """
+        テキストの断片を追加する
+
+        Args:
+            chunk: 応答テキストの断片
+
+        Returns:
+            この断片で完結したJSONオブジェクトの文字列のリスト
+        """
+        completed = []
+        for char in chunk:
+            if self._depth == 0:
+                if char == "{":
+                    self._buffer = [char]
+                    self._depth = 1
+                    self._closers = ["}"]
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                self._closers.append("}" if char == "{" else "]")
+            elif char in "}]":
+                self._depth -= 1
+                if self._closers:
+                    self._closers.pop()
+                if self._depth == 0:
+                    completed.append("".join(self._buffer))
+                    self._buffer = []
+        return completed
+
+    def finish(self) -> Optional[str]:
+        """
+        途中で途切れたオブジェクトを閉じて返す
+
+        Returns:
+            閉じ括弧を補ったJSONオブジェクトの文字列（途中のオブジェクトがない場合はNone）
+        """
+        if self._depth == 0:
+            return None
+
+        text = "".join(self._buffer)
+        if self._in_string:
+            if self._escaped:
+                text = text[:-1]
+            text += '"'
+        # 値の途中で途切れた末尾のカンマやコロンを除く
+        text = text.rstrip().rstrip(",:")
+        text += "".join(reversed(self._closers))
+
+        self._buffer = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._closers = []
+        return text
+
+
+def _strip_comments(text: str) -> str:
+    """文字列リテラルの外側にある // コメントを除去する"""
+    result = []
+    in_string = False
+    escaped = False
+    index = 0
+    while index < len(text):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "/" and text.startswith("//", index):
+            newline = text.find("\n", index)
+            index = len(text) if newline < 0 else newline
+            continue
+        result.append(char)
+        index += 1
+    return "".join(result)
+
+
+def _loads_tolerant(candidate: str) -> Optional[Dict[str, Any]]:
+    """JSONとして読み込む（失敗した場合はよくある崩れを補正して再試行する）"""
+    candidate = _CONTROL_CHARS.sub("", candidate)
+    for text in (candidate, _TRAILING_COMMA.sub(r"\1", _strip_comments(candidate))):
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(value, dict):
+            return value
+    return None
+
+
+def extract_json_object(text_or_chunks: Any) -> Dict[str, Any]:
+    """
+    LLMの応答からJSONオブジェクトを取り出す
+
+    応答全体がJSONでない場合でも、最初に読み込めたオブジェクトを返します。
+    途中で途切れた応答は閉じ括弧を補って読み込みを試みます。
+
+    Args:
+        text_or_chunks: 応答テキスト、またはテキストの断片のイテラブル
+
+    Returns:
+        取り出したJSONオブジェクト
+
+    Raises:
+        ValueError: JSONオブジェクトを取り出せなかった場合
+    """
+    chunks: Iterable[str] = (
+        [text_or_chunks] if isinstance(text_or_chunks, str) else text_or_chunks
+    )
+    extractor = StreamingJsonExtractor()
+    for chunk in chunks:
+        for candidate in extractor.feed(chunk):
+            value = _loads_tolerant(candidate)
+            if value is not None:
+                return value
+
+    truncated = extractor.finish()
+    if truncated is not None:
+        value = _loads_tolerant(truncated)
+        if value is not None:
+            return value
+
+    raise ValueError("応答からJSONオブジェクトを取り出せませんでした")
+
+
+class ResponseStats:
+    """
+    モデルごとにLLM応答の検証結果を集計するクラス
+
+    1回の要求（修復のための再試行を含む）につき1件として、
+    最初の応答で成功した件数、再試行で修復できた件数、最終的に不正だった件数を記録します。
+    """
+
+    OUTCOMES = ("valid", "repaired", "invalid")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def record(self, model_name: str, outcome: str, structured: bool = False) -> None:
+        """
+        1件の要求の結果を記録する
+
+        Args:
+            model_name: 使用したモデル名
+            outcome: "valid"、"repaired"、"invalid" のいずれか
+            structured: 構造化出力（スキーマ指定）を使用したか
+        """
+        if outcome not in self.OUTCOMES:
+            raise ValueError(f"未知の結果です: {outcome}")
+
+        with self._lock:
+            counts = self._counts.setdefault(
+                model_name,
+                {"requests": 0, "structured": 0, **{o: 0 for o in self.OUTCOMES}},
+            )
+            counts["requests"] += 1
+            counts[outcome] += 1
+            if structured:
+                counts["structured"] += 1
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """モデルごとの集計結果と不正応答率を辞書形式で返す"""
+        with self._lock:
+            snapshot = {model: dict(counts) for model, counts in self._counts.items()}
+
+        for counts in snapshot.values():
+            requests = counts["requests"]
+            first_try_invalid = counts["repaired"] + counts["invalid"]
+            counts["first_try_invalid_rate"] = (
+                first_try_invalid / requests if requests else 0.0
+            )
+            counts["invalid_rate"] = counts["invalid"] / requests if requests else 0.0
+        return snapshot
+
+    def reset(self) -> None:
+        """集計結果を消去する"""
+        with self._lock:
+            self._counts.clear()
+
+
+# プロセス全体で共有する集計（LLMAdapterのインスタンスをまたいでモデルごとに集計する）
+response_stats = ResponseStats()
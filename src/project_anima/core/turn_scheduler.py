@@ -0,0 +1,243 @@
+"""
+ターンの行動順を決定するスケジューラを提供するモジュール
+
+このモジュールは、SimulationEngineが次に行動するキャラクターを決定するための
+TurnSchedulerと、その実装（ラウンドロビン、重み付き、指名、同時行動）を提供します。
+
+スケジューラは内部にターン位置を持たず、参加キャラクターのリストと記録済みのターンから
+次の行動者を導出するため、途中で参加者が追加・除外されても行動順が崩れません。
+"""
+
+import random
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence
+
+# 循環参照を避けるための型チェック時のみのインポート
+if TYPE_CHECKING:
+    from .data_models import TurnData
+
+# キャラクターIDから表示名を取得する関数
+CharacterNameResolver = Callable[[str], str]
+
+
+class TurnScheduler:
+    """
+    次に行動するキャラクターを決定するスケジューラの基底クラス
+
+    next_speakersが1人を返した場合は通常のターンとして、複数人を返した場合は
+    同じ状態を見た全員が同時に行動するラウンドとして実行されます。
+    """
+
+    name = "base"
+
+    def next_speakers(
+        self,
+        participants: Sequence[str],
+        turns: Sequence["TurnData"],
+        get_character_name: Optional[CharacterNameResolver] = None,
+    ) -> List[str]:
+        """
+        次に行動するキャラクターを決定する
+
+        Args:
+            participants: 現在の参加キャラクターIDのリスト
+            turns: 現在の場面で記録済みのターン
+            get_character_name: キャラクターIDから表示名を取得する関数
+
+        Returns:
+            行動するキャラクターIDのリスト（決定できない場合は空のリスト）
+        """
+        raise NotImplementedError
+
+
+class RoundRobinScheduler(TurnScheduler):
+    """
+    参加キャラクターが順番に1人ずつ行動するスケジューラ
+
+    直近に行動したキャラクターのうち、現在も参加しているキャラクターの次の
+    キャラクターを選ぶため、参加者の追加・除外があっても順番が維持されます。
+    """
+
+    name = "round_robin"
+
+    def next_speakers(
+        self,
+        participants: Sequence[str],
+        turns: Sequence["TurnData"],
+        get_character_name: Optional[CharacterNameResolver] = None,
+    ) -> List[str]:
+        if not participants:
+            return []
+
+        for index in range(len(turns) - 1, -1, -1):
+            character_id = turns[index].character_id
+            if character_id in participants:
+                position = participants.index(character_id)
+                return [participants[(position + 1) % len(participants)]]
+
+        return [participants[0]]
+
+
+class WeightedScheduler(TurnScheduler):
+    """
+    キャラクターごとの重みに従って確率的に次の行動者を選ぶスケジューラ
+
+    seedを指定した場合は記録済みのターン数と組み合わせて乱数を初期化するため、
+    同じログからは常に同じ行動者が選ばれます（再開しても結果が変わりません）。
+    """
+
+    name = "weighted"
+
+    def __init__(
+        self,
+        weights: Optional[Dict[str, float]] = None,
+        default_weight: float = 1.0,
+        seed: Optional[int] = None,
+        avoid_repeat: bool = True,
+    ):
+        """
+        WeightedSchedulerを初期化する
+
+        Args:
+            weights: キャラクターIDと重みの辞書
+            default_weight: weightsに含まれないキャラクターの重み
+            seed: 乱数のシード（Noneの場合は毎回異なる結果になる）
+            avoid_repeat: 同じキャラクターが連続して行動しないようにするか
+        """
+        self.weights = dict(weights or {})
+        self.default_weight = default_weight
+        self.seed = seed
+        self.avoid_repeat = avoid_repeat
+        self._random = random.Random()
+
+    def next_speakers(
+        self,
+        participants: Sequence[str],
+        turns: Sequence["TurnData"],
+        get_character_name: Optional[CharacterNameResolver] = None,
+    ) -> List[str]:
+        candidates = list(participants)
+        if self.avoid_repeat and len(candidates) > 1 and turns:
+            last_speaker = turns[-1].character_id
+            candidates = [c for c in candidates if c != last_speaker]
+
+        weights = [
+            max(self.weights.get(c, self.default_weight), 0.0) for c in candidates
+        ]
+        if not candidates or sum(weights) <= 0:
+            return []
+
+        rng = (
+            random.Random(f"{self.seed}:{len(turns)}")
+            if self.seed is not None
+            else self._random
+        )
+        return rng.choices(candidates, weights=weights, k=1)
+
+
+class AddressedSpeakerScheduler(TurnScheduler):
+    """
+    直前の発言で呼びかけられたキャラクターを次の行動者にするスケジューラ
+
+    直前のターンの発言に他の参加キャラクターの名前（またはID）が含まれていれば、
+    最初に登場したキャラクターを選びます。該当者がいない場合はfallbackに委ねます。
+    """
+
+    name = "addressed"
+
+    def __init__(self, fallback: Optional[TurnScheduler] = None):
+        """
+        AddressedSpeakerSchedulerを初期化する
+
+        Args:
+            fallback: 呼びかけが見つからない場合に使用するスケジューラ（省略時はラウンドロビン）
+        """
+        self.fallback = fallback if fallback is not None else RoundRobinScheduler()
+
+    def next_speakers(
+        self,
+        participants: Sequence[str],
+        turns: Sequence["TurnData"],
+        get_character_name: Optional[CharacterNameResolver] = None,
+    ) -> List[str]:
+        if turns and participants:
+            last_turn = turns[-1]
+            talk = last_turn.talk or ""
+            best_position = None
+            addressed = None
+            for character_id in participants:
+                if character_id == last_turn.character_id:
+                    continue
+                for label in self._labels(character_id, get_character_name):
+                    position = talk.find(label)
+                    if position >= 0 and (
+                        best_position is None or position < best_position
+                    ):
+                        best_position = position
+                        addressed = character_id
+            if addressed is not None:
+                return [addressed]
+
+        return self.fallback.next_speakers(participants, turns, get_character_name)
+
+    @staticmethod
+    def _labels(
+        character_id: str, get_character_name: Optional[CharacterNameResolver]
+    ) -> List[str]:
+        """発言中で検索するキャラクターの呼び名を取得する"""
+        labels = [character_id]
+        if get_character_name is not None:
+            name = get_character_name(character_id)
+            if name and name != character_id:
+                labels.insert(0, name)
+        return labels
+
+
+class SimultaneousScheduler(TurnScheduler):
+    """
+    全ての参加キャラクターが同じ状態を見て同時に行動するスケジューラ
+
+    各ラウンドの結果は参加キャラクターの並び順で記録されます。
+    """
+
+    name = "simultaneous"
+
+    def next_speakers(
+        self,
+        participants: Sequence[str],
+        turns: Sequence["TurnData"],
+        get_character_name: Optional[CharacterNameResolver] = None,
+    ) -> List[str]:
+        return list(participants)
+
+
+_SCHEDULERS = {
+    scheduler_cls.name: scheduler_cls
+    for scheduler_cls in (
+        RoundRobinScheduler,
+        WeightedScheduler,
+        AddressedSpeakerScheduler,
+        SimultaneousScheduler,
+    )
+}
+
+
+def create_turn_scheduler(name: str, **options) -> TurnScheduler:
+    """
+    名前からスケジューラを作成する
+
+    Args:
+        name: スケジューラ名（"round_robin", "weighted", "addressed", "simultaneous"）
+        **options: スケジューラのコンストラクタに渡すオプション
+
+    Returns:
+        作成したスケジューラ
+
+    Raises:
+        ValueError: 未知のスケジューラ名が指定された場合
+    """
+    scheduler_cls = _SCHEDULERS.get(name)
+    if scheduler_cls is None:
+        raise ValueError(
+            f"未知のスケジューラです: {name}（利用可能: {', '.join(_SCHEDULERS)}）"
+        )
+    return scheduler_cls(**options)
@@ -0,0 +1,255 @@
+"""
+場面ログのターン記録をコンパクトに保持するモジュール
+
+このモジュールは、SceneLogData.turnsの代わりに使用できるCompactTurnStoreクラスを提供します。
+ターンは__slots__を持つ軽量なレコードとして保持され、キャラクターIDと名前は
+インターンされた文字列を共有します。また、指定した件数を超えた古いターンを
+一時ファイルに退避してメモリ使用量を一定に保つこともできます。
+
+取り出す際はTurnDataとして復元されるため、ContextBuilderなど既存の利用箇所
+（末尾N件のスライス、反復、len、append）はそのまま動作します。
+"""
+
+import json
+import sys
+import tempfile
+import threading
+from array import array
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Union
+
+from pydantic_core import core_schema
+
+# 循環参照を避けるための型チェック時のみのインポート
+if TYPE_CHECKING:
+    from .data_models import TurnData
+
+
+class _TurnRecord:
+    """メモリ上に保持する1ターン分の軽量なレコード"""
+
+    __slots__ = (
+        "turn_number",
+        "character_id",
+        "character_name",
+        "think",
+        "act",
+        "talk",
+        "metadata",
+    )
+
+    def __init__(self, turn: "TurnData"):
+        self.turn_number = turn.turn_number
+        self.character_id = sys.intern(turn.character_id)
+        self.character_name = sys.intern(turn.character_name)
+        self.think = turn.think
+        self.act = turn.act
+        self.talk = turn.talk
+        self.metadata = turn.metadata
+
+    def to_turn_data(self) -> "TurnData":
+        """TurnDataに復元する（保存時に検証済みのためバリデーションは行わない）"""
+        from .data_models import TurnData
+
+        return TurnData.model_construct(
+            turn_number=self.turn_number,
+            character_id=self.character_id,
+            character_name=self.character_name,
+            think=self.think,
+            act=self.act,
+            talk=self.talk,
+            metadata=self.metadata,
+        )
+
+
+class CompactTurnStore:
+    """
+    ターン記録をコンパクトに保持するシーケンス
+
+    listと同様にlen、インデックス・スライスによる参照、反復、appendをサポートします。
+    spill_thresholdを指定すると、メモリ上のレコードがその件数を超えた時点で
+    直近keep_in_memory件を残して古いレコードを一時ファイルに退避します。
+    退避したレコードも参照できますが、ファイルからの読み込みが発生します。
+    """
+
+    def __init__(
+        self,
+        turns: Optional[List["TurnData"]] = None,
+        spill_threshold: Optional[int] = None,
+        keep_in_memory: Optional[int] = None,
+    ):
+        """
+        CompactTurnStoreを初期化する
+
+        Args:
+            turns: 初期状態で格納するターンのリスト
+            spill_threshold: メモリ上に保持するレコード数の上限（Noneの場合は退避しない）
+            keep_in_memory: 退避時にメモリ上に残すレコード数（省略時はspill_thresholdの半分）
+        """
+        if spill_threshold is not None and spill_threshold < 1:
+            raise ValueError("spill_thresholdは1以上を指定してください")
+
+        self.spill_threshold = spill_threshold
+        self.keep_in_memory = (
+            keep_in_memory
+            if keep_in_memory is not None
+            else (spill_threshold // 2 if spill_threshold else 0)
+        )
+
+        self._records: List[_TurnRecord] = []
+        self._spill_file = None
+        # 退避したレコードのファイル内オフセット（末尾に終端位置を追加で保持）
+        self._spill_offsets = array("q", [0])
+        self._lock = threading.Lock()
+
+        for turn in turns or []:
+            self.append(turn)
+
+    @property
+    def spilled_count(self) -> int:
+        """一時ファイルに退避したターン数"""
+        return len(self._spill_offsets) - 1
+
+    def __len__(self) -> int:
+        return self.spilled_count + len(self._records)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator["TurnData"]:
+        for index in range(self.spilled_count):
+            yield self._read_spilled(index)
+        for record in list(self._records):
+            yield record.to_turn_data()
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union["TurnData", List["TurnData"]]:
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("turn index out of range")
+        return self._get(index)
+
+    def __repr__(self) -> str:
+        return f"CompactTurnStore(turns={len(self)}, spilled={self.spilled_count})"
+
+    def _get(self, index: int) -> "TurnData":
+        spilled_count = self.spilled_count
+        if index < spilled_count:
+            return self._read_spilled(index)
+        return self._records[index - spilled_count].to_turn_data()
+
+    def append(self, turn: "TurnData") -> None:
+        """
+        ターンを末尾に追加する
+
+        Args:
+            turn: 追加するターン
+        """
+        self._records.append(_TurnRecord(turn))
+        if (
+            self.spill_threshold is not None
+            and len(self._records) > self.spill_threshold
+        ):
+            self._spill(len(self._records) - self.keep_in_memory)
+
+    def filter_by_character(
+        self, character_id: str, limit: Optional[int] = None
+    ) -> List["TurnData"]:
+        """
+        指定したキャラクターのターンを古い順に取得する
+
+        Args:
+            character_id: キャラクターID
+            limit: 取得する最大件数（直近のものを優先。Noneの場合は全て）
+
+        Returns:
+            ターンのリスト
+        """
+        turns = [turn for turn in self if turn.character_id == character_id]
+        return turns[-limit:] if limit is not None else turns
+
+    def to_list(self) -> List["TurnData"]:
+        """全てのターンをTurnDataのリストとして取得する"""
+        return list(self)
+
+    def close(self) -> None:
+        """退避用の一時ファイルを閉じる"""
+        with self._lock:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+
+    def _spill(self, count: int) -> None:
+        """メモリ上の古いレコードをcount件、一時ファイルに退避する"""
+        if count <= 0:
+            return
+
+        with self._lock:
+            if self._spill_file is None:
+                self._spill_file = tempfile.TemporaryFile(mode="w+b")
+
+            self._spill_file.seek(0, 2)
+            for record in self._records[:count]:
+                line = (
+                    json.dumps(
+                        record.to_turn_data().model_dump(mode="json"),
+                        ensure_ascii=False,
+                    )
+                    + "\n"
+                ).encode("utf-8")
+                self._spill_file.write(line)
+                self._spill_offsets.append(self._spill_offsets[-1] + len(line))
+            self._spill_file.flush()
+
+        del self._records[:count]
+
+    def _read_spilled(self, index: int) -> "TurnData":
+        """一時ファイルに退避したレコードを読み込む"""
+        from .data_models import TurnData
+
+        with self._lock:
+            start = self._spill_offsets[index]
+            end = self._spill_offsets[index + 1]
+            self._spill_file.seek(start)
+            line = self._spill_file.read(end - start)
+        return TurnData.model_validate_json(line)
+
+
+def _serialize_turns(
+    turns: Any, handler: core_schema.SerializerFunctionWrapHandler
+) -> List[Any]:
+    """
+    ターンのシーケンスをシリアライズする
+
+    CompactTurnStoreはTurnDataのリストに変換してから、通常のリストと同じ
+    シリアライザに渡します（exclude_noneやinclude/excludeなどの指定を維持するため）。
+    """
+    if isinstance(turns, CompactTurnStore):
+        turns = list(turns)
+    return handler(turns)
+
+
+class TurnSequenceSchema:
+    """
+    SceneLogData.turnsにlistとCompactTurnStoreのどちらも格納できるようにする型注釈
+
+    listが渡された場合は従来通りTurnDataのリストとして検証し、
+    CompactTurnStoreはそのまま受け入れます。どちらもmodel_dumpでは
+    TurnDataの辞書のリストとして出力されます。
+    """
+
+    def __get_pydantic_core_schema__(self, source_type: Any, handler) -> Any:
+        list_schema = handler(source_type)
+        return core_schema.union_schema(
+            [
+                core_schema.is_instance_schema(CompactTurnStore),
+                list_schema,
+            ],
+            serialization=core_schema.wrap_serializer_function_ser_schema(
+                _serialize_turns, schema=list_schema
+            ),
+        )
@@ -16,6 +16,7 @@ from datetime import datetime
 from typing import List, Optional, Dict, Any
 
 from .core.simulation_engine import SimulationEngine, SceneNotLoadedError
+from .utils.logging_setup import add_logging_arguments, configure_logging_from_args
 
 
 class ProjectAnimaShell(cmd.Cmd):
@@ -316,6 +317,7 @@ def parse_args():
         action="store_true",
         help="Enable debug mode",
     )
+    add_logging_arguments(parser, default_verbosity="quiet")
 
     return parser.parse_args()
 
@@ -323,6 +325,7 @@ def parse_args():
 def main():
     """インタラクティブCLIのメイン関数"""
     args = parse_args()
+    configure_logging_from_args(args)
 
     # Check if scene file exists
     if not os.path.exists(args.scene):
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Project Anima - 学習用データのエクスポートツール
+
+このモジュールは、保存済みの場面ログを読み込み、各ターンを
+「その時点でキャラクターに与えられた短期コンテクスト」と「think/act/talk」の組として
+1行1レコードのNDJSON（JSON Lines）形式で出力します。
+
+ログは1ファイルずつ読み込み、レコードを逐次生成するため、
+エクスポートするターン数に関係なく一定のメモリで動作します。
+
+使用例:
+    python -m project_anima.training_export --log-dir logs --since 20240101 -o train.jsonl
+"""
+
+import argparse
+import json
+import sys
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .analytics import is_error_placeholder
+from .core.context_builder import ContextBuilder, format_short_term_context
+from .core.data_models import TurnData
+from .utils.log_files import iter_scene_log_files, parse_date_filter
+
+# 出力レコードの形式バージョン
+TRAINING_RECORD_VERSION = "1.0"
+
+
+def iter_scene_training_records(
+    simulation_id: str,
+    file_path: str,
+    history_turns: int = ContextBuilder.MAX_TURNS,
+    include_errors: bool = False,
+    character_ids: Optional[Iterable[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    1つの場面ログから学習用レコードを順に生成する
+
+    Args:
+        simulation_id: ログが属するシミュレーションID
+        file_path: 場面ログファイルのパス
+        history_turns: 短期コンテクストに含める直近のターン数
+        include_errors: エラー時の代替ターンも出力するか
+        character_ids: 出力対象のキャラクターID（Noneの場合は全て）
+
+    Yields:
+        学習用レコードの辞書
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        log_data = json.load(f)
+
+    scene_info = log_data.get("scene_info") or {}
+    wanted_ids = set(character_ids) if character_ids is not None else None
+
+    # 介入は適用されたターン番号ごとにまとめておく
+    interventions_by_turn: Dict[int, List[Dict[str, Any]]] = {}
+    for intervention in log_data.get("interventions_in_scene") or []:
+        turn_number = intervention.get("applied_before_turn_number")
+        interventions_by_turn.setdefault(turn_number, []).append(intervention)
+
+    # ContextBuilderと同じく直近のターンのみを保持する
+    history = deque(maxlen=max(history_turns, 1))
+
+    for turn_dict in log_data.get("turns") or []:
+        turn = TurnData.model_validate(turn_dict)
+
+        if (wanted_ids is None or turn.character_id in wanted_ids) and (
+            include_errors or not is_error_placeholder(turn.think)
+        ):
+            yield {
+                "version": TRAINING_RECORD_VERSION,
+                "simulation_id": simulation_id,
+                "scene_id": scene_info.get("scene_id"),
+                "turn_number": turn.turn_number,
+                "character_id": turn.character_id,
+                "character_name": turn.character_name,
+                "context": {
+                    "scene": {
+                        "location": scene_info.get("location"),
+                        "time": scene_info.get("time"),
+                        "situation": scene_info.get("situation"),
+                    },
+                    "short_term_context": format_short_term_context(
+                        list(history), history_turns
+                    ),
+                    "interventions": interventions_by_turn.get(turn.turn_number, []),
+                },
+                "output": {"think": turn.think, "act": turn.act, "talk": turn.talk},
+                "metadata": (
+                    turn.metadata.model_dump(exclude_none=True)
+                    if turn.metadata
+                    else None
+                ),
+            }
+
+        history.append(turn)
+
+
+def iter_training_records(
+    log_dir: str,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    simulation_ids: Optional[List[str]] = None,
+    history_turns: int = ContextBuilder.MAX_TURNS,
+    include_errors: bool = False,
+    character_ids: Optional[List[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    条件に合う全ての場面ログから学習用レコードを順に生成する
+
+    Args:
+        log_dir: ログのルートディレクトリ
+        since: この日付以降の実行に限定（"YYYYMMDD" または "YYYY-MM-DD"）
+        until: この日付以前の実行に限定（"YYYYMMDD" または "YYYY-MM-DD"）
+        simulation_ids: 対象とするシミュレーションIDのリスト（Noneの場合は全て）
+        history_turns: 短期コンテクストに含める直近のターン数
+        include_errors: エラー時の代替ターンも出力するか
+        character_ids: 出力対象のキャラクターID（Noneの場合は全て）
+
+    Yields:
+        学習用レコードの辞書
+
+    Raises:
+        ValueError: 日付の形式が不正な場合
+    """
+    log_files = iter_scene_log_files(
+        log_dir,
+        since=parse_date_filter(since),
+        until=parse_date_filter(until),
+        simulation_ids=simulation_ids,
+    )
+
+    for simulation_id, file_path in log_files:
+        try:
+            yield from iter_scene_training_records(
+                simulation_id,
+                file_path,
+                history_turns=history_turns,
+                include_errors=include_errors,
+                character_ids=character_ids,
+            )
+        except (OSError, ValueError) as e:
+            # 壊れたログはスキップして処理を続ける
+            print(
+                f"警告: ログファイル '{file_path}' を読み込めませんでした: {e}",
+                file=sys.stderr,
+            )
+
+
+def iter_ndjson_lines(records: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """
+    レコードをNDJSON形式の行として返す
+
+    Args:
+        records: レコードのイテラブル
+
+    Yields:
+        改行で終わるJSON文字列
+    """
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Export saved Project Anima simulation logs as NDJSON training records"
+    )
+    parser.add_argument(
+        "--log-dir",
+        type=str,
+        default="logs",
+        help="Path to logs directory",
+    )
+    parser.add_argument(
+        "--since",
+        type=str,
+        default=None,
+        help="Only include runs on or after this date (YYYYMMDD or YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--until",
+        type=str,
+        default=None,
+        help="Only include runs on or before this date (YYYYMMDD or YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--sim-id",
+        action="append",
+        default=None,
+        help="Only include the given simulation ID (can be repeated)",
+    )
+    parser.add_argument(
+        "--character-id",
+        action="append",
+        default=None,
+        help="Only export turns of the given character (can be repeated)",
+    )
+    parser.add_argument(
+        "--history-turns",
+        type=int,
+        default=ContextBuilder.MAX_TURNS,
+        help="Number of previous turns included in the short-term context",
+    )
+    parser.add_argument(
+        "--include-errors",
+        action="store_true",
+        help="Also export turns whose thought is an error placeholder",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=None,
+        help="Output file path (defaults to stdout)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main entry point for the training export command."""
+    args = parse_args(argv)
+
+    records = iter_training_records(
+        args.log_dir,
+        since=args.since,
+        until=args.until,
+        simulation_ids=args.sim_id,
+        history_turns=args.history_turns,
+        include_errors=args.include_errors,
+        character_ids=args.character_id,
+    )
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    count = 0
+    try:
+        for line in iter_ndjson_lines(records):
+            output.write(line)
+            count += 1
+    except ValueError as e:
+        print(f"エラー: {e}", file=sys.stderr)
+        sys.exit(2)
+    finally:
+        if args.output:
+            output.close()
+
+    print(f"{count}件のレコードをエクスポートしました", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
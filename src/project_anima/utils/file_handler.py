@@ -11,6 +11,9 @@ from typing import Any, Optional
 
 import yaml
 
+# libyamlが利用可能な場合は高速なCローダーを使用する
+YAML_SAFE_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def load_yaml(file_path: str) -> Any:
     """
@@ -28,7 +31,7 @@ def load_yaml(file_path: str) -> Any:
         yaml.YAMLError: YAMLのパースに失敗した場合
     """
     with open(file_path, "r", encoding="utf-8") as file:
-        return yaml.safe_load(file)
+        return yaml.load(file, Loader=YAML_SAFE_LOADER)
 
 
 def save_yaml(data: Any, file_path: str) -> None:
@@ -0,0 +1,142 @@
+"""
+保存済みシミュレーションログの探索を行うユーティリティ関数
+
+このモジュールは、SimulationEngineがlogsディレクトリ以下に保存する
+「sim_<YYYYMMDD>_<HHMMSS>/scene_<scene_id>.json」形式のログファイルを、
+日付やシミュレーションIDで絞り込みながら順に列挙する機能を提供します。
+"""
+
+import os
+from datetime import date, datetime
+from typing import Iterable, Iterator, Optional, Tuple
+
+# シミュレーションログディレクトリの接頭辞
+SIMULATION_DIR_PREFIX = "sim_"
+
+
+def parse_date_filter(value: Optional[str]) -> Optional[date]:
+    """
+    日付フィルター文字列を日付に変換する
+
+    Args:
+        value: "YYYYMMDD" または "YYYY-MM-DD" 形式の文字列（Noneの場合はNone）
+
+    Returns:
+        変換した日付
+
+    Raises:
+        ValueError: 形式が不正な場合
+    """
+    if value is None or value == "":
+        return None
+
+    for date_format in ("%Y%m%d", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+
+    raise ValueError(
+        f"日付の形式が不正です: {value}（YYYYMMDD または YYYY-MM-DD で指定してください）"
+    )
+
+
+def get_simulation_date(simulation_id: str) -> Optional[date]:
+    """
+    シミュレーションIDから実行日を取得する
+
+    Args:
+        simulation_id: "sim_YYYYMMDD_HHMMSS" 形式のシミュレーションID
+
+    Returns:
+        実行日。IDが想定した形式でない場合はNone
+    """
+    timestamp_str = simulation_id[len(SIMULATION_DIR_PREFIX) :]
+    try:
+        return datetime.strptime(timestamp_str[:8], "%Y%m%d").date()
+    except ValueError:
+        return None
+
+
+def iter_simulation_dirs(
+    log_dir: str,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    simulation_ids: Optional[Iterable[str]] = None,
+) -> Iterator[Tuple[str, str]]:
+    """
+    条件に合うシミュレーションログディレクトリを古い順に列挙する
+
+    Args:
+        log_dir: ログのルートディレクトリ
+        since: この日付以降に実行されたものに限定（Noneの場合は制限なし）
+        until: この日付以前に実行されたものに限定（Noneの場合は制限なし）
+        simulation_ids: 対象とするシミュレーションIDの集合（Noneの場合は全て）
+
+    Yields:
+        (シミュレーションID, ディレクトリパス) のタプル
+    """
+    if not os.path.isdir(log_dir):
+        return
+
+    wanted_ids = set(simulation_ids) if simulation_ids is not None else None
+
+    with os.scandir(log_dir) as entries:
+        simulation_entries = sorted(
+            (
+                entry
+                for entry in entries
+                if entry.is_dir() and entry.name.startswith(SIMULATION_DIR_PREFIX)
+            ),
+            key=lambda entry: entry.name,
+        )
+
+    for entry in simulation_entries:
+        if wanted_ids is not None and entry.name not in wanted_ids:
+            continue
+
+        if since is not None or until is not None:
+            simulation_date = get_simulation_date(entry.name)
+            if simulation_date is None:
+                continue
+            if since is not None and simulation_date < since:
+                continue
+            if until is not None and simulation_date > until:
+                continue
+
+        yield entry.name, entry.path
+
+
+def iter_scene_log_files(
+    log_dir: str,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    simulation_ids: Optional[Iterable[str]] = None,
+) -> Iterator[Tuple[str, str]]:
+    """
+    条件に合う場面ログファイル（JSON）を列挙する
+
+    ディレクトリは必要になった時点で1つずつ走査するため、
+    ログの総量に関係なく一定のメモリで動作します。
+
+    Args:
+        log_dir: ログのルートディレクトリ
+        since: この日付以降に実行されたものに限定（Noneの場合は制限なし）
+        until: この日付以前に実行されたものに限定（Noneの場合は制限なし）
+        simulation_ids: 対象とするシミュレーションIDの集合（Noneの場合は全て）
+
+    Yields:
+        (シミュレーションID, ログファイルパス) のタプル
+    """
+    for simulation_id, simulation_dir in iter_simulation_dirs(
+        log_dir, since, until, simulation_ids
+    ):
+        with os.scandir(simulation_dir) as entries:
+            file_names = sorted(
+                entry.name
+                for entry in entries
+                if entry.is_file() and entry.name.endswith(".json")
+            )
+
+        for file_name in file_names:
+            yield simulation_id, os.path.join(simulation_dir, file_name)
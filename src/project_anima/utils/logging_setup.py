@@ -0,0 +1,415 @@
+"""
+ログ出力の設定を行うモジュール
+
+このモジュールは、ログの書き込みを呼び出し元のスレッドから切り離すための設定を提供します。
+
+- ロガーにはQueueHandlerのみを登録し、コンソールやファイルへの書き込みは
+  QueueListenerのスレッドで行う（ターン実行やAPIリクエストの処理をI/Oで待たせない）
+- 詳細度（quiet / normal / verbose）でルートロガーのレベルを切り替える
+- LLMに送信したプロンプトと応答は専用のロガー（PROMPT_LOGGER_NAME）に出力し、
+  サイズでローテーションするファイルに書き込む（任意でサンプリング可能）
+
+プロンプトのダンプ先が設定されていない場合、dump_prompt_exchangeは何もしません。
+"""
+
+import argparse
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import threading
+from typing import Any, List, Optional, Union
+
+# プロンプトと応答のダンプに使用するロガー名
+PROMPT_LOGGER_NAME = "project_anima.prompts"
+
+# configure_loggingが登録するQueueHandlerの名前
+# （同じモジュールが別のパッケージ名で読み込まれていても識別できるよう、名前で判別する）
+LOG_QUEUE_HANDLER_NAME = "project_anima.log_queue"
+PROMPT_DUMP_HANDLER_NAME = "project_anima.prompt_dump_queue"
+
+# 詳細度とログレベルの対応
+VERBOSITY_LEVELS = {
+    "quiet": logging.WARNING,
+    "normal": logging.INFO,
+    "verbose": logging.DEBUG,
+}
+
+DEFAULT_LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+PROMPT_DUMP_FORMAT = "%(asctime)s - %(threadName)s\n%(message)s\n"
+
+# プロンプトダンプの既定のローテーション設定
+DEFAULT_PROMPT_DUMP_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_PROMPT_DUMP_BACKUP_COUNT = 5
+
+# 環境変数による設定（Webサーバーなど、コマンドライン引数を持たない起動方法向け）
+ENV_VERBOSITY = "PROJECT_ANIMA_VERBOSITY"
+ENV_LOG_FILE = "PROJECT_ANIMA_LOG_FILE"
+ENV_PROMPT_DUMP_FILE = "PROJECT_ANIMA_PROMPT_DUMP_FILE"
+ENV_PROMPT_DUMP_MAX_BYTES = "PROJECT_ANIMA_PROMPT_DUMP_MAX_BYTES"
+ENV_PROMPT_DUMP_BACKUP_COUNT = "PROJECT_ANIMA_PROMPT_DUMP_BACKUP_COUNT"
+ENV_PROMPT_SAMPLE_RATE = "PROJECT_ANIMA_PROMPT_SAMPLE_RATE"
+
+_prompt_logger = logging.getLogger(PROMPT_LOGGER_NAME)
+_prompt_logger.propagate = False
+_prompt_logger.addHandler(logging.NullHandler())
+
+_lock = threading.Lock()
+_active_pipeline: Optional["LoggingPipeline"] = None
+
+
+def resolve_verbosity(verbosity: Union[str, int]) -> int:
+    """
+    詳細度をログレベルに変換する
+
+    Args:
+        verbosity: "quiet"、"normal"、"verbose"、ログレベル名（"DEBUG"など）、またはログレベルの数値
+
+    Returns:
+        ログレベル
+
+    Raises:
+        ValueError: 未知の詳細度が指定された場合
+    """
+    if isinstance(verbosity, int):
+        return verbosity
+
+    name = verbosity.strip().lower()
+    if name in VERBOSITY_LEVELS:
+        return VERBOSITY_LEVELS[name]
+
+    level = logging.getLevelName(name.upper())
+    if isinstance(level, int):
+        return level
+
+    raise ValueError(
+        f"未知の詳細度です: {verbosity}（利用可能: {', '.join(VERBOSITY_LEVELS)}）"
+    )
+
+
+class PromptSampler(logging.Filter):
+    """
+    指定した割合のレコードだけを通すフィルタ
+
+    QueueHandlerに設定するため、間引かれたレコードはキューに積まれません。
+    """
+
+    def __init__(self, rate: float, seed: Optional[int] = None):
+        """
+        PromptSamplerを初期化する
+
+        Args:
+            rate: 通すレコードの割合（0.0〜1.0）
+            seed: 乱数のシード
+        """
+        super().__init__()
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(
+                f"サンプリング率は0.0から1.0の範囲で指定してください: {rate}"
+            )
+        self.rate = rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1.0:
+            return True
+        with self._lock:
+            return self._random.random() < self.rate
+
+
+class LoggingPipeline:
+    """
+    configure_loggingで構築したキューとリスナーをまとめたクラス
+
+    stopを呼び出すと、キューに残っているレコードを書き出してからリスナーを停止し、
+    登録したハンドラーをロガーから取り除きます。
+    """
+
+    def __init__(self):
+        self.listeners: List[logging.handlers.QueueListener] = []
+        self.handlers: List[logging.Handler] = []
+        self._installed: List[tuple] = []
+        self._stopped = False
+
+    def _install(self, logger: logging.Logger, handler: logging.Handler) -> None:
+        """ロガーにハンドラーを登録し、停止時に取り除けるよう記録する"""
+        logger.addHandler(handler)
+        self._installed.append((logger, handler))
+
+    def start(self) -> None:
+        """リスナーのスレッドを開始する"""
+        for listener in self.listeners:
+            listener.start()
+
+    def stop(self) -> None:
+        """リスナーを停止し、出力先のハンドラーを閉じる"""
+        if self._stopped:
+            return
+        self._stopped = True
+
+        for logger, handler in self._installed:
+            logger.removeHandler(handler)
+        for listener in self.listeners:
+            listener.stop()
+        for handler in self.handlers:
+            handler.close()
+
+
+def configure_logging(
+    verbosity: Union[str, int] = "normal",
+    log_file: Optional[str] = None,
+    prompt_dump_file: Optional[str] = None,
+    prompt_dump_max_bytes: int = DEFAULT_PROMPT_DUMP_MAX_BYTES,
+    prompt_dump_backup_count: int = DEFAULT_PROMPT_DUMP_BACKUP_COUNT,
+    prompt_sample_rate: float = 1.0,
+    console: bool = True,
+    log_format: str = DEFAULT_LOG_FORMAT,
+) -> LoggingPipeline:
+    """
+    キューを経由してログを書き出すようにロガーを設定する
+
+    既にconfigure_loggingで設定済みの場合は、以前の設定を停止してから置き換えます。
+    それ以外の既存のハンドラー（テストフレームワークのものなど）には手を加えません。
+
+    Args:
+        verbosity: 詳細度（"quiet"、"normal"、"verbose"、またはログレベル）
+        log_file: 通常のログも書き出すファイルのパス
+        prompt_dump_file: プロンプトと応答を書き出すファイルのパス（Noneの場合はダンプしない）
+        prompt_dump_max_bytes: プロンプトダンプのファイルをローテーションするサイズ
+        prompt_dump_backup_count: 保持するプロンプトダンプのファイル数
+        prompt_sample_rate: ダンプするLLM呼び出しの割合（0.0〜1.0）
+        console: 通常のログを標準エラー出力に出力するか
+        log_format: 通常のログの書式
+
+    Returns:
+        構築したLoggingPipeline
+    """
+    global _active_pipeline
+
+    level = resolve_verbosity(verbosity)
+    sampler = PromptSampler(prompt_sample_rate)
+
+    with _lock:
+        if _active_pipeline is not None:
+            _active_pipeline.stop()
+        root_logger = logging.getLogger()
+        _remove_named_handlers(root_logger, LOG_QUEUE_HANDLER_NAME)
+        _remove_named_handlers(_prompt_logger, PROMPT_DUMP_HANDLER_NAME)
+
+        pipeline = LoggingPipeline()
+        formatter = logging.Formatter(log_format)
+
+        # 通常のログ
+        outputs: List[logging.Handler] = []
+        if console:
+            outputs.append(logging.StreamHandler())
+        if log_file:
+            _ensure_parent_dir(log_file)
+            outputs.append(logging.FileHandler(log_file, encoding="utf-8"))
+        for handler in outputs:
+            handler.setFormatter(formatter)
+
+        root_logger.setLevel(level)
+        if outputs:
+            log_queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+            log_queue_handler = logging.handlers.QueueHandler(log_queue)
+            log_queue_handler.set_name(LOG_QUEUE_HANDLER_NAME)
+            pipeline._install(root_logger, log_queue_handler)
+            pipeline.listeners.append(
+                logging.handlers.QueueListener(
+                    log_queue, *outputs, respect_handler_level=True
+                )
+            )
+            pipeline.handlers.extend(outputs)
+
+        # プロンプトと応答のダンプ
+        if prompt_dump_file:
+            _ensure_parent_dir(prompt_dump_file)
+            dump_handler = logging.handlers.RotatingFileHandler(
+                prompt_dump_file,
+                maxBytes=prompt_dump_max_bytes,
+                backupCount=prompt_dump_backup_count,
+                encoding="utf-8",
+            )
+            dump_handler.setFormatter(logging.Formatter(PROMPT_DUMP_FORMAT))
+
+            dump_queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+            dump_queue_handler = logging.handlers.QueueHandler(dump_queue)
+            dump_queue_handler.set_name(PROMPT_DUMP_HANDLER_NAME)
+            dump_queue_handler.addFilter(sampler)
+            pipeline._install(_prompt_logger, dump_queue_handler)
+            pipeline.listeners.append(
+                logging.handlers.QueueListener(dump_queue, dump_handler)
+            )
+            pipeline.handlers.append(dump_handler)
+            _prompt_logger.setLevel(logging.INFO)
+
+        pipeline.start()
+        _active_pipeline = pipeline
+
+    return pipeline
+
+
+def configure_logging_from_env(
+    default_verbosity: Union[str, int] = "normal",
+) -> LoggingPipeline:
+    """
+    環境変数の設定に従ってconfigure_loggingを呼び出す
+
+    PROJECT_ANIMA_VERBOSITY、PROJECT_ANIMA_LOG_FILE、PROJECT_ANIMA_PROMPT_DUMP_FILE、
+    PROJECT_ANIMA_PROMPT_DUMP_MAX_BYTES、PROJECT_ANIMA_PROMPT_DUMP_BACKUP_COUNT、
+    PROJECT_ANIMA_PROMPT_SAMPLE_RATE を参照します。
+
+    Args:
+        default_verbosity: PROJECT_ANIMA_VERBOSITYが未設定の場合の詳細度
+
+    Returns:
+        構築したLoggingPipeline
+    """
+    return configure_logging(
+        verbosity=os.environ.get(ENV_VERBOSITY) or default_verbosity,
+        log_file=os.environ.get(ENV_LOG_FILE) or None,
+        prompt_dump_file=os.environ.get(ENV_PROMPT_DUMP_FILE) or None,
+        prompt_dump_max_bytes=int(
+            os.environ.get(ENV_PROMPT_DUMP_MAX_BYTES, DEFAULT_PROMPT_DUMP_MAX_BYTES)
+        ),
+        prompt_dump_backup_count=int(
+            os.environ.get(
+                ENV_PROMPT_DUMP_BACKUP_COUNT, DEFAULT_PROMPT_DUMP_BACKUP_COUNT
+            )
+        ),
+        prompt_sample_rate=float(os.environ.get(ENV_PROMPT_SAMPLE_RATE, 1.0)),
+    )
+
+
+def add_logging_arguments(
+    parser: argparse.ArgumentParser, default_verbosity: str = "normal"
+) -> None:
+    """
+    ログ出力に関するコマンドライン引数を追加する
+
+    Args:
+        parser: 引数を追加するパーサー
+        default_verbosity: --verbosityの既定値
+    """
+    parser.add_argument(
+        "--verbosity",
+        choices=list(VERBOSITY_LEVELS),
+        default=default_verbosity,
+        help="Log verbosity (verbose also logs each turn's think/act/talk)",
+    )
+    parser.add_argument(
+        "--log-file",
+        type=str,
+        default=None,
+        help="Also write log messages to this file",
+    )
+    parser.add_argument(
+        "--prompt-dump",
+        type=str,
+        default=None,
+        help="Write LLM prompts and responses to this size-rotated file",
+    )
+    parser.add_argument(
+        "--prompt-dump-max-bytes",
+        type=int,
+        default=DEFAULT_PROMPT_DUMP_MAX_BYTES,
+        help="Rotate the prompt dump file when it reaches this size",
+    )
+    parser.add_argument(
+        "--prompt-sample-rate",
+        type=float,
+        default=1.0,
+        help="Fraction of LLM calls to dump (0.0-1.0)",
+    )
+
+
+def configure_logging_from_args(args: argparse.Namespace) -> LoggingPipeline:
+    """
+    add_logging_argumentsで追加した引数に従ってconfigure_loggingを呼び出す
+
+    --debugが指定されている場合は詳細度をverboseとして扱います。
+
+    Args:
+        args: 解析済みのコマンドライン引数
+
+    Returns:
+        構築したLoggingPipeline
+    """
+    verbosity = "verbose" if getattr(args, "debug", False) else args.verbosity
+    return configure_logging(
+        verbosity=verbosity,
+        log_file=args.log_file,
+        prompt_dump_file=args.prompt_dump,
+        prompt_dump_max_bytes=args.prompt_dump_max_bytes,
+        prompt_sample_rate=args.prompt_sample_rate,
+    )
+
+
+def shutdown_logging() -> None:
+    """configure_loggingで構築した設定を停止する（残っているレコードは書き出される）"""
+    global _active_pipeline
+    with _lock:
+        if _active_pipeline is not None:
+            _active_pipeline.stop()
+            _active_pipeline = None
+
+
+def prompt_dump_enabled() -> bool:
+    """プロンプトのダンプ先が設定されているかを返す"""
+    return _prompt_logger.isEnabledFor(logging.INFO) and any(
+        handler.get_name() == PROMPT_DUMP_HANDLER_NAME
+        for handler in _prompt_logger.handlers
+    )
+
+
+def dump_prompt_exchange(
+    label: str,
+    prompt: str,
+    response: Optional[str] = None,
+    **fields: Any,
+) -> None:
+    """
+    LLMに送信したプロンプトと応答をダンプする
+
+    プロンプトと応答を1件のレコードにまとめるため、サンプリングしても対応関係が崩れません。
+    ダンプ先が設定されていない場合は何もしません。
+
+    Args:
+        label: 処理名（"Character Thought"など）
+        prompt: 送信したプロンプト
+        response: 受信した応答（API呼び出しに失敗した場合はNone）
+        **fields: 見出しに含める付加情報（モデル名など）
+    """
+    if not prompt_dump_enabled():
+        return
+
+    details = " ".join(
+        f"{key}={value}" for key, value in fields.items() if value is not None
+    )
+    _prompt_logger.info(
+        "===== %s %s =====\n----- PROMPT -----\n%s\n----- RESPONSE -----\n%s",
+        label,
+        details,
+        prompt,
+        response if response is not None else "（応答なし）",
+    )
+
+
+def _remove_named_handlers(logger: logging.Logger, name: str) -> None:
+    """以前の設定が残したハンドラーをロガーから取り除く"""
+    for handler in list(logger.handlers):
+        if handler.get_name() == name:
+            logger.removeHandler(handler)
+
+
+def _ensure_parent_dir(path: str) -> None:
+    """ファイルの親ディレクトリを作成する"""
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+
+
+atexit.register(shutdown_logging)
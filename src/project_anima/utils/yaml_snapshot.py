@@ -0,0 +1,178 @@
+"""
+YAMLファイルから作成したPydanticモデルのスナップショットを扱うユーティリティ関数
+
+このモジュールは、YAMLの解析を済ませたモデルを元ファイルの隣にJSON形式で保存し、
+元ファイルの内容が変わっていない場合はYAMLを解析せずにスナップショットから
+復元する機能を提供します。
+
+スナップショットは元ファイルの内容のハッシュとモデルのスキーマのハッシュで照合するため、
+ファイルが編集された場合やモデルの定義が変わった場合は自動的に再作成されます。
+スナップショットはJSONとして読み込み、Pydanticのバリデーションを経てモデルに戻すため、
+ファイルが書き換えられていてもコードが実行されることはありません。
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Optional, Type, TypeVar
+
+import pydantic
+import yaml
+from pydantic import BaseModel
+
+from .file_handler import YAML_SAFE_LOADER
+
+logger = logging.getLogger(__name__)
+
+# スナップショットファイルの接尾辞（元ファイル名の前に"."を付けた隠しファイルとして保存）
+SNAPSHOT_SUFFIX = ".snapshot.json"
+
+# 以前の形式（pickle）のスナップショットファイルの接尾辞（読み込みには使用しない）
+LEGACY_SNAPSHOT_SUFFIXES = (".snapshot.pickle",)
+
+# スナップショットの形式バージョン（形式を変更した場合は値を上げる）
+SNAPSHOT_FORMAT_VERSION = 2
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def get_snapshot_path(file_path: str) -> str:
+    """
+    YAMLファイルに対応するスナップショットファイルのパスを取得する
+
+    Args:
+        file_path: YAMLファイルのパス
+
+    Returns:
+        スナップショットファイルのパス
+    """
+    directory, file_name = os.path.split(file_path)
+    return os.path.join(directory, f".{file_name}{SNAPSHOT_SUFFIX}")
+
+
+def is_snapshot_path(file_path: str) -> bool:
+    """
+    スナップショットファイル（以前の形式を含む）のパスかどうかを判定する
+
+    Args:
+        file_path: 判定するファイルのパス
+
+    Returns:
+        スナップショットファイルの場合はTrue
+    """
+    return str(file_path).endswith((SNAPSHOT_SUFFIX, *LEGACY_SNAPSHOT_SUFFIXES))
+
+
+@functools.lru_cache(maxsize=None)
+def get_schema_fingerprint(model_cls: Type[BaseModel]) -> str:
+    """
+    モデルクラスの定義のハッシュを計算する
+
+    フィールドの追加・名前の変更・型の変更などでスキーマが変わると値が変わるため、
+    古い定義で作成したスナップショットを検証を経ずに読み込むことを防げます。
+
+    Args:
+        model_cls: Pydanticモデルクラス
+
+    Returns:
+        SHA-256のハッシュ（16進数文字列）
+    """
+    payload = json.dumps(
+        {
+            "model": f"{model_cls.__module__}.{model_cls.__qualname__}",
+            "schema": model_cls.model_json_schema(),
+            "pydantic": pydantic.VERSION,
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _read_snapshot(
+    snapshot_path: str, source_hash: str, model_cls: Type[ModelT]
+) -> Optional[ModelT]:
+    """元ファイルのハッシュとモデルのスキーマが一致する場合のみスナップショットを返す"""
+    try:
+        with open(snapshot_path, "r", encoding="utf-8") as file:
+            snapshot = json.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.debug(f"スナップショットを読み込めませんでした: {snapshot_path}: {e}")
+        return None
+
+    if not (
+        isinstance(snapshot, dict)
+        and snapshot.get("format_version") == SNAPSHOT_FORMAT_VERSION
+        and snapshot.get("source_sha256") == source_hash
+        and snapshot.get("schema_sha256") == get_schema_fingerprint(model_cls)
+    ):
+        return None
+
+    try:
+        return model_cls.model_validate(snapshot.get("model"))
+    except pydantic.ValidationError as e:
+        logger.debug(f"スナップショットの内容が不正です: {snapshot_path}: {e}")
+        return None
+
+
+def _write_snapshot(snapshot_path: str, source_hash: str, model: BaseModel) -> None:
+    """スナップショットを一時ファイル経由で書き出す（失敗しても無視する）"""
+    snapshot = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "source_sha256": source_hash,
+        "schema_sha256": get_schema_fingerprint(type(model)),
+        "model": model.model_dump(mode="json"),
+    }
+    directory = os.path.dirname(snapshot_path) or "."
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(snapshot, file, ensure_ascii=False)
+            os.replace(temp_path, snapshot_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError as e:
+        logger.debug(f"スナップショットを保存できませんでした: {snapshot_path}: {e}")
+
+
+def load_model_with_snapshot(file_path: str, model_cls: Type[ModelT]) -> ModelT:
+    """
+    YAMLファイルをPydanticモデルとして読み込む（スナップショットがあればそれを使用する）
+
+    元ファイルの内容とモデルのスキーマのハッシュがスナップショットと一致する場合は、
+    YAMLの解析を行わずにスナップショットのJSONから復元します。
+    一致しない場合は通常通り読み込み、新しいスナップショットを保存します。
+
+    Args:
+        file_path: 読み込むYAMLファイルのパス
+        model_cls: 変換先のPydanticモデルクラス
+
+    Returns:
+        読み込んだモデルのインスタンス
+
+    Raises:
+        FileNotFoundError: 指定されたファイルが存在しない場合
+        yaml.YAMLError: YAMLのパースに失敗した場合
+        pydantic.ValidationError: データがモデルの定義に合わない場合
+    """
+    with open(file_path, "rb") as file:
+        content = file.read()
+    source_hash = hashlib.sha256(content).hexdigest()
+    snapshot_path = get_snapshot_path(file_path)
+
+    model = _read_snapshot(snapshot_path, source_hash, model_cls)
+    if model is not None:
+        return model
+
+    raw_data = yaml.load(content.decode("utf-8"), Loader=YAML_SAFE_LOADER)
+    model = model_cls(**raw_data)
+    _write_snapshot(snapshot_path, source_hash, model)
+    return model
@@ -0,0 +1,155 @@
+"""
+シミュレーションログ分析ツールのユニットテスト
+"""
+
+import json
+import os
+
+import pytest
+
+from src.project_anima.analytics import (
+    LatencyHistogram,
+    analyze_logs,
+    analyze_scene_log,
+    is_error_placeholder,
+)
+from src.project_anima.utils.log_files import iter_scene_log_files, parse_date_filter
+
+
+def _write_scene_log(log_dir, simulation_id, scene_id, turns):
+    sim_dir = os.path.join(log_dir, simulation_id)
+    os.makedirs(sim_dir, exist_ok=True)
+    path = os.path.join(sim_dir, f"scene_{scene_id}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "scene_info": {"scene_id": scene_id},
+                "interventions_in_scene": [],
+                "turns": turns,
+            },
+            f,
+            ensure_ascii=False,
+        )
+    return path
+
+
+def _turn(turn_number, character_id, talk="", act="", think="考える", **metadata):
+    return {
+        "turn_number": turn_number,
+        "character_id": character_id,
+        "character_name": character_id.upper(),
+        "think": think,
+        "act": act,
+        "talk": talk,
+        "metadata": metadata or None,
+    }
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    """2日分の実行ログを含むディレクトリ"""
+    root = str(tmp_path / "logs")
+    _write_scene_log(
+        root,
+        "sim_20240101_120000",
+        "s1",
+        [
+            _turn(1, "alice", talk="こんにちは", prompt_chars=100, llm_latency_ms=200),
+            _turn(2, "bob", act="座る", prompt_chars=140, llm_latency_ms=400),
+            _turn(3, "alice", talk="ええ", act="笑う", prompt_chars=180),
+        ],
+    )
+    _write_scene_log(
+        root,
+        "sim_20240105_090000",
+        "s1",
+        [_turn(1, "bob", think="（エラーにより思考を生成できませんでした）")],
+    )
+    return root
+
+
+def test_parse_date_filter():
+    """日付フィルターを両方の形式で解釈できること"""
+    assert parse_date_filter("20240102") == parse_date_filter("2024-01-02")
+    assert parse_date_filter(None) is None
+    with pytest.raises(ValueError):
+        parse_date_filter("2024/01/02")
+
+
+def test_iter_scene_log_files_filters_by_date(log_dir):
+    """日付範囲で対象の実行を絞り込めること"""
+    files = list(iter_scene_log_files(log_dir, since=parse_date_filter("20240102")))
+
+    assert [sim_id for sim_id, _ in files] == ["sim_20240105_090000"]
+
+
+def test_analyze_scene_log_counts_turns(log_dir):
+    """1ファイル分のターン数と比率の元データを集計できること"""
+    path = os.path.join(log_dir, "sim_20240101_120000", "scene_s1.json")
+    summary = analyze_scene_log("sim_20240101_120000", path)
+
+    assert summary["turns"] == 3
+    assert summary["characters"]["alice"]["talk_turns"] == 2
+    assert summary["characters"]["alice"]["act_turns"] == 1
+    assert summary["prompt_chars"] == [100, 140, 180]
+    assert summary["latencies_ms"] == [200, 400]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_analyze_logs_aggregates_runs(log_dir, workers):
+    """複数の実行を集計できること（並列実行でも同じ結果になること）"""
+    report = analyze_logs(log_dir, workers=workers).to_dict()
+
+    assert report["runs"] == 2
+    assert report["turns"] == 4
+    assert report["turns_per_run"]["max"] == 3
+    assert report["error_turns"] == 1
+    assert report["characters"]["bob"]["error_rate"] == 0.5
+    assert report["prompt_size"]["mean_growth_chars_per_turn"] == 40
+    assert report["latency"]["count"] == 2
+
+
+def test_is_error_placeholder():
+    """エラー時の代替テキストを判定できること"""
+    assert is_error_placeholder("（予期せぬエラーが発生しました）")
+    assert not is_error_placeholder("普通の思考")
+    assert not is_error_placeholder(None)
+
+
+def test_latency_histogram_percentiles():
+    """パーセンタイルの近似値が実測の範囲に収まること"""
+    histogram = LatencyHistogram()
+    for latency in range(1, 101):
+        histogram.add(float(latency * 10))
+
+    p50 = histogram.percentile(50)
+    assert 450 <= p50 <= 560
+    assert histogram.percentile(100) == 1000
+
+
+def test_analyze_logs_reports_invalid_response_rate_per_model(tmp_path):
+    """モデルごとに不正な応答と修復の割合を集計できること"""
+    root = str(tmp_path / "logs")
+    _write_scene_log(
+        root,
+        "sim_20240101_120000",
+        "s1",
+        [
+            _turn(1, "alice", llm_model="model-a"),
+            _turn(2, "bob", llm_model="model-a", response_repaired=True),
+            _turn(
+                3,
+                "alice",
+                think="（エラーにより思考できませんでした: InvalidLLMResponseError）",
+                llm_model="model-a",
+            ),
+            _turn(4, "bob", llm_model="model-b"),
+        ],
+    )
+
+    models = analyze_logs(root).to_dict()["models"]
+
+    assert models["model-a"]["turns"] == 3
+    assert models["model-a"]["invalid_responses"] == 1
+    assert models["model-a"]["repair_rate"] == pytest.approx(1 / 3)
+    assert models["model-b"]["invalid_rate"] == 0.0
@@ -0,0 +1,227 @@
+"""
+キャンペーン実行ツールのユニットテスト
+"""
+
+import json
+import os
+
+import pytest
+
+from src.project_anima.campaign import (
+    CampaignDefinition,
+    CampaignError,
+    CampaignRunner,
+    build_fallback_summary,
+)
+from src.project_anima.core.data_models import SceneInfoData, SceneLogData, TurnData
+
+
+class FakeEngine:
+    """CampaignRunnerから使われる部分だけを実装したエンジン"""
+
+    def __init__(self, log_dir, scene_file, previous_summary, previous_log):
+        self.scene_file = scene_file
+        self.previous_summary = previous_summary
+        self.previous_log = previous_log
+        self.scene_id = os.path.splitext(os.path.basename(scene_file))[0]
+        self.log_path = os.path.join(log_dir, "sim_test", f"scene_{self.scene_id}.json")
+        self.scene_log = None
+        self.long_term_calls = []
+        self.fail_long_term = set()
+
+    def start_simulation_setup(self):
+        self.scene_log = SceneLogData(
+            scene_info=SceneInfoData(
+                scene_id=self.scene_id,
+                situation=f"{self.scene_id}の状況",
+                participant_character_ids=["alice", "bob"],
+            ),
+            interventions_in_scene=[],
+            turns=[],
+        )
+        return True
+
+    def execute_one_turn(self):
+        turn_number = len(self.scene_log.turns) + 1
+        character_id = ["alice", "bob"][turn_number % 2]
+        self.scene_log.turns.append(
+            TurnData(
+                turn_number=turn_number,
+                character_id=character_id,
+                character_name=character_id,
+                think="考える",
+                talk=f"{self.scene_id}の発言{turn_number}",
+            )
+        )
+        return True
+
+    def get_current_scene_log(self):
+        return self.scene_log
+
+    def wait_for_memory_consolidation(self, timeout=None):
+        return {}
+
+    def get_scene_log_file_path(self):
+        return self.log_path
+
+    def end_simulation(self, update_long_term=True):
+        assert update_long_term is False
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        with open(self.log_path, "w", encoding="utf-8") as f:
+            json.dump(self.scene_log.model_dump(), f, ensure_ascii=False)
+
+    def attach_scene_log(self, scene_log):
+        self.scene_log = scene_log
+
+    def update_long_term_info_batch(self, character_ids, max_workers=None):
+        self.long_term_calls.append(list(character_ids))
+        return {
+            c: (None if c in self.fail_long_term else {"new_experiences": []})
+            for c in character_ids
+        }
+
+
+def _definition():
+    return CampaignDefinition(
+        campaign_id="test_campaign",
+        max_turns_per_scene=2,
+        scenes=[
+            {"scene_file": "scenes/first.yaml"},
+            {"scene_file": "scenes/second.yaml", "max_turns": 3},
+        ],
+    )
+
+
+def _summarize(engine, scene_log):
+    return f"{scene_log.scene_info.scene_id}のサマリー"
+
+
+class EngineRecorder:
+    """作成したFakeEngineを記録するファクトリ"""
+
+    def __init__(self, log_dir, fail_on=None):
+        self.log_dir = log_dir
+        self.engines = []
+        self.fail_on = fail_on
+
+    def __call__(self, scene_file, previous_summary, previous_log):
+        if scene_file == self.fail_on:
+            raise RuntimeError("中断")
+        engine = FakeEngine(self.log_dir, scene_file, previous_summary, previous_log)
+        self.engines.append(engine)
+        return engine
+
+
+def test_run_chains_previous_scene_summary(tmp_path):
+    """前の場面のサマリーとログが次の場面に渡されること"""
+    state_path = str(tmp_path / "state.json")
+    factory = EngineRecorder(str(tmp_path))
+
+    state = CampaignRunner(_definition(), state_path, factory, _summarize).run()
+
+    first, second = factory.engines
+    assert first.previous_summary is None
+    assert second.previous_summary == "firstのサマリー"
+    assert second.previous_log == first.log_path
+
+    assert state.is_completed
+    assert [s.turns_executed for s in state.scenes] == [2, 3]
+    assert state.scenes[0].simulation_id == "sim_test"
+    assert state.scenes[1].long_term_updated == ["alice", "bob"]
+
+    with open(state_path, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved["scenes"][1]["summary"] == "secondのサマリー"
+
+
+def test_resume_skips_completed_scenes(tmp_path):
+    """中断後の再実行では完了済みの場面をやり直さないこと"""
+    state_path = str(tmp_path / "state.json")
+
+    with pytest.raises(RuntimeError):
+        CampaignRunner(
+            _definition(),
+            state_path,
+            EngineRecorder(str(tmp_path), fail_on="scenes/second.yaml"),
+            _summarize,
+        ).run()
+
+    factory = EngineRecorder(str(tmp_path))
+    state = CampaignRunner(_definition(), state_path, factory, _summarize).run()
+
+    assert [e.scene_file for e in factory.engines] == ["scenes/second.yaml"]
+    assert factory.engines[0].previous_summary == "firstのサマリー"
+    assert state.is_completed
+
+
+def test_resume_updates_only_pending_long_term(tmp_path):
+    """長期情報の更新途中で中断した場面は、未更新のキャラクターのみ更新すること"""
+    state_path = str(tmp_path / "state.json")
+    definition = CampaignDefinition(
+        campaign_id="test_campaign", scenes=[{"scene_file": "scenes/first.yaml"}]
+    )
+
+    class FailingBobRecorder(EngineRecorder):
+        def __call__(self, *args):
+            engine = super().__call__(*args)
+            engine.fail_long_term = {"bob"}
+            return engine
+
+    state = CampaignRunner(
+        definition, state_path, FailingBobRecorder(str(tmp_path)), _summarize
+    ).run()
+    assert state.scenes[0].long_term_failed == ["bob"]
+    # 失敗したキャラクターが残っている場面は完了扱いにしない
+    assert state.scenes[0].status == "simulated"
+    assert not state.is_completed
+
+    # 再実行すると失敗したキャラクターのみ更新する
+    factory = EngineRecorder(str(tmp_path))
+    state = CampaignRunner(definition, state_path, factory, _summarize).run()
+
+    engine = factory.engines[0]
+    assert engine.long_term_calls == [["bob"]]
+    assert engine.scene_log.scene_info.scene_id == "first"
+    assert state.scenes[0].long_term_updated == ["alice", "bob"]
+    assert state.scenes[0].long_term_failed == []
+
+
+def test_mismatched_state_file_is_rejected(tmp_path):
+    """別のキャンペーンの状態ファイルは使用しないこと"""
+    state_path = str(tmp_path / "state.json")
+    CampaignRunner(
+        _definition(), state_path, EngineRecorder(str(tmp_path)), _summarize
+    ).run()
+
+    other = CampaignDefinition(
+        campaign_id="test_campaign", scenes=[{"scene_file": "scenes/other.yaml"}]
+    )
+    with pytest.raises(CampaignError):
+        CampaignRunner(other, state_path, EngineRecorder(str(tmp_path)), _summarize)
+
+
+def test_build_fallback_summary():
+    """LLMを使わないサマリーに場面の状況と直近の発言が含まれること"""
+    scene_log = SceneLogData(
+        scene_info=SceneInfoData(
+            scene_id="s1",
+            location="屋上",
+            situation="放課後の屋上",
+            participant_character_ids=["alice"],
+        ),
+        interventions_in_scene=[],
+        turns=[
+            TurnData(
+                turn_number=1,
+                character_id="alice",
+                character_name="アリス",
+                think="考える",
+                talk="こんにちは",
+            )
+        ],
+    )
+
+    summary = build_fallback_summary(scene_log)
+
+    assert "放課後の屋上" in summary
+    assert "アリス：「こんにちは」" in summary
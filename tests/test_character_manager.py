@@ -241,3 +241,185 @@ def test_update_long_term_context_with_file_save(tmp_path):
     assert len(updated_data.experiences) == 2
     assert len(updated_data.goals) == 2
     assert len(updated_data.memories) == 1
+
+
+def _write_test_character(base_path, name="テスト太郎"):
+    """ホットリロード確認用のキャラクターファイルを作成する"""
+    char_dir = base_path / "reload_char"
+    char_dir.mkdir(exist_ok=True)
+    with open(char_dir / "immutable.yaml", "w", encoding="utf-8") as f:
+        yaml.dump(
+            {
+                "character_id": "reload_char",
+                "name": name,
+                "base_personality": "真面目",
+            },
+            f,
+            allow_unicode=True,
+        )
+    if not (char_dir / "long_term.yaml").exists():
+        with open(char_dir / "long_term.yaml", "w", encoding="utf-8") as f:
+            yaml.dump({"character_id": "reload_char"}, f, allow_unicode=True)
+    return char_dir
+
+
+def test_hot_reload_changed_file(tmp_path):
+    """ファイルが変更された場合は該当ファイルのみ再読み込みされること"""
+    _write_test_character(tmp_path)
+    manager = CharacterManager(str(tmp_path), reload_check_interval=0)
+    long_term_before = manager.get_long_term_context("reload_char")
+    version_before = manager.get_character_version("reload_char")
+
+    _write_test_character(tmp_path, name="テスト次郎（改名後）")
+
+    assert manager.get_immutable_context("reload_char").name == "テスト次郎（改名後）"
+    assert manager.get_long_term_context("reload_char") is long_term_before
+    assert manager.get_character_version("reload_char") == version_before + 1
+
+
+def test_hot_reload_is_throttled(tmp_path):
+    """確認間隔内はファイルの変更を確認しないこと"""
+    _write_test_character(tmp_path)
+    manager = CharacterManager(str(tmp_path), reload_check_interval=3600)
+    manager.get_immutable_context("reload_char")
+
+    _write_test_character(tmp_path, name="テスト次郎（改名後）")
+
+    assert manager.get_immutable_context("reload_char").name == "テスト太郎"
+
+    manager.reload_character("reload_char")
+    assert manager.get_immutable_context("reload_char").name == "テスト次郎（改名後）"
+
+
+def test_hot_reload_keeps_cache_on_invalid_yaml(tmp_path):
+    """編集途中の不正なYAMLでは既存のキャッシュを使い続けること"""
+    char_dir = _write_test_character(tmp_path)
+    manager = CharacterManager(str(tmp_path), reload_check_interval=0)
+    manager.get_immutable_context("reload_char")
+    version = manager.get_character_version("reload_char")
+
+    with open(char_dir / "immutable.yaml", "w", encoding="utf-8") as f:
+        f.write("name: [unterminated\n")
+
+    assert manager.get_immutable_context("reload_char").name == "テスト太郎"
+    assert manager.get_character_version("reload_char") == version
+
+
+def test_update_long_term_context_does_not_trigger_reload(tmp_path):
+    """自身による書き込みは外部からの変更として扱われないこと"""
+    _write_test_character(tmp_path)
+    manager = CharacterManager(str(tmp_path), reload_check_interval=0)
+    new_data = LongTermCharacterData(
+        character_id="reload_char",
+        goals=[GoalData(goal="新しい目標", importance=5)],
+    )
+
+    manager.update_long_term_context("reload_char", new_data)
+    version = manager.get_character_version("reload_char")
+
+    assert manager.get_long_term_context("reload_char") is new_data
+    assert manager.get_character_version("reload_char") == version
+
+
+def test_write_behind_coalesces_and_flushes(tmp_path):
+    """遅延書き込みでは更新がすぐにメモリへ反映され、連続した更新は最後の内容のみ書き込まれること"""
+    char_dir = _write_test_character(tmp_path)
+    manager = CharacterManager(str(tmp_path), write_behind=True, write_behind_delay=30)
+    manager.get_long_term_context("reload_char")
+
+    try:
+        for importance in (3, 9):
+            manager.update_long_term_context(
+                "reload_char",
+                LongTermCharacterData(
+                    character_id="reload_char",
+                    goals=[GoalData(goal="新しい目標", importance=importance)],
+                ),
+            )
+
+        assert manager.get_long_term_context("reload_char").goals[0].importance == 9
+        assert manager.get_pending_writes() == ["reload_char"]
+        assert "goals" not in load_yaml(str(char_dir / "long_term.yaml"))
+
+        assert manager.flush(timeout=5)
+        assert manager.get_pending_writes() == []
+        saved = load_yaml(str(char_dir / "long_term.yaml"))
+        assert saved["goals"] == [{"goal": "新しい目標", "importance": 9}]
+    finally:
+        assert manager.close(timeout=5)
+
+
+def test_write_behind_is_flushed_before_another_manager_reads(tmp_path):
+    """別のインスタンスが読み込む前と終了時に、保留中の書き込みが完了すること"""
+    _write_test_character(tmp_path)
+    writer = CharacterManager(str(tmp_path), write_behind=True, write_behind_delay=30)
+    writer.update_long_term_context(
+        "reload_char",
+        LongTermCharacterData(
+            character_id="reload_char",
+            goals=[GoalData(goal="次の場面に引き継ぐ目標", importance=6)],
+        ),
+    )
+
+    reader = CharacterManager(str(tmp_path))
+    assert reader.get_long_term_context("reload_char").goals[0].goal == (
+        "次の場面に引き継ぐ目標"
+    )
+
+    # 停止後の更新は同期的に書き込まれる
+    assert writer.close(timeout=5)
+    writer.update_long_term_context(
+        "reload_char", LongTermCharacterData(character_id="reload_char")
+    )
+    assert writer.get_pending_writes() == []
+    assert load_yaml(str(tmp_path / "reload_char" / "long_term.yaml"))["goals"] == []
+
+
+def test_preload_characters_includes_related(tmp_path):
+    """参加キャラクターと記憶に登場する関連キャラクターを並行して読み込むこと"""
+    for character_id, related_ids in (
+        ("alice", ["bob"]),
+        ("bob", ["carol", "ghost"]),
+        ("carol", []),
+    ):
+        char_dir = tmp_path / character_id
+        char_dir.mkdir()
+        with open(char_dir / "immutable.yaml", "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "character_id": character_id,
+                    "name": character_id,
+                    "base_personality": "普通",
+                },
+                f,
+            )
+        with open(char_dir / "long_term.yaml", "w", encoding="utf-8") as f:
+            yaml.dump(
+                {
+                    "character_id": character_id,
+                    "memories": [
+                        {
+                            "memory": "出会い",
+                            "scene_id_of_memory": "s1",
+                            "related_character_ids": related_ids,
+                        }
+                    ],
+                },
+                f,
+            )
+
+    manager = CharacterManager(str(tmp_path))
+    results = manager.preload_characters(["alice"], max_workers=2)
+
+    assert set(results) == {"alice", "bob", "carol", "ghost"}
+    assert results["alice"] is None
+    assert results["carol"] is None
+    assert isinstance(results["ghost"], CharacterNotFoundError)
+    assert str(tmp_path / "carol" / "long_term.yaml") in manager.get_load_timings()
+
+
+def test_preload_characters_without_related(character_manager):
+    """include_relatedがFalseの場合は指定したキャラクターのみ読み込むこと"""
+    results = character_manager.preload_characters(["char_001"], include_related=False)
+
+    assert results == {"char_001": None}
@@ -601,3 +601,60 @@ def test_extract_significant_events_with_empty_log(
 
     # 結果の検証
     assert "まだ重要な出来事は発生していません" in events_str
+
+
+def test_build_context_for_batch_long_term_update(
+    mock_character_manager, mock_scene_manager, sample_scene_log_data
+):
+    """一括更新のコンテクストで共通の出来事は1回だけ、思考と天啓は本人の節にのみ含まれること"""
+    context_builder = ContextBuilder(mock_character_manager, mock_scene_manager)
+
+    context = context_builder.build_context_for_batch_long_term_update(
+        ["test_char_1", "test_char_2"], sample_scene_log_data
+    )
+
+    shared = context["shared_scene_events_str"]
+    assert context["character_ids_str"] == "test_char_1, test_char_2"
+    assert shared.count("「今日この後、予定ある？」") == 1
+    assert "突然、廊下から大きな物音がした" in shared
+    assert "テスト花子はあなたに好意を持っているようだ" not in shared
+    assert "カフェか、いいね！" not in shared
+
+    sections = context["character_sections_str"].split("## ")[1:]
+    assert len(sections) == 2
+    assert "テスト花子はあなたに好意を持っているようだ" in sections[0]
+    assert "カフェか、いいね！" in sections[0]
+    assert "よかった、誘えそう" not in sections[0]
+    assert "よかった、誘えそう" in sections[1]
+    assert "テスト花子はあなたに好意を持っているようだ" not in sections[1]
+
+
+def test_build_context_includes_new_events_since_last_turn(
+    mock_character_manager, mock_scene_manager, sample_turn_data
+):
+    """include_new_events指定時、前回行動してからの出来事のみを含めること"""
+    context_builder = ContextBuilder(mock_character_manager, mock_scene_manager)
+
+    # test_char_2の直近の行動（ターン5）以降はtest_char_1のターン6のみ
+    context_dict = context_builder.build_context_for_character(
+        "test_char_2", sample_turn_data, include_new_events=True
+    )
+    new_events = context_dict["new_events_context"]
+    assert "【あなたが前回行動してからの出来事】" in new_events
+    assert "今から行こうか" in new_events
+    assert "駅の近く" not in new_events
+
+    # 直近のターンが自分の場合は新しい出来事がない
+    context_dict = context_builder.build_context_for_character(
+        "test_char_1", sample_turn_data, include_new_events=True
+    )
+    assert "新しい出来事はありません" in context_dict["new_events_context"]
+
+    # 短期ログに自分の行動がない場合と、指定しない場合は含めない
+    context_dict = context_builder.build_context_for_character(
+        "test_char_1", sample_turn_data[:1], include_new_events=True
+    )
+    assert "new_events_context" not in context_dict
+    assert "new_events_context" not in context_builder.build_context_for_character(
+        "test_char_2", sample_turn_data
+    )
@@ -270,3 +270,63 @@ class TestSceneLogData:
         assert scene_log.scene_info.scene_id == "S002"
         assert len(scene_log.interventions_in_scene) == 0
         assert len(scene_log.turns) == 0
+
+    def _make_scene_log(self):
+        return SceneLogData(
+            scene_info=SceneInfoData(
+                scene_id="S003",
+                situation="インデックスのテスト",
+                participant_character_ids=["c001", "c002"],
+            )
+        )
+
+    def _make_turn(self, turn_number, character_id):
+        return TurnData(
+            turn_number=turn_number,
+            character_id=character_id,
+            character_name=character_id,
+            think="考える",
+        )
+
+    def _make_revelation(self, turn_number, target_character_id):
+        return InterventionData(
+            applied_before_turn_number=turn_number,
+            intervention_type="REVELATION",
+            intervention=RevelationDetails(
+                description="テスト用の天啓", revelation_content="天啓"
+            ),
+            target_character_id=target_character_id,
+        )
+
+    def test_turn_index_by_character(self):
+        """キャラクター別のターンを取得できること（直接追加された分も含む）"""
+        scene_log = self._make_scene_log()
+        scene_log.append_turn(self._make_turn(1, "c001"))
+        scene_log.append_turn(self._make_turn(2, "c002"))
+        scene_log.turns.append(self._make_turn(3, "c001"))
+
+        turns = scene_log.get_turns_by_character("c001")
+        assert [turn.turn_number for turn in turns] == [1, 3]
+        assert scene_log.get_turns_by_character("c001", limit=1)[0].turn_number == 3
+        assert scene_log.get_turns_by_character("c003") == []
+
+        # リストが置き換えられた場合はインデックスを作り直す
+        scene_log.turns = [self._make_turn(1, "c002")]
+        assert scene_log.get_turns_by_character("c001") == []
+
+        # 同じ長さ以上のリストに置き換えられた場合も作り直す
+        scene_log.turns = [self._make_turn(1, "c001"), self._make_turn(2, "c002")]
+        assert [t.turn_number for t in scene_log.get_turns_by_character("c002")] == [2]
+        assert [t.turn_number for t in scene_log.get_turns_by_character("c001")] == [1]
+
+    def test_intervention_index_by_target(self):
+        """対象キャラクターと場面全体への介入を発生順に取得できること"""
+        scene_log = self._make_scene_log()
+        scene_log.append_intervention(self._make_revelation(1, "c001"))
+        scene_log.append_intervention(self._make_revelation(2, None))
+        scene_log.append_intervention(self._make_revelation(3, "c002"))
+        scene_log.interventions_in_scene.append(self._make_revelation(4, "c001"))
+
+        interventions = scene_log.get_interventions_for_character("c001")
+        assert [i.applied_before_turn_number for i in interventions] == [1, 2, 4]
+        assert "_turn_indices_by_character" not in scene_log.model_dump()
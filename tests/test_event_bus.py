@@ -0,0 +1,62 @@
+"""
+SimulationEventBusのユニットテスト
+"""
+
+from unittest import mock
+
+from src.project_anima.core.event_bus import (
+    SimulationEvent,
+    SimulationEventBus,
+    SimulationEventType,
+)
+
+
+def test_publish_notifies_all_subscribers():
+    """発行したイベントが全ての購読者に届くこと"""
+    bus = SimulationEventBus()
+    received_a = []
+    received_b = []
+    bus.subscribe(received_a.append)
+    bus.subscribe(received_b.append)
+
+    event = bus.publish(SimulationEventType.TURN_RECORDED, {"turn_number": 1})
+
+    assert isinstance(event, SimulationEvent)
+    assert received_a == [event]
+    assert received_b == [event]
+    assert event.payload == {"turn_number": 1}
+
+
+def test_sequence_is_monotonic():
+    """イベント番号が単調増加すること"""
+    bus = SimulationEventBus()
+    first = bus.publish(SimulationEventType.STATUS_CHANGED)
+    second = bus.publish(SimulationEventType.LTM_UPDATED)
+
+    assert second.sequence == first.sequence + 1
+
+
+def test_unsubscribe_stops_notifications():
+    """購読解除後はイベントが届かないこと"""
+    bus = SimulationEventBus()
+    callback = mock.Mock()
+    bus.subscribe(callback)
+    bus.unsubscribe(callback)
+
+    bus.publish(SimulationEventType.INTERVENTION_APPLIED)
+
+    callback.assert_not_called()
+    assert bus.subscriber_count == 0
+
+
+def test_failing_subscriber_does_not_affect_others():
+    """購読者の例外が他の購読者への通知を妨げないこと"""
+    bus = SimulationEventBus()
+    failing = mock.Mock(side_effect=RuntimeError("boom"))
+    received = []
+    bus.subscribe(failing)
+    bus.subscribe(received.append)
+
+    bus.publish(SimulationEventType.TURN_RECORDED)
+
+    assert len(received) == 1
@@ -106,6 +106,36 @@ class TestInformationUpdater(unittest.TestCase):
         self.assertEqual(turn2.character_name, "ボブ")
         self.assertEqual(turn2.talk, "やあ、アリス。いい天気だね")
 
+    def test_record_turn_with_metadata(self):
+        """ターンの開始時刻とLLM呼び出し情報がメタデータとして記録されること"""
+        from datetime import datetime
+
+        started_at = datetime(2024, 1, 1, 12, 0, 0)
+        self.updater.record_turn_to_short_term_log(
+            self.scene_log_data,
+            "char_001",
+            "アリス",
+            "考えている",
+            None,
+            "こんにちは",
+            turn_started_at=started_at,
+            generation_info={
+                "llm_model": "gemini-1.5-flash-latest",
+                "llm_latency_ms": 850.5,
+                "prompt_chars": 1200,
+                "response_chars": 80,
+                "prompt_tokens": None,
+            },
+        )
+
+        metadata = self.scene_log_data.turns[0].metadata
+        self.assertEqual(metadata.started_at, started_at.isoformat())
+        self.assertIsNotNone(metadata.ended_at)
+        self.assertEqual(metadata.llm_model, "gemini-1.5-flash-latest")
+        self.assertEqual(metadata.llm_latency_ms, 850.5)
+        self.assertEqual(metadata.prompt_chars, 1200)
+        self.assertIsNone(metadata.prompt_tokens)
+
     def test_record_turn_with_null_act_and_talk(self):
         """行動と発言がNoneの場合も正しく記録されること"""
         self.updater.record_turn_to_short_term_log(
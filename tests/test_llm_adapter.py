@@ -18,6 +18,7 @@ from src.project_anima.core.llm_adapter import (
     LLMGenerationError,
     InvalidLLMResponseError,
 )
+from src.project_anima.core.structured_output import ResponseStats
 
 
 class TestLLMAdapter(TestCase):
@@ -206,6 +207,31 @@ class TestLLMAdapter(TestCase):
             # 一時ファイルを削除
             os.unlink(temp_path)
 
+    def test_generate_character_thought_records_generation_info(self):
+        """思考生成時にLLM呼び出しの計測情報が記録されること"""
+        self.mock_response.usage_metadata = mock.MagicMock(
+            prompt_token_count=120, candidates_token_count=30, total_token_count=150
+        )
+
+        with tempfile.NamedTemporaryFile(mode="w+", delete=False) as temp_file:
+            temp_file.write(self.test_template_content)
+            temp_path = temp_file.name
+
+        try:
+            adapter = LLMAdapter()
+            adapter.generate_character_thought(self.test_context_dict, temp_path)
+
+            info = adapter.last_generation_info
+            self.assertEqual(info["llm_model"], "gemini-1.5-flash-latest")
+            self.assertGreaterEqual(info["llm_latency_ms"], 0)
+            self.assertEqual(info["response_chars"], len(self.mock_response.text))
+            self.assertGreater(info["prompt_chars"], 0)
+            self.assertEqual(info["prompt_tokens"], 120)
+            self.assertEqual(info["completion_tokens"], 30)
+            self.assertEqual(info["total_tokens"], 150)
+        finally:
+            os.unlink(temp_path)
+
     def test_generate_character_thought_api_error(self):
         """LLM API呼び出しエラー時に適切な例外を発生させること"""
         # APIエラーをシミュレート
@@ -242,6 +268,99 @@ class TestLLMAdapter(TestCase):
             # 一時ファイルを削除
             os.unlink(temp_path)
 
+    def test_generate_character_thought_repairs_invalid_response_once(self):
+        """不正な応答は1回だけ修復を依頼し、修復できれば結果を返すこと"""
+        invalid_response = mock.MagicMock(text="これはJSONではないテキスト")
+        repaired_response = mock.MagicMock(
+            text=json.dumps({"think": "修復", "act": "", "talk": "はい"})
+        )
+        self.mock_model.generate_content.side_effect = [
+            invalid_response,
+            repaired_response,
+        ]
+
+        with tempfile.NamedTemporaryFile(mode="w+", delete=False) as temp_file:
+            temp_file.write(self.test_template_content)
+            temp_path = temp_file.name
+
+        try:
+            stats = ResponseStats()
+            adapter = LLMAdapter(stats=stats)
+            result = adapter.generate_character_thought(
+                self.test_context_dict, temp_path
+            )
+
+            self.assertEqual(result["think"], "修復")
+            self.assertEqual(self.mock_model.generate_content.call_count, 2)
+            self.assertTrue(adapter.last_generation_info["response_repaired"])
+            self.assertEqual(stats.to_dict()["gemini-1.5-flash-latest"]["repaired"], 1)
+        finally:
+            os.unlink(temp_path)
+
+    def test_generate_character_thought_passes_response_schema(self):
+        """構造化出力が有効な場合はJSONスキーマを指定して呼び出すこと"""
+        with tempfile.NamedTemporaryFile(mode="w+", delete=False) as temp_file:
+            temp_file.write(self.test_template_content)
+            temp_path = temp_file.name
+
+        try:
+            adapter = LLMAdapter()
+            adapter.generate_character_thought(self.test_context_dict, temp_path)
+
+            config = self.mock_model.generate_content.call_args.kwargs[
+                "generation_config"
+            ]
+            self.assertEqual(config["response_mime_type"], "application/json")
+            self.assertEqual(
+                config["response_schema"]["required"], ["think", "act", "talk"]
+            )
+        finally:
+            os.unlink(temp_path)
+
+    def test_structured_output_falls_back_when_unsupported(self):
+        """スキーマ指定が受け付けられない場合は通常の呼び出しに切り替えること"""
+
+        def generate_content(prompt, generation_config=None):
+            if generation_config is not None:
+                raise ValueError("response_schema is not supported")
+            return self.mock_response
+
+        self.mock_model.generate_content.side_effect = generate_content
+
+        with tempfile.NamedTemporaryFile(mode="w+", delete=False) as temp_file:
+            temp_file.write(self.test_template_content)
+            temp_path = temp_file.name
+
+        try:
+            adapter = LLMAdapter()
+            result = adapter.generate_character_thought(
+                self.test_context_dict, temp_path
+            )
+
+            self.assertEqual(result["act"], "テスト用の行動内容")
+            self.assertFalse(adapter.structured_output)
+        finally:
+            os.unlink(temp_path)
+
+    def test_structured_output_kept_for_unrelated_errors(self):
+        """スキーマと無関係な引数エラーでは構造化出力を無効にしないこと"""
+        self.mock_model.generate_content.side_effect = ValueError("prompt is too long")
+
+        with tempfile.NamedTemporaryFile(mode="w+", delete=False) as temp_file:
+            temp_file.write(self.test_template_content)
+            temp_path = temp_file.name
+
+        try:
+            adapter = LLMAdapter()
+            with self.assertRaises(LLMGenerationError):
+                adapter.generate_character_thought(self.test_context_dict, temp_path)
+
+            self.assertTrue(adapter.structured_output)
+            for call in self.mock_model.generate_content.call_args_list:
+                self.assertIn("generation_config", call.kwargs)
+        finally:
+            os.unlink(temp_path)
+
     def test_generate_character_thought_missing_keys(self):
         """必須キーが欠けたLLM応答に対して適切な例外を発生させること"""
         # 必須キーが欠けたJSONをシミュレート
@@ -266,6 +385,69 @@ class TestLLMAdapter(TestCase):
             # 一時ファイルを削除
             os.unlink(temp_path)
 
+    def test_chat_session_sends_only_new_events_after_first_turn(self):
+        """会話モードでは2回目以降のターンで新しい出来事のみをやり取りに続けて送信すること"""
+        with tempfile.NamedTemporaryFile(mode="w+", delete=False) as temp_file:
+            temp_file.write(self.test_template_content)
+            template_path = temp_file.name
+        with tempfile.NamedTemporaryFile(mode="w+", delete=False) as temp_file:
+            temp_file.write("{{new_events_context}}\nJSONで返してください。")
+            session_template_path = temp_file.name
+
+        try:
+            adapter = LLMAdapter(stats=ResponseStats())
+            adapter.enable_chat_sessions()
+            adapter.generate_character_thought_in_session(
+                "char_001", self.test_context_dict, template_path, session_template_path
+            )
+            first_prompt = self.mock_model.generate_content.call_args[0][0]
+
+            context = {**self.test_context_dict, "new_events_context": "新しい出来事"}
+            adapter.generate_character_thought_in_session(
+                "char_001", context, template_path, session_template_path
+            )
+            contents = self.mock_model.generate_content.call_args[0][0]
+
+            # 長期情報が変わった場合はセッションを作り直して全文を送信する
+            changed = {**context, "long_term_context": "更新された長期情報"}
+            adapter.generate_character_thought_in_session(
+                "char_001", changed, template_path, session_template_path
+            )
+            rebuilt_prompt = self.mock_model.generate_content.call_args[0][0]
+        finally:
+            os.unlink(template_path)
+            os.unlink(session_template_path)
+
+        self.assertIsInstance(first_prompt, str)
+        self.assertIn("テスト用の不変情報", first_prompt)
+        self.assertEqual(
+            [message["role"] for message in contents], ["user", "model", "user"]
+        )
+        self.assertEqual(contents[0]["parts"], [first_prompt])
+        self.assertEqual(contents[2]["parts"], ["新しい出来事\nJSONで返してください。"])
+        self.assertIsInstance(rebuilt_prompt, str)
+        self.assertIn("更新された長期情報", rebuilt_prompt)
+        self.assertEqual(adapter.chat_sessions.rebuilds, 1)
+
+    def test_chat_session_is_discarded_on_error(self):
+        """会話モードで生成に失敗した場合はセッションを破棄すること"""
+        self.mock_model.generate_content.side_effect = Exception("API Error")
+
+        with tempfile.NamedTemporaryFile(mode="w+", delete=False) as temp_file:
+            temp_file.write(self.test_template_content)
+            template_path = temp_file.name
+
+        try:
+            adapter = LLMAdapter(stats=ResponseStats())
+            with self.assertRaises(LLMGenerationError):
+                adapter.generate_character_thought_in_session(
+                    "char_001", self.test_context_dict, template_path, template_path
+                )
+        finally:
+            os.unlink(template_path)
+
+        self.assertNotIn("char_001", adapter.chat_sessions)
+
     def test_update_character_long_term_info_dummy(self):
         """update_character_long_term_infoメソッドのダミー実装をテスト"""
         # 実装済みのメソッドなので、このテストはスキップ
@@ -322,6 +504,40 @@ class TestLLMAdapter(TestCase):
             # 一時ファイルを削除
             os.unlink(template_path)
 
+    def test_update_long_term_info_batch_filters_invalid_proposals(self):
+        """一括更新の応答から、不正な提案と依頼していないキャラクターの提案を除外すること"""
+        valid_proposal = {
+            "new_experiences": [{"event": "カフェに行った", "importance": 6}],
+            "updated_goals": [],
+            "new_memories": [],
+        }
+        self.mock_response.text = json.dumps(
+            {
+                "updates": [
+                    {"character_id": "test_char_1", **valid_proposal},
+                    {"character_id": "test_char_2", "new_experiences": "不正"},
+                    {"character_id": "stranger", **valid_proposal},
+                ]
+            }
+        )
+
+        with tempfile.NamedTemporaryFile(mode="w+", delete=False) as temp_file:
+            temp_file.write("{{character_ids_str}}{{shared_scene_events_str}}")
+            template_path = temp_file.name
+
+        try:
+            adapter = LLMAdapter(stats=ResponseStats())
+            result = adapter.update_long_term_info_batch(
+                ["test_char_1", "test_char_2"],
+                {"character_ids_str": "test_char_1, test_char_2"},
+                template_path,
+            )
+        finally:
+            os.unlink(template_path)
+
+        self.assertEqual(result, {"test_char_1": valid_proposal})
+        self.mock_model.generate_content.assert_called_once()
+
     def test_update_character_long_term_info_api_error(self):
         """update_character_long_term_infoメソッドがAPI呼び出しエラーを適切に処理することをテスト"""
         # テスト用の長期情報更新コンテキスト
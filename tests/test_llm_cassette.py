@@ -0,0 +1,143 @@
+"""
+LLM呼び出しの記録・再生（カセット）のテスト
+"""
+
+import json
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from src.project_anima.core.llm_adapter import LLMAdapter, LLMAdapterError
+from src.project_anima.core.llm_cassette import (
+    CassetteMissError,
+    LLMCassette,
+    RecordingModel,
+    ReplayedAPIError,
+    ReplayModel,
+)
+from src.project_anima.core.structured_output import ResponseStats
+
+BASE_CONFIG = {"temperature": 0.7}
+
+
+class FakeModel:
+    """呼び出しごとに異なる応答を返すモデル"""
+
+    def __init__(self, fail_on=None):
+        self.calls = 0
+        self.fail_on = fail_on
+
+    def generate_content(self, prompt, generation_config=None):
+        self.calls += 1
+        if prompt == self.fail_on:
+            raise RuntimeError("quota exceeded")
+        return SimpleNamespace(
+            text=f"{prompt}への応答{self.calls}",
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=10, candidates_token_count=self.calls
+            ),
+        )
+
+
+def _record(path, prompts, fail_on=None):
+    """プロンプトを順に送信してカセットに記録する"""
+    recorder = RecordingModel(
+        FakeModel(fail_on), LLMCassette(path), lambda: "fake-model", BASE_CONFIG
+    )
+    for prompt in prompts:
+        try:
+            recorder.generate_content(prompt)
+        except RuntimeError:
+            pass
+
+
+def test_replay_returns_recorded_responses_in_order(tmp_path):
+    """同じプロンプトの記録は記録順に再生され、トークン数も再現されること"""
+    path = str(tmp_path / "session.jsonl")
+    _record(path, ["A", "B", "A"])
+
+    with open(path, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    assert [e["model"] for e in entries] == ["fake-model"] * 3
+    assert "prompt" not in entries[0]
+
+    replay = ReplayModel(LLMCassette(path), BASE_CONFIG)
+    first = replay.generate_content("A")
+    assert first.text == "Aへの応答1"
+    assert first.usage_metadata.candidates_token_count == 1
+    assert replay.generate_content("A").text == "Aへの応答3"
+    assert replay.generate_content("B").text == "Bへの応答2"
+
+
+def test_replay_miss_and_sequential_fallback(tmp_path):
+    """記録にない要求は既定では失敗し、strict=Falseでは記録順の応答を返すこと"""
+    path = str(tmp_path / "session.jsonl")
+    _record(path, ["A", "B"])
+
+    with pytest.raises(CassetteMissError):
+        ReplayModel(LLMCassette(path), BASE_CONFIG).generate_content("変更後のA")
+
+    cassette = LLMCassette(path)
+    replay = ReplayModel(cassette, BASE_CONFIG, strict=False)
+    assert replay.generate_content("変更後のA").text == "Aへの応答1"
+    assert replay.generate_content("B").text == "Bへの応答2"
+    assert cassette.misses == 1
+    assert cassette.remaining == 0
+
+
+def test_replay_reproduces_errors_and_latency(tmp_path):
+    """記録時のAPIエラーが再現され、originalでは記録時の所要時間だけ待つこと"""
+    path = str(tmp_path / "session.jsonl")
+    _record(path, ["A", "失敗"], fail_on="失敗")
+
+    cassette = LLMCassette(path)
+    cassette.entries[0].latency_ms = 50.0
+    replay = ReplayModel(cassette, BASE_CONFIG, latency="original")
+
+    started = time.perf_counter()
+    replay.generate_content("A")
+    assert time.perf_counter() - started >= 0.05
+
+    with pytest.raises(ReplayedAPIError) as excinfo:
+        replay.generate_content("失敗")
+    assert excinfo.value.error_type == "RuntimeError"
+
+
+def test_adapter_record_then_replay_without_network(tmp_path, monkeypatch):
+    """記録モードで保存した思考生成を、APIキーなしの再生モードで再現できること"""
+    path = str(tmp_path / "session.jsonl")
+    template_path = tmp_path / "think.txt"
+    template_path.write_text("あなたは{{character_name}}です。", encoding="utf-8")
+    context = {"character_name": "アリス"}
+    response_json = json.dumps({"think": "考える", "act": "", "talk": "こんにちは"})
+
+    monkeypatch.setenv("GOOGLE_API_KEY", "dummy_api_key_for_testing")
+    with mock.patch("google.generativeai.GenerativeModel") as mock_genai:
+        mock_genai.return_value.generate_content.return_value = SimpleNamespace(
+            text=response_json, usage_metadata=None
+        )
+        recorder = LLMAdapter(
+            cassette_path=path, cassette_mode="record", stats=ResponseStats()
+        )
+        recorded = recorder.generate_character_thought(context, str(template_path))
+
+    monkeypatch.delenv("GOOGLE_API_KEY")
+    with mock.patch("google.generativeai.GenerativeModel") as mock_genai:
+        with mock.patch("src.project_anima.core.llm_adapter.load_dotenv"):
+            replayer = LLMAdapter(
+                cassette_path=path, cassette_mode="replay", stats=ResponseStats()
+            )
+            replayed = replayer.generate_character_thought(context, str(template_path))
+        mock_genai.assert_not_called()
+
+    assert replayed == recorded
+    assert replayer.last_generation_info["llm_model"] == replayer.model_name
+
+
+def test_adapter_rejects_cassette_mode_without_path(monkeypatch):
+    """パスを指定せずにカセットモードを使用した場合はエラーになること"""
+    monkeypatch.delenv("PROJECT_ANIMA_LLM_CASSETTE", raising=False)
+    with pytest.raises(LLMAdapterError):
+        LLMAdapter(api_key="dummy", cassette_mode="replay")
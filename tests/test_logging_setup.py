@@ -0,0 +1,140 @@
+"""
+ログ出力の設定（logging_setup）のテスト
+"""
+
+import logging
+import os
+
+import pytest
+
+from src.project_anima.utils.logging_setup import (
+    LOG_QUEUE_HANDLER_NAME,
+    PROMPT_LOGGER_NAME,
+    PromptSampler,
+    configure_logging,
+    dump_prompt_exchange,
+    prompt_dump_enabled,
+    resolve_verbosity,
+    shutdown_logging,
+)
+
+
+@pytest.fixture(autouse=True)
+def restore_logging():
+    """テスト後にリスナーを停止し、ルートロガーのレベルを元に戻す"""
+    root_logger = logging.getLogger()
+    original_level = root_logger.level
+    yield
+    shutdown_logging()
+    root_logger.setLevel(original_level)
+
+
+def test_resolve_verbosity():
+    """詳細度の名前とログレベル名をログレベルに変換できること"""
+    assert resolve_verbosity("quiet") == logging.WARNING
+    assert resolve_verbosity("normal") == logging.INFO
+    assert resolve_verbosity("verbose") == logging.DEBUG
+    assert resolve_verbosity("ERROR") == logging.ERROR
+    assert resolve_verbosity(logging.CRITICAL) == logging.CRITICAL
+
+    with pytest.raises(ValueError):
+        resolve_verbosity("chatty")
+
+
+def test_log_records_are_written_by_listener(tmp_path):
+    """ログがキューを経由してファイルに書き込まれ、詳細度未満のログは捨てられること"""
+    log_file = str(tmp_path / "app.log")
+    pipeline = configure_logging(verbosity="normal", log_file=log_file, console=False)
+
+    queue_handlers = [
+        h
+        for h in logging.getLogger().handlers
+        if h.get_name() == LOG_QUEUE_HANDLER_NAME
+    ]
+    assert len(queue_handlers) == 1
+
+    test_logger = logging.getLogger("project_anima.test")
+    test_logger.info("ターン 1: アリス")
+    test_logger.debug("  思考: 考える")
+    pipeline.stop()
+
+    with open(log_file, encoding="utf-8") as f:
+        content = f.read()
+    assert "ターン 1: アリス" in content
+    assert "思考" not in content
+    # 停止後はルートロガーからQueueHandlerが取り除かれる
+    assert queue_handlers[0] not in logging.getLogger().handlers
+
+
+def test_prompt_dump_is_skipped_without_destination():
+    """ダンプ先が設定されていない場合はプロンプトを出力しないこと"""
+    configure_logging(console=False)
+
+    assert not prompt_dump_enabled()
+    dump_prompt_exchange("Character Thought", "プロンプト", "応答")
+
+
+def test_prompt_dump_writes_prompt_and_response(tmp_path):
+    """プロンプトと応答が1件にまとめてダンプされ、通常のログには流れないこと"""
+    log_file = str(tmp_path / "app.log")
+    dump_file = str(tmp_path / "dumps" / "prompts.log")
+    configure_logging(log_file=log_file, prompt_dump_file=dump_file, console=False)
+
+    assert prompt_dump_enabled()
+    dump_prompt_exchange(
+        "Character Thought", "アリスのプロンプト", '{"think": "..."}', model="test"
+    )
+    shutdown_logging()
+
+    with open(dump_file, encoding="utf-8") as f:
+        content = f.read()
+    assert "Character Thought model=test" in content
+    assert "アリスのプロンプト" in content
+    assert '{"think": "..."}' in content
+
+    with open(log_file, encoding="utf-8") as f:
+        assert "アリスのプロンプト" not in f.read()
+
+
+def test_prompt_dump_rotates_by_size(tmp_path):
+    """ダンプファイルが指定サイズでローテーションされること"""
+    dump_file = str(tmp_path / "prompts.log")
+    configure_logging(
+        prompt_dump_file=dump_file,
+        prompt_dump_max_bytes=500,
+        prompt_dump_backup_count=2,
+        console=False,
+    )
+
+    for index in range(10):
+        dump_prompt_exchange("Long Term Update", "x" * 200, f"応答{index}")
+    shutdown_logging()
+
+    assert os.path.exists(dump_file + ".1")
+    assert os.path.exists(dump_file + ".2")
+    assert not os.path.exists(dump_file + ".3")
+
+
+def test_prompt_dump_sampling(tmp_path):
+    """サンプリング率0の場合はダンプされないこと"""
+    dump_file = str(tmp_path / "prompts.log")
+    configure_logging(prompt_dump_file=dump_file, prompt_sample_rate=0.0, console=False)
+
+    dump_prompt_exchange("Character Thought", "プロンプト", "応答")
+    shutdown_logging()
+
+    assert os.path.getsize(dump_file) == 0
+
+
+def test_prompt_sampler_rate():
+    """PromptSamplerがおおよそ指定した割合のレコードを通すこと"""
+    sampler = PromptSampler(0.25, seed=7)
+    record = logging.getLogger(PROMPT_LOGGER_NAME).makeRecord(
+        PROMPT_LOGGER_NAME, logging.INFO, __file__, 0, "msg", None, None
+    )
+
+    passed = sum(sampler.filter(record) for _ in range(2000))
+
+    assert 400 < passed < 600
+    with pytest.raises(ValueError):
+        PromptSampler(1.5)
@@ -0,0 +1,196 @@
+"""
+長期情報の整理（memory_consolidator）のテスト
+"""
+
+from unittest import mock
+
+import yaml
+
+from src.project_anima.core.character_manager import CharacterManager
+from src.project_anima.core.data_models import (
+    ExperienceData,
+    GoalData,
+    LongTermCharacterData,
+    MemoryData,
+)
+from src.project_anima.core.memory_consolidator import (
+    MemoryConsolidator,
+    MinHashLSH,
+    char_ngrams,
+    cluster_similar_texts,
+    jaccard_similarity,
+)
+
+
+def _long_term_data(experiences=(), goals=(), memories=()):
+    return LongTermCharacterData(
+        character_id="alice",
+        experiences=[ExperienceData(event=e, importance=i) for e, i in experiences],
+        goals=[GoalData(goal=g, importance=i) for g, i in goals],
+        memories=[
+            MemoryData(memory=m, scene_id_of_memory=s, related_character_ids=r)
+            for m, s, r in memories
+        ],
+    )
+
+
+def test_char_ngrams_normalizes_text():
+    """全角・半角、空白、句読点の違いを無視してn-gramを作成すること"""
+    assert char_ngrams("ボブと 喧嘩した。") == char_ngrams("ボブと喧嘩した")
+    assert char_ngrams("ＡＢＣ") == {"ab", "bc"}
+    assert char_ngrams("あ") == {"あ"}
+    assert jaccard_similarity(set(), {"ab"}) == 0.0
+
+
+def test_cluster_similar_texts_groups_paraphrases():
+    """言い換えた本文が同じグループにまとまり、無関係な本文は分かれること"""
+    texts = [
+        "図書館でボブと本の取り合いになった",
+        "今日は晴れていた",
+        "図書館でボブと本の取り合いになってしまった",
+    ]
+
+    assert cluster_similar_texts(texts) == [[0, 2], [1]]
+
+
+def test_minhash_lsh_finds_near_duplicates():
+    """MinHash/LSHで絞り込んでも類似した本文が同じグループになること"""
+    texts = [f"{index}番目の村で祭りの準備を手伝った日のこと" for index in range(30)]
+    texts += [
+        "図書館でボブと本の取り合いになった",
+        "図書館でボブと本の取り合いになった。",
+    ]
+
+    groups = cluster_similar_texts(texts, threshold=0.9, lsh_threshold=10)
+
+    assert [30, 31] in groups
+    assert MinHashLSH().candidate_pairs([set(), {"ab"}]) == set()
+
+
+def test_consolidate_merges_and_prunes():
+    """類似項目の統合と上限による削除を行い、元のデータは変更しないこと"""
+    data = _long_term_data(
+        experiences=[
+            ("図書館でボブと本の取り合いになった", 5),
+            ("図書館でボブと本の取り合いになってしまった", 7),
+            ("雨の日に傘をなくした", 1),
+            ("森で迷子になった", 3),
+        ],
+        goals=[("ボブと仲直りしたい", 8), ("ボブと仲直りしたい！", 4)],
+        memories=[
+            ("ボブが本を譲ってくれた", "S001", ["bob"]),
+            ("ボブが本を譲ってくれた。", "S002", ["carol"]),
+            ("キャロルに挨拶した", "S002", []),
+        ],
+    )
+    consolidator = MemoryConsolidator(max_experiences=2, max_memories=1)
+
+    consolidated, result = consolidator.consolidate(data)
+
+    assert [(e.event, e.importance) for e in consolidated.experiences] == [
+        ("図書館でボブと本の取り合いになってしまった", 7),
+        ("森で迷子になった", 3),
+    ]
+    assert [(g.goal, g.importance) for g in consolidated.goals] == [
+        ("ボブと仲直りしたい！", 8)
+    ]
+    assert [m.memory for m in consolidated.memories] == ["キャロルに挨拶した"]
+    assert result.merged == 3
+    assert result.pruned == 2
+    assert result.after == {"experiences": 2, "goals": 1, "memories": 1}
+    assert len(data.experiences) == 4
+
+    # 上限がなければ記憶は最新の項目に統合され、関連キャラクターが引き継がれる
+    unbounded, unbounded_result = MemoryConsolidator().consolidate(data)
+    assert unbounded.memories[0].scene_id_of_memory == "S002"
+    assert unbounded.memories[0].related_character_ids == ["bob", "carol"]
+    assert unbounded_result.pruned == 0
+
+
+def test_consolidate_uses_summarizer_for_large_clusters():
+    """項目数の多いグループはsummarizerの結果で置き換え、失敗時は要約せずに統合すること"""
+    data = _long_term_data(
+        experiences=[
+            ("ボブと図書館で本の取り合いをした", 4),
+            ("ボブと図書館で本の取り合いをした日", 6),
+            ("ボブと図書館で本の取り合いをしたこと", 5),
+        ]
+    )
+    summarizer = mock.Mock(return_value="ボブと図書館で本を取り合った")
+
+    consolidated, result = MemoryConsolidator(summarizer=summarizer).consolidate(data)
+
+    summarizer.assert_called_once()
+    assert summarizer.call_args.args[0] == "experience"
+    assert consolidated.experiences[0].event == "ボブと図書館で本を取り合った"
+    assert consolidated.experiences[0].importance == 6
+    assert result.summarized == 1
+
+    summarizer.side_effect = RuntimeError("LLMエラー")
+    consolidated, result = MemoryConsolidator(summarizer=summarizer).consolidate(data)
+    assert consolidated.experiences[0].event == "ボブと図書館で本の取り合いをした日"
+    assert result.summarized == 0
+
+
+def test_submit_saves_only_changed_characters():
+    """バックグラウンドで整理し、変更があったキャラクターのみ保存すること"""
+    character_manager = mock.Mock()
+    character_manager.get_long_term_context_with_version.side_effect = (
+        lambda character_id: (
+            (
+                _long_term_data(experiences=[("森で迷子になった", 3)] * 2)
+                if character_id == "alice"
+                else _long_term_data(experiences=[("森で迷子になった", 3)])
+            ),
+            1,
+        )
+    )
+    consolidator = MemoryConsolidator()
+
+    try:
+        results = consolidator.submit(character_manager, ["alice", "bob"]).result(
+            timeout=5
+        )
+    finally:
+        consolidator.shutdown()
+
+    assert results["alice"].merged == 1
+    assert not results["bob"].changed
+    character_manager.update_long_term_context.assert_called_once()
+    assert character_manager.update_long_term_context.call_args.args[0] == "alice"
+
+
+def test_consolidation_does_not_overwrite_concurrent_update(tmp_path):
+    """整理中に長期情報が更新された場合は、その更新を上書きしないこと"""
+    char_dir = tmp_path / "alice"
+    char_dir.mkdir()
+    with open(char_dir / "immutable.yaml", "w", encoding="utf-8") as f:
+        yaml.dump(
+            {"character_id": "alice", "name": "アリス", "base_personality": "明るい"},
+            f,
+            allow_unicode=True,
+        )
+    with open(char_dir / "long_term.yaml", "w", encoding="utf-8") as f:
+        yaml.dump(
+            _long_term_data(experiences=[("森で迷子になった", 3)] * 2).model_dump(),
+            f,
+            allow_unicode=True,
+        )
+    character_manager = CharacterManager(str(tmp_path))
+    consolidator = MemoryConsolidator()
+    concurrent_update = _long_term_data(experiences=[("新しい経験", 5)])
+    consolidate = consolidator.consolidate
+
+    def consolidate_while_updating(data):
+        character_manager.update_long_term_context("alice", concurrent_update)
+        return consolidate(data)
+
+    with mock.patch.object(
+        consolidator, "consolidate", side_effect=consolidate_while_updating
+    ):
+        result = consolidator.consolidate_character(character_manager, "alice")
+
+    assert result.changed and result.discarded
+    assert character_manager.get_long_term_context("alice") == concurrent_update
+    reloaded = CharacterManager(str(tmp_path)).get_long_term_context("alice")
+    assert [e.event for e in reloaded.experiences] == ["新しい経験"]
@@ -0,0 +1,132 @@
+"""
+プロンプトキャッシュ（prompt_cache）のテスト
+"""
+
+import json
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from src.project_anima.core.llm_adapter import LLMAdapter
+from src.project_anima.core.prompt_cache import (
+    PromptCacheError,
+    PromptCacheRegistry,
+    StubCacheBackend,
+    estimate_tokens,
+    split_cacheable_prompt,
+)
+from src.project_anima.core.structured_output import ResponseStats
+
+PREFIX = "指示と不変情報と長期情報" * 20
+
+
+class FakeClock:
+    """テストから進められる時計"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeModel:
+    """受け取ったプロンプトを記録し、思考のJSONを返すモデル"""
+
+    def __init__(self):
+        self.prompts = []
+
+    def generate_content(self, prompt, generation_config=None):
+        self.prompts.append(prompt)
+        return SimpleNamespace(
+            text=json.dumps({"think": "考える", "act": "", "talk": "こんにちは"}),
+            usage_metadata=SimpleNamespace(candidates_token_count=5),
+        )
+
+
+def test_split_cacheable_prompt():
+    """境界で分割し、境界がない場合はプレフィックスを空にすること"""
+    assert split_cacheable_prompt("共通{{cache_boundary}}毎回") == ("共通", "毎回")
+    assert split_cacheable_prompt("境界なし") == ("", "境界なし")
+
+
+def test_registry_reuses_refreshes_and_recreates_handles():
+    """同じプレフィックスは同じキャッシュを使い、期限が近ければ延長、失効後は作り直すこと"""
+    clock = FakeClock()
+    backend = StubCacheBackend(FakeModel(), clock=clock)
+    registry = PromptCacheRegistry(
+        backend, ttl_seconds=100, refresh_margin_seconds=20, clock=clock
+    )
+
+    first = registry.generate("model", PREFIX, "ターン1")
+    registry.generate("model", PREFIX, "ターン2")
+    assert backend.created == 1
+    assert first.usage_metadata.cached_content_token_count == estimate_tokens(PREFIX)
+    assert backend.model.prompts[-1] == PREFIX + "ターン2"
+
+    # 残り期間がrefresh_margin未満になると使用時に延長される
+    clock.now = 90
+    registry.generate("model", PREFIX, "ターン3")
+    clock.now = 150
+    registry.generate("model", PREFIX, "ターン4")
+    assert backend.created == 1
+
+    # プロバイダー側で失効していた場合は1回だけ作り直す
+    backend.caches.clear()
+    registry.generate("model", PREFIX, "ターン5")
+    assert backend.created == 2
+
+    stats = registry.get_stats()
+    assert stats["requests"] == 5
+    assert stats["misses"] == 2
+    assert stats["hits"] == 3
+    assert stats["refreshes"] == 1
+    assert 0 < stats["cached_token_ratio"] < 1
+
+
+def test_registry_bypasses_short_and_uncacheable_prefixes():
+    """短いプレフィックスと作成に失敗したプレフィックスはキャッシュを試みないこと"""
+    backend = StubCacheBackend(FakeModel())
+    registry = PromptCacheRegistry(backend, min_prefix_chars=10)
+
+    with pytest.raises(PromptCacheError):
+        registry.generate("model", "短い", "ターン")
+
+    with mock.patch.object(
+        backend, "create", side_effect=PromptCacheError("トークン数が不足しています")
+    ) as create:
+        for _ in range(2):
+            with pytest.raises(PromptCacheError):
+                registry.generate("model", PREFIX, "ターン")
+    assert create.call_count == 1
+    assert registry.get_stats()["bypassed"] == 3
+
+
+def test_adapter_sends_suffix_through_prompt_cache(tmp_path, monkeypatch):
+    """思考生成でプレフィックスがキャッシュされ、キャッシュ分のトークン数が記録されること"""
+    template_path = tmp_path / "think.txt"
+    template_path.write_text(
+        PREFIX + "{{character_name}}{{cache_boundary}}状況: {{scene_context}}",
+        encoding="utf-8",
+    )
+    model = FakeModel()
+    registry = PromptCacheRegistry(StubCacheBackend(model))
+
+    monkeypatch.setenv("GOOGLE_API_KEY", "dummy_api_key_for_testing")
+    with mock.patch("google.generativeai.GenerativeModel") as mock_genai:
+        adapter = LLMAdapter(stats=ResponseStats(), prompt_cache=registry)
+        for scene in ("教室", "廊下"):
+            adapter.generate_character_thought(
+                {"character_name": "アリス", "scene_context": scene},
+                str(template_path),
+            )
+        mock_genai.return_value.generate_content.assert_not_called()
+
+    assert model.prompts[-1] == PREFIX + "アリス状況: 廊下"
+    info = adapter.last_generation_info
+    assert info["cached_prompt_tokens"] == estimate_tokens(PREFIX + "アリス")
+    assert info["prompt_chars"] == len(model.prompts[-1])
+    stats = adapter.get_prompt_cache_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
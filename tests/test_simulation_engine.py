@@ -5,8 +5,10 @@ SimulationEngineのテスト
 """
 
 import os
+import json
 import unittest
 import shutil
+import threading
 from unittest import mock
 from typing import Dict, List, Any, Optional
 
@@ -17,6 +19,7 @@ from src.project_anima.core.simulation_engine import (
     SimulationEngineError,
     SceneNotLoadedError,
 )
+from src.project_anima.core.turn_scheduler import SimultaneousScheduler
 from src.project_anima.core.data_models import (
     SceneInfoData,
     SceneLogData,
@@ -515,20 +518,328 @@ class TestSimulationEngine(unittest.TestCase):
         )
 
         # 1人目のキャラクター
-        self.engine._current_turn = 0
         character_id = self.engine._determine_next_character()
         self.assertEqual(character_id, "char_001")
 
         # 2人目のキャラクター
-        self.engine._current_turn = 1
+        self.engine._current_scene_log.turns.append(
+            TurnData(
+                turn_number=1,
+                character_id="char_001",
+                character_name="アリス",
+                think="考え中",
+            )
+        )
         character_id = self.engine._determine_next_character()
         self.assertEqual(character_id, "char_002")
 
-        # インデックスが範囲外の場合
-        self.engine._current_turn = 2
+        # 全員が行動したら1人目に戻る
+        self.engine._current_scene_log.turns.append(
+            TurnData(
+                turn_number=2,
+                character_id="char_002",
+                character_name="ボブ",
+                think="考え中",
+            )
+        )
+        character_id = self.engine._determine_next_character()
+        self.assertEqual(character_id, "char_001")
+
+        # 参加者がいない場合
+        self.engine._current_scene_log.scene_info.participant_character_ids = []
         character_id = self.engine._determine_next_character()
         self.assertIsNone(character_id)
 
+    @mock.patch("src.project_anima.core.simulation_engine.save_json")
+    def test_execute_one_turn_skips_character_that_fails(self, mock_save_json):
+        """ターンを記録できないキャラクターがいても、他のキャラクターが順番に行動すること"""
+        self.test_scene_info.participant_character_ids = [
+            "char_001",
+            "ghost_char",
+            "char_002",
+        ]
+        self.engine._current_scene_log = SceneLogData(
+            scene_info=self.test_scene_info, interventions_in_scene=[], turns=[]
+        )
+        self.engine._is_running = True
+
+        def build_context(character_id, *args, **kwargs):
+            if character_id == "ghost_char":
+                raise FileNotFoundError("キャラクターのディレクトリがありません")
+            return {"character_id": character_id}
+
+        def record_turn(scene_log, character_id, character_name, think, act, talk, **_):
+            scene_log.turns.append(
+                TurnData(
+                    turn_number=len(scene_log.turns) + 1,
+                    character_id=character_id,
+                    character_name=character_name,
+                    think=think,
+                )
+            )
+
+        self.mock_context_builder.build_context_for_character.side_effect = (
+            build_context
+        )
+        self.mock_information_updater.record_turn_to_short_term_log.side_effect = (
+            record_turn
+        )
+
+        for _ in range(6):
+            self.assertTrue(self.engine.execute_one_turn())
+
+        turns = self.engine._current_scene_log.turns
+        self.assertEqual(
+            [t.character_id for t in turns],
+            ["char_001", "char_002", "char_001", "char_002"],
+        )
+        self.assertEqual(self.engine._turn_count, 4)
+
+    @mock.patch("src.project_anima.core.simulation_engine.save_json")
+    def test_execute_one_turn_simultaneous(self, mock_save_json):
+        """同時行動モードでは全員が同じ状態から生成し、参加順に記録されること"""
+        self.engine.turn_scheduler = SimultaneousScheduler()
+        self.engine._current_scene_log = SceneLogData(
+            scene_info=self.test_scene_info, interventions_in_scene=[], turns=[]
+        )
+        self.engine._is_running = True
+
+        # 記録時に実際にターンを追加する
+        def record_turn(scene_log, character_id, character_name, think, act, talk, **_):
+            scene_log.turns.append(
+                TurnData(
+                    turn_number=len(scene_log.turns) + 1,
+                    character_id=character_id,
+                    character_name=character_name,
+                    think=think,
+                    act=act,
+                    talk=talk,
+                )
+            )
+
+        self.mock_information_updater.record_turn_to_short_term_log.side_effect = (
+            record_turn
+        )
+
+        self.assertTrue(self.engine.execute_one_turn())
+
+        # 両者のコンテクストは記録前の同じ短期ログから構築される
+        calls = self.mock_context_builder.build_context_for_character.call_args_list
+        self.assertEqual([c.args[0] for c in calls], ["char_001", "char_002"])
+        self.assertTrue(all(len(c.args[1]) == 0 for c in calls))
+
+        turns = self.engine._current_scene_log.turns
+        self.assertEqual([t.character_id for t in turns], ["char_001", "char_002"])
+        self.assertEqual(self.engine._turn_count, 2)
+
+    @mock.patch("src.project_anima.core.simulation_engine.save_json")
+    def test_previous_scene_summary_is_passed_to_context(self, mock_save_json):
+        """直前の場面のサマリーが全キャラクターのコンテクストに渡されること"""
+        self.engine.previous_scene_summary = "前の場面で二人は喧嘩をした"
+        self.engine._current_scene_log = SceneLogData(
+            scene_info=self.test_scene_info, interventions_in_scene=[], turns=[]
+        )
+
+        self.engine.next_turn("char_002")
+
+        args = self.mock_context_builder.build_context_for_character.call_args.args
+        self.assertEqual(args[2], "前の場面で二人は喧嘩をした")
+
+    @mock.patch("src.project_anima.core.simulation_engine.save_json")
+    def test_chat_session_mode_uses_session_and_new_events(self, mock_save_json):
+        """会話モードでは前回行動してからのターンを含む短期ログでセッションを使うこと"""
+        self.engine.chat_session_mode = True
+        self.mock_context_builder.MAX_TURNS = 2
+        self.mock_llm_adapter.generate_character_thought_in_session.return_value = {
+            "think": "考え",
+            "act": "",
+            "talk": "こんにちは",
+        }
+        speakers = ["char_001", "char_002", "char_002", "char_002"]
+        self.engine._current_scene_log = SceneLogData(
+            scene_info=self.test_scene_info,
+            interventions_in_scene=[],
+            turns=[
+                TurnData(
+                    turn_number=i + 1,
+                    character_id=speaker,
+                    character_name=speaker,
+                    think="",
+                    act="",
+                    talk=f"発言{i + 1}",
+                )
+                for i, speaker in enumerate(speakers)
+            ],
+        )
+
+        self.engine.next_turn("char_001")
+
+        # MAX_TURNSを超えて、char_001の前回のターンまで遡る
+        call = self.mock_context_builder.build_context_for_character.call_args
+        self.assertEqual(len(call.args[1]), 4)
+        self.assertTrue(call.kwargs["include_new_events"])
+        session_call = self.mock_llm_adapter.generate_character_thought_in_session
+        self.assertEqual(session_call.call_args.args[0], "char_001")
+        self.assertTrue(
+            session_call.call_args.args[3].endswith("think_session_turn.txt")
+        )
+        self.mock_llm_adapter.generate_character_thought.assert_not_called()
+
+    def test_export_and_restore_state(self):
+        """export_stateで書き出した状態をrestore_stateで復元できること"""
+        self.engine._current_scene_log = SceneLogData(
+            scene_info=self.test_scene_info,
+            interventions_in_scene=[],
+            turns=[
+                TurnData(
+                    turn_number=1,
+                    character_id="char_001",
+                    character_name="テストキャラクター1",
+                    think="考え",
+                    act="",
+                    talk="こんにちは",
+                )
+            ],
+        )
+        self.engine._current_turn = 1
+        self.engine._turn_count = 1
+        self.engine._pending_revelations = {"char_002": ["天啓"], "char_001": []}
+        self.mock_llm_adapter.model_name = "gemini-test"
+
+        state = json.loads(json.dumps(self.engine.export_state()))
+
+        self.engine._current_scene_log = None
+        self.engine._current_turn = 0
+        self.engine._turn_count = 0
+        self.engine._pending_revelations = {}
+        self.engine.restore_state(state)
+
+        self.assertEqual(self.engine._current_scene_log.turns[0].talk, "こんにちは")
+        self.assertEqual(self.engine._current_turn, 1)
+        self.assertEqual(self.engine._turn_count, 1)
+        self.assertEqual(self.engine._pending_revelations, {"char_002": ["天啓"]})
+        self.mock_scene_manager.set_current_scene_info.assert_called_once_with(
+            self.engine._current_scene_log.scene_info
+        )
+
+    def test_update_long_term_info_batch(self):
+        """長期情報の一括更新で失敗したキャラクターはNoneになること"""
+        self.engine._current_scene_log = SceneLogData(
+            scene_info=self.test_scene_info, interventions_in_scene=[], turns=[]
+        )
+
+        def trigger(character_id, *args, **kwargs):
+            if character_id == "char_002":
+                raise ValueError("更新失敗")
+            return {"new_experiences": []}
+
+        self.mock_information_updater.trigger_long_term_update.side_effect = trigger
+
+        results = self.engine.update_long_term_info_batch()
+
+        self.assertEqual(
+            results, {"char_001": {"new_experiences": []}, "char_002": None}
+        )
+
+    def test_update_long_term_info_batch_single_call_with_fallback(self):
+        """一括更新で提案が得られなかったキャラクターのみ個別に更新されること"""
+        self.engine._current_scene_log = SceneLogData(
+            scene_info=self.test_scene_info, interventions_in_scene=[], turns=[]
+        )
+        self.engine.long_term_batch_size = 8
+        self.mock_information_updater.trigger_batch_long_term_update.return_value = {
+            "char_001": {"new_experiences": []}
+        }
+        self.mock_information_updater.trigger_long_term_update.return_value = {
+            "new_memories": []
+        }
+
+        results = self.engine.update_long_term_info_batch()
+
+        self.assertEqual(
+            results,
+            {"char_001": {"new_experiences": []}, "char_002": {"new_memories": []}},
+        )
+        batch_args = (
+            self.mock_information_updater.trigger_batch_long_term_update.call_args.args
+        )
+        self.assertEqual(batch_args[0], ["char_001", "char_002"])
+        self.assertTrue(batch_args[4].endswith("long_term_update_batch.txt"))
+        self.mock_information_updater.trigger_long_term_update.assert_called_once()
+        self.assertEqual(
+            self.mock_information_updater.trigger_long_term_update.call_args.args[0],
+            "char_002",
+        )
+
+        # 一括更新自体が失敗した場合は全員を個別に更新する
+        self.mock_information_updater.trigger_batch_long_term_update.side_effect = (
+            ValueError("JSONが不正")
+        )
+        results = self.engine.update_long_term_info_batch()
+        self.assertEqual(
+            results,
+            {"char_001": {"new_memories": []}, "char_002": {"new_memories": []}},
+        )
+        self.assertEqual(
+            self.mock_information_updater.trigger_long_term_update.call_count, 3
+        )
+
+    def test_update_long_term_info_batch_submits_consolidation(self):
+        """長期情報の更新に成功したキャラクターのみ整理がバックグラウンドで開始されること"""
+        self.engine._current_scene_log = SceneLogData(
+            scene_info=self.test_scene_info, interventions_in_scene=[], turns=[]
+        )
+        self.mock_information_updater.trigger_long_term_update.side_effect = (
+            lambda character_id, *args, **kwargs: (
+                None if character_id == "char_002" else {"new_experiences": []}
+            )
+        )
+        consolidator = mock.MagicMock()
+        consolidator.submit.return_value.result.return_value = {"char_001": None}
+        self.engine.memory_consolidator = consolidator
+
+        self.assertEqual(self.engine.wait_for_memory_consolidation(), {})
+        self.engine.update_long_term_info_batch()
+
+        consolidator.submit.assert_called_once_with(
+            self.engine.character_manager, ["char_001"]
+        )
+        self.assertEqual(
+            self.engine.wait_for_memory_consolidation(timeout=1), {"char_001": None}
+        )
+        consolidator.submit.return_value.result.assert_called_once_with(timeout=1)
+
+    @mock.patch("src.project_anima.core.simulation_engine.save_json")
+    def test_execute_round_generates_concurrently(self, mock_save_json):
+        """execute_roundではLLM呼び出しが並行して行われ、参加順に記録されること"""
+        self.engine._current_scene_log = SceneLogData(
+            scene_info=self.test_scene_info, interventions_in_scene=[], turns=[]
+        )
+        self.engine._is_running = True
+
+        # 両方の呼び出しが同時に待ち合わせないと先に進めない（逐次実行ならタイムアウト）
+        barrier = threading.Barrier(2, timeout=5)
+
+        def generate(context_dict, prompt_file_path):
+            barrier.wait()
+            return {"think": "同時の思考", "act": "", "talk": ""}
+
+        self.mock_llm_adapter.generate_character_thought.side_effect = generate
+
+        self.assertTrue(self.engine.execute_round(max_concurrency=2))
+
+        calls = (
+            self.mock_information_updater.record_turn_to_short_term_log.call_args_list
+        )
+        self.assertEqual([c.args[1] for c in calls], ["char_001", "char_002"])
+        self.assertEqual([c.args[3] for c in calls], ["同時の思考", "同時の思考"])
+        self.assertEqual(self.engine._turn_count, 2)
+
+    def test_execute_round_scene_not_loaded(self):
+        """場面がロードされていない状態でexecute_roundを呼ぶとエラーになること"""
+        with self.assertRaises(SceneNotLoadedError):
+            self.engine.execute_round()
+
     @mock.patch("src.project_anima.core.simulation_engine.datetime")
     @mock.patch("src.project_anima.core.simulation_engine.save_json")
     def test_save_scene_log_success(self, mock_save_json, mock_datetime):
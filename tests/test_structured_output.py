@@ -0,0 +1,75 @@
+"""
+構造化出力ユーティリティのユニットテスト
+"""
+
+import pytest
+
+from src.project_anima.core.structured_output import (
+    ResponseStats,
+    StreamingJsonExtractor,
+    extract_json_object,
+)
+
+
+def test_extract_json_object_ignores_surrounding_text():
+    """コードブロックや説明文に囲まれたJSONを取り出せること"""
+    text = '了解しました。\n```json\n{"think": "考え {括弧}", "act": "", "talk": "はい"}\n```'
+
+    assert extract_json_object(text) == {
+        "think": "考え {括弧}",
+        "act": "",
+        "talk": "はい",
+    }
+
+
+def test_extract_json_object_repairs_common_mistakes():
+    """コメントと末尾のカンマを含むJSONを読み込めること"""
+    text = """{
+      "new_experiences": [
+        {"event": "http://example.com を見た", "importance": 7}, // 重要
+      ],
+    }"""
+
+    result = extract_json_object(text)
+
+    assert result["new_experiences"][0]["event"] == "http://example.com を見た"
+
+
+def test_extract_json_object_closes_truncated_response():
+    """途中で途切れた応答を閉じ括弧を補って読み込めること"""
+    result = extract_json_object('{"think": "途中で", "act": "歩く", "talk": "こん')
+
+    assert result == {"think": "途中で", "act": "歩く", "talk": "こん"}
+
+
+def test_extract_json_object_raises_without_object():
+    """JSONオブジェクトがない場合はValueErrorになること"""
+    with pytest.raises(ValueError):
+        extract_json_object("JSONはありません")
+
+
+def test_streaming_extractor_accepts_chunks():
+    """断片に分かれた応答からオブジェクトを取り出せること"""
+    extractor = StreamingJsonExtractor()
+    chunks = ['前置き {"think": "a\\"', 'b", "items": [1, ', "2]}", " 後書き"]
+
+    completed = [obj for chunk in chunks for obj in extractor.feed(chunk)]
+
+    assert completed == ['{"think": "a\\"b", "items": [1, 2]}']
+    assert extractor.finish() is None
+
+
+def test_response_stats_rates():
+    """モデルごとに不正応答率を計算できること"""
+    stats = ResponseStats()
+    stats.record("model-a", "valid", structured=True)
+    stats.record("model-a", "repaired", structured=True)
+    stats.record("model-a", "invalid")
+    stats.record("model-a", "valid")
+
+    result = stats.to_dict()["model-a"]
+
+    assert result["requests"] == 4
+    assert result["structured"] == 2
+    assert result["first_try_invalid_rate"] == 0.5
+    assert result["invalid_rate"] == 0.25
@@ -0,0 +1,125 @@
+"""
+学習用データエクスポートツールのユニットテスト
+"""
+
+import json
+import os
+
+from src.project_anima.training_export import (
+    iter_ndjson_lines,
+    iter_training_records,
+    main,
+)
+
+
+def _write_scene_log(log_dir, simulation_id, turns, interventions=None):
+    sim_dir = os.path.join(log_dir, simulation_id)
+    os.makedirs(sim_dir, exist_ok=True)
+    with open(os.path.join(sim_dir, "scene_s1.json"), "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "scene_info": {
+                    "scene_id": "s1",
+                    "location": "教室",
+                    "time": "放課後",
+                    "situation": "二人きり",
+                    "participant_character_ids": ["alice", "bob"],
+                },
+                "interventions_in_scene": interventions or [],
+                "turns": turns,
+            },
+            f,
+            ensure_ascii=False,
+        )
+
+
+def _turn(turn_number, character_id, think="考える", act="", talk=""):
+    return {
+        "turn_number": turn_number,
+        "character_id": character_id,
+        "character_name": character_id.upper(),
+        "think": think,
+        "act": act,
+        "talk": talk,
+    }
+
+
+def test_records_rebuild_short_term_context(tmp_path):
+    """各レコードにそのターン以前の短期コンテクストが含まれること"""
+    log_dir = str(tmp_path)
+    _write_scene_log(
+        log_dir,
+        "sim_20240101_000000",
+        [
+            _turn(1, "alice", talk="こんにちは"),
+            _turn(2, "bob", act="手を振る"),
+            _turn(3, "alice", talk="元気？"),
+        ],
+        interventions=[
+            {
+                "applied_before_turn_number": 2,
+                "intervention_type": "REVELATION",
+                "intervention": {"revelation_content": "雨が降り始めた"},
+            }
+        ],
+    )
+
+    records = list(iter_training_records(log_dir, history_turns=1))
+
+    assert [r["turn_number"] for r in records] == [1, 2, 3]
+    assert (
+        "まだやり取りは始まっていません" in records[0]["context"]["short_term_context"]
+    )
+    assert "ALICE：「こんにちは」" in records[1]["context"]["short_term_context"]
+    assert "ALICE" not in records[2]["context"]["short_term_context"]
+    assert (
+        records[1]["context"]["interventions"][0]["intervention_type"] == "REVELATION"
+    )
+    assert records[2]["output"]["talk"] == "元気？"
+
+
+def test_error_turns_and_character_filter(tmp_path):
+    """エラー時の代替ターンとキャラクター指定で絞り込めること"""
+    log_dir = str(tmp_path)
+    _write_scene_log(
+        log_dir,
+        "sim_20240101_000000",
+        [
+            _turn(1, "alice", think="（エラーにより思考を生成できませんでした）"),
+            _turn(2, "bob", talk="やあ"),
+        ],
+    )
+
+    assert [r["turn_number"] for r in iter_training_records(log_dir)] == [2]
+    assert len(list(iter_training_records(log_dir, include_errors=True))) == 2
+    assert list(iter_training_records(log_dir, character_ids=["alice"])) == []
+
+
+def test_main_writes_ndjson(tmp_path):
+    """CLIが1行1レコードのNDJSONを出力すること"""
+    log_dir = str(tmp_path / "logs")
+    _write_scene_log(log_dir, "sim_20240101_000000", [_turn(1, "alice")])
+    _write_scene_log(log_dir, "sim_20240102_000000", [_turn(1, "bob")])
+    output_path = tmp_path / "train.jsonl"
+
+    main(
+        [
+            "--log-dir",
+            log_dir,
+            "--sim-id",
+            "sim_20240102_000000",
+            "-o",
+            str(output_path),
+        ]
+    )
+
+    lines = output_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["character_id"] == "bob"
+
+
+def test_iter_ndjson_lines():
+    """各行が改行で終わるJSONになること"""
+    lines = list(iter_ndjson_lines([{"a": "日本語"}]))
+
+    assert lines == ['{"a": "日本語"}\n']
@@ -0,0 +1,125 @@
+"""
+TurnSchedulerのテスト
+"""
+
+import pytest
+
+from src.project_anima.core.data_models import TurnData
+from src.project_anima.core.turn_scheduler import (
+    AddressedSpeakerScheduler,
+    RoundRobinScheduler,
+    SimultaneousScheduler,
+    WeightedScheduler,
+    create_turn_scheduler,
+)
+
+NAMES = {"alice": "アリス", "bob": "ボブ", "carol": "キャロル"}
+
+
+def make_turn(turn_number, character_id, talk=""):
+    """テスト用のTurnDataを作成する"""
+    return TurnData(
+        turn_number=turn_number,
+        character_id=character_id,
+        character_name=NAMES.get(character_id, character_id),
+        think="考え中",
+        talk=talk,
+    )
+
+
+class TestRoundRobinScheduler:
+    """RoundRobinSchedulerのテスト"""
+
+    def test_follows_participant_order(self):
+        """参加順に1人ずつ選ばれ、一巡したら先頭に戻ること"""
+        scheduler = RoundRobinScheduler()
+        participants = ["alice", "bob", "carol"]
+        turns = []
+
+        order = []
+        for number in range(1, 5):
+            speaker = scheduler.next_speakers(participants, turns)[0]
+            order.append(speaker)
+            turns.append(make_turn(number, speaker))
+
+        assert order == ["alice", "bob", "carol", "alice"]
+
+    def test_keeps_order_after_participant_removed(self):
+        """直前の行動者が除外されても、その次のキャラクターが選ばれること"""
+        scheduler = RoundRobinScheduler()
+        turns = [make_turn(1, "alice"), make_turn(2, "bob")]
+
+        assert scheduler.next_speakers(["alice", "carol"], turns) == ["carol"]
+
+    def test_added_participant_joins_rotation(self):
+        """追加されたキャラクターが順番に組み込まれること"""
+        scheduler = RoundRobinScheduler()
+        turns = [make_turn(1, "alice"), make_turn(2, "bob")]
+
+        assert scheduler.next_speakers(["alice", "bob", "carol"], turns) == ["carol"]
+
+    def test_no_participants(self):
+        """参加者がいない場合は空のリストを返すこと"""
+        assert RoundRobinScheduler().next_speakers([], []) == []
+
+
+class TestWeightedScheduler:
+    """WeightedSchedulerのテスト"""
+
+    def test_seed_is_reproducible(self):
+        """同じシードとログからは同じキャラクターが選ばれること"""
+        participants = ["alice", "bob", "carol"]
+        turns = [make_turn(1, "alice")]
+
+        first = WeightedScheduler(seed=42).next_speakers(participants, turns)
+        second = WeightedScheduler(seed=42).next_speakers(participants, turns)
+
+        assert first == second
+        assert first[0] in ("bob", "carol")
+
+    def test_zero_weight_is_never_chosen(self):
+        """重みが0のキャラクターは選ばれないこと"""
+        scheduler = WeightedScheduler(weights={"bob": 0.0}, seed=1, avoid_repeat=False)
+        turns = []
+        for number in range(1, 30):
+            speaker = scheduler.next_speakers(["alice", "bob"], turns)[0]
+            assert speaker == "alice"
+            turns.append(make_turn(number, speaker))
+
+
+class TestAddressedSpeakerScheduler:
+    """AddressedSpeakerSchedulerのテスト"""
+
+    def test_addressed_character_speaks_next(self):
+        """直前の発言で呼びかけられたキャラクターが選ばれること"""
+        scheduler = AddressedSpeakerScheduler()
+        turns = [make_turn(1, "alice", talk="キャロル、ボブの話を聞いた？")]
+
+        speakers = scheduler.next_speakers(["alice", "bob", "carol"], turns, NAMES.get)
+
+        assert speakers == ["carol"]
+
+    def test_falls_back_when_nobody_addressed(self):
+        """呼びかけがない場合はfallbackが使われること"""
+        scheduler = AddressedSpeakerScheduler()
+        turns = [make_turn(1, "alice", talk="アリスはそう思う")]
+
+        speakers = scheduler.next_speakers(["alice", "bob", "carol"], turns, NAMES.get)
+
+        assert speakers == ["bob"]
+
+
+def test_simultaneous_returns_all_participants():
+    """同時行動スケジューラは全参加者を返すこと"""
+    scheduler = SimultaneousScheduler()
+    assert scheduler.next_speakers(["alice", "bob"], []) == ["alice", "bob"]
+
+
+def test_create_turn_scheduler():
+    """名前からスケジューラを作成できること"""
+    scheduler = create_turn_scheduler("weighted", seed=3)
+    assert isinstance(scheduler, WeightedScheduler)
+    assert scheduler.seed == 3
+
+    with pytest.raises(ValueError):
+        create_turn_scheduler("unknown")
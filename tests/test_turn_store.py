@@ -0,0 +1,103 @@
+"""
+CompactTurnStoreのユニットテスト
+"""
+
+import pytest
+
+from src.project_anima.core.context_builder import format_short_term_context
+from src.project_anima.core.data_models import SceneInfoData, SceneLogData, TurnData
+from src.project_anima.core.turn_store import CompactTurnStore
+
+
+def _turn(turn_number, character_id="alice"):
+    return TurnData(
+        turn_number=turn_number,
+        character_id=character_id,
+        character_name=character_id.upper(),
+        think=f"思考{turn_number}",
+        talk=f"発言{turn_number}",
+    )
+
+
+def _scene_info():
+    return SceneInfoData(
+        scene_id="s1",
+        situation="テスト",
+        participant_character_ids=["alice", "bob"],
+    )
+
+
+def test_behaves_like_list():
+    """len、インデックス、スライス、反復がlistと同様に動作すること"""
+    turns = [_turn(i, "alice" if i % 2 else "bob") for i in range(1, 8)]
+    store = CompactTurnStore(turns)
+
+    assert len(store) == 7
+    assert store[0] == turns[0]
+    assert store[-1] == turns[-1]
+    assert store[-3:] == turns[-3:]
+    assert list(store) == turns
+    assert format_short_term_context(store) == format_short_term_context(turns)
+
+
+def test_interns_character_strings():
+    """キャラクターIDと名前の文字列が共有されること"""
+    store = CompactTurnStore()
+    store.append(_turn(1, "".join(["al", "ice"])))
+    store.append(_turn(2, "".join(["ali", "ce"])))
+
+    assert store._records[0].character_id is store._records[1].character_id
+    assert store._records[0].character_name is store._records[1].character_name
+
+
+def test_spills_old_turns_to_disk():
+    """上限を超えた古いターンを退避しても参照できること"""
+    store = CompactTurnStore(spill_threshold=4, keep_in_memory=2)
+    turns = [_turn(i) for i in range(1, 11)]
+    for turn in turns:
+        store.append(turn)
+
+    assert store.spilled_count > 0
+    assert len(store._records) <= 4
+    assert list(store) == turns
+    assert store[1] == turns[1]
+    assert store.filter_by_character("alice", limit=2) == turns[-2:]
+    store.close()
+
+
+def test_scene_log_accepts_store_and_dumps_as_list():
+    """SceneLogDataに格納でき、model_dumpではリストとして出力されること"""
+    store = CompactTurnStore(spill_threshold=2)
+    scene_log = SceneLogData(scene_info=_scene_info(), turns=store)
+    for i in range(1, 5):
+        scene_log.turns.append(_turn(i))
+
+    dumped = scene_log.model_dump()
+    list_log = SceneLogData(
+        scene_info=_scene_info(), turns=[_turn(i) for i in range(1, 5)]
+    )
+
+    assert scene_log.turns is store
+    assert dumped == list_log.model_dump()
+    assert SceneLogData.model_validate_json(scene_log.model_dump_json()) == list_log
+
+
+def test_scene_log_dump_keeps_dump_options():
+    """exclude_noneやexcludeの指定がリストとCompactTurnStoreのどちらでも反映されること"""
+    store = CompactTurnStore()
+    store.append(_turn(1))
+    for turns in ([_turn(1)], store):
+        scene_log = SceneLogData(scene_info=_scene_info(), turns=turns)
+
+        dumped_turn = scene_log.model_dump(exclude_none=True)["turns"][0]
+        assert "metadata" not in dumped_turn
+        assert dumped_turn["think"] == "思考1"
+
+        excluded = scene_log.model_dump(exclude={"turns": {0: {"think"}}})
+        assert "think" not in excluded["turns"][0]
+
+
+def test_invalid_spill_threshold():
+    """不正な上限値はValueErrorになること"""
+    with pytest.raises(ValueError):
+        CompactTurnStore(spill_threshold=0)
@@ -0,0 +1,121 @@
+"""
+YAMLスナップショットユーティリティのユニットテスト
+"""
+
+import json
+import os
+import pickle
+from unittest import mock
+
+import yaml
+
+from src.project_anima.core.character_manager import CharacterManager
+from src.project_anima.core.data_models import ImmutableCharacterData
+from src.project_anima.utils import yaml_snapshot
+from src.project_anima.utils.yaml_snapshot import (
+    get_snapshot_path,
+    is_snapshot_path,
+    load_model_with_snapshot,
+)
+
+
+def _write_immutable(path, name):
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.dump(
+            {"character_id": "snap", "name": name, "base_personality": "冷静"},
+            f,
+            allow_unicode=True,
+        )
+
+
+def test_snapshot_is_reused_when_unchanged(tmp_path):
+    """内容が変わらない場合はYAMLを解析せずにスナップショットから読み込むこと"""
+    file_path = str(tmp_path / "immutable.yaml")
+    _write_immutable(file_path, "スナップ")
+
+    first = load_model_with_snapshot(file_path, ImmutableCharacterData)
+    assert os.path.exists(get_snapshot_path(file_path))
+
+    with mock.patch.object(yaml_snapshot.yaml, "load") as yaml_load:
+        second = load_model_with_snapshot(file_path, ImmutableCharacterData)
+
+    yaml_load.assert_not_called()
+    assert second == first
+
+
+def test_snapshot_is_rebuilt_when_file_changes(tmp_path):
+    """元ファイルが変更された場合はスナップショットを作り直すこと"""
+    file_path = str(tmp_path / "immutable.yaml")
+    _write_immutable(file_path, "変更前")
+    load_model_with_snapshot(file_path, ImmutableCharacterData)
+
+    _write_immutable(file_path, "変更後")
+
+    assert load_model_with_snapshot(file_path, ImmutableCharacterData).name == "変更後"
+
+
+def test_corrupted_snapshot_is_ignored(tmp_path):
+    """壊れたスナップショットは無視して元ファイルから読み込むこと"""
+    file_path = str(tmp_path / "immutable.yaml")
+    _write_immutable(file_path, "スナップ")
+    with open(get_snapshot_path(file_path), "wb") as f:
+        f.write(b"not a pickle")
+
+    assert (
+        load_model_with_snapshot(file_path, ImmutableCharacterData).name == "スナップ"
+    )
+
+
+def test_snapshot_is_plain_json_and_rejects_pickle(tmp_path):
+    """スナップショットはJSONで保存し、pickleを置かれても読み込まないこと"""
+    file_path = str(tmp_path / "immutable.yaml")
+    _write_immutable(file_path, "スナップ")
+    snapshot_path = get_snapshot_path(file_path)
+    load_model_with_snapshot(file_path, ImmutableCharacterData)
+
+    with open(snapshot_path, encoding="utf-8") as f:
+        snapshot = json.load(f)
+    assert snapshot["model"]["name"] == "スナップ"
+    assert is_snapshot_path(snapshot_path)
+
+    snapshot["model"] = {"character_id": "snap", "name": "改ざん"}
+    with open(snapshot_path, "wb") as f:
+        f.write(pickle.dumps(snapshot, protocol=0))
+
+    assert (
+        load_model_with_snapshot(file_path, ImmutableCharacterData).name == "スナップ"
+    )
+
+
+def test_character_manager_uses_snapshot_cache(tmp_path):
+    """CharacterManagerでスナップショットキャッシュを有効にできること"""
+    char_dir = tmp_path / "snap"
+    char_dir.mkdir()
+    _write_immutable(char_dir / "immutable.yaml", "スナップ")
+    with open(char_dir / "long_term.yaml", "w", encoding="utf-8") as f:
+        yaml.dump({"character_id": "snap"}, f)
+
+    manager = CharacterManager(str(tmp_path), use_snapshot_cache=True)
+
+    assert manager.get_immutable_context("snap").name == "スナップ"
+    assert os.path.exists(get_snapshot_path(str(char_dir / "long_term.yaml")))
+
+
+def test_snapshot_is_rebuilt_when_schema_changes(tmp_path):
+    """モデルのスキーマが変わった場合はスナップショットを使用せずに検証し直すこと"""
+    file_path = str(tmp_path / "immutable.yaml")
+    _write_immutable(file_path, "スナップ")
+    load_model_with_snapshot(file_path, ImmutableCharacterData)
+
+    with (
+        mock.patch.object(
+            yaml_snapshot, "get_schema_fingerprint", return_value="changed"
+        ),
+        mock.patch.object(
+            yaml_snapshot.yaml, "load", wraps=yaml_snapshot.yaml.load
+        ) as yaml_load,
+    ):
+        model = load_model_with_snapshot(file_path, ImmutableCharacterData)
+
+    yaml_load.assert_called_once()
+    assert model.name == "スナップ"
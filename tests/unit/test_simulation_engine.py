@@ -515,17 +515,35 @@ class TestSimulationEngine(unittest.TestCase):
         )
 
         # 1人目のキャラクター
-        self.engine._current_turn = 0
         character_id = self.engine._determine_next_character()
         self.assertEqual(character_id, "char_001")
 
         # 2人目のキャラクター
-        self.engine._current_turn = 1
+        self.engine._current_scene_log.turns.append(
+            TurnData(
+                turn_number=1,
+                character_id="char_001",
+                character_name="アリス",
+                think="考え中",
+            )
+        )
         character_id = self.engine._determine_next_character()
         self.assertEqual(character_id, "char_002")
 
-        # インデックスが範囲外の場合
-        self.engine._current_turn = 2
+        # 全員が行動したら1人目に戻る
+        self.engine._current_scene_log.turns.append(
+            TurnData(
+                turn_number=2,
+                character_id="char_002",
+                character_name="ボブ",
+                think="考え中",
+            )
+        )
+        character_id = self.engine._determine_next_character()
+        self.assertEqual(character_id, "char_001")
+
+        # 参加者がいない場合
+        self.engine._current_scene_log.scene_info.participant_character_ids = []
         character_id = self.engine._determine_next_character()
         self.assertIsNone(character_id)
 
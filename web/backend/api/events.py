@@ -0,0 +1,97 @@
+"""
+シミュレーションイベント配信用のWebSocketエンドポイント
+
+EngineWrapperのイベントバスに流れる状態変化イベントを、接続中の
+クライアントへプッシュ配信する。クライアントごとに上限付きのキューを持ち、
+送信が追いつかない場合は古いイベントから破棄する（バックプレッシャー）。
+"""
+
+import asyncio
+import logging
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from project_anima.core.event_bus import SimulationEvent
+from web.backend.services.engine_wrapper import engine_wrapper
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["events"])
+
+# クライアントごとに保持する未送信イベントの上限
+MAX_PENDING_EVENTS = 256
+
+
+class EventSubscriber:
+    """
+    1クライアント分のイベント購読を管理するクラス
+
+    イベントバスのコールバックは任意のスレッドから呼ばれるため、
+    イベントループへはcall_soon_threadsafe経由で受け渡す。
+    """
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, max_pending: int = MAX_PENDING_EVENTS
+    ):
+        self.loop = loop
+        self.queue: "asyncio.Queue[SimulationEvent]" = asyncio.Queue(
+            maxsize=max_pending
+        )
+        self.dropped_count = 0
+
+    def __call__(self, event: SimulationEvent) -> None:
+        """イベントバスから呼び出されるコールバック"""
+        self.loop.call_soon_threadsafe(self._enqueue, event)
+
+    def _enqueue(self, event: SimulationEvent) -> None:
+        """キューにイベントを追加（満杯なら最も古いイベントを破棄）"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped_count += 1
+        self.queue.put_nowait(event)
+
+
+@router.websocket("/ws")
+async def simulation_events(websocket: WebSocket):
+    """シミュレーションの状態変化イベントをプッシュ配信"""
+    await websocket.accept()
+
+    subscriber = EventSubscriber(asyncio.get_running_loop())
+    engine_wrapper.add_websocket_callback(subscriber)
+    logger.info("イベント購読クライアントが接続しました")
+
+    # 接続直後に現在の状態を通知
+    await websocket.send_json(
+        {
+            "event_type": "snapshot",
+            "payload": {"status": engine_wrapper.status.value},
+        }
+    )
+
+    async def send_events():
+        while True:
+            event = await subscriber.queue.get()
+            message = event.model_dump(mode="json")
+            message["dropped_count"] = subscriber.dropped_count
+            await websocket.send_json(message)
+
+    async def wait_for_disconnect():
+        # クライアントからのメッセージは使用しないが、切断検知のために受信を続ける
+        while True:
+            await websocket.receive_text()
+
+    sender = asyncio.create_task(send_events())
+    receiver = asyncio.create_task(wait_for_disconnect())
+    try:
+        done, pending = await asyncio.wait(
+            {sender, receiver}, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in pending:
+            task.cancel()
+        for task in done:
+            exception = task.exception()
+            if exception and not isinstance(exception, WebSocketDisconnect):
+                logger.warning(f"イベント配信中にエラーが発生しました: {exception}")
+    finally:
+        engine_wrapper.remove_websocket_callback(subscriber)
+        logger.info("イベント購読クライアントが切断しました")
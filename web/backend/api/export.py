@@ -1,13 +1,18 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse, Response
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 import json
-import zipfile
-import io
 import os
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import yaml
-from web.backend.services.engine_wrapper import EngineWrapper
+from web.backend.services.engine_wrapper import engine_wrapper
+from web.backend.services.archive_stream import (
+    iter_directory_entries,
+    iter_log_entries,
+    iter_zip_stream,
+)
+from project_anima.utils.log_files import parse_date_filter
+from project_anima.training_export import iter_ndjson_lines, iter_training_records
 
 router = APIRouter()
 
@@ -17,8 +22,7 @@ async def export_simulation():
     """現在のシミュレーション結果をJSON形式でエクスポート"""
     try:
         # シミュレーション状態を取得
-        engine = EngineWrapper()
-        status = engine.get_status()
+        status = engine_wrapper.get_simulation_state().model_dump(mode="json")
 
         # エクスポート用データを構築
         export_data = {
@@ -52,68 +56,119 @@ async def export_simulation():
 
 
 @router.get("/project")
-async def export_project():
-    """プロジェクト全体をZIP形式でエクスポート"""
+async def export_project(
+    include_logs: bool = Query(False, description="シミュレーションログを含めるか"),
+    since: Optional[str] = Query(
+        None, description="この日付以降のログに限定（YYYYMMDD または YYYY-MM-DD）"
+    ),
+    until: Optional[str] = Query(
+        None, description="この日付以前のログに限定（YYYYMMDD または YYYY-MM-DD）"
+    ),
+    sim_id: Optional[List[str]] = Query(
+        None, description="含めるシミュレーションID（複数指定可）"
+    ),
+):
+    """プロジェクト全体をZIP形式でストリーミングエクスポート"""
     try:
-        # ZIPファイルをメモリ上に作成
-        zip_buffer = io.BytesIO()
-
-        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            # データディレクトリの内容を追加
-            data_dirs = ["data/characters", "data/scenes", "data/prompts"]
-
-            for data_dir in data_dirs:
-                if os.path.exists(data_dir):
-                    for root, dirs, files in os.walk(data_dir):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            arcname = os.path.relpath(file_path, ".")
-                            zip_file.write(file_path, arcname)
-
-            # 設定ファイルを追加
-            config_files = ["data/immutable.yaml", "data/long_term.yaml"]
-            for config_file in config_files:
-                if os.path.exists(config_file):
-                    zip_file.write(config_file, config_file)
-
-            # エクスポート情報を追加
-            export_info = {
-                "export_info": {
-                    "timestamp": datetime.now().isoformat(),
-                    "version": "1.0.0",
-                    "type": "project_backup",
-                },
-                "project_name": "Project Anima",
-                "description": "Complete project backup including characters, scenes, and prompts",
-            }
+        since_date = parse_date_filter(since)
+        until_date = parse_date_filter(until)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-            zip_file.writestr(
-                "export_info.json",
-                json.dumps(export_info, indent=2, ensure_ascii=False),
-            )
+    def iter_entries():
+        # データディレクトリの内容を追加
+        for data_dir in ["data/characters", "data/scenes", "data/prompts"]:
+            yield from iter_directory_entries(data_dir)
 
-        zip_buffer.seek(0)
+        # 設定ファイルを追加
+        for config_file in ["data/immutable.yaml", "data/long_term.yaml"]:
+            if os.path.exists(config_file):
+                yield config_file, config_file
 
-        return Response(
-            content=zip_buffer.getvalue(),
-            media_type="application/zip",
-            headers={
-                "Content-Disposition": f"attachment; filename=project_anima_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        # シミュレーションログを追加
+        if include_logs:
+            yield from iter_log_entries(
+                "logs", since=since_date, until=until_date, simulation_ids=sim_id
+            )
+
+        # エクスポート情報を追加
+        export_info = {
+            "export_info": {
+                "timestamp": datetime.now().isoformat(),
+                "version": "1.0.0",
+                "type": "project_backup",
             },
-        )
+            "project_name": "Project Anima",
+            "description": "Complete project backup including characters, scenes, and prompts",
+            "logs": (
+                {"included": True, "since": since, "until": until, "sim_ids": sim_id}
+                if include_logs
+                else {"included": False}
+            ),
+        }
+        yield "export_info.json", json.dumps(
+            export_info, indent=2, ensure_ascii=False
+        ).encode("utf-8")
+
+    return StreamingResponse(
+        iter_zip_stream(iter_entries()),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename=project_anima_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        },
+    )
 
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"プロジェクトエクスポートに失敗しました: {str(e)}"
-        )
+
+@router.get("/training")
+async def export_training(
+    since: Optional[str] = Query(
+        None, description="この日付以降のログに限定（YYYYMMDD または YYYY-MM-DD）"
+    ),
+    until: Optional[str] = Query(
+        None, description="この日付以前のログに限定（YYYYMMDD または YYYY-MM-DD）"
+    ),
+    sim_id: Optional[List[str]] = Query(
+        None, description="含めるシミュレーションID（複数指定可）"
+    ),
+    character_id: Optional[List[str]] = Query(
+        None, description="含めるキャラクターID（複数指定可）"
+    ),
+    history_turns: int = Query(
+        5, ge=1, description="短期コンテクストに含める直近のターン数"
+    ),
+    include_errors: bool = Query(False, description="エラー時の代替ターンも含めるか"),
+):
+    """保存済みシミュレーションログを学習用のNDJSON形式でストリーミングエクスポート"""
+    try:
+        parse_date_filter(since)
+        parse_date_filter(until)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    records = iter_training_records(
+        "logs",
+        since=since,
+        until=until,
+        simulation_ids=sim_id,
+        history_turns=history_turns,
+        include_errors=include_errors,
+        character_ids=character_id,
+    )
+
+    return StreamingResponse(
+        iter_ndjson_lines(records),
+        media_type="application/x-ndjson",
+        headers={
+            "Content-Disposition": f"attachment; filename=training_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        },
+    )
 
 
 @router.get("/timeline/{format}")
 async def export_timeline(format: str):
     """タイムラインを指定された形式でエクスポート"""
     try:
-        engine = EngineWrapper()
-        status = engine.get_status()
+        status = engine_wrapper.get_simulation_state().model_dump(mode="json")
         timeline = status["timeline"]
 
         if format.lower() == "json":
@@ -192,10 +247,14 @@ async def get_export_formats():
         },
         "project": {
             "formats": ["zip"],
-            "description": "プロジェクト全体をバックアップ",
+            "description": "プロジェクト全体をバックアップ（include_logs=trueでログも含める）",
         },
         "timeline": {
             "formats": ["json", "txt"],
             "description": "タイムラインを指定形式でエクスポート",
         },
+        "training": {
+            "formats": ["jsonl"],
+            "description": "保存済みシミュレーションログを学習用データとしてエクスポート",
+        },
     }
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query, Response
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 import os
 import json
+import hashlib
+import threading
 from pathlib import Path
 from datetime import datetime
+from web.backend.services.engine_wrapper import engine_wrapper
+from project_anima.utils.yaml_snapshot import is_snapshot_path
 
 router = APIRouter(tags=["files"])
 
@@ -28,15 +32,112 @@ class FileInfo(BaseModel):
     last_modified: str
 
 
+class FileMetadata(BaseModel):
+    name: str
+    path: str
+    size: int
+    last_modified: str
+    content_hash: str
+
+
 class FileListResponse(BaseModel):
     files: List[FileInfo]
 
 
-@router.get("", response_model=FileListResponse)
+class FileMetadataListResponse(BaseModel):
+    files: List[FileMetadata]
+
+
+# ハッシュ計算時にファイルを読み込む単位（バイト）
+HASH_CHUNK_SIZE = 64 * 1024
+
+# ファイルパス -> (st_mtime_ns, st_size, コンテンツハッシュ)
+_content_hash_cache: Dict[str, Tuple[int, int, str]] = {}
+_content_hash_lock = threading.Lock()
+
+
+def _lookup_content_hash(file_path: Path, stat: os.stat_result) -> Optional[str]:
+    """更新時刻とサイズが一致する場合のみキャッシュ済みのハッシュを返す"""
+    with _content_hash_lock:
+        cached = _content_hash_cache.get(str(file_path))
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    return None
+
+
+def _get_content_hash(file_path: Path, stat: os.stat_result) -> str:
+    """
+    ファイル内容のハッシュを取得
+
+    更新時刻とサイズが変わっていなければキャッシュ済みの値を返すため、
+    ファイルの読み込みは内容が変更された場合にのみ発生する。
+    """
+    cached_hash = _lookup_content_hash(file_path, stat)
+    if cached_hash is not None:
+        return cached_hash
+
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return _store_content_hash(file_path, stat, hasher.hexdigest())
+
+
+def _remember_content_hash(file_path: Path, stat: os.stat_result, data: bytes) -> str:
+    """読み込み済みの内容からハッシュを計算してキャッシュする"""
+    return _store_content_hash(file_path, stat, hashlib.sha256(data).hexdigest())
+
+
+def _store_content_hash(
+    file_path: Path, stat: os.stat_result, content_hash: str
+) -> str:
+    """ハッシュを更新時刻・サイズとともにキャッシュする"""
+    with _content_hash_lock:
+        _content_hash_cache[str(file_path)] = (
+            stat.st_mtime_ns,
+            stat.st_size,
+            content_hash,
+        )
+    return content_hash
+
+
+def _reject_snapshot_path(file_path: str) -> None:
+    """キャラクターデータのスナップショット（内部キャッシュ）へのアクセスを拒否する"""
+    if is_snapshot_path(file_path):
+        raise HTTPException(
+            status_code=403, detail="Access to snapshot files is not allowed"
+        )
+
+
+def _make_etag(content_hash: str) -> str:
+    """コンテンツハッシュからETagヘッダーの値を作成"""
+    return f'"{content_hash}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Matchヘッダーが指定のETagに一致するか判定"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    # 弱いETag（W/プレフィックス付き）も同一とみなす
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+@router.get("", response_model=Union[FileListResponse, FileMetadataListResponse])
 async def list_files(
-    directory: str = Query(..., description="Directory path to list files from")
+    directory: str = Query(..., description="Directory path to list files from"),
+    metadata_only: bool = Query(
+        False, description="Return only file metadata without file contents"
+    ),
 ):
-    """指定されたディレクトリ内のファイル一覧を取得"""
+    """
+    指定されたディレクトリ内のファイル一覧を取得
+
+    metadata_onlyを指定した場合は、ファイル内容を含めずに名前・パス・サイズ・
+    更新時刻・コンテンツハッシュのみを返す。
+    """
     try:
         # セキュリティ: 許可されたディレクトリのみアクセス可能
         allowed_dirs = ["data/prompts", "data/characters", "data/scenes"]
@@ -55,6 +156,25 @@ async def list_files(
                 # ファイル拡張子をチェック（テキストファイルのみ）
                 allowed_extensions = {".md", ".txt", ".yaml", ".yml", ".json"}
                 if file_path.suffix.lower() in allowed_extensions:
+                    if metadata_only:
+                        try:
+                            stat = file_path.stat()
+                            files.append(
+                                FileMetadata(
+                                    name=file_path.name,
+                                    path=str(file_path.relative_to(PROJECT_ROOT)),
+                                    size=stat.st_size,
+                                    last_modified=datetime.fromtimestamp(
+                                        stat.st_mtime
+                                    ).isoformat(),
+                                    content_hash=_get_content_hash(file_path, stat),
+                                )
+                            )
+                        except OSError:
+                            # ファイル読み込みエラーは無視して続行
+                            continue
+                        continue
+
                     try:
                         with open(file_path, "r", encoding="utf-8") as f:
                             content = f.read()
@@ -77,19 +197,33 @@ async def list_files(
                         # ファイル読み込みエラーは無視して続行
                         continue
 
+        if metadata_only:
+            return FileMetadataListResponse(files=files)
         return FileListResponse(files=files)
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list files: {str(e)}")
 
 
 @router.get("/{file_path:path}", response_model=FileInfo)
-async def get_file(file_path: str):
-    """指定されたファイルの内容を取得"""
+async def get_file(
+    file_path: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    指定されたファイルの内容を取得
+
+    レスポンスにはコンテンツハッシュに基づくETagを付与し、If-None-Matchが
+    一致する場合は内容を返さずに304を返す。
+    """
     try:
         # セキュリティチェック
         if ".." in file_path or file_path.startswith("/"):
             raise HTTPException(status_code=403, detail="Invalid file path")
+        _reject_snapshot_path(file_path)
 
         full_path = PROJECT_ROOT / file_path
         if not full_path.exists():
@@ -105,12 +239,26 @@ async def get_file(file_path: str):
                 status_code=403, detail="Access to this file is not allowed"
             )
 
-        with open(full_path, "r", encoding="utf-8") as f:
-            content = f.read()
-
         stat = full_path.stat()
         last_modified = datetime.fromtimestamp(stat.st_mtime).isoformat()
 
+        # 変更がなければキャッシュ済みのハッシュで判定し、ファイルを読み込まない
+        cached_hash = _lookup_content_hash(full_path, stat)
+        if cached_hash is not None and _etag_matches(
+            if_none_match, _make_etag(cached_hash)
+        ):
+            return Response(status_code=304, headers={"ETag": _make_etag(cached_hash)})
+
+        with open(full_path, "rb") as f:
+            data = f.read()
+
+        etag = _make_etag(_remember_content_hash(full_path, stat, data))
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        content = data.decode("utf-8")
+        response.headers["ETag"] = etag
+
         return FileInfo(
             name=full_path.name,
             path=file_path,
@@ -131,6 +279,7 @@ async def update_file(file_path: str, file_content: FileContent):
         # セキュリティチェック
         if ".." in file_path or file_path.startswith("/"):
             raise HTTPException(status_code=403, detail="Invalid file path")
+        _reject_snapshot_path(file_path)
 
         # 許可されたディレクトリ内かチェック
         allowed_dirs = ["data/prompts", "data/characters", "data/scenes"]
@@ -148,6 +297,9 @@ async def update_file(file_path: str, file_content: FileContent):
         with open(full_path, "w", encoding="utf-8") as f:
             f.write(file_content.content)
 
+        # キャラクター・シーン一覧のキャッシュに変更を通知
+        engine_wrapper.asset_catalog.invalidate(full_path)
+
         return {"message": "File updated successfully", "path": file_path}
 
     except HTTPException:
@@ -163,6 +315,7 @@ async def create_file(request: CreateFileRequest):
         # セキュリティチェック
         if ".." in request.path or request.path.startswith("/"):
             raise HTTPException(status_code=403, detail="Invalid file path")
+        _reject_snapshot_path(request.path)
 
         # 許可されたディレクトリ内かチェック
         allowed_dirs = ["data/prompts", "data/characters", "data/scenes"]
@@ -186,6 +339,9 @@ async def create_file(request: CreateFileRequest):
         with open(full_path, "w", encoding="utf-8") as f:
             f.write(request.content)
 
+        # キャラクター・シーン一覧のキャッシュに変更を通知
+        engine_wrapper.asset_catalog.invalidate(full_path)
+
         return {"message": "File created successfully", "path": request.path}
 
     except HTTPException:
@@ -201,6 +357,7 @@ async def delete_file(file_path: str):
         # セキュリティチェック
         if ".." in file_path or file_path.startswith("/"):
             raise HTTPException(status_code=403, detail="Invalid file path")
+        _reject_snapshot_path(file_path)
 
         # 許可されたディレクトリ内かチェック
         allowed_dirs = ["data/prompts", "data/characters", "data/scenes"]
@@ -219,6 +376,11 @@ async def delete_file(file_path: str):
 
         # ファイルを削除
         full_path.unlink()
+        with _content_hash_lock:
+            _content_hash_cache.pop(str(full_path), None)
+
+        # キャラクター・シーン一覧のキャッシュに変更を通知
+        engine_wrapper.asset_catalog.invalidate(full_path)
 
         return {"message": "File deleted successfully", "path": file_path}
 
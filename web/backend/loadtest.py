@@ -0,0 +1,484 @@
+"""
+Web APIの負荷試験ツール
+
+スタブのLLMを使ってFastAPIアプリケーションを同じプロセス内で起動し、
+複数のクライアントが思考時間を挟みながら各エンドポイントを呼び出す状況を再現します。
+エンドポイントごとのスループット、レイテンシ（p50/p95/p99）、エラー率を報告します。
+
+使用例:
+    python -m web.backend.loadtest --clients 20 --duration 30
+    python -m web.backend.loadtest --url http://localhost:8000 --mix status=5,files=1
+
+スタブのLLMは実際のLLM呼び出しと同じく同期的に待機するため、
+ターン実行がイベントループを塞ぐ影響もそのまま計測されます。
+キャラクター設定とログは一時ディレクトリに複製して使用するため、data/ 以下は変更されません。
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+from pydantic import BaseModel, Field
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "src"))
+
+from project_anima.analytics import LatencyHistogram
+from project_anima.core.llm_adapter import LLMAdapter
+from project_anima.core.structured_output import ResponseStats
+from project_anima.utils.logging_setup import (
+    ENV_VERBOSITY,
+    VERBOSITY_LEVELS,
+    configure_logging,
+)
+
+logger = logging.getLogger(__name__)
+
+# エンドポイント名と (メソッド, パス, リクエストボディを作成する関数) の対応
+ENDPOINTS: Dict[str, Tuple[str, str, Optional[Callable[[int], Dict[str, Any]]]]] = {
+    "status": ("GET", "/api/simulation/status", None),
+    "next-turn": ("POST", "/api/simulation/next-turn", None),
+    "intervention": (
+        "POST",
+        "/api/simulation/intervention",
+        lambda n: {"type": "update_situation", "content": f"負荷試験の介入 {n}"},
+    ),
+    "files": ("GET", "/api/files?directory=data/characters&metadata_only=true", None),
+}
+
+# 既定のエンドポイントの呼び出し比率（状態の確認が最も多く、ターン実行と介入は少ない）
+DEFAULT_MIX = {"status": 6.0, "next-turn": 2.0, "intervention": 1.0, "files": 1.0}
+
+
+class LoadTestConfig(BaseModel):
+    """負荷試験の設定"""
+
+    clients: int = Field(10, ge=1, description="同時に動作するクライアント数")
+    duration_s: float = Field(10.0, gt=0, description="負荷をかける時間（秒）")
+    think_time_ms: float = Field(
+        500.0, ge=0, description="リクエスト間の思考時間の平均（指数分布、ミリ秒）"
+    )
+    mix: Dict[str, float] = Field(
+        default_factory=lambda: dict(DEFAULT_MIX),
+        description="エンドポイント名と呼び出し比率",
+    )
+    seed: Optional[int] = Field(None, description="乱数のシード")
+    scene_id: Optional[str] = Field(None, description="使用する場面のID")
+    request_timeout_s: float = Field(60.0, gt=0, description="リクエストのタイムアウト")
+
+
+class StubModel:
+    """
+    固定の応答を一定時間待ってから返すLLMモデルのスタブ
+
+    思考生成と長期情報更新のどちらの検証にも通るJSONを返します。
+    """
+
+    def __init__(self, latency_ms: float = 200.0, jitter: float = 0.2, seed=None):
+        """
+        StubModelを初期化する
+
+        Args:
+            latency_ms: 応答までの平均待ち時間（ミリ秒）
+            jitter: 待ち時間のばらつき（平均に対する割合）
+            seed: 乱数のシード
+        """
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def generate_content(self, prompt: str, generation_config=None, **kwargs):
+        with self._lock:
+            self.calls += 1
+            call_number = self.calls
+            spread = self._random.uniform(-self.jitter, self.jitter)
+        time.sleep(max(self.latency_ms * (1 + spread), 0) / 1000)
+
+        text = json.dumps(
+            {
+                "think": f"スタブの思考 {call_number}",
+                "act": "",
+                "talk": f"スタブの発言 {call_number}",
+                "new_experiences": [],
+                "updated_goals": [],
+                "new_memories": [],
+            },
+            ensure_ascii=False,
+        )
+        return SimpleNamespace(
+            text=text,
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=len(prompt) // 4,
+                candidates_token_count=len(text) // 4,
+                total_token_count=(len(prompt) + len(text)) // 4,
+            ),
+        )
+
+
+def create_stub_llm_adapter(model_name: str, latency_ms: float = 200.0) -> LLMAdapter:
+    """
+    スタブのモデルを使用するLLMAdapterを作成する（ネットワークは使用しない）
+
+    Args:
+        model_name: 応答の計測情報に記録するモデル名
+        latency_ms: スタブの応答までの平均待ち時間（ミリ秒）
+
+    Returns:
+        作成したLLMAdapter
+    """
+    adapter = LLMAdapter(model_name=model_name, api_key="stub", stats=ResponseStats())
+    adapter.model = StubModel(latency_ms)
+    return adapter
+
+
+class EndpointStats:
+    """エンドポイントごとの計測結果"""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+        self.rejected = 0
+
+    def record(self, latency_ms: float, error: bool, rejected: bool) -> None:
+        """
+        1件のリクエストの結果を記録する
+
+        Args:
+            latency_ms: レイテンシ（ミリ秒）
+            error: 通信エラーまたはHTTPステータス400以上の場合True
+            rejected: HTTPステータスは成功だが、応答のsuccessがfalseの場合True
+        """
+        self.histogram.add(latency_ms)
+        if error:
+            self.errors += 1
+        elif rejected:
+            self.rejected += 1
+
+    def to_dict(self, elapsed_s: float) -> Dict[str, Any]:
+        """計測結果を辞書形式で返す"""
+        requests = self.histogram.count
+        return {
+            **self.histogram.to_dict(),
+            "throughput_rps": requests / elapsed_s if elapsed_s > 0 else 0.0,
+            "errors": self.errors,
+            "error_rate": self.errors / requests if requests else 0.0,
+            "rejected": self.rejected,
+            "rejected_rate": self.rejected / requests if requests else 0.0,
+        }
+
+
+async def _send(
+    client: httpx.AsyncClient, endpoint: str, sequence: int
+) -> Tuple[bool, bool]:
+    """エンドポイントを1回呼び出し、(エラーか, 拒否されたか) を返す"""
+    method, path, body_factory = ENDPOINTS[endpoint]
+    try:
+        response = await client.request(
+            method, path, json=body_factory(sequence) if body_factory else None
+        )
+    except httpx.HTTPError as e:
+        logger.debug(f"{endpoint} の呼び出しに失敗しました: {e}")
+        return True, False
+
+    if response.status_code >= 400:
+        return True, False
+    try:
+        payload = response.json()
+    except ValueError:
+        return False, False
+    return False, isinstance(payload, dict) and payload.get("success") is False
+
+
+async def _run_client(
+    client: httpx.AsyncClient,
+    config: LoadTestConfig,
+    client_index: int,
+    deadline: float,
+    stats: Dict[str, EndpointStats],
+) -> None:
+    """1台のクライアントとして、期限まで思考時間を挟みながらリクエストを送る"""
+    seed = None if config.seed is None else config.seed * 1000 + client_index
+    rng = random.Random(seed)
+    endpoints = list(config.mix)
+    weights = [config.mix[name] for name in endpoints]
+    sequence = 0
+
+    while True:
+        if config.think_time_ms > 0:
+            await asyncio.sleep(rng.expovariate(1000 / config.think_time_ms))
+        if time.perf_counter() >= deadline:
+            return
+
+        endpoint = rng.choices(endpoints, weights=weights, k=1)[0]
+        sequence += 1
+        started = time.perf_counter()
+        error, rejected = await _send(
+            client, endpoint, client_index * 100000 + sequence
+        )
+        stats[endpoint].record((time.perf_counter() - started) * 1000, error, rejected)
+
+
+async def run_load_test(base_url: str, config: LoadTestConfig) -> Dict[str, Any]:
+    """
+    負荷試験を実行する
+
+    シミュレーションを開始してから各クライアントを動作させ、終了後にリセットします。
+
+    Args:
+        base_url: 対象のAPIサーバーのURL
+        config: 負荷試験の設定
+
+    Returns:
+        エンドポイントごとの計測結果と全体の集計
+    """
+    unknown = set(config.mix) - set(ENDPOINTS)
+    if unknown:
+        raise ValueError(
+            f"未知のエンドポイントです: {', '.join(sorted(unknown))}（利用可能: {', '.join(ENDPOINTS)}）"
+        )
+
+    stats = {name: EndpointStats() for name in config.mix}
+    limits = httpx.Limits(max_connections=config.clients + 2)
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=config.request_timeout_s, limits=limits
+    ) as client:
+        start_config = {
+            "llm_provider": "gemini",
+            "model_name": "stub",
+            "scene_id": config.scene_id,
+        }
+        response = await client.post(
+            "/api/simulation/start", json={"config": start_config}
+        )
+        if response.status_code >= 400 or not response.json().get("success"):
+            raise RuntimeError(
+                f"シミュレーションを開始できませんでした: {response.text}"
+            )
+
+        started = time.perf_counter()
+        deadline = started + config.duration_s
+        try:
+            await asyncio.gather(
+                *(
+                    _run_client(client, config, index, deadline, stats)
+                    for index in range(config.clients)
+                )
+            )
+        finally:
+            elapsed_s = time.perf_counter() - started
+            await client.post("/api/simulation/reset")
+
+    endpoints = {name: s.to_dict(elapsed_s) for name, s in stats.items()}
+    total_requests = sum(e["count"] for e in endpoints.values())
+    total_errors = sum(e["errors"] for e in endpoints.values())
+    return {
+        "config": config.model_dump(),
+        "elapsed_s": elapsed_s,
+        "total_requests": total_requests,
+        "throughput_rps": total_requests / elapsed_s if elapsed_s > 0 else 0.0,
+        "error_rate": total_errors / total_requests if total_requests else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+@contextmanager
+def launch_app_server(stub_latency_ms: float = 200.0) -> Iterator[str]:
+    """
+    スタブのLLMを使うようにしたアプリケーションを別スレッドで起動する
+
+    キャラクター設定とログの出力先は一時ディレクトリに切り替え、終了時に元に戻します。
+
+    Args:
+        stub_latency_ms: スタブのLLMの平均待ち時間（ミリ秒）
+
+    Yields:
+        起動したサーバーのURL
+    """
+    import uvicorn
+
+    from web.backend.main import app
+    from web.backend.services.engine_wrapper import engine_wrapper
+
+    original = (
+        engine_wrapper.characters_dir,
+        engine_wrapper.log_dir,
+        engine_wrapper.llm_adapter_factory,
+    )
+    with tempfile.TemporaryDirectory(prefix="anima-loadtest-") as work_dir:
+        characters_dir = Path(work_dir) / "characters"
+        shutil.copytree(original[0], characters_dir)
+        engine_wrapper.characters_dir = characters_dir
+        engine_wrapper.log_dir = Path(work_dir) / "logs"
+        engine_wrapper.llm_adapter_factory = lambda model_name: create_stub_llm_adapter(
+            model_name, stub_latency_ms
+        )
+
+        server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning")
+        )
+        thread = threading.Thread(
+            target=server.run, name="anima-loadtest-server", daemon=True
+        )
+        thread.start()
+        try:
+            while not server.started:
+                if not thread.is_alive():
+                    raise RuntimeError("APIサーバーを起動できませんでした")
+                time.sleep(0.05)
+            port = server.servers[0].sockets[0].getsockname()[1]
+            yield f"http://127.0.0.1:{port}"
+        finally:
+            server.should_exit = True
+            thread.join()
+            (
+                engine_wrapper.characters_dir,
+                engine_wrapper.log_dir,
+                engine_wrapper.llm_adapter_factory,
+            ) = original
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """
+    負荷試験の結果を表形式の文字列に整形する
+
+    Args:
+        report: run_load_testの戻り値
+
+    Returns:
+        整形した文字列
+    """
+
+    def _ms(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value:.1f}"
+
+    config = report["config"]
+    lines = [
+        f"クライアント数: {config['clients']}  実行時間: {report['elapsed_s']:.1f} 秒"
+        f"  思考時間の平均: {config['think_time_ms']:.0f} ms",
+        f"合計: {report['total_requests']} 件"
+        f"  {report['throughput_rps']:.1f} req/s  エラー率: {report['error_rate']:.1%}",
+        "",
+        f"{'endpoint':<14}{'count':>7}{'req/s':>8}{'p50':>9}{'p95':>9}{'p99':>9}"
+        f"{'max':>9}{'errors':>8}{'rejected':>10}",
+    ]
+    for name, stats in report["endpoints"].items():
+        lines.append(
+            f"{name:<14}{stats['count']:>7}{stats['throughput_rps']:>8.1f}"
+            f"{_ms(stats['p50_ms']):>9}{_ms(stats['p95_ms']):>9}"
+            f"{_ms(stats['p99_ms']):>9}{_ms(stats['max_ms']):>9}"
+            f"{stats['error_rate']:>8.1%}{stats['rejected_rate']:>10.1%}"
+        )
+    lines.append("（レイテンシの単位はミリ秒）")
+    return "\n".join(lines)
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """
+    "status=5,next-turn=1" の形式の呼び出し比率を解析する
+
+    Args:
+        text: 呼び出し比率の文字列
+
+    Returns:
+        エンドポイント名と比率の辞書
+    """
+    mix = {}
+    for item in text.split(","):
+        if not item.strip():
+            continue
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = float(weight) if weight else 1.0
+    return mix
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Load-test the Project Anima web API with a stub LLM"
+    )
+    parser.add_argument(
+        "--url",
+        type=str,
+        default=None,
+        help="Target an already running server instead of launching one with a stub LLM",
+    )
+    parser.add_argument("--clients", type=int, default=10, help="Concurrent clients")
+    parser.add_argument(
+        "--duration", type=float, default=10.0, help="Test duration in seconds"
+    )
+    parser.add_argument(
+        "--think-time-ms",
+        type=float,
+        default=500.0,
+        help="Mean think time between requests per client (exponential)",
+    )
+    parser.add_argument(
+        "--mix",
+        type=str,
+        default=",".join(f"{name}={weight:g}" for name, weight in DEFAULT_MIX.items()),
+        help=f"Endpoint weights, e.g. status=6,next-turn=2 (endpoints: {', '.join(ENDPOINTS)})",
+    )
+    parser.add_argument(
+        "--stub-latency-ms",
+        type=float,
+        default=200.0,
+        help="Mean latency of the stub LLM",
+    )
+    parser.add_argument("--scene", type=str, default=None, help="Scene ID to use")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    parser.add_argument(
+        "--verbosity",
+        choices=list(VERBOSITY_LEVELS),
+        default="quiet",
+        help="Log verbosity of the load test and the launched server",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Main entry point for the load test."""
+    args = parse_args(argv)
+    config = LoadTestConfig(
+        clients=args.clients,
+        duration_s=args.duration,
+        think_time_ms=args.think_time_ms,
+        mix=parse_mix(args.mix),
+        seed=args.seed,
+        scene_id=args.scene,
+    )
+
+    # 起動するアプリケーションは環境変数からログ設定を読み込む
+    os.environ.setdefault(ENV_VERBOSITY, args.verbosity)
+    configure_logging(verbosity=args.verbosity)
+
+    if args.url:
+        report = asyncio.run(run_load_test(args.url, config))
+    else:
+        with launch_app_server(args.stub_latency_ms) as url:
+            report = asyncio.run(run_load_test(url, config))
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -10,13 +10,13 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-from web.backend.api import simulation, files, export
+from web.backend.api import simulation, files, export, events
 from web.backend.services.engine_wrapper import engine_wrapper
+from project_anima.utils.logging_setup import configure_logging_from_env
 
-# ロギング設定
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+# ロギング設定（書き込みはリスナーのスレッドで行い、リクエスト処理を待たせない）
+# 詳細度やプロンプトダンプの出力先は環境変数 PROJECT_ANIMA_* で指定する
+configure_logging_from_env()
 logger = logging.getLogger(__name__)
 
 # FastAPIアプリケーションの初期化
@@ -52,6 +52,7 @@ app.add_middleware(
 app.include_router(simulation.router, prefix="/api/simulation", tags=["simulation"])
 app.include_router(files.router, prefix="/api/files", tags=["files"])
 app.include_router(export.router, prefix="/api/export", tags=["export"])
+app.include_router(events.router, prefix="/api/events", tags=["events"])
 
 
 @app.on_event("startup")
@@ -4,23 +4,69 @@ Project Anima Web UI - サーバー起動スクリプト
 
 FastAPIサーバーを起動するためのスクリプト
 """
+
+import argparse
 import sys
 import os
 from pathlib import Path
+from typing import List, Optional
 
 # プロジェクトルートをPythonパスに追加
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 import uvicorn
-from web.backend.main import app
+from web.backend.services.session_store import SESSION_DB_ENV
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """コマンドライン引数を解析する"""
+    parser = argparse.ArgumentParser(description="Project Anima Web UI APIサーバー")
+    parser.add_argument("--host", default="0.0.0.0", help="待ち受けるアドレス")
+    parser.add_argument("--port", type=int, default=8000, help="待ち受けるポート")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="ワーカープロセス数（2以上の場合は自動リロードを無効にし、セッションストアを使用する）",
+    )
+    parser.add_argument(
+        "--session-db",
+        default=None,
+        help=f"セッション状態を保存するSQLiteファイル（省略時は環境変数 {SESSION_DB_ENV}、"
+        "ワーカーが2以上で未設定の場合は logs/sessions.sqlite3）",
+    )
+    parser.add_argument(
+        "--no-reload",
+        action="store_true",
+        help="ファイル変更時の自動リロードを無効にする",
+    )
+    return parser.parse_args(argv)
+
 
 if __name__ == "__main__":
+    args = parse_args()
+
+    # ワーカーはこのプロセスの環境変数を引き継いでセッションストアを作成する
+    if args.session_db:
+        os.environ[SESSION_DB_ENV] = args.session_db
+    elif args.workers > 1 and not os.environ.get(SESSION_DB_ENV):
+        os.environ[SESSION_DB_ENV] = str(project_root / "logs" / "sessions.sqlite3")
+
     print("Project Anima Web UI APIサーバーを起動しています...")
-    print("サーバーURL: http://localhost:8000")
-    print("API ドキュメント: http://localhost:8000/docs")
+    print(f"サーバーURL: http://localhost:{args.port}")
+    print(f"API ドキュメント: http://localhost:{args.port}/docs")
+    if args.workers > 1:
+        print(
+            f"ワーカー数: {args.workers}（セッションストア: {os.environ[SESSION_DB_ENV]}）"
+        )
     print("停止するには Ctrl+C を押してください")
 
     uvicorn.run(
-        "web.backend.main:app", host="0.0.0.0", port=8000, reload=True, log_level="info"
+        "web.backend.main:app",
+        host=args.host,
+        port=args.port,
+        reload=args.workers == 1 and not args.no_reload,
+        workers=args.workers,
+        log_level="info",
     )
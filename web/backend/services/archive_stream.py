@@ -0,0 +1,155 @@
+"""
+ZIPアーカイブのストリーミング生成サービス
+
+アーカイブ全体をメモリ上に構築せず、ファイルを読み込みながら
+ZIPのバイト列をチャンク単位で生成するための機能を提供します。
+"""
+
+import io
+import os
+import sys
+import zipfile
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Project Animaのコアモジュールをインポートするためのパス設定
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from project_anima.utils.log_files import iter_simulation_dirs
+from project_anima.utils.yaml_snapshot import is_snapshot_path
+
+# ファイルを読み込む単位（バイト）
+READ_CHUNK_SIZE = 64 * 1024
+
+# アーカイブに含めるエントリ（アーカイブ内のパス, 実ファイルのパス or バイト列）
+ArchiveEntry = Tuple[str, object]
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """
+    ZipFileの書き込み先として使用する、書き込まれたデータを順次取り出せるバッファ
+
+    シーク不可能なストリームとして振る舞うため、ZipFileはデータディスクリプタ形式で
+    書き込みを行い、書き込み済みのデータを後から書き換えることはありません。
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        if data:
+            self._chunks.append(data)
+            self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        """書き込まれたデータを取り出してバッファを空にする"""
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_directory_entries(
+    directory: str, base_dir: str = "."
+) -> Iterator[ArchiveEntry]:
+    """
+    ディレクトリ以下のファイルをアーカイブのエントリとして列挙する
+
+    キャラクターデータのスナップショット（内部キャッシュ）は含めません。
+
+    Args:
+        directory: 対象のディレクトリ
+        base_dir: アーカイブ内のパスの基準となるディレクトリ
+
+    Yields:
+        (アーカイブ内のパス, ファイルパス) のタプル
+    """
+    if not os.path.isdir(directory):
+        return
+
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for file_name in sorted(files):
+            file_path = os.path.join(root, file_name)
+            if is_snapshot_path(file_path):
+                continue
+            yield os.path.relpath(file_path, base_dir), file_path
+
+
+def iter_log_entries(
+    log_dir: str,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    simulation_ids: Optional[Iterable[str]] = None,
+    base_dir: str = ".",
+) -> Iterator[ArchiveEntry]:
+    """
+    条件に合うシミュレーションログをアーカイブのエントリとして列挙する
+
+    Args:
+        log_dir: ログのルートディレクトリ
+        since: この日付以降の実行に限定（Noneの場合は制限なし）
+        until: この日付以前の実行に限定（Noneの場合は制限なし）
+        simulation_ids: 対象とするシミュレーションIDの集合（Noneの場合は全て）
+        base_dir: アーカイブ内のパスの基準となるディレクトリ
+
+    Yields:
+        (アーカイブ内のパス, ファイルパス) のタプル
+    """
+    for _, simulation_dir in iter_simulation_dirs(
+        log_dir, since, until, simulation_ids
+    ):
+        yield from iter_directory_entries(simulation_dir, base_dir)
+
+
+def iter_zip_stream(entries: Iterable[ArchiveEntry]) -> Iterator[bytes]:
+    """
+    エントリを順に圧縮し、ZIPアーカイブのバイト列をチャンク単位で返す
+
+    メモリ上に保持するのは処理中のチャンクのみのため、
+    アーカイブのサイズに関係なく一定のメモリで動作します。
+
+    Args:
+        entries: (アーカイブ内のパス, ファイルパス or バイト列) のイテラブル
+
+    Yields:
+        ZIPアーカイブのバイト列
+    """
+    buffer = _ChunkBuffer()
+
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for arcname, source in entries:
+            if isinstance(source, bytes):
+                zip_file.writestr(arcname, source)
+            else:
+                zip_info = zipfile.ZipInfo.from_file(source, arcname)
+                zip_info.compress_type = zipfile.ZIP_DEFLATED
+                with open(source, "rb") as src:
+                    with zip_file.open(zip_info, "w", force_zip64=True) as dest:
+                        while True:
+                            chunk = src.read(READ_CHUNK_SIZE)
+                            if not chunk:
+                                break
+                            dest.write(chunk)
+                            data = buffer.drain()
+                            if data:
+                                yield data
+
+            data = buffer.drain()
+            if data:
+                yield data
+
+    # セントラルディレクトリ
+    data = buffer.drain()
+    if data:
+        yield data
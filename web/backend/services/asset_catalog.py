@@ -0,0 +1,181 @@
+"""
+キャラクター・シーンのカタログサービス
+
+data/characters と data/scenes の内容を索引化してキャッシュし、
+一覧取得のたびにファイルシステムを走査・YAMLを解析しないようにするサービス
+"""
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+
+class AssetCatalog:
+    """
+    キャラクターとシーンの一覧をキャッシュするカタログ
+
+    一覧は最後の走査からrefresh_interval秒の間はキャッシュから返し、
+    それ以降の最初のアクセスでファイルの更新時刻を確認して差分のみ再読み込みする。
+    ファイル管理APIなどからの書き込み時はinvalidateを呼ぶことで即座に反映される。
+    """
+
+    DEFAULT_REFRESH_INTERVAL = 2.0
+
+    def __init__(
+        self,
+        characters_dir: Path,
+        scenes_dir: Path,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+    ):
+        """
+        AssetCatalogを初期化
+
+        Args:
+            characters_dir: キャラクターディレクトリ
+            scenes_dir: シーンファイルのディレクトリ
+            refresh_interval: ファイルシステムの変更を確認する最短間隔（秒）
+        """
+        self.characters_dir = Path(characters_dir)
+        self.scenes_dir = Path(scenes_dir)
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.RLock()
+        self._last_checked: Optional[float] = None
+
+        # シーンファイルパス -> (st_mtime_ns, st_size, シーン情報)
+        self._scene_entries: Dict[str, Tuple[int, int, Dict[str, str]]] = {}
+        self._characters: List[str] = []
+        self._scenes: List[Dict[str, str]] = []
+
+    def get_characters(self) -> List[str]:
+        """利用可能なキャラクターIDの一覧を取得"""
+        with self._lock:
+            self._refresh_if_stale()
+            return list(self._characters)
+
+    def get_scenes(self) -> List[Dict[str, str]]:
+        """利用可能なシーン情報の一覧を取得"""
+        with self._lock:
+            self._refresh_if_stale()
+            return [dict(scene) for scene in self._scenes]
+
+    def invalidate(self, path: Optional[Union[str, Path]] = None) -> None:
+        """
+        キャッシュを無効化し、次回アクセス時に再走査させる
+
+        Args:
+            path: 変更されたファイルのパス（シーンファイルの場合は解析結果も破棄する）
+        """
+        with self._lock:
+            self._last_checked = None
+            if path is not None:
+                self._scene_entries.pop(str(Path(path)), None)
+
+    def _refresh_if_stale(self) -> None:
+        """前回の確認から一定時間が経過していれば変更を確認する"""
+        now = time.monotonic()
+        if (
+            self._last_checked is not None
+            and now - self._last_checked < self.refresh_interval
+        ):
+            return
+
+        self._characters = self._scan_characters()
+        self._scenes = self._scan_scenes()
+        self._last_checked = now
+
+    def _scan_characters(self) -> List[str]:
+        """immutable.yamlを持つキャラクターディレクトリを列挙"""
+        characters = []
+        try:
+            with os.scandir(self.characters_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir() and os.path.exists(
+                        os.path.join(entry.path, "immutable.yaml")
+                    ):
+                        characters.append(entry.name)
+        except FileNotFoundError:
+            return []
+        except OSError as e:
+            logger.error(f"キャラクター一覧取得エラー: {e}")
+            return list(self._characters)
+
+        return sorted(characters)
+
+    def _scan_scenes(self) -> List[Dict[str, str]]:
+        """シーンファイルを列挙し、更新されたものだけを再解析"""
+        entries: Dict[str, Tuple[int, int, Dict[str, str]]] = {}
+        try:
+            with os.scandir(self.scenes_dir) as dir_entries:
+                scene_files = [
+                    entry
+                    for entry in dir_entries
+                    if entry.is_file() and entry.name.endswith(".yaml")
+                ]
+        except FileNotFoundError:
+            self._scene_entries = {}
+            return []
+        except OSError as e:
+            logger.error(f"シーン一覧取得エラー: {e}")
+            return list(self._scenes)
+
+        for entry in scene_files:
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+
+            path = str(Path(entry.path))
+            cached = self._scene_entries.get(path)
+            if (
+                cached is not None
+                and cached[0] == stat.st_mtime_ns
+                and cached[1] == stat.st_size
+            ):
+                entries[path] = cached
+            else:
+                entries[path] = (
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                    self._load_scene_info(Path(entry.path)),
+                )
+
+        self._scene_entries = entries
+        return sorted(
+            (info for _, _, info in entries.values()), key=lambda x: x["name"]
+        )
+
+    def _load_scene_info(self, scene_file: Path) -> Dict[str, str]:
+        """シーンファイルを解析して一覧表示用の情報を作成"""
+        try:
+            with open(scene_file, "r", encoding="utf-8") as f:
+                scene_data = yaml.safe_load(f) or {}
+
+            return {
+                "id": scene_file.stem,
+                "name": scene_data.get(
+                    "scene_id", scene_file.stem
+                ),  # scene_idを名前として使用
+                "description": scene_data.get(
+                    "situation", "説明なし"
+                ),  # situationを説明として使用
+                "file_path": str(scene_file),
+                "location": scene_data.get("location", ""),  # locationは別途保持
+            }
+        except Exception as e:
+            logger.warning(f"シーンファイル読み込みエラー {scene_file}: {e}")
+            # エラーがあってもファイル名だけは返す
+            return {
+                "id": scene_file.stem,
+                "name": scene_file.stem,  # ファイル名をシーンIDとして使用
+                "description": "読み込みエラー",
+                "file_path": str(scene_file),
+                "location": "",
+            }
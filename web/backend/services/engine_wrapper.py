@@ -8,6 +8,9 @@ import os
 import sys
 import logging
 import asyncio
+import functools
+import threading
+from contextvars import ContextVar
 from typing import Dict, List, Optional, Any, Callable
 from datetime import datetime
 from pathlib import Path
@@ -18,6 +21,13 @@ sys.path.insert(0, str(project_root / "src"))
 
 from project_anima.core.simulation_engine import SimulationEngine, SceneNotLoadedError
 from project_anima.core.data_models import InterventionData
+from project_anima.core.event_bus import (
+    EventCallback,
+    SimulationEventBus,
+    SimulationEventType,
+)
+from web.backend.services.asset_catalog import AssetCatalog
+from web.backend.services.session_store import SessionStore
 from web.backend.api.models import (
     SimulationStatus,
     SimulationConfig,
@@ -35,6 +45,36 @@ class EngineWrapperError(Exception):
     pass
 
 
+# 現在の処理がロックを保持しているセッションのID（処理の中から別の操作を呼び出す場合に再取得しない）
+_held_session: ContextVar[Optional[str]] = ContextVar("_held_session", default=None)
+
+
+def _with_session_state(method):
+    """
+    セッションストアが有効な場合、ロックを取得して最新の状態を読み込んでから処理し、
+    終了後にチェックポイントを保存するデコレーター
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self: "EngineWrapper", *args, **kwargs):
+        store = self.session_store
+        if store is None or _held_session.get() == self.session_id:
+            return await method(self, *args, **kwargs)
+
+        owner = await asyncio.to_thread(store.acquire, self.session_id)
+        token = _held_session.set(self.session_id)
+        try:
+            await asyncio.to_thread(self._load_session_state)
+            result = await method(self, *args, **kwargs)
+            await asyncio.to_thread(self._save_session_state)
+            return result
+        finally:
+            _held_session.reset(token)
+            await asyncio.to_thread(store.release, self.session_id, owner)
+
+    return wrapper
+
+
 class EngineWrapper:
     """
     SimulationEngineのラッパークラス
@@ -42,12 +82,28 @@ class EngineWrapper:
     Web UIからの操作を受け付け、既存のSimulationEngineに橋渡しする
     """
 
-    def __init__(self):
-        """EngineWrapperを初期化"""
+    def __init__(
+        self,
+        session_store: Optional[SessionStore] = None,
+        session_id: str = "default",
+    ):
+        """
+        EngineWrapperを初期化
+
+        Args:
+            session_store: 進行状態を保存するストア（省略時は環境変数
+                PROJECT_ANIMA_SESSION_DB が設定されている場合のみ作成する）。
+                複数のワーカープロセスで同じセッションを扱う場合に使用する
+            session_id: ストアに保存するセッションのID
+        """
         self.engine: Optional[SimulationEngine] = None
-        self.status = SimulationStatus.NOT_STARTED
+        self._status = SimulationStatus.NOT_STARTED
         self.current_config: Optional[SimulationConfig] = None
 
+        # エンジンの再生成をまたいで状態変化を配信するイベントバス
+        self.event_bus = SimulationEventBus()
+        self.websocket_callbacks: List[EventCallback] = []
+
         # プロジェクトのパス設定
         self.project_root = project_root
         self.characters_dir = self.project_root / "data" / "characters"
@@ -55,17 +111,60 @@ class EngineWrapper:
         self.scenes_dir = self.project_root / "data" / "scenes"
         self.log_dir = self.project_root / "logs"
 
+        # キャラクター・シーン一覧のキャッシュ
+        self.asset_catalog = AssetCatalog(self.characters_dir, self.scenes_dir)
+
+        # モデル名からLLMアダプターを作成する関数（負荷試験でスタブを使う場合などに設定する）
+        # Noneの場合はSimulationEngineが既定のLLMAdapterを作成する
+        self.llm_adapter_factory: Optional[Callable[[str], Any]] = None
+
+        # 進行状態の保存先（ワーカープロセス間で共有する）
+        self.session_store = (
+            session_store if session_store is not None else SessionStore.from_env()
+        )
+        self.session_id = session_id
+        self._session_version: Optional[int] = None
+        self._rewrite_turns = False
+        self._session_state_lock = threading.RLock()
+
         logger.info("EngineWrapperを初期化しました")
 
+    @property
+    def status(self) -> SimulationStatus:
+        """現在のシミュレーション状態"""
+        return self._status
+
+    @status.setter
+    def status(self, new_status: SimulationStatus) -> None:
+        """シミュレーション状態を更新し、変化があればイベントを発行"""
+        previous_status = self._status
+        self._status = new_status
+        if previous_status != new_status:
+            self.event_bus.publish(
+                SimulationEventType.STATUS_CHANGED,
+                {
+                    "source": "wrapper",
+                    "status": SimulationStatus(new_status).value,
+                    "previous_status": SimulationStatus(previous_status).value,
+                },
+            )
+
+    def add_websocket_callback(self, callback: EventCallback) -> None:
+        """状態変化イベントを受け取るコールバックを登録"""
+        if callback not in self.websocket_callbacks:
+            self.websocket_callbacks.append(callback)
+        self.event_bus.subscribe(callback)
+
+    def remove_websocket_callback(self, callback: EventCallback) -> None:
+        """登録済みのコールバックを解除"""
+        if callback in self.websocket_callbacks:
+            self.websocket_callbacks.remove(callback)
+        self.event_bus.unsubscribe(callback)
+
     def get_available_characters(self) -> List[str]:
         """利用可能なキャラクター一覧を取得"""
         try:
-            characters = []
-            if self.characters_dir.exists():
-                for char_dir in self.characters_dir.iterdir():
-                    if char_dir.is_dir() and (char_dir / "immutable.yaml").exists():
-                        characters.append(char_dir.name)
-            return sorted(characters)
+            return self.asset_catalog.get_characters()
         except Exception as e:
             logger.error(f"キャラクター一覧取得エラー: {e}")
             return []
@@ -73,49 +172,115 @@ class EngineWrapper:
     def get_available_scenes(self) -> List[Dict[str, str]]:
         """利用可能なシーン一覧を取得"""
         try:
-            import yaml
-
-            scenes = []
-            if self.scenes_dir.exists():
-                for scene_file in self.scenes_dir.glob("*.yaml"):
-                    try:
-                        with open(scene_file, "r", encoding="utf-8") as f:
-                            scene_data = yaml.safe_load(f)
-
-                        scene_info = {
-                            "id": scene_file.stem,
-                            "name": scene_data.get(
-                                "scene_id", scene_file.stem
-                            ),  # scene_idを名前として使用
-                            "description": scene_data.get(
-                                "situation", "説明なし"
-                            ),  # situationを説明として使用
-                            "file_path": str(scene_file),
-                            "location": scene_data.get(
-                                "location", ""
-                            ),  # locationは別途保持
-                        }
-                        scenes.append(scene_info)
-                    except Exception as e:
-                        logger.warning(
-                            f"シーンファイル読み込みエラー {scene_file}: {e}"
-                        )
-                        # エラーがあってもファイル名だけは返す
-                        scenes.append(
-                            {
-                                "id": scene_file.stem,
-                                "name": scene_file.stem,  # ファイル名をシーンIDとして使用
-                                "description": "読み込みエラー",
-                                "file_path": str(scene_file),
-                                "location": "",
-                            }
-                        )
-
-            return sorted(scenes, key=lambda x: x["name"])
+            return self.asset_catalog.get_scenes()
         except Exception as e:
             logger.error(f"シーン一覧取得エラー: {e}")
             return []
 
+    def _create_engine(self, scene_file_path: str, llm_model: str) -> SimulationEngine:
+        """SimulationEngineを作成"""
+        return SimulationEngine(
+            scene_file_path=scene_file_path,
+            characters_dir=str(self.characters_dir),
+            prompts_dir=str(self.prompts_dir),
+            log_dir=str(self.log_dir),
+            llm_model=llm_model,
+            debug=False,
+            event_bus=self.event_bus,
+            llm_adapter=(
+                self.llm_adapter_factory(llm_model)
+                if self.llm_adapter_factory is not None
+                else None
+            ),
+        )
+
+    def _load_session_state(self) -> None:
+        """
+        ストアに保存されたセッションが手元の状態より新しければ読み込む
+
+        他のワーカーが進めたセッションを引き継ぐため、必要に応じてエンジンを作成し直す。
+        """
+        if self.session_store is None:
+            return
+
+        with self._session_state_lock:
+            if self.session_store.get_version(self.session_id) == self._session_version:
+                return
+
+            stored = self.session_store.load(self.session_id)
+            if stored is None:
+                self.engine = None
+                self.current_config = None
+                self._intervention_timeline = []
+                self.status = SimulationStatus.NOT_STARTED
+                self._session_version = None
+                return
+
+            state = stored.state
+            self.current_config = (
+                SimulationConfig.model_validate(state["config"])
+                if state.get("config")
+                else None
+            )
+            self._intervention_timeline = list(state.get("intervention_timeline", []))
+
+            engine_state = state.get("engine")
+            if engine_state is None:
+                self.engine = None
+            else:
+                if self.engine is None or str(self.engine.scene_file_path) != (
+                    engine_state["scene_file_path"]
+                ):
+                    self.engine = self._create_engine(
+                        engine_state["scene_file_path"],
+                        engine_state.get("llm_model") or self.current_config.model_name,
+                    )
+                self.engine.restore_state(engine_state, stored.turns)
+
+            self.status = SimulationStatus(state["status"])
+            self._session_version = stored.version
+            logger.info(
+                f"セッション '{self.session_id}' を読み込みました（版数: {stored.version}）"
+            )
+
+    def _save_session_state(self) -> None:
+        """現在の状態をストアにチェックポイントとして保存"""
+        if self.session_store is None:
+            return
+
+        with self._session_state_lock:
+            has_scene_log = (
+                self.engine is not None and self.engine._current_scene_log is not None
+            )
+            if not has_scene_log and self.current_config is None:
+                # 停止・リセット後は保存しているセッションを削除
+                self.session_store.delete(self.session_id)
+                self._session_version = None
+                return
+
+            state = {
+                "status": SimulationStatus(self.status).value,
+                "config": (
+                    self.current_config.model_dump(mode="json")
+                    if self.current_config
+                    else None
+                ),
+                "intervention_timeline": getattr(self, "_intervention_timeline", []),
+                "engine": (
+                    self.engine.export_state(include_turns=False)
+                    if has_scene_log
+                    else None
+                ),
+            }
+            self._session_version = self.session_store.checkpoint(
+                self.session_id,
+                state,
+                self.engine._current_scene_log.turns if has_scene_log else [],
+                rewrite=self._rewrite_turns,
+            )
+            self._rewrite_turns = False
+
+    @_with_session_state
     async def start_simulation(self, config: SimulationConfig) -> Dict[str, Any]:
         """シミュレーションを開始"""
         try:
@@ -169,14 +334,8 @@ class EngineWrapper:
                 )
 
             # SimulationEngineを初期化
-            self.engine = SimulationEngine(
-                scene_file_path=str(scene_file_path),
-                characters_dir=str(self.characters_dir),
-                prompts_dir=str(self.prompts_dir),
-                log_dir=str(self.log_dir),
-                llm_model=llm_model,
-                debug=False,
-            )
+            self.engine = self._create_engine(str(scene_file_path), llm_model)
+            self._rewrite_turns = True
 
             # シミュレーションセットアップ
             if not self.engine.start_simulation_setup():
@@ -203,6 +362,7 @@ class EngineWrapper:
 
             return {"success": False, "message": error_msg, "status": self.status}
 
+    @_with_session_state
     async def execute_next_turn(self) -> Dict[str, Any]:
         """次のターンを実行"""
         try:
@@ -271,6 +431,11 @@ class EngineWrapper:
                         "think": turn_data.think,
                         "act": turn_data.act,
                         "talk": turn_data.talk,
+                        "metadata": (
+                            turn_data.metadata.model_dump()
+                            if turn_data.metadata
+                            else None
+                        ),
                     },
                 }
             else:
@@ -294,6 +459,9 @@ class EngineWrapper:
     def get_simulation_state(self) -> SimulationState:
         """現在のシミュレーション状態を取得"""
         try:
+            # 他のワーカーが進めたセッションを反映（読み取りのみのためロックは取得しない）
+            self._load_session_state()
+
             if not self.engine or not self.current_config:
                 return SimulationState(
                     status=self.status,
@@ -346,7 +514,7 @@ class EngineWrapper:
                         timeline.append(
                             TimelineEntry(
                                 step=turn.turn_number,
-                                timestamp=datetime.now().isoformat(),  # 実際のタイムスタンプがない場合
+                                timestamp=self._get_turn_timestamp(turn),
                                 character=turn.character_name,
                                 action_type="turn",
                                 content=f"思考: {turn.think}\n行動: {turn.act}\n発言: {turn.talk}",
@@ -429,6 +597,14 @@ class EngineWrapper:
                 ),
             )
 
+    def _get_turn_timestamp(self, turn) -> str:
+        """ターンの記録時刻を取得（記録がない古いログは現在時刻で代用）"""
+        metadata = getattr(turn, "metadata", None)
+        if metadata is not None and (metadata.ended_at or metadata.started_at):
+            return metadata.ended_at or metadata.started_at
+        return datetime.now().isoformat()
+
+    @_with_session_state
     async def process_intervention(
         self,
         intervention_type: str,
@@ -538,6 +714,7 @@ class EngineWrapper:
         except Exception as e:
             logger.error(f"介入記録の追加に失敗: {e}")
 
+    @_with_session_state
     async def stop_simulation(self) -> Dict[str, Any]:
         """シミュレーションを停止"""
         try:
@@ -598,6 +775,7 @@ class EngineWrapper:
             logger.error(error_msg)
             return {"success": False, "message": error_msg}
 
+    @_with_session_state
     async def reset_simulation(self) -> Dict[str, Any]:
         """シミュレーション状態を強制的にリセット"""
         try:
@@ -648,6 +826,7 @@ class EngineWrapper:
                 self._intervention_timeline = []
             return {"success": False, "message": error_msg}
 
+    @_with_session_state
     async def update_llm_model(
         self, llm_provider: LLMProvider, model_name: str
     ) -> Dict[str, Any]:
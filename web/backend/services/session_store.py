@@ -0,0 +1,331 @@
+"""
+シミュレーションのセッション状態を保存するストア
+
+複数のワーカープロセスのどれでも同じセッションを扱えるよう、進行状態（場面ログ、
+ターンの位置、保留中の天啓、設定など）をSQLiteに保存するサービス。
+ターンの記録は追加された分だけを書き込むため、ターンごとのチェックポイントは
+ログの長さによらず軽量です。
+
+セッションごとのロックは期限付きの行（リース）で実現し、ロックを保持したまま
+ワーカーが終了した場合でも、期限が切れれば他のワーカーが取得できます。
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+# セッションストアのSQLiteファイルのパスを指定する環境変数（未設定の場合はプロセス内のみで保持）
+SESSION_DB_ENV = "PROJECT_ANIMA_SESSION_DB"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    turn_count INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS session_turns (
+    session_id TEXT NOT NULL,
+    turn_index INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (session_id, turn_index)
+);
+CREATE TABLE IF NOT EXISTS session_locks (
+    session_id TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class SessionStoreError(Exception):
+    """SessionStore固有のエラー"""
+
+    pass
+
+
+class SessionLockTimeoutError(SessionStoreError):
+    """セッションのロックを期限内に取得できなかった場合のエラー"""
+
+    def __init__(self, session_id: str, timeout: float):
+        self.session_id = session_id
+        self.timeout = timeout
+        super().__init__(
+            f"セッション '{session_id}' のロックを {timeout:.1f} 秒以内に取得できませんでした"
+        )
+
+
+class StoredSession(BaseModel):
+    """保存されたセッション"""
+
+    session_id: str = Field(..., description="セッションID")
+    version: int = Field(..., description="チェックポイントごとに増える版数")
+    state: Dict[str, Any] = Field(..., description="ターンの記録を除く進行状態")
+    turns: List[Dict[str, Any]] = Field(
+        default_factory=list, description="ターンの記録"
+    )
+
+
+class SessionStore:
+    """
+    セッション状態をSQLiteに保存するストア
+
+    1つのファイルを複数のプロセスから共有して使用できます（WALモード）。
+    接続はスレッドごとに作成します。
+    """
+
+    DEFAULT_LOCK_TTL = 300.0
+    DEFAULT_LOCK_TIMEOUT = 60.0
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        lock_ttl: float = DEFAULT_LOCK_TTL,
+        lock_poll_interval: float = 0.05,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        SessionStoreを初期化
+
+        Args:
+            db_path: SQLiteファイルのパス（親ディレクトリがなければ作成する）
+            lock_ttl: ロックの有効期限（秒）。1回の操作（LLM呼び出しを含む）より長くする
+            lock_poll_interval: ロックが取得できない場合に再試行する間隔（秒）
+            clock: 現在時刻（UNIX時間）を返す関数
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock_ttl = lock_ttl
+        self.lock_poll_interval = lock_poll_interval
+        self.clock = clock
+        self._local = threading.local()
+
+        self._connection().executescript(_SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> Optional["SessionStore"]:
+        """環境変数 PROJECT_ANIMA_SESSION_DB が設定されていればストアを作成する"""
+        db_path = os.environ.get(SESSION_DB_ENV)
+        return cls(db_path) if db_path else None
+
+    def _connection(self) -> sqlite3.Connection:
+        """現在のスレッドの接続を取得する"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.db_path, timeout=30.0, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """書き込みロックを取得したトランザクションを実行する"""
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def get_version(self, session_id: str) -> Optional[int]:
+        """保存されているセッションの版数を取得する（存在しない場合はNone）"""
+        row = (
+            self._connection()
+            .execute("SELECT version FROM sessions WHERE session_id = ?", (session_id,))
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def load(self, session_id: str) -> Optional[StoredSession]:
+        """
+        セッションを読み込む
+
+        Args:
+            session_id: セッションID
+
+        Returns:
+            保存されたセッション（存在しない場合はNone）
+        """
+        connection = self._connection()
+        connection.execute("BEGIN")
+        try:
+            row = connection.execute(
+                "SELECT version, state, turn_count FROM sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            turn_rows = connection.execute(
+                "SELECT data FROM session_turns WHERE session_id = ? AND turn_index < ? "
+                "ORDER BY turn_index",
+                (session_id, row[2]),
+            ).fetchall()
+        finally:
+            connection.execute("COMMIT")
+
+        return StoredSession(
+            session_id=session_id,
+            version=row[0],
+            state=json.loads(row[1]),
+            turns=[json.loads(data) for (data,) in turn_rows],
+        )
+
+    def checkpoint(
+        self,
+        session_id: str,
+        state: Dict[str, Any],
+        turns: Sequence[Any],
+        rewrite: bool = False,
+    ) -> int:
+        """
+        セッションの進行状態を保存する
+
+        ターンの記録は保存済みの件数より後ろの分だけを書き込みます。
+
+        Args:
+            session_id: セッションID
+            state: ターンの記録を除く進行状態（JSONに変換できる辞書）
+            turns: ターンの記録（辞書またはPydanticモデルのシーケンス）
+            rewrite: 保存済みのターンの記録を破棄して全て書き直すか
+                （新しい場面を開始した場合など）
+
+        Returns:
+            保存後の版数
+        """
+        state_json = json.dumps(state, ensure_ascii=False)
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT version, turn_count FROM sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            version = (row[0] if row else 0) + 1
+            stored_count = row[1] if row else 0
+
+            if rewrite or stored_count > len(turns):
+                connection.execute(
+                    "DELETE FROM session_turns WHERE session_id = ?", (session_id,)
+                )
+                stored_count = 0
+
+            new_turns = turns[stored_count:]
+            connection.executemany(
+                "INSERT OR REPLACE INTO session_turns (session_id, turn_index, data) "
+                "VALUES (?, ?, ?)",
+                [
+                    (session_id, stored_count + offset, self._serialize_turn(turn))
+                    for offset, turn in enumerate(new_turns)
+                ],
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO sessions "
+                "(session_id, version, state, turn_count, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (session_id, version, state_json, len(turns), self.clock()),
+            )
+
+        logger.debug(
+            f"セッション '{session_id}' を保存しました（版数: {version}、追加したターン: {len(new_turns)}）"
+        )
+        return version
+
+    def delete(self, session_id: str) -> None:
+        """セッションを削除する（ロックは削除しない）"""
+        with self._transaction() as connection:
+            connection.execute(
+                "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+            )
+            connection.execute(
+                "DELETE FROM session_turns WHERE session_id = ?", (session_id,)
+            )
+
+    def try_acquire(self, session_id: str, owner: str) -> bool:
+        """
+        セッションのロックの取得を1回だけ試みる
+
+        同じownerが保持しているロックは有効期限を延長します。
+
+        Returns:
+            ロックを取得できたか
+        """
+        now = self.clock()
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT owner, expires_at FROM session_locks WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is not None and row[0] != owner and row[1] > now:
+                return False
+            if row is not None and row[0] != owner:
+                logger.warning(
+                    f"セッション '{session_id}' の期限切れのロックを引き継ぎます（前の保持者: {row[0]}）"
+                )
+            connection.execute(
+                "INSERT OR REPLACE INTO session_locks (session_id, owner, expires_at) "
+                "VALUES (?, ?, ?)",
+                (session_id, owner, now + self.lock_ttl),
+            )
+        return True
+
+    def acquire(self, session_id: str, timeout: Optional[float] = None) -> str:
+        """
+        セッションのロックを取得する（取得できるまで待機する）
+
+        Args:
+            session_id: セッションID
+            timeout: 待機する最長時間（秒）。省略時はDEFAULT_LOCK_TIMEOUT
+
+        Returns:
+            releaseに渡すロックの保持者ID
+
+        Raises:
+            SessionLockTimeoutError: 期限内に取得できなかった場合
+        """
+        timeout = self.DEFAULT_LOCK_TIMEOUT if timeout is None else timeout
+        owner = f"{os.getpid()}-{uuid.uuid4().hex}"
+        deadline = time.monotonic() + timeout
+        while not self.try_acquire(session_id, owner):
+            if time.monotonic() >= deadline:
+                raise SessionLockTimeoutError(session_id, timeout)
+            time.sleep(self.lock_poll_interval)
+        return owner
+
+    def release(self, session_id: str, owner: str) -> None:
+        """セッションのロックを解放する（他の保持者に引き継がれている場合は何もしない）"""
+        with self._transaction() as connection:
+            connection.execute(
+                "DELETE FROM session_locks WHERE session_id = ? AND owner = ?",
+                (session_id, owner),
+            )
+
+    @contextmanager
+    def lock(self, session_id: str, timeout: Optional[float] = None) -> Iterator[str]:
+        """セッションのロックを保持している間だけ処理を実行するコンテクストマネージャ"""
+        owner = self.acquire(session_id, timeout)
+        try:
+            yield owner
+        finally:
+            self.release(session_id, owner)
+
+    @staticmethod
+    def _serialize_turn(turn: Any) -> str:
+        """ターンの記録をJSON文字列に変換する"""
+        if hasattr(turn, "model_dump"):
+            turn = turn.model_dump(mode="json")
+        return json.dumps(turn, ensure_ascii=False)
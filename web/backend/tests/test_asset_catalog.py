@@ -0,0 +1,86 @@
+"""
+AssetCatalogのテスト
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from web.backend.services.asset_catalog import AssetCatalog
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """キャラクターとシーンを1つずつ含むデータディレクトリ"""
+    (tmp_path / "characters" / "alice").mkdir(parents=True)
+    (tmp_path / "characters" / "alice" / "immutable.yaml").write_text(
+        "name: アリス\n", encoding="utf-8"
+    )
+    (tmp_path / "characters" / "draft").mkdir()
+    (tmp_path / "scenes").mkdir()
+    (tmp_path / "scenes" / "school.yaml").write_text(
+        "scene_id: school\nlocation: 教室\nsituation: 放課後\n", encoding="utf-8"
+    )
+    return tmp_path
+
+
+def _catalog(data_dir, refresh_interval=60.0):
+    return AssetCatalog(data_dir / "characters", data_dir / "scenes", refresh_interval)
+
+
+def test_lists_characters_and_scenes(data_dir):
+    """immutable.yamlを持つキャラクターとシーン情報を一覧できること"""
+    catalog = _catalog(data_dir)
+
+    assert catalog.get_characters() == ["alice"]
+    [scene] = catalog.get_scenes()
+    assert scene["id"] == "school"
+    assert scene["location"] == "教室"
+    assert scene["description"] == "放課後"
+
+
+def test_cached_within_refresh_interval(data_dir):
+    """更新間隔内はシーンファイルを再解析しないこと"""
+    catalog = _catalog(data_dir)
+    catalog.get_scenes()
+
+    with patch("web.backend.services.asset_catalog.yaml.safe_load") as safe_load:
+        catalog.get_scenes()
+        catalog.get_characters()
+
+    safe_load.assert_not_called()
+
+
+def test_invalidate_reloads_changed_scene_only(data_dir):
+    """無効化後は変更されたシーンファイルのみ再解析すること"""
+    catalog = _catalog(data_dir)
+    catalog.get_scenes()
+    (data_dir / "scenes" / "park.yaml").write_text(
+        "scene_id: park\nsituation: 昼\n", encoding="utf-8"
+    )
+
+    catalog.invalidate(data_dir / "scenes" / "park.yaml")
+    with patch(
+        "web.backend.services.asset_catalog.yaml.safe_load",
+        return_value={"scene_id": "park"},
+    ) as safe_load:
+        scenes = catalog.get_scenes()
+
+    assert safe_load.call_count == 1
+    assert [scene["id"] for scene in scenes] == ["park", "school"]
+
+
+def test_detects_changes_after_refresh_interval(data_dir):
+    """更新間隔を過ぎると新しいキャラクターを検出すること"""
+    catalog = _catalog(data_dir, refresh_interval=0)
+    catalog.get_characters()
+    (data_dir / "characters" / "draft" / "immutable.yaml").write_text(
+        "name: 下書き\n", encoding="utf-8"
+    )
+
+    assert catalog.get_characters() == ["alice", "draft"]
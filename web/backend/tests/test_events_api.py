@@ -0,0 +1,36 @@
+"""
+イベント配信WebSocketエンドポイントのテスト
+"""
+
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from web.backend.api.models import SimulationStatus
+from web.backend.main import app
+from web.backend.services.engine_wrapper import engine_wrapper
+
+
+def test_websocket_receives_status_changes():
+    """状態遷移がWebSocket経由でプッシュされること"""
+    client = TestClient(app)
+
+    with client.websocket_connect("/api/events/ws") as websocket:
+        snapshot = websocket.receive_json()
+        assert snapshot["event_type"] == "snapshot"
+
+        engine_wrapper.status = SimulationStatus.COMPLETED
+        try:
+            message = websocket.receive_json()
+        finally:
+            engine_wrapper.status = SimulationStatus.NOT_STARTED
+
+        assert message["event_type"] == "status_changed"
+        assert message["payload"]["status"] == "completed"
+
+    # 切断後は購読が解除されていること
+    assert engine_wrapper.websocket_callbacks == []
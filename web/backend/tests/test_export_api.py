@@ -0,0 +1,117 @@
+"""
+エクスポートAPIのテスト
+"""
+
+import io
+import json
+import os
+import sys
+import zipfile
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from web.backend.main import app
+from web.backend.services.archive_stream import iter_zip_stream
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def test_iter_zip_stream_produces_valid_archive(tmp_path):
+    """チャンク単位で生成したZIPが正しく展開できること"""
+    large_file = tmp_path / "large.txt"
+    large_content = os.urandom(300 * 1024)
+    large_file.write_bytes(large_content)
+
+    chunks = list(
+        iter_zip_stream([("large.txt", str(large_file)), ("info.json", b"{}")])
+    )
+
+    assert len(chunks) > 1
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+        assert archive.read("large.txt") == large_content
+        assert archive.read("info.json") == b"{}"
+
+
+def test_export_project_streams_logs_with_filters(tmp_path, monkeypatch):
+    """ログを含めたプロジェクトエクスポートが日付で絞り込まれること"""
+    monkeypatch.chdir(tmp_path)
+    _write("data/characters/alice.yaml", "name: alice\n")
+    _write("data/characters/.alice.yaml.snapshot.json", "{}")
+    _write("logs/sim_20240101_100000/scene_s1.json", "{}")
+    _write("logs/sim_20240301_100000/scene_s1.json", "{}")
+
+    client = TestClient(app)
+    response = client.get(
+        "/api/export/project", params={"include_logs": True, "since": "20240201"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        names = archive.namelist()
+        export_info = json.loads(archive.read("export_info.json"))
+
+    assert "data/characters/alice.yaml" in names
+    assert "data/characters/.alice.yaml.snapshot.json" not in names
+    assert "logs/sim_20240301_100000/scene_s1.json" in names
+    assert "logs/sim_20240101_100000/scene_s1.json" not in names
+    assert export_info["logs"]["included"] is True
+
+
+def test_export_project_rejects_invalid_date():
+    """不正な日付フィルターは400エラーになること"""
+    client = TestClient(app)
+    response = client.get(
+        "/api/export/project", params={"include_logs": True, "since": "yesterday"}
+    )
+
+    assert response.status_code == 400
+
+
+def test_export_training_streams_ndjson(tmp_path, monkeypatch):
+    """保存済みログが学習用NDJSONとしてエクスポートされること"""
+    monkeypatch.chdir(tmp_path)
+    _write(
+        "logs/sim_20240101_100000/scene_s1.json",
+        json.dumps(
+            {
+                "scene_info": {"scene_id": "s1", "situation": "テスト"},
+                "turns": [
+                    {
+                        "turn_number": 1,
+                        "character_id": "alice",
+                        "character_name": "Alice",
+                        "think": "考える",
+                        "act": "",
+                        "talk": "こんにちは",
+                    }
+                ],
+            }
+        ),
+    )
+
+    client = TestClient(app)
+    response = client.get("/api/export/training")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert len(records) == 1
+    assert records[0]["output"]["talk"] == "こんにちは"
+
+
+def test_export_timeline_uses_current_state():
+    """タイムラインのエクスポートが現在のシミュレーション状態から作成されること"""
+    client = TestClient(app)
+    response = client.get("/api/export/timeline/json")
+
+    assert response.status_code == 200
+    assert response.json()["timeline"] == []
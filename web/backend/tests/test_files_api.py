@@ -0,0 +1,82 @@
+"""
+ファイル管理APIのテスト
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from web.backend.api import files
+from web.backend.main import app
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """一時ディレクトリをプロジェクトルートとするクライアント"""
+    monkeypatch.setattr(files, "PROJECT_ROOT", tmp_path)
+    characters_dir = tmp_path / "data" / "characters" / "alice"
+    characters_dir.mkdir(parents=True)
+    (characters_dir / "immutable.yaml").write_text("name: アリス\n", encoding="utf-8")
+    return TestClient(app)
+
+
+def test_list_files_metadata_only(client):
+    """metadata_onlyの場合は内容を含まずにメタデータのみを返すこと"""
+    response = client.get(
+        "/api/files",
+        params={"directory": "data/characters", "metadata_only": True},
+    )
+
+    assert response.status_code == 200
+    [file_info] = response.json()["files"]
+    assert file_info["path"] == "data/characters/alice/immutable.yaml"
+    assert file_info["size"] == len("name: アリス\n".encode("utf-8"))
+    assert "content" not in file_info
+    assert len(file_info["content_hash"]) == 64
+
+
+def test_list_files_includes_content_by_default(client):
+    """従来通り内容を含む一覧も取得できること"""
+    response = client.get("/api/files", params={"directory": "data/characters"})
+
+    assert response.json()["files"][0]["content"] == "name: アリス\n"
+
+
+def test_get_file_supports_conditional_request(client, tmp_path):
+    """ETagが一致する場合は304を返し、更新後は新しい内容を返すこと"""
+    path = "data/characters/alice/immutable.yaml"
+    first = client.get(f"/api/files/{path}")
+    etag = first.headers["etag"]
+
+    listed = client.get(
+        "/api/files",
+        params={"directory": "data/characters", "metadata_only": True},
+    )
+    assert etag == f'"{listed.json()["files"][0]["content_hash"]}"'
+
+    not_modified = client.get(f"/api/files/{path}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    (tmp_path / path).write_text("name: ありす\n", encoding="utf-8")
+    modified = client.get(f"/api/files/{path}", headers={"If-None-Match": etag})
+    assert modified.status_code == 200
+    assert modified.json()["content"] == "name: ありす\n"
+    assert modified.headers["etag"] != etag
+
+
+def test_snapshot_files_cannot_be_written(client, tmp_path):
+    """キャラクターデータのスナップショットはAPIから作成・更新できないこと"""
+    path = "data/characters/alice/.immutable.yaml.snapshot.pickle"
+
+    created = client.post("/api/files", json={"path": path, "content": "x"})
+    updated = client.put(f"/api/files/{path}", json={"content": "x"})
+
+    assert created.status_code == 403
+    assert updated.status_code == 403
+    assert not (tmp_path / path).exists()
@@ -0,0 +1,71 @@
+"""
+負荷試験ツールのテスト
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from web.backend.loadtest import (
+    LoadTestConfig,
+    StubModel,
+    format_report,
+    launch_app_server,
+    parse_mix,
+    run_load_test,
+)
+from web.backend.services.engine_wrapper import engine_wrapper
+
+
+def test_parse_mix():
+    """呼び出し比率の文字列を解析できること（比率の省略時は1）"""
+    assert parse_mix("status=5, next-turn=0.5,files") == {
+        "status": 5.0,
+        "next-turn": 0.5,
+        "files": 1.0,
+    }
+
+
+def test_stub_model_response_passes_both_validations():
+    """スタブの応答が思考生成と長期情報更新のどちらの形式も満たすこと"""
+    response = StubModel(latency_ms=0).generate_content("プロンプト")
+    payload = json.loads(response.text)
+
+    assert {"think", "act", "talk"} <= payload.keys()
+    assert {"new_experiences", "updated_goals", "new_memories"} <= payload.keys()
+    assert response.usage_metadata.total_token_count > 0
+
+
+def test_load_test_against_launched_server():
+    """スタブのLLMで起動したサーバーに負荷をかけ、エンドポイントごとに集計されること"""
+    original_characters_dir = engine_wrapper.characters_dir
+    config = LoadTestConfig(
+        clients=3,
+        duration_s=1.0,
+        think_time_ms=20,
+        mix={"status": 2, "next-turn": 1, "files": 1},
+        seed=1,
+    )
+
+    with launch_app_server(stub_latency_ms=5) as url:
+        report = asyncio.run(run_load_test(url, config))
+
+    assert report["total_requests"] > 0
+    assert report["error_rate"] == 0.0
+    assert set(report["endpoints"]) == {"status", "next-turn", "files"}
+    status = report["endpoints"]["status"]
+    assert status["count"] > 0
+    assert status["p50_ms"] <= status["p95_ms"] <= status["p99_ms"]
+
+    # 起動時に切り替えた設定は元に戻される
+    assert engine_wrapper.characters_dir == original_characters_dir
+    assert engine_wrapper.llm_adapter_factory is None
+    assert engine_wrapper.engine is None
+
+    text = format_report(report)
+    assert "next-turn" in text
+    assert "p99" in text
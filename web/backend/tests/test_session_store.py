@@ -0,0 +1,113 @@
+"""
+SessionStoreのテスト
+"""
+
+import asyncio
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from web.backend.api.models import LLMProvider, SimulationConfig, SimulationStatus
+from web.backend.loadtest import create_stub_llm_adapter
+from web.backend.services.engine_wrapper import EngineWrapper
+from web.backend.services.session_store import SessionLockTimeoutError, SessionStore
+
+
+def test_checkpoint_writes_only_new_turns(tmp_path):
+    """チェックポイントでは追加されたターンのみを書き込み、読み込み時に全件を返すこと"""
+    store = SessionStore(tmp_path / "sessions.sqlite3")
+    assert store.load("s1") is None
+
+    turns = [{"turn_number": 1}, {"turn_number": 2}]
+    assert store.checkpoint("s1", {"status": "idle"}, turns) == 1
+
+    # 保存済みのターンが変更されても書き直されない（追加分のみ書き込む）
+    turns = [{"turn_number": 99}, {"turn_number": 2}, {"turn_number": 3}]
+    assert store.checkpoint("s1", {"status": "running"}, turns) == 2
+
+    stored = store.load("s1")
+    assert stored.version == 2
+    assert stored.state == {"status": "running"}
+    assert [t["turn_number"] for t in stored.turns] == [1, 2, 3]
+
+    # 新しい場面を開始した場合は全て書き直す
+    store.checkpoint("s1", {"status": "idle"}, [{"turn_number": 1}], rewrite=True)
+    assert [t["turn_number"] for t in store.load("s1").turns] == [1]
+
+    store.delete("s1")
+    assert store.get_version("s1") is None
+
+
+def test_lock_is_exclusive_until_released_or_expired(tmp_path):
+    """ロックは解放されるか期限が切れるまで他の保持者が取得できないこと"""
+    now = [1000.0]
+    store = SessionStore(
+        tmp_path / "sessions.sqlite3",
+        lock_ttl=10.0,
+        lock_poll_interval=0.01,
+        clock=lambda: now[0],
+    )
+
+    owner = store.acquire("s1")
+    assert not store.try_acquire("s1", "other")
+    with pytest.raises(SessionLockTimeoutError):
+        store.acquire("s1", timeout=0.05)
+
+    # 別のセッションのロックは独立している
+    with store.lock("s2"):
+        pass
+
+    store.release("s1", owner)
+    assert store.try_acquire("s1", "other")
+
+    # 保持者が終了して期限が切れたロックは引き継げる
+    now[0] += 11.0
+    assert store.try_acquire("s1", "another")
+
+
+def test_wrappers_share_session_through_store(tmp_path):
+    """同じストアを使う別のEngineWrapper（別ワーカー相当）がセッションを引き継げること"""
+    store_path = tmp_path / "sessions.sqlite3"
+    characters_dir = tmp_path / "characters"
+    shutil.copytree(project_root / "data" / "characters", characters_dir)
+
+    def create_wrapper() -> EngineWrapper:
+        wrapper = EngineWrapper(session_store=SessionStore(store_path))
+        wrapper.characters_dir = characters_dir
+        wrapper.log_dir = tmp_path / "logs"
+        wrapper.llm_adapter_factory = lambda model_name: create_stub_llm_adapter(
+            model_name, latency_ms=0
+        )
+        return wrapper
+
+    first, second = create_wrapper(), create_wrapper()
+    config = SimulationConfig(
+        character_name="",
+        llm_provider=LLMProvider.GEMINI,
+        model_name="gemini-1.5-flash",
+        scene_id="default",
+    )
+
+    async def scenario():
+        assert (await first.start_simulation(config))["success"]
+        assert (await first.execute_next_turn())["success"]
+
+        # 2つ目のワーカーは保存された状態から続きのターンを実行する
+        result = await second.execute_next_turn()
+        assert result["success"]
+        assert result["turn_data"]["turn_number"] == 2
+
+        # 1つ目のワーカーの状態取得にも反映される
+        assert first.get_simulation_state().current_step == 2
+
+        assert (await second.stop_simulation())["success"]
+
+    asyncio.run(scenario())
+
+    assert first.get_simulation_state().status == SimulationStatus.NOT_STARTED
+    assert first.engine is None